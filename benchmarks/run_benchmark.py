@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Offline Retrieval Benchmark
+
+Replays the fixed query set in benchmarks/queries.json (hymn references, proper
+nouns, location/tribal and construction/grammar queries) through
+HybridRetriever and, optionally, run_agentic_rag. Needs no network or API keys:
+
+- corpus: the Griffith Rigveda and Yajurveda text files in the repository root,
+  chunked exactly as the indexer does
+- embeddings: a deterministic hashing bag-of-words model (HashingEmbeddings)
+- vector store: an in-memory Qdrant collection
+- LLM: a stub chat model returning a canned answer (agentic run only)
+
+Reports p50/p95 latency overall, per category and per retrieval stage (from
+HybridRetriever.last_stage_timings), and compares the retrieved chunks and
+agentic routing against a recorded baseline so regressions show up locally.
+
+Usage:
+    python benchmarks/run_benchmark.py                  # compare with benchmarks/baseline.json
+    python benchmarks/run_benchmark.py --agentic        # include run_agentic_rag
+    python benchmarks/run_benchmark.py --record         # re-record the baseline
+    python benchmarks/run_benchmark.py --json out.json  # also write the full report
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# Offline run: config requires a model name and a provider key to be set
+os.environ.setdefault("MODEL", "benchmark-stub")
+os.environ.setdefault("GROQ_API_KEY", "offline")
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+QUERIES_FILE = os.path.join(BENCHMARK_DIR, "queries.json")
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, "baseline.json")
+CORPUS_FILES = (
+    "rigveda-griffith_COMPLETE_english_with_metadata.txt",
+    "yajurveda-griffith_COMPLETE_english_with_metadata.txt",
+)
+STUB_ANSWER = "Stub answer from the offline benchmark model. " * 4
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic bag-of-words embeddings (signed feature hashing, L2-normalised).
+
+    Texts sharing words land close together, which is enough for the semantic
+    side of the hybrid retriever to behave plausibly. Queries are embedded like
+    documents, as with the sentence-transformers models.
+    """
+
+    query_uses_document_embedding = True
+
+    def __init__(self, size: int = 384):
+        self.size = size
+
+    def _embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.size, dtype=np.float32)
+        plain = "".join(c for c in unicodedata.normalize("NFD", text.lower()) if unicodedata.category(c) != "Mn")
+        for token in re.findall(r"\w+", plain):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.size
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+def load_corpus(max_chars: int = 0) -> List[Document]:
+    """Chunk the fixture texts with the indexer's splitter."""
+    from src.utils.index_files import chunk_doc
+
+    documents = []
+    for filename in CORPUS_FILES:
+        with open(os.path.join(ROOT, filename), "r", encoding="utf-8") as f:
+            text = f.read()
+        if max_chars:
+            text = text[:max_chars]
+        documents.append(Document(page_content=text, metadata={"filename": filename.rsplit(".", 1)[0]}))
+    chunks = chunk_doc(documents)
+    for i, chunk in enumerate(chunks):
+        chunk.metadata = {**chunk.metadata, "chunk": i}
+    return chunks
+
+
+def build_retriever(chunks: List[Document], work_dir: str, use_cache: bool):
+    """In-memory Qdrant collection plus the production create_retriever."""
+    from langchain_qdrant import QdrantVectorStore
+    from src.utils.retriever import create_retriever
+
+    vec_db = QdrantVectorStore.from_documents(
+        chunks, HashingEmbeddings(), location=":memory:", collection_name="benchmark"
+    )
+    retriever = create_retriever(vec_db, chunks, index_dir=work_dir)
+    if not use_cache and hasattr(retriever, "result_cache"):
+        retriever.result_cache = None  # measure retrieval, not cache hits
+    return vec_db, retriever
+
+
+def install_stub_llm():
+    """Make Settings hand out a canned chat model before the RAG modules import it."""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from src.settings import Settings
+
+    Settings._llm = FakeListChatModel(responses=[STUB_ANSWER])
+    Settings._eval_llm = FakeListChatModel(responses=["yes"])
+
+
+def result_keys(docs: List[Document]) -> List[str]:
+    return [hashlib.blake2b(doc.page_content.encode("utf-8"), digest_size=6).hexdigest() for doc in docs]
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    values = np.asarray(samples, dtype=np.float64) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+    }
+
+
+def bench_retriever(retriever, queries: List[dict], repeat: int) -> dict:
+    for q in queries:  # warm-up: lazy loads, variant tables, BM25 pages
+        retriever.invoke(q["query"])
+
+    latencies = defaultdict(list)
+    stages = defaultdict(list)
+    results = {}
+    for _ in range(repeat):
+        for q in queries:
+            start = time.perf_counter()
+            docs = retriever.invoke(q["query"])
+            latencies[q["id"]].append(time.perf_counter() - start)
+            for stage, seconds in getattr(retriever, "last_stage_timings", {}).items():
+                stages[stage].append(seconds)
+            results[q["id"]] = result_keys(docs)
+
+    by_category = defaultdict(list)
+    for q in queries:
+        by_category[q["category"]].extend(latencies[q["id"]])
+    return {
+        "overall": percentiles([s for samples in latencies.values() for s in samples]),
+        "by_category": {category: percentiles(samples) for category, samples in sorted(by_category.items())},
+        "stages": {stage: percentiles(samples) for stage, samples in stages.items()},
+        "queries": {
+            q["id"]: {**percentiles(latencies[q["id"]]), "results": results[q["id"]]} for q in queries
+        },
+    }
+
+
+def bench_agentic(vec_db, chunks, retriever, queries: List[dict], repeat: int) -> dict:
+    from src.utils import agentic_rag
+
+    agentic_rag.set_shared_vector_store(vec_db, chunks)
+    agentic_rag._SHARED_RETRIEVER = retriever
+
+    for q in queries:  # warm-up: dictionary load
+        agentic_rag.run_agentic_rag(q["query"])
+
+    latencies = defaultdict(list)
+    routes = {}
+    for _ in range(repeat):
+        for q in queries:
+            start = time.perf_counter()
+            state = agentic_rag.run_agentic_rag(q["query"])
+            latencies[q["id"]].append(time.perf_counter() - start)
+            routes[q["id"]] = state.get("query_type", "")
+
+    return {
+        "overall": percentiles([s for samples in latencies.values() for s in samples]),
+        "queries": {q["id"]: {**percentiles(latencies[q["id"]]), "query_type": routes[q["id"]]} for q in queries},
+    }
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Result overlap, routing changes and latency ratios against the baseline."""
+    comparison = {}
+    base_retrieval = baseline.get("retrieval", {}).get("queries", {})
+    overlaps = {}
+    for query_id, current in report["retrieval"]["queries"].items():
+        expected = base_retrieval.get(query_id, {}).get("results")
+        if expected is None:
+            continue
+        overlaps[query_id] = len(set(current["results"]) & set(expected)) / max(len(expected), 1)
+    if overlaps:
+        comparison["mean_overlap"] = round(sum(overlaps.values()) / len(overlaps), 4)
+        comparison["changed_queries"] = {q: round(v, 3) for q, v in overlaps.items() if v < 1.0}
+
+    if baseline.get("retrieval", {}).get("overall"):
+        comparison["retrieval_p50_ratio"] = round(
+            report["retrieval"]["overall"]["p50_ms"] / max(baseline["retrieval"]["overall"]["p50_ms"], 1e-9), 3
+        )
+
+    if "agentic" in report and "agentic" in baseline:
+        comparison["changed_routes"] = {
+            q: {"baseline": baseline["agentic"]["queries"][q]["query_type"], "current": current["query_type"]}
+            for q, current in report["agentic"]["queries"].items()
+            if q in baseline["agentic"]["queries"] and baseline["agentic"]["queries"][q]["query_type"] != current["query_type"]
+        }
+        comparison["agentic_p50_ratio"] = round(
+            report["agentic"]["overall"]["p50_ms"] / max(baseline["agentic"]["overall"]["p50_ms"], 1e-9), 3
+        )
+    return comparison
+
+
+def print_report(report: dict):
+    retrieval = report["retrieval"]
+    print("=" * 70)
+    print(f"RETRIEVAL ({report['n_chunks']} chunks, {report['n_queries']} queries x {report['repeat']})")
+    print("=" * 70)
+    print(f"  overall      p50 {retrieval['overall']['p50_ms']:8.2f} ms   p95 {retrieval['overall']['p95_ms']:8.2f} ms")
+    for category, stats in retrieval["by_category"].items():
+        print(f"  {category:<14} p50 {stats['p50_ms']:8.2f} ms   p95 {stats['p95_ms']:8.2f} ms")
+    print("  stages:")
+    for stage, stats in retrieval["stages"].items():
+        print(f"    {stage:<20} p50 {stats['p50_ms']:8.2f} ms   p95 {stats['p95_ms']:8.2f} ms")
+
+    if "agentic" in report:
+        agentic = report["agentic"]
+        print("\n" + "=" * 70)
+        print("AGENTIC RAG (stub LLM)")
+        print("=" * 70)
+        print(f"  overall      p50 {agentic['overall']['p50_ms']:8.2f} ms   p95 {agentic['overall']['p95_ms']:8.2f} ms")
+
+    comparison = report.get("comparison")
+    if comparison:
+        print("\n" + "=" * 70)
+        print("VS BASELINE")
+        print("=" * 70)
+        if "mean_overlap" in comparison:
+            print(f"  result overlap        {comparison['mean_overlap']:.1%}")
+            for query_id, overlap in comparison["changed_queries"].items():
+                print(f"    changed: {query_id} ({overlap:.0%} of baseline chunks)")
+        if "retrieval_p50_ratio" in comparison:
+            print(f"  retrieval p50 ratio   {comparison['retrieval_p50_ratio']:.2f}x")
+        if "agentic_p50_ratio" in comparison:
+            print(f"  agentic p50 ratio     {comparison['agentic_p50_ratio']:.2f}x")
+            for query_id, change in comparison["changed_routes"].items():
+                print(f"    route changed: {query_id} {change['baseline']} -> {change['current']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline retrieval latency benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over the query set")
+    parser.add_argument("--agentic", action="store_true", help="Also benchmark run_agentic_rag with a stub LLM")
+    parser.add_argument("--with-cache", action="store_true", help="Keep the retrieval result cache enabled")
+    parser.add_argument("--max-chars", type=int, default=0, help="Truncate each corpus file (0 = full texts)")
+    parser.add_argument("--record", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline file to compare against / record to")
+    parser.add_argument("--json", help="Write the full report to this file")
+    parser.add_argument("--min-overlap", type=float, default=1.0, help="Fail when mean result overlap drops below this")
+    parser.add_argument("--max-slowdown", type=float, default=0.0, help="Fail when p50 latency exceeds baseline by this factor (0 = report only)")
+    parser.add_argument("--verbose", action="store_true", help="Keep INFO logging from the pipeline")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    with open(QUERIES_FILE, "r", encoding="utf-8") as f:
+        queries = json.load(f)
+
+    install_stub_llm()
+    setup_start = time.perf_counter()
+    chunks = load_corpus(args.max_chars)
+    with tempfile.TemporaryDirectory() as work_dir:
+        vec_db, retriever = build_retriever(chunks, work_dir, args.with_cache)
+        setup_seconds = time.perf_counter() - setup_start
+
+        report = {
+            "n_chunks": len(chunks),
+            "n_queries": len(queries),
+            "repeat": args.repeat,
+            "max_chars": args.max_chars,
+            "setup_s": round(setup_seconds, 3),
+            "retrieval": bench_retriever(retriever, queries, args.repeat),
+        }
+        if args.agentic:
+            report["agentic"] = bench_agentic(vec_db, chunks, retriever, queries, args.repeat)
+
+    exit_code = 0
+    if args.record:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Recorded baseline to {args.baseline}")
+    elif os.path.isfile(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("max_chars") != args.max_chars:
+            print(f"⚠️  Baseline was recorded with --max-chars {baseline.get('max_chars')}; overlap is not comparable")
+        report["comparison"] = compare(report, baseline)
+        comparison = report["comparison"]
+        if comparison.get("mean_overlap", 1.0) < args.min_overlap or comparison.get("changed_routes"):
+            exit_code = 1
+        if args.max_slowdown and comparison.get("retrieval_p50_ratio", 0) > args.max_slowdown:
+            exit_code = 1
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if exit_code:
+        print("\n❌ Benchmark regressed against the baseline")
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
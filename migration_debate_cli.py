@@ -21,29 +21,37 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+# Must start before the heavy imports below so they are timed (no-op without --profile-startup)
+from utils.startup_profile import (
+    start_startup_profile,
+    startup_checkpoint,
+    startup_phase,
+    add_profile_argument,
+    finish_startup_profile,
+)
+start_startup_profile("migration_debate_cli")
+
 from cli_run import build_index_and_retriever
 from utils.migration_debate_agents import AMTAgent, OITAgent, MigrationDebateOrchestrator
-from debate_cli import (
-    auto_retrieve_both_translations,
-    extract_specific_verse_griffith,
-    parse_verse_reference
-)
-from langchain_ollama import ChatOllama
-from langchain_google_genai import ChatGoogleGenerativeAI
+from utils.debate_batch import DebateLedger, print_batch_summary, read_verse_list, run_debate_batch
+from utils.providers import chat_model_class, provider_concurrency, provider_of
 from config import GEMINI_API_KEY, GEMINI_MODEL, OLLAMA_MODEL, OLLAMA_BASE_URL, MODEL_SPECS
+from config import DEBATE_AGENT_TIMEOUT, DEBATE_BATCH_WORKERS, DEBATE_PARALLEL
+
+startup_checkpoint("imports", "migration_debate_cli")
 
 
 def create_llm(use_google: bool = False):
     """Create LLM instance."""
     if use_google and GEMINI_API_KEY:
-        return ChatGoogleGenerativeAI(
+        return chat_model_class("gemini")(
             model=GEMINI_MODEL,
             google_api_key=GEMINI_API_KEY,
             temperature=0.3,
             timeout=180  # 3 minute timeout
         )
     else:
-        return ChatOllama(
+        return chat_model_class("ollama")(
             base_url=OLLAMA_BASE_URL,
             model=OLLAMA_MODEL,
             temperature=MODEL_SPECS.get("temperature", 0.7),
@@ -53,35 +61,26 @@ def create_llm(use_google: bool = False):
         )
 
 
-def run_migration_debate(verse_ref: str, griffith_text: str = None, sharma_text: str = None,
-                        context: str = "", rounds: int = 2, use_google: bool = False,
-                        retriever=None):
+def fetch_translations(verse_ref: str, retriever, griffith_text: str = None, sharma_text: str = None):
     """
-    Run AMT vs OIT debate on a specific verse.
+    Griffith and Sharma texts of a verse, from the verse index or else a corpus search.
 
-    Args:
-        verse_ref: Verse reference (e.g., "RV 7.95.2")
-        griffith_text: Griffith translation (if None, will auto-retrieve)
-        sharma_text: Sharma translation (if None, will auto-retrieve)
-        context: Additional scholarly context
-        rounds: Number of debate rounds
-        use_google: Whether to use Google Gemini for evaluation
-        retriever: Pre-built retriever (optional, for interactive mode)
+    Texts passed in are kept. Returns (griffith_text, sharma_text); either may be None.
     """
-    print("\n🔍 Initializing Migration Debate System...")
-    print(f"📖 Target Verse: {verse_ref}")
-    print(f"🤖 LLM: {'Google Gemini' if use_google else 'Ollama ' + OLLAMA_MODEL}")
-    print(f"🔄 Rounds: {rounds}\n")
+    # Exact texts from the verse index (Sharma has no verse numbers: whole sukta)
+    verse_index = getattr(retriever, "verse_index", None)
+    if verse_index is not None and verse_ref in verse_index:
+        print(f"📇 Fetching {verse_ref} from the verse index...")
+        griffith_text = griffith_text or verse_index.text(verse_ref, "griffith")
+        sharma_text = sharma_text or verse_index.text(verse_ref, "sharma")
 
-    # Build retriever if needed
     if not griffith_text or not sharma_text:
-        if retriever is None:
-            print("📚 Building vector store and retriever...")
-            vec_db, docs, retriever = build_index_and_retriever(force=False)
-        else:
-            print("📚 Using existing retriever...")
-
         # Try to retrieve both translations
+        from debate_cli import (
+            auto_retrieve_both_translations,
+            extract_specific_verse_griffith,
+            parse_verse_reference
+        )
         print(f"🔎 Auto-retrieving translations for {verse_ref}...")
 
         # Check if it's a complete hymn or specific verse
@@ -116,6 +115,42 @@ def run_migration_debate(verse_ref: str, griffith_text: str = None, sharma_text:
             if not sharma_text:
                 sharma_text = auto_sharma
 
+    return griffith_text, sharma_text
+
+
+def run_migration_debate(verse_ref: str, griffith_text: str = None, sharma_text: str = None,
+                        context: str = "", rounds: int = 2, use_google: bool = False,
+                        retriever=None, parallel: bool = DEBATE_PARALLEL,
+                        agent_timeout: float = DEBATE_AGENT_TIMEOUT):
+    """
+    Run AMT vs OIT debate on a specific verse.
+
+    Args:
+        verse_ref: Verse reference (e.g., "RV 7.95.2")
+        griffith_text: Griffith translation (if None, will auto-retrieve)
+        sharma_text: Sharma translation (if None, will auto-retrieve)
+        context: Additional scholarly context
+        rounds: Number of debate rounds
+        use_google: Whether to use Google Gemini for evaluation
+        retriever: Pre-built retriever (optional, for interactive mode)
+        parallel: Run the AMT and OIT calls of each round at the same time
+        agent_timeout: Seconds per agent call before it is marked as timed out (0 = no limit)
+    """
+    print("\n🔍 Initializing Migration Debate System...")
+    print(f"📖 Target Verse: {verse_ref}")
+    print(f"🤖 LLM: {'Google Gemini' if use_google else 'Ollama ' + OLLAMA_MODEL}")
+    print(f"🔄 Rounds: {rounds} ({'AMT and OIT in parallel' if parallel else 'sequential'})\n")
+
+    # Build retriever if needed
+    if not griffith_text or not sharma_text:
+        if retriever is None:
+            print("📚 Building vector store and retriever...")
+            vec_db, docs, retriever = build_index_and_retriever(force=False)
+        else:
+            print("📚 Using existing retriever...")
+
+        griffith_text, sharma_text = fetch_translations(verse_ref, retriever, griffith_text, sharma_text)
+
         if not griffith_text or not sharma_text:
             print(f"❌ ERROR: Could not retrieve translations for {verse_ref}")
             print(f"   Griffith: {'✓' if griffith_text else '✗'}")
@@ -128,7 +163,8 @@ def run_migration_debate(verse_ref: str, griffith_text: str = None, sharma_text:
 
     amt_agent = AMTAgent(llm)
     oit_agent = OITAgent(llm)
-    orchestrator = MigrationDebateOrchestrator(amt_agent, oit_agent, synthesis_llm)
+    orchestrator = MigrationDebateOrchestrator(amt_agent, oit_agent, synthesis_llm,
+                                               parallel=parallel, agent_timeout=agent_timeout)
 
     # Run debate
     debate_history = orchestrator.run_debate(
@@ -204,6 +240,74 @@ def interactive_mode():
             break
 
 
+def run_batch(verses_file: str, ledger_path: str = None, workers: int = DEBATE_BATCH_WORKERS,
+              rounds: int = 2, use_google: bool = False, parallel: bool = DEBATE_PARALLEL,
+              agent_timeout: float = DEBATE_AGENT_TIMEOUT) -> dict:
+    """
+    Run a debate for every verse in a verse list file, resuming an interrupted run.
+
+    One retriever and one set of agents serve every verse. Debates run `workers`
+    at a time, capped so that their LLM calls stay within the provider's
+    LLM_MAX_CONCURRENCY (or e.g. OLLAMA_MAX_CONCURRENCY). Finished verses go to
+    the ledger (default: migration_debates/<list name>.ledger.jsonl) and are
+    skipped when the same list runs again.
+    """
+    verse_refs = read_verse_list(verses_file)
+    ledger = DebateLedger(ledger_path or os.path.join("migration_debates", f"{Path(verses_file).stem}.ledger.jsonl"))
+    pending = [ref for ref in verse_refs if ref not in ledger.completed()]
+
+    print("\n🔍 Initializing Migration Debate Batch...")
+    print(f"📋 Verses: {len(verse_refs)} from {verses_file} ({len(pending)} to run)")
+    print(f"🧾 Ledger: {ledger.path}")
+
+    if pending:
+        llm = create_llm(use_google)
+        synthesis_llm = create_llm(True) if use_google else llm
+        calls_per_debate = 2 if parallel else 1
+        provider_limit = max(1, provider_concurrency(provider_of(llm)) // calls_per_debate)
+        workers = max(1, min(workers, provider_limit, len(pending)))
+        print(f"🤖 LLM: {'Google Gemini' if use_google else 'Ollama ' + OLLAMA_MODEL}, "
+              f"{workers} debate(s) at a time (provider allows {provider_limit})")
+        print(f"🔄 Rounds: {rounds} ({'AMT and OIT in parallel' if parallel else 'sequential'})\n")
+
+        print("📚 Building vector store and retriever...")
+        vec_db, docs, retriever = build_index_and_retriever(force=False)
+
+        # Transcripts of debates running side by side would interleave
+        orchestrator = MigrationDebateOrchestrator(AMTAgent(llm), OITAgent(llm), synthesis_llm,
+                                                   parallel=parallel, agent_timeout=agent_timeout,
+                                                   echo=workers == 1)
+
+        def run_one(verse_ref):
+            griffith_text, sharma_text = fetch_translations(verse_ref, retriever)
+            if not griffith_text or not sharma_text:
+                raise LookupError(f"could not retrieve translations (Griffith: {'✓' if griffith_text else '✗'}, "
+                                  f"Sharma: {'✓' if sharma_text else '✗'})")
+            debate_history = orchestrator.run_debate(verse_ref, griffith_text, sharma_text,
+                                                     rounds=rounds, save=False)
+            return str(orchestrator._save_debate(verse_ref, debate_history))
+    else:
+        run_one = None
+
+    summary = run_debate_batch(verse_refs, run_one, ledger, workers=workers)
+    print_batch_summary(summary)
+    return summary
+
+
+def profile_startup(args):
+    """Build everything a debate needs (index, retriever, agents), then write the startup profile."""
+    if not args.force:
+        with startup_phase("index_and_retriever"):
+            build_index_and_retriever(force=False)
+
+    with startup_phase("llm_init"):
+        llm = create_llm(args.google)
+        synthesis_llm = create_llm(True) if args.google else llm
+        MigrationDebateOrchestrator(AMTAgent(llm), OITAgent(llm), synthesis_llm)
+
+    finish_startup_profile(args.profile_startup)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Evaluate Rigvedic verses for AMT vs OIT evidence",
@@ -228,9 +332,15 @@ Examples:
   # Interactive mode
   python migration_debate_cli.py --interactive
 
+  # Debate every verse in a list (one ref per line); rerun to resume
+  python migration_debate_cli.py --batch river_hymns.txt --workers 2
+
   # Use Google Gemini for higher quality
   python migration_debate_cli.py --verse "RV 7.95.2" --google
 
+  # Time each startup phase and exit
+  python migration_debate_cli.py --profile-startup startup.json
+
 Key Verses for Testing:
   AMT Evidence:
     RV 10.75 - River Hymn (geographic west-to-east)
@@ -252,6 +362,26 @@ Key Verses for Testing:
         help='Verse reference (e.g., "RV 7.95.2" or "RV 10.75")'
     )
 
+    parser.add_argument(
+        '--batch',
+        type=str,
+        metavar='FILE',
+        help='Debate every verse in FILE (one reference per line, # comments), skipping verses already done'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEBATE_BATCH_WORKERS,
+        help=f'Debates running at once with --batch, capped by the provider limit (default: {DEBATE_BATCH_WORKERS})'
+    )
+
+    parser.add_argument(
+        '--ledger',
+        type=str,
+        help='JSONL progress ledger for --batch (default: migration_debates/<FILE name>.ledger.jsonl)'
+    )
+
     parser.add_argument(
         '--griffith-text',
         type=str,
@@ -278,6 +408,19 @@ Key Verses for Testing:
         help='Number of debate rounds (default: 2)'
     )
 
+    parser.add_argument(
+        '--sequential',
+        action='store_true',
+        help='Run the AMT and OIT scholars one after the other (default: in parallel, DEBATE_PARALLEL)'
+    )
+
+    parser.add_argument(
+        '--agent-timeout',
+        type=float,
+        default=DEBATE_AGENT_TIMEOUT,
+        help=f'Seconds each scholar may take per round, 0 = no limit (default: {DEBATE_AGENT_TIMEOUT})'
+    )
+
     parser.add_argument(
         '--google',
         action='store_true',
@@ -296,16 +439,31 @@ Key Verses for Testing:
         help='Force rebuild vector store'
     )
 
+    add_profile_argument(parser)
+
     args = parser.parse_args()
 
     # Force rebuild if requested
     if args.force:
         print("🔄 Forcing vector store rebuild...")
-        vec_db, docs, retriever = build_index_and_retriever(force=True)
+        with startup_phase("index_and_retriever"):
+            vec_db, docs, retriever = build_index_and_retriever(force=True)
         print("✅ Vector store rebuilt")
 
-    if args.interactive:
+    if args.profile_startup is not None:
+        profile_startup(args)
+    elif args.interactive:
         interactive_mode()
+    elif args.batch:
+        run_batch(
+            verses_file=args.batch,
+            ledger_path=args.ledger,
+            workers=args.workers,
+            rounds=args.rounds,
+            use_google=args.google,
+            parallel=DEBATE_PARALLEL and not args.sequential,
+            agent_timeout=args.agent_timeout
+        )
     elif args.verse:
         run_migration_debate(
             verse_ref=args.verse,
@@ -313,7 +471,9 @@ Key Verses for Testing:
             sharma_text=args.sharma_text,
             context=args.context,
             rounds=args.rounds,
-            use_google=args.google
+            use_google=args.google,
+            parallel=DEBATE_PARALLEL and not args.sequential,
+            agent_timeout=args.agent_timeout
         )
     else:
         parser.print_help()
@@ -16,12 +16,12 @@ load_dotenv(Path(__file__).parent / ".env")
 print("🔄 RE-INDEXING ALL DOCUMENTS WITH PANCAVAMSA")
 print("=" * 70)
 
-from src.utils.index_files import create_qdrant_vector_store
+from src.utils.index_files import update_qdrant_vector_store
 
-print("\n1️⃣  Re-indexing with force_recreate=True on LOCAL store...")
-print("   (This will recreate the local Qdrant collection with all docs)")
+print("\n1️⃣  Incrementally re-indexing the LOCAL store...")
+print("   (Only new or changed documents are embedded; the first run indexes everything)")
 
-vector_store, docs = create_qdrant_vector_store(force_recreate=True)
+vector_store, docs = update_qdrant_vector_store()
 
 print(f"\n✅ Local indexing complete!")
 print(f"   Total documents loaded: {len(docs)}")
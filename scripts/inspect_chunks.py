@@ -1,9 +1,14 @@
-import pickle, os
+import os, sys
 from collections import Counter
 
-CHUNKS_FILE = 'vector_store/ancient_history/docs_chunks.pkl'
-print('exists', os.path.isfile(CHUNKS_FILE))
-chunks = pickle.load(open(CHUNKS_FILE, 'rb'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.chunk_store import open_chunk_store
+
+CHUNKS_DIR = 'vector_store/ancient_history'
+chunks = open_chunk_store(CHUNKS_DIR)
+print('exists', chunks is not None)
+if chunks is None:
+    raise SystemExit(1)
 print('total_chunks', len(chunks))
 if len(chunks) == 0:
     raise SystemExit(0)
@@ -16,7 +21,7 @@ print('sample_metadata0', {k: c0.metadata.get(k) for k in list(c0.metadata)[:10]
 
 # sample distribution of content lengths (first N)
 N = min(2000, len(chunks))
-lengths = [len(c.page_content) for c in chunks[:N]]
+lengths = [len(t) for t in chunks.texts[:N]]
 rounded = [l//50*50 for l in lengths]
 print('sample_lengths_counter', Counter(rounded).most_common()[:10])
 
@@ -24,11 +29,12 @@ print('sample_lengths_counter', Counter(rounded).most_common()[:10])
 M = min(500, len(chunks))
 found_keys = set()
 chunk_size_key_count = 0
-for i, c in enumerate(chunks[:M]):
-    if isinstance(c.metadata, dict) and 'chunk_size' in c.metadata:
+for i in range(M):
+    metadata = chunks.metadata(i)
+    if isinstance(metadata, dict) and 'chunk_size' in metadata:
         chunk_size_key_count += 1
-    if isinstance(c.metadata, dict):
-        found_keys.update(c.metadata.keys())
+    if isinstance(metadata, dict):
+        found_keys.update(metadata.keys())
 
 print('chunk_size_key_count_first{}_chunks'.format(M), chunk_size_key_count)
 print('metadata_keys_union_sample', sorted(list(found_keys)))
@@ -36,10 +42,9 @@ print('metadata_keys_union_sample', sorted(list(found_keys)))
 # show a sample chunk metadata for a chunk containing 'Divodasa' or 'Trksi' if present
 targets = ['Divodasa', 'Trksi', 'Trksis', 'Trkṣi']
 found = []
-for idx, c in enumerate(chunks):
-    pc = c.page_content
+for idx, pc in enumerate(chunks.texts):
     if any(t in pc for t in targets):
-        found.append((idx, len(pc), list(c.metadata.keys()), (pc[:200].replace('\n',' ') + '...')))
+        found.append((idx, len(pc), list(chunks.metadata(idx).keys()), (pc[:200].replace('\n',' ') + '...')))
     if len(found) >= 5:
         break
 
@@ -1,14 +1,15 @@
-import pickle, os, re
+import os, re, sys
 from collections import defaultdict
 
-CHUNKS_FILE = 'vector_store/ancient_history/docs_chunks.pkl'
-if not os.path.isfile(CHUNKS_FILE):
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.chunk_store import open_chunk_store
+
+CHUNKS_DIR = 'vector_store/ancient_history'
+chunks = open_chunk_store(CHUNKS_DIR)
+if chunks is None:
     print('chunks_file_missing')
     raise SystemExit(1)
 
-with open(CHUNKS_FILE, 'rb') as f:
-    chunks = pickle.load(f)
-
 patterns = [r'Ikshvaku', r'Ikshvakus', r'Ikshvauks', r'Ikshvāku', r'Ikshvaku\b', r'Ikshvakus\b']
 regex = re.compile('|'.join(patterns), flags=re.IGNORECASE)
 
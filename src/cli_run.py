@@ -4,6 +4,7 @@ Usage:
   - Edit HARDCODED_FILES below to point to your file(s), OR
   - Run with --file /path/to/file1.pdf --file /path/to/file2.txt to override
   - Run with --files /path/to/file1.pdf /path/to/file2.txt (space-separated)
+  - Run with --update to add/refresh files without re-embedding the whole corpus
 
 Supported formats: PDF, TXT
 
@@ -26,6 +27,16 @@ import os
 # CRITICAL: Set this BEFORE any HuggingFace/transformers imports (including transitive imports via helper/settings)
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
+# Must start before the heavy imports below so they are timed (no-op without --profile-startup)
+from utils.startup_profile import (
+    start_startup_profile,
+    startup_checkpoint,
+    startup_phase,
+    add_profile_argument,
+    finish_startup_profile,
+)
+start_startup_profile("cli_run")
+
 import argparse
 import shutil
 import json
@@ -33,13 +44,16 @@ import glob
 import logging
 
 from helper import project_root, logger
-from config import LOCAL_FOLDER, COLLECTION_NAME, VECTORDB_FOLDER
+from config import LOCAL_FOLDER, COLLECTION_NAME, VECTORDB_FOLDER, STREAM_ANSWERS
 from utils.process_files import process_uploaded_pdfs
-from utils.index_files import create_qdrant_vector_store
+from utils.index_files import create_qdrant_vector_store, update_qdrant_vector_store
 from utils.retriever import create_retriever
-from utils.final_block_rag import create_langgraph_app, run_rag_with_langgraph
+from utils.final_block_rag import create_langgraph_app, run_rag_with_langgraph, stream_rag_with_langgraph
+from utils.service_client import ServiceClient, ServiceError
 # from utils.debate_agents import create_debate_orchestrator
 
+startup_checkpoint("imports", "cli_run")
+
 
 # Change this to your preferred default file(s) (absolute or relative to project root).
 # Example single PDF: [os.path.join(project_root, "examples", "my_doc.pdf")]
@@ -142,11 +156,13 @@ def prepare_and_process(file_paths: list):
     logger.info(f"Processing {len(dest_paths)} file(s)...")
     process_uploaded_pdfs(dest_paths, extract_metadata=True)
     logger.info(f"Successfully processed {len(dest_paths)} file(s)")
-def build_index_and_retriever(force: bool = False):
+def build_index_and_retriever(force: bool = False, update: bool = False):
     """Create Qdrant vector store and retriever from processed docs.
 
     If `force` is True, remove any existing vector store directory and
     the chunks file so indexing starts from a clean state.
+    If `update` is True, only new or changed processed documents are
+    embedded and removed ones are deleted from the existing index.
     """
     # Remove previous vector store and chunks file if forcing a clean index
     if force:
@@ -167,12 +183,15 @@ def build_index_and_retriever(force: bool = False):
         except Exception:
             logger.exception("Failed to remove chunks file %s", chunks_file)
 
-    vec_db, docs = create_qdrant_vector_store(force_recreate=force)
+    if update and not force:
+        vec_db, docs = update_qdrant_vector_store()
+    else:
+        vec_db, docs = create_qdrant_vector_store(force_recreate=force)
     retriever = create_retriever(vec_db, docs)
     return vec_db, docs, retriever
 
 
-def run_repl(retriever, debug=False):
+def run_repl(retriever, debug=False, stream=STREAM_ANSWERS):
     app = create_langgraph_app(retriever)
     print("\nReady. Enter questions (type 'exit' or 'quit' to stop).\n")
     if debug:
@@ -207,7 +226,17 @@ def run_repl(retriever, debug=False):
             "debug": debug,  # Pass debug flag to RAG pipeline
         }
 
-        result = run_rag_with_langgraph(graph_state, app)
+        # Print the answer as it is generated; the full result arrives at the end
+        streamed = ""
+        if stream:
+            answer_stream = stream_rag_with_langgraph(graph_state, app)
+            for delta in answer_stream:
+                print(delta, end="", flush=True)
+            result, streamed = answer_stream.result, answer_stream.text
+            if streamed:
+                print()
+        else:
+            result = run_rag_with_langgraph(graph_state, app)
 
         # Update the persistent chat history with the result
         if result and "chat_history" in result:
@@ -238,13 +267,54 @@ def run_repl(retriever, debug=False):
 
             # If the answer is a structured object with 'answer' text inside
             if isinstance(answer, dict):
-                print(answer.get("answer", "(no answer returned)"))
-            else:
+                answer = answer.get("answer", "(no answer returned)")
+            if answer != streamed:  # fallback answers and non-streaming providers
                 print(answer)
         else:
             print(result)
 
 
+def run_service_repl(client: ServiceClient, debug=False):
+    """REPL against a running `src/serve.py` instead of an in-process index."""
+    health = client.health()
+    print(f"\nConnected to {client.base_url} (LLM queue: {health['llm_queue']['queued']} waiting).")
+    print("Enter questions (type 'exit' or 'quit' to stop).\n")
+
+    chat_history = []
+    while True:
+        try:
+            question = input("Q> ").strip()
+        except (EOFError, KeyboardInterrupt):
+            print("\nExiting.")
+            break
+        if not question:
+            continue
+        if question.lower() in {"exit", "quit"}:
+            print("Goodbye.")
+            break
+
+        try:
+            result = client.answer(question, chat_history=chat_history, debug=debug)
+        except ServiceError as e:
+            print(f"Service error: {e}")
+            continue
+        chat_history = result.get("chat_history", chat_history)
+
+        if debug and result.get("evaluation"):
+            eval_data = result["evaluation"]
+            print(f"\n📊 Confidence: {eval_data.get('confidence_score', 'N/A')}%")
+            if "reasoning" in eval_data:
+                print(f"💭 Reasoning: {eval_data['reasoning']}")
+            print(f"📄 Retrieved {len(result.get('documents', []))} documents ({result['elapsed_ms']:.0f} ms)")
+            print()
+
+        answer = result.get("answer")
+        if isinstance(answer, dict):
+            print(answer.get("answer", "(no answer returned)"))
+        else:
+            print(answer)
+
+
 # DEBATE MODE DISABLED - Function commented out
 # def auto_retrieve_both_translations(retriever, verse_reference: str):
 #     """Auto-retrieve verse text from BOTH Griffith and Sharma translations."""
@@ -288,6 +358,12 @@ Examples:
 
   # Run debate with manual verse text
   python src/cli_run.py --debate --no-cleanup-prompt --verse "RV 1.32" --verse-text "Indra slew Vritra..." --rounds 3
+
+  # Ask a running service (python src/serve.py) instead of loading the index here
+  python src/cli_run.py --service http://127.0.0.1:8765
+
+  # Time each startup phase (imports, embed model, chunks, BM25, Qdrant, graph) and exit
+  python src/cli_run.py --no-cleanup-prompt --profile-startup startup.json
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -323,6 +399,11 @@ Examples:
         action="store_true",
         help="Force clean reindex: delete any existing vector store and chunks before indexing",
     )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Incremental reindex: process the given files and embed only new or changed documents",
+    )
     parser.add_argument(
         "--no-cleanup-prompt",
         action="store_true",
@@ -333,6 +414,11 @@ Examples:
         action="store_true",
         help="Show detailed retrieval info: query processing, document previews, confidence scores, and evaluation reasoning",
     )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Print each answer once it is complete instead of token by token (STREAM_ANSWERS)",
+    )
     parser.add_argument(
         "--debate",
         action="store_true",
@@ -359,7 +445,22 @@ Examples:
         action="store_true",
         help="Suppress INFO logs (only show warnings and errors). Automatically disabled if errors occur.",
     )
+    parser.add_argument(
+        "--service",
+        type=str,
+        metavar="URL",
+        help="Send questions to a running src/serve.py at URL instead of processing files and loading the index",
+    )
+    add_profile_argument(parser)
     args = parser.parse_args()
+    profiling = args.profile_startup is not None
+
+    if args.service:
+        try:
+            run_service_repl(ServiceClient(args.service), debug=args.debug)
+        except ServiceError as e:
+            print(f"Error: {e}")
+        return
 
     # Collect all file paths from --file/--files and --pdf/--pdfs arguments (backward compatibility)
     file_paths = []
@@ -400,8 +501,8 @@ Examples:
                            'transformers', 'qdrant_client', 'httpx', 'httpcore']:
             logging.getLogger(logger_name).setLevel(logging.WARNING)
 
-    # Prompt for session cleanup unless --no-cleanup-prompt is specified
-    if not args.no_cleanup_prompt:
+    # Prompt for session cleanup unless --no-cleanup-prompt is specified (never while profiling)
+    if not args.no_cleanup_prompt and not profiling:
         prompt_cleanup_session()
 
     # Check if vector store already exists
@@ -409,12 +510,13 @@ Examples:
     vector_store_exists = os.path.exists(vec_store_path) and os.path.isdir(vec_store_path)
 
     # Skip file processing if vector store exists and we're not forcing reindex
-    if vector_store_exists and not args.force:
+    if vector_store_exists and not (args.force or args.update):
         logger.info("Vector store already exists. Skipping file processing.")
-        logger.info("Use --force flag to rebuild the index from scratch.")
+        logger.info("Use --force flag to rebuild the index from scratch, or --update to add new files.")
     else:
         try:
-            prepare_and_process(absolute_file_paths)
+            with startup_phase("document_processing"):
+                prepare_and_process(absolute_file_paths)
         except Exception as e:
             # Re-enable INFO logging on error for troubleshooting
             if args.quiet:
@@ -424,7 +526,8 @@ Examples:
             return
 
     try:
-        vec_db, docs, retriever = build_index_and_retriever(force=args.force)
+        with startup_phase("index_and_retriever"):
+            vec_db, docs, retriever = build_index_and_retriever(force=args.force, update=args.update)
     except Exception as e:
         # Re-enable INFO logging on error for troubleshooting
         if args.quiet:
@@ -437,13 +540,18 @@ Examples:
         print(f"Indexing error: {e}")
         return
 
+    if profiling:
+        create_langgraph_app(retriever)
+        finish_startup_profile(args.profile_startup)
+        return
+
     # Run debate mode or regular REPL
     if args.debate:
         print("❌ Debate mode is currently disabled.")
         print("Please run without the --debate flag to use the regular query mode.")
         return
     else:
-        run_repl(retriever, debug=args.debug)
+        run_repl(retriever, debug=args.debug, stream=STREAM_ANSWERS and not args.no_stream)
 
 
 if __name__ == "__main__":
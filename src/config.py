@@ -1,4 +1,7 @@
 import os
+import sys
+from functools import lru_cache
+from pathlib import Path
 import src.helper as helper
 
 from dotenv import load_dotenv
@@ -7,10 +10,24 @@ load_dotenv()
 
 logger = helper.logger
 
+@lru_cache(maxsize=1)
+def _secrets_file_exists():
+    candidates = (Path.home() / ".streamlit" / "secrets.toml", Path.cwd() / ".streamlit" / "secrets.toml")
+    return any(path.is_file() for path in candidates)
+
+
+def _streamlit_secrets_available():
+    """Whether st.secrets can hold values: inside a Streamlit app or with a secrets.toml on disk.
+
+    Avoids importing streamlit (about a second) from CLI entry points that never use it.
+    """
+    return "streamlit" in sys.modules or _secrets_file_exists()
+
+
 def get_config_value(key, default=None, cast_type=None):
     """Get configuration value from environment or Streamlit secrets."""
     value = os.getenv(key)
-    if value is None:
+    if value is None and _streamlit_secrets_available():
         try:
             import streamlit as st
             # Try to access st.secrets, but don't fail if it's not available
@@ -71,6 +88,9 @@ VECTORDB_FOLDER = get_config_value("VECTORDB_FOLDER", "vector_store")
 # Embedding configuration
 EMBEDDING_PROVIDER = get_config_value("EMBEDDING_PROVIDER", "local-best")  # local-fast, local-best, or gemini
 EMBED_MODEL = get_config_value("EMBED_MODEL")
+EMBED_REQUESTS_PER_MINUTE = get_config_value("EMBED_REQUESTS_PER_MINUTE", 100, float)  # Gemini embedding request quota (free tier: 100/min)
+EMBED_TEXTS_PER_MINUTE = get_config_value("EMBED_TEXTS_PER_MINUTE", None, float)  # Optional quota on embedded texts per minute (unset = requests only)
+EMBED_MAX_RETRIES = get_config_value("EMBED_MAX_RETRIES", 5, int)  # Retries per batch after 429 responses
 
 # LLM Provider configuration
 LLM_PROVIDER = get_config_value("LLM_PROVIDER", "groq")  # groq, ollama, or gemini
@@ -80,6 +100,11 @@ OLLAMA_MODEL = get_config_value("OLLAMA_MODEL", "llama3.1:8b")  # Ollama model n
 OLLAMA_EVAL_MODEL = get_config_value("OLLAMA_EVAL_MODEL", "llama3.1:8b")  # Ollama evaluation model
 GEMINI_MODEL = get_config_value("GEMINI_MODEL", "gemini-2.0-flash-exp")  # Gemini model name (free tier: gemini-2.0-flash-exp, gemini-1.5-flash, gemini-1.5-pro)
 
+# On-disk embedding cache shared by indexing and query paths
+EMBEDDING_CACHE = get_config_value("EMBEDDING_CACHE", True, bool)  # Reuse embeddings of identical text across runs
+EMBEDDING_CACHE_PATH = get_config_value("EMBEDDING_CACHE_PATH", os.path.join("embedding_cache", "embeddings.sqlite"))
+EMBEDDING_CACHE_MAX_MB = get_config_value("EMBEDDING_CACHE_MAX_MB", 512, int)  # Least recently used entries are evicted beyond this size
+
 CHUNK_SIZE = get_config_value("CHUNK_SIZE", 768, int)  # Reduced from 1024 for Groq token limits (6K max)
 CHUNK_OVERLAP = get_config_value("CHUNK_OVERLAP", 96, int)  # Scaled proportionally (was 128)
 RETRIEVAL_K = get_config_value("RETRIEVAL_K", 3, int)  # Number of chunks to retrieve per query (reduced from 5 for Groq token limit)
@@ -88,9 +113,59 @@ RETRIEVAL_K = get_config_value("RETRIEVAL_K", 3, int)  # Number of chunks to ret
 SEMANTIC_WEIGHT = get_config_value("SEMANTIC_WEIGHT", 0.7, float)  # Weight for Qdrant semantic search (conceptual)
 KEYWORD_WEIGHT = get_config_value("KEYWORD_WEIGHT", 0.3, float)     # Weight for BM25 keyword search (exact matches)
 
+# Hybrid result fusion (see src/utils/fusion.py)
+FUSION_METHOD = get_config_value("FUSION_METHOD", "rank_heuristic")  # rank_heuristic (original), rrf, or weighted_score
+FUSION_CANDIDATES = get_config_value("FUSION_CANDIDATES", 0, int)  # Candidates fetched from each retriever before fusion (0 = RETRIEVAL_K); e.g. 50 raises recall without raising RETRIEVAL_K
+RRF_K = get_config_value("RRF_K", 60, int)  # Rank offset for reciprocal rank fusion
+
 # Query expansion via proper noun association
 # Reduced from 2 to 1 to stay within Groq token limits (6K max)
 EXPANSION_DOCS = get_config_value("EXPANSION_DOCS", 1, int)  # Number of additional docs to retrieve per proper noun for context expansion
+EXPANSION_BATCH_SEARCH = get_config_value("EXPANSION_BATCH_SEARCH", True, bool)  # Embed all variants in one batch and search Qdrant in one batched request
+EXPANSION_MAX_WORKERS = get_config_value("EXPANSION_MAX_WORKERS", 4, int)  # Thread pool size when batched search is unavailable (1 = sequential)
+
+# Keyword index persistence
+PERSISTENT_BM25 = get_config_value("PERSISTENT_BM25", True, bool)  # Memory-map a BM25 index saved next to the chunk store instead of re-tokenizing the corpus at startup
+
+# Verse reference index (see src/utils/verse_index.py)
+VERSE_INDEX = get_config_value("VERSE_INDEX", True, bool)  # Answer queries naming a verse ("RV 2.33", "RV 7.95.2") with its chunks instead of searching
+VERSE_SOURCE_FOLDER = get_config_value("VERSE_SOURCE_FOLDER", ".")  # Folder with the source <filename>.txt files, for byte ranges (empty = chunks only)
+
+# Query-result cache (see src/utils/retrieval_cache.py)
+RETRIEVAL_CACHE = get_config_value("RETRIEVAL_CACHE", True, bool)  # Serve repeated queries without re-running BM25, Qdrant and expansion
+RETRIEVAL_CACHE_MAX_ENTRIES = get_config_value("RETRIEVAL_CACHE_MAX_ENTRIES", 256, int)  # In-memory entry limit
+RETRIEVAL_CACHE_MAX_MB = get_config_value("RETRIEVAL_CACHE_MAX_MB", 32, int)  # In-memory size limit (serialized results)
+RETRIEVAL_CACHE_TTL = get_config_value("RETRIEVAL_CACHE_TTL", 0, int)  # Seconds before a cached result expires (0 = until the index changes)
+RETRIEVAL_CACHE_PATH = get_config_value("RETRIEVAL_CACHE_PATH", "")  # SQLite file for a persistent tier that survives restarts (empty = memory only)
+
+# Async pipeline (create_async_langgraph_app, arun_agentic_rag)
+LLM_MAX_CONCURRENCY = get_config_value("LLM_MAX_CONCURRENCY", 4, int)  # Async requests in flight per LLM provider; override one provider with e.g. GROQ_MAX_CONCURRENCY
+ASYNC_RETRIEVAL_WORKERS = get_config_value("ASYNC_RETRIEVAL_WORKERS", 4, int)  # Threads running hybrid retrieval for async callers
+SPECULATIVE_RETRIEVAL = get_config_value("SPECULATIVE_RETRIEVAL", False, bool)  # Retrieve on the raw question while the follow-up/grammar LLM calls run
+SPECULATIVE_REUSE_SIMILARITY = get_config_value("SPECULATIVE_REUSE_SIMILARITY", 1.0, float)  # Keyword-query word overlap (Jaccard) between raw and rewritten question needed to keep the speculative documents (proper nouns must match exactly)
+AGENTIC_TOOL_FANOUT = get_config_value("AGENTIC_TOOL_FANOUT", True, bool)  # Agentic graph: run dictionary, then grammar and corpus searches together in one hop
+DICTIONARY_INDEX_DIR = get_config_value("DICTIONARY_INDEX_DIR", "")  # Compiled Monier-Williams index (empty = dictionary_index/ next to the JSON)
+DICTIONARY_MAX_EDIT_DISTANCE = get_config_value("DICTIONARY_MAX_EDIT_DISTANCE", 2, int)  # Typo tolerance of dictionary_lookup's fuzzy fallback for words of 8+ letters; 5-7 letters get 1, shorter words and English words none (0 = off)
+
+# Local HTTP service (see src/serve.py)
+SERVICE_HOST = get_config_value("SERVICE_HOST", "127.0.0.1")  # Interface to bind; keep on localhost unless behind a proxy
+SERVICE_PORT = get_config_value("SERVICE_PORT", 8765, int)
+SERVICE_RETRIEVAL_WORKERS = get_config_value("SERVICE_RETRIEVAL_WORKERS", 4, int)  # Thread pool size for /retrieve
+SERVICE_LLM_CONCURRENCY = get_config_value("SERVICE_LLM_CONCURRENCY", 2, int)  # /answer and /agentic requests running at once (provider rate limits)
+SERVICE_QUEUE_SIZE = get_config_value("SERVICE_QUEUE_SIZE", 32, int)  # LLM requests allowed to wait before the service answers 503
+SERVICE_MAX_CONNECTIONS = get_config_value("SERVICE_MAX_CONNECTIONS", 64, int)  # Open connections before new ones get 503
+SERVICE_REQUEST_TIMEOUT = get_config_value("SERVICE_REQUEST_TIMEOUT", 300, int)  # Seconds a request may wait for its result (504 after)
+
+# Streaming answers (see src/utils/answer_stream.py)
+STREAM_ANSWERS = get_config_value("STREAM_ANSWERS", True, bool)  # Show answers token by token in the CLIs and the web tutor; confidence and citations follow at the end
+
+# Vedic Sanskrit tutor (see src/vedic_sanskrit_tutor.py)
+TUTOR_SKIP_EVALUATION = get_config_value("TUTOR_SKIP_EVALUATION", "pronunciation,quiz")  # Learning modes whose answers are not scored against the documents (comma-separated; saves one LLM call, and any regeneration, per turn)
+
+# Migration debate (see src/utils/migration_debate_agents.py)
+DEBATE_PARALLEL = get_config_value("DEBATE_PARALLEL", True, bool)  # Run the AMT and OIT calls of each round at the same time (output still prints AMT first)
+DEBATE_AGENT_TIMEOUT = get_config_value("DEBATE_AGENT_TIMEOUT", 0, int)  # Seconds an agent may take per round before its reply is marked as timed out (0 = no limit)
+DEBATE_BATCH_WORKERS = get_config_value("DEBATE_BATCH_WORKERS", 2, int)  # Debates at once in --batch mode (also capped by the provider's LLM_MAX_CONCURRENCY)
 
 # Low-confidence answer handling
 USE_REGENERATION = get_config_value("USE_REGENERATION", True, bool)  # Enable/disable regeneration with superior model
@@ -1,8 +1,14 @@
 import streamlit as st
 from utils.process_files import process_uploaded_pdfs
-from utils.index_files import create_qdrant_vector_store
 from utils.final_block_rag import create_langgraph_app, run_rag_with_langgraph
-from utils.retriever import create_retriever
+# src-qualified so this shares the one process-wide index with every other importer
+from src.utils.index_service import (
+    get_index_service,
+    rebuild_index_service,
+    reset_index_service,
+    index_service_loaded,
+    format_footprint,
+)
 
 import os
 import io
@@ -173,12 +179,35 @@ def initialize():
         st.session_state["debug_mode"] = False
 
 
+def attach_index(index):
+    """Point this session at the shared index and build its RAG graph."""
+    st.session_state["vector_store"] = index.vector_store
+    st.session_state["document_chunks"] = index.chunks
+    st.session_state["retriever"] = index.retriever
+    st.session_state["rag_app"] = create_langgraph_app(index.retriever)
+    st.session_state["index_loaded_at"] = index.loaded_at
+
+
+def session_rag_app():
+    """The session's RAG graph, re-attached if another session rebuilt the shared index."""
+    if st.session_state.get("rag_app") is not None and index_service_loaded():
+        index = get_index_service()
+        if st.session_state.get("index_loaded_at") != index.loaded_at:
+            attach_index(index)
+    return st.session_state.get("rag_app")
+
+
+def index_locked_elsewhere():
+    """A Qdrant lock held by another process (this process's own shared index does not count)."""
+    return check_qdrant_lock() and not index_service_loaded()
+
+
 # A function to handle the user's query
 def handle_query_and_run_rag(query):
     # Check if the vector store and chunks are in session state
+    app = session_rag_app()
 
-    if "rag_app" in st.session_state and query is not None:
-        app = st.session_state.rag_app
+    if app is not None and query is not None:
         graph_state = {
             "question": query,
             "chat_history": st.session_state["chat_history"],
@@ -380,6 +409,8 @@ def main():
     with col3:
         if st.button("🗑️ Cleanup", help="Remove vector store locks and force cleanup"):
             with st.spinner("Cleaning up..."):
+                # Close this process's shared index first so its lock is released cleanly
+                reset_index_service()
                 # First try to remove just lock files
                 removed = cleanup_qdrant_locks()
                 if removed > 0:
@@ -407,7 +438,7 @@ def main():
     processed_folder = os.path.join(project_root, LOCAL_FOLDER, COLLECTION_NAME)
     processed_files_exist = os.path.exists(processed_folder) and len(os.listdir(processed_folder)) > 0 if os.path.exists(processed_folder) else False
 
-    if check_qdrant_lock():
+    if index_locked_elsewhere():
         st.warning("⚠️ Qdrant database is locked. Click 'Cleanup' button to resolve.")
 
     # Show index status
@@ -436,25 +467,20 @@ def main():
 
     # Load existing index
     if load_button:
-        if check_qdrant_lock():
+        if index_locked_elsewhere():
             st.error("❌ Cannot load index: Qdrant database is locked by another process")
             st.info("💡 Click the 'Cleanup' button above to resolve this issue")
         else:
             try:
                 with st.spinner("Loading existing vector store..."):
-                    # Load existing index without forcing recreation
-                    vec_db, docs = create_qdrant_vector_store(force_recreate=False)
-                    st.session_state["vector_store"] = vec_db
-                    st.session_state["document_chunks"] = docs
+                    # Load existing index without forcing recreation (once per process)
+                    index = get_index_service()
                     st.success("✓ Index loaded successfully")
 
-                with st.spinner("Creating retriever..."):
-                    st.session_state.retriever = create_retriever(vec_db, docs)
-                    st.success("✓ Retriever created")
-
                 with st.spinner("Setting up RAG pipeline..."):
-                    st.session_state.rag_app = create_langgraph_app(st.session_state.retriever)
+                    attach_index(index)
                     st.success("✓ RAG setup complete")
+                    st.caption(f"Index memory: {format_footprint(index.memory_footprint())}")
             except RuntimeError as e:
                 if "already accessed" in str(e):
                     st.error("❌ Qdrant lock error detected. Click 'Cleanup' and try again.")
@@ -467,25 +493,20 @@ def main():
     # Rebuild index from scratch
     if rebuild_button:
         # Check for locks before creating index
-        if check_qdrant_lock():
+        if index_locked_elsewhere():
             st.error("❌ Cannot create index: Qdrant database is locked by another process")
             st.info("💡 Click the 'Cleanup' button above to resolve this issue")
         else:
             try:
                 with st.spinner("Rebuilding vector store from scratch..."):
-                    # Force recreation by passing True
-                    vec_db, docs = create_qdrant_vector_store(force_recreate=True)
-                    st.session_state["vector_store"] = vec_db
-                    st.session_state["document_chunks"] = docs
+                    # Force recreation; other sessions pick up the new index on their next query
+                    index = rebuild_index_service(force_recreate=True)
                     st.success("✓ Index rebuilt successfully")
 
-                with st.spinner("Creating retriever..."):
-                    st.session_state.retriever = create_retriever(vec_db, docs)
-                    st.success("✓ Retriever created")
-
                 with st.spinner("Setting up RAG pipeline..."):
-                    st.session_state.rag_app = create_langgraph_app(st.session_state.retriever)
+                    attach_index(index)
                     st.success("✓ RAG setup complete")
+                    st.caption(f"Index memory: {format_footprint(index.memory_footprint())}")
             except RuntimeError as e:
                 if "already accessed" in str(e):
                     st.error("❌ Qdrant lock error detected. Click 'Cleanup' and try again.")
@@ -497,25 +518,20 @@ def main():
 
     # Create new index (first time)
     if create_button:
-        if check_qdrant_lock():
+        if index_locked_elsewhere():
             st.error("❌ Cannot create index: Qdrant database is locked by another process")
             st.info("💡 Click the 'Cleanup' button above to resolve this issue")
         else:
             try:
                 with st.spinner("Creating vector store for the first time..."):
                     # Create new index
-                    vec_db, docs = create_qdrant_vector_store(force_recreate=True)
-                    st.session_state["vector_store"] = vec_db
-                    st.session_state["document_chunks"] = docs
+                    index = rebuild_index_service(force_recreate=True)
                     st.success("✓ Index created successfully")
 
-                with st.spinner("Creating retriever..."):
-                    st.session_state.retriever = create_retriever(vec_db, docs)
-                    st.success("✓ Retriever created")
-
                 with st.spinner("Setting up RAG pipeline..."):
-                    st.session_state.rag_app = create_langgraph_app(st.session_state.retriever)
+                    attach_index(index)
                     st.success("✓ RAG setup complete")
+                    st.caption(f"Index memory: {format_footprint(index.memory_footprint())}")
             except RuntimeError as e:
                 if "already accessed" in str(e):
                     st.error("❌ Qdrant lock error detected. Click 'Cleanup' and try again.")
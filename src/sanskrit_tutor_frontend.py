@@ -15,6 +15,17 @@ os.environ["TOKENIZERS_PARALLELISM"] = "false"
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Must start before the heavy imports below so they are timed (no-op without --profile-startup)
+from src.utils.startup_profile import (
+    start_startup_profile,
+    startup_checkpoint,
+    startup_phase,
+    add_profile_argument,
+    finish_startup_profile,
+)
+start_startup_profile("sanskrit_tutor_frontend")
+
+import argparse
 import streamlit as st
 from typing import Dict, List, Optional
 import json
@@ -27,15 +38,15 @@ import glob
 
 from src.helper import project_root, logger
 from src.config import LOCAL_FOLDER, COLLECTION_NAME, VECTORDB_FOLDER
-from src.utils.index_files import create_qdrant_vector_store
-from src.utils.agentic_rag import run_agentic_rag, set_shared_vector_store
+from src.utils.index_service import get_index_service, index_service_loaded, format_footprint
+from src.utils.agentic_rag import run_agentic_rag, create_agentic_rag_graph, stream_agentic_rag
 
-from langchain_community.chat_models import ChatOllama
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 from src.settings import OLLAMA_BASE_URL, OLLAMA_MODEL, GEMINI_MODEL
-from src.config import GROQ_API_KEY
+from src.utils.providers import chat_model_class
+from src.config import GROQ_API_KEY, STREAM_ANSWERS
+
+startup_checkpoint("imports", "sanskrit_tutor_frontend")
 
 
 # Page configuration with Devanagari font support
@@ -303,8 +314,9 @@ class SanskritTutorApp:
             return True
 
         try:
-            # Check for Qdrant lock before attempting to initialize
-            if self.check_qdrant_lock():
+            # Check for Qdrant lock before attempting to initialize. Once this process
+            # holds the shared index, the lock file is its own and must be left alone.
+            if not index_service_loaded() and self.check_qdrant_lock():
                 st.info("🔧 Found stale Qdrant locks. Cleaning up automatically...")
 
                 # Automatically clean locks
@@ -327,18 +339,16 @@ class SanskritTutorApp:
                 return False
 
             with st.spinner("📚 Loading Vedic texts corpus..."):
-                vec_db, docs = create_qdrant_vector_store(force_recreate=False)
-                # Store vector DB for agentic RAG access
-                st.session_state.vec_db = vec_db
-                st.session_state.docs = docs
-
-                # CRITICAL: Set shared vector store for agentic RAG tools
-                set_shared_vector_store(vec_db, docs)
-                logger.info("[FRONTEND] Shared vector store configured for agentic RAG")
+                # Loaded once per process and shared read-only by every session;
+                # the agentic RAG tools use the same index
+                index = get_index_service()
+                st.session_state.vec_db = index.vector_store
+                st.session_state.docs = index.chunks
+                logger.info("[FRONTEND] Using shared index service for agentic RAG")
 
             with st.spinner("🤖 Initializing AI resource..."):
                 if llm_provider == "gemini":
-                    llm = ChatGoogleGenerativeAI(
+                    llm = chat_model_class("gemini")(
                         model=GEMINI_MODEL,
                         temperature=0.7,
                         timeout=180
@@ -347,14 +357,14 @@ class SanskritTutorApp:
                     if not GROQ_API_KEY:
                         st.error("❌ GROQ_API_KEY not found in environment variables!")
                         return False
-                    llm = ChatGroq(
+                    llm = chat_model_class("groq")(
                         api_key=GROQ_API_KEY,
                         model=model_name,
                         temperature=0.7,
                         timeout=180
                     )
                 else:  # ollama
-                    llm = ChatOllama(
+                    llm = chat_model_class("ollama-community")(
                         base_url=OLLAMA_BASE_URL,
                         model=model_name,
                         temperature=0.7,
@@ -478,7 +488,16 @@ Have natural conversation about Sanskrit:
             # Use Agentic RAG system
             with st.spinner("🤖 Agent analyzing your question..."):
                 logger.info(f"[FRONTEND] Processing query with Agentic RAG: {query}")
-                result = run_agentic_rag(query)
+                if STREAM_ANSWERS and hasattr(st, "write_stream"):  # streamlit >= 1.31
+                    # Show the answer as it is written; the caller renders the final text
+                    answer_stream = stream_agentic_rag(query)
+                    live = st.empty()
+                    with live.container():
+                        st.write_stream(iter(answer_stream))
+                    live.empty()
+                    result = answer_stream.result
+                else:
+                    result = run_agentic_rag(query)
                 logger.info(f"[FRONTEND] Agentic RAG returned result type: {type(result)}")
                 logger.info(f"[FRONTEND] Result keys: {result.keys() if isinstance(result, dict) else 'not a dict'}")
 
@@ -580,9 +599,11 @@ Have natural conversation about Sanskrit:
 
             if st.session_state.initialized:
                 st.success(f"✓ Using: {st.session_state.model_name}")
+                with st.expander("📊 Index memory"):
+                    st.caption(format_footprint(get_index_service().memory_footprint()))
 
-            # Qdrant lock cleanup utility
-            if not st.session_state.initialized:
+            # Qdrant lock cleanup utility (not while this process holds the shared index)
+            if not st.session_state.initialized and not index_service_loaded():
                 st.markdown("---")
                 st.caption("**Having issues?**")
                 if st.button("🗑️ Clean Qdrant Locks", key="sidebar_cleanup"):
@@ -956,7 +977,26 @@ Have natural conversation about Sanskrit:
             self.render_chat_module()
 
 
+def profile_startup(path: str):
+    """Load the corpus and compile the agentic graph without the UI, then write the startup profile.
+
+    Run with `python src/sanskrit_tutor_frontend.py --profile-startup [PATH]`.
+    """
+    with startup_phase("index_load"):
+        get_index_service()
+    create_agentic_rag_graph()
+    finish_startup_profile(path)
+
+
 def main():
+    # Streamlit passes script arguments after `--`; ignore anything else
+    parser = argparse.ArgumentParser(description="Vedic Sanskrit Tutor (Streamlit)")
+    add_profile_argument(parser)
+    args, _ = parser.parse_known_args()
+    if args.profile_startup is not None:
+        profile_startup(args.profile_startup)
+        return
+
     app = SanskritTutorApp()
     app.run()
 
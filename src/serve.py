@@ -0,0 +1,530 @@
+"""Local HTTP service: one warm process answering retrieval and RAG requests.
+
+Every CLI run and Streamlit worker otherwise loads the embedding model, the
+index and the LLM clients itself. This entry point loads them once and serves
+them over HTTP, so frontends and scripts can act as thin clients
+(see src/utils/service_client.py).
+
+Endpoints (JSON in, JSON out):
+  GET  /health     index, queue and memory stats
+  POST /retrieve   {"query": "...", "k": 5}
+  POST /answer     {"question": "...", "chat_history": [{"role": "user", "content": "..."}], "debug": false}
+                   runs the LangGraph app from create_langgraph_app
+  POST /agentic    {"question": "..."}
+                   runs run_agentic_rag
+
+Concurrency:
+  - retrieval runs in a bounded thread pool (--workers)
+  - /answer and /agentic jobs go through an asyncio queue drained by
+    --llm-concurrency workers, so provider rate limits are not multiplied by
+    the number of clients; when --queue-size jobs are already waiting the
+    service answers 503 with Retry-After instead of queueing without bound
+  - the workers await the async graphs (create_async_langgraph_app,
+    arun_agentic_rag) on one event loop; LLM calls also respect the
+    per-provider LLM_MAX_CONCURRENCY limit
+
+Usage:
+  python src/serve.py                          # 127.0.0.1:8765
+  python src/serve.py --port 9000 --workers 8 --llm-concurrency 1
+  python src/cli_run.py --service http://127.0.0.1:8765
+"""
+import os
+# CRITICAL: Set this BEFORE any HuggingFace/transformers imports (including transitive imports via helper/settings)
+os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+# Must start before the heavy imports below so they are timed (no-op without --profile-startup)
+from utils.startup_profile import (
+    start_startup_profile,
+    startup_checkpoint,
+    startup_phase,
+    add_profile_argument,
+    finish_startup_profile,
+)
+start_startup_profile("serve")
+
+import argparse
+import asyncio
+import inspect
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from pydantic import BaseModel
+
+from helper import logger
+from config import (
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_RETRIEVAL_WORKERS,
+    SERVICE_LLM_CONCURRENCY,
+    SERVICE_QUEUE_SIZE,
+    SERVICE_MAX_CONNECTIONS,
+    SERVICE_REQUEST_TIMEOUT,
+)
+from utils.final_block_rag import create_async_langgraph_app, arun_rag_with_langgraph
+from src.utils.agentic_rag import arun_agentic_rag
+from src.utils.index_service import get_index_service, index_service_loaded, format_footprint
+
+startup_checkpoint("imports", "serve")
+
+
+class ServiceBusy(Exception):
+    """The LLM queue is full; the client should retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(f"Service busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class BadRequest(Exception):
+    """Malformed request body (answered with 400)."""
+
+
+class LLMQueue:
+    """Runs LLM-bound jobs from an asyncio queue on a background event loop.
+
+    At most `concurrency` jobs run at once; up to `maxsize` more may wait.
+    Coroutine functions are awaited on the loop, plain functions run in a
+    worker thread. `submit` is called from request threads and returns a
+    concurrent Future.
+    """
+
+    def __init__(self, concurrency: int = SERVICE_LLM_CONCURRENCY, maxsize: int = SERVICE_QUEUE_SIZE):
+        self.concurrency = max(1, concurrency)
+        self.maxsize = max(1, maxsize)
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="llm")
+        self._ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="llm-queue", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [self.loop.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._ready.set()
+        self.loop.run_forever()
+
+    async def _worker(self):
+        while True:
+            fn, future = await self._queue.get()
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self.running += 1
+                try:
+                    if inspect.iscoroutinefunction(fn):
+                        result = await fn()
+                    else:
+                        result = await self.loop.run_in_executor(self._executor, fn)
+                except Exception as e:
+                    self.failed += 1
+                    future.set_exception(e)
+                else:
+                    self.completed += 1
+                    future.set_result(result)
+                finally:
+                    self.running -= 1
+            finally:
+                self._queue.task_done()
+
+    async def _enqueue(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise ServiceBusy(retry_after=1)
+
+    def submit(self, fn) -> Future:
+        """Queue fn() for an LLM worker; raises ServiceBusy if the queue is full."""
+        future = Future()
+        asyncio.run_coroutine_threadsafe(self._enqueue((fn, future)), self.loop).result()
+        return future
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.maxsize,
+            "queued": self._queue.qsize(),
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    async def _stop_workers(self):
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+    def close(self):
+        if self.loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._stop_workers(), self.loop).result(timeout=5)
+        except Exception as e:
+            logger.warning(f"LLM queue did not stop cleanly: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.loop.close()
+
+
+def to_jsonable(value):
+    """Convert graph results (Documents, messages, pydantic models) to JSON types."""
+    if isinstance(value, Document):
+        return {"page_content": value.page_content, "metadata": to_jsonable(value.metadata)}
+    if isinstance(value, BaseMessage):
+        return {"role": "user" if value.type == "human" else "assistant", "content": value.content}
+    if isinstance(value, BaseModel):
+        return to_jsonable(value.model_dump())
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_jsonable(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def to_messages(chat_history) -> list:
+    """Turn [{"role": "user"|"assistant", "content": ...}] into LangChain messages."""
+    if not isinstance(chat_history, list):
+        raise BadRequest("chat_history must be a list of {role, content} objects")
+    messages = []
+    for item in chat_history:
+        if not isinstance(item, dict) or "content" not in item:
+            raise BadRequest("chat_history must be a list of {role, content} objects")
+        role = item.get("role", "user")
+        messages.append(HumanMessage(content=item["content"]) if role in ("user", "human") else AIMessage(content=item["content"]))
+    return messages
+
+
+class RagService:
+    """The warm pipeline behind the HTTP handlers.
+
+    Uses the process-wide index service unless a retriever is passed in
+    (tests pass a stub so no index or embedding model is loaded).
+    """
+
+    def __init__(
+        self,
+        retriever=None,
+        retrieval_workers: int = SERVICE_RETRIEVAL_WORKERS,
+        llm_concurrency: int = SERVICE_LLM_CONCURRENCY,
+        queue_size: int = SERVICE_QUEUE_SIZE,
+        request_timeout: float = SERVICE_REQUEST_TIMEOUT,
+    ):
+        self._retriever = retriever
+        self.request_timeout = request_timeout
+        self.retrieval_workers = max(1, retrieval_workers)
+        self.retrieval_pool = ThreadPoolExecutor(max_workers=self.retrieval_workers, thread_name_prefix="retrieve")
+        self.llm_queue = LLMQueue(llm_concurrency, queue_size)
+        self.started = time.time()
+        self._app = None
+        self._app_retriever = None
+        self._app_lock = threading.Lock()
+
+    @property
+    def retriever(self):
+        return self._retriever if self._retriever is not None else get_index_service().retriever
+
+    def langgraph_app(self):
+        """The compiled async RAG graph, rebuilt only if the index service was rebuilt."""
+        retriever = self.retriever
+        with self._app_lock:
+            if self._app is None or self._app_retriever is not retriever:
+                self._app = create_async_langgraph_app(retriever)
+                self._app_retriever = retriever
+            return self._app
+
+    def warm(self):
+        """Load the index and compile the graph before the first request."""
+        with startup_phase("index_load"):
+            retriever = self.retriever
+        self.langgraph_app()
+        return retriever
+
+    def _wait(self, future: Future):
+        try:
+            return future.result(timeout=self.request_timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise
+
+    def retrieve(self, query: str, k=None) -> dict:
+        start = time.perf_counter()
+        docs = self._wait(self.retrieval_pool.submit(self.retriever.invoke, query))
+        if k is not None:
+            docs = docs[:k]
+        return {
+            "query": query,
+            "documents": to_jsonable(docs),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    def answer(self, question: str, chat_history=None, debug: bool = False) -> dict:
+        start = time.perf_counter()
+        graph_state = {
+            "question": question,
+            "chat_history": to_messages(chat_history or []),
+            "documents": [],
+            "answer": "",
+            "enhanced_question": "",
+            "is_follow_up": False,
+            "reset_history": False,
+            "regeneration_count": 0,
+            "debug": debug,
+        }
+        app = self.langgraph_app()
+
+        async def job():
+            return await arun_rag_with_langgraph(graph_state, app)
+
+        result = self._wait(self.llm_queue.submit(job))
+        answer = to_jsonable(result.get("answer"))
+        response = {
+            "answer": answer,
+            "chat_history": to_jsonable(result.get("chat_history", [])),
+            # The evaluator stores its score on the answer; "evaluation" is not part of GraphState
+            "evaluation": answer.get("confidence") if isinstance(answer, dict) else None,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        if debug:
+            response["enhanced_question"] = result.get("enhanced_question")
+            response["documents"] = to_jsonable(result.get("documents", []))
+        return response
+
+    def agentic(self, question: str) -> dict:
+        start = time.perf_counter()
+        async def job():
+            return await arun_agentic_rag(question)
+
+        result = self._wait(self.llm_queue.submit(job))
+        return {
+            "query_type": result.get("query_type"),
+            "answer": to_jsonable(result.get("answer")),
+            "messages": to_jsonable(result.get("messages", [])),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    def health(self) -> dict:
+        status = {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "retrieval_workers": self.retrieval_workers,
+            "llm_queue": self.llm_queue.stats(),
+            "index_loaded": self._retriever is not None or index_service_loaded(),
+        }
+        if self._retriever is None and index_service_loaded():
+            service = get_index_service()
+            status["index"] = {
+                "chunks": len(service.chunks),
+                "load_seconds": round(service.load_seconds, 2),
+                "footprint": service.memory_footprint(),
+            }
+        return status
+
+    def close(self):
+        self.llm_queue.close()
+        self.retrieval_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _require_text(body: dict, field: str) -> str:
+    value = body.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise BadRequest(f"'{field}' must be a non-empty string")
+    return value.strip()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    server_version = "VedicRAG"
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise BadRequest(f"Invalid JSON body: {e}")
+        if not isinstance(body, dict):
+            raise BadRequest("Request body must be a JSON object")
+        return body
+
+    def _handle(self, route):
+        service: RagService = self.server.service
+        try:
+            self._send_json(200, route(service))
+        except BadRequest as e:
+            self._send_json(400, {"error": str(e)})
+        except ServiceBusy as e:
+            self._send_json(503, {"error": str(e)}, {"Retry-After": str(e.retry_after)})
+        except FutureTimeout:
+            self._send_json(504, {"error": f"No result within {service.request_timeout}s"})
+        except Exception as e:
+            logger.exception(f"Request to {self.path} failed")
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/health":
+            self._handle(lambda service: service.health())
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: GET {self.path}"})
+
+    def do_POST(self):
+        routes = {
+            "/retrieve": self._retrieve,
+            "/answer": self._answer,
+            "/agentic": self._agentic,
+        }
+        route = routes.get(self.path.rstrip("/"))
+        if route is None:
+            self._send_json(404, {"error": f"Unknown endpoint: POST {self.path}"})
+            return
+        self._handle(route)
+
+    def _retrieve(self, service: RagService) -> dict:
+        body = self._read_json()
+        k = body.get("k")
+        if k is not None and (not isinstance(k, int) or k < 1):
+            raise BadRequest("'k' must be a positive integer")
+        return service.retrieve(_require_text(body, "query"), k)
+
+    def _answer(self, service: RagService) -> dict:
+        body = self._read_json()
+        return service.answer(
+            _require_text(body, "question"),
+            chat_history=body.get("chat_history") or [],
+            debug=bool(body.get("debug", False)),
+        )
+
+    def _agentic(self, service: RagService) -> dict:
+        body = self._read_json()
+        return service.agentic(_require_text(body, "question"))
+
+
+_BUSY_BODY = b'{"error": "Too many connections"}'
+_TOO_MANY_CONNECTIONS = (
+    b"HTTP/1.0 503 Service Unavailable\r\nRetry-After: 1\r\nContent-Type: application/json\r\n"
+    b"Content-Length: " + str(len(_BUSY_BODY)).encode() + b"\r\n\r\n" + _BUSY_BODY
+)
+
+
+class RagHTTPServer(ThreadingHTTPServer):
+    """Thread-per-connection server with a cap on open connections.
+
+    Connections beyond `max_connections` get an immediate 503 rather than a
+    thread each.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, service: RagService, max_connections: int = SERVICE_MAX_CONNECTIONS):
+        super().__init__(address, ServiceHandler)
+        self.service = service
+        self._slots = threading.BoundedSemaphore(max(1, max_connections))
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            try:
+                request.sendall(_TOO_MANY_CONNECTIONS)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        super().process_request(request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+
+
+def create_server(service: RagService, host: str = SERVICE_HOST, port: int = SERVICE_PORT,
+                  max_connections: int = SERVICE_MAX_CONNECTIONS) -> RagHTTPServer:
+    """Bind the HTTP server (port 0 picks a free port; see server.server_address)."""
+    return RagHTTPServer((host, port), service, max_connections=max_connections)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve retrieval and RAG answers over HTTP from one warm process",
+        epilog="""
+Examples:
+  python src/serve.py
+  python src/serve.py --host 0.0.0.0 --port 9000 --workers 8 --llm-concurrency 1
+
+  curl -s localhost:8765/retrieve -d '{"query": "Who is Sudas?", "k": 3}'
+  curl -s localhost:8765/answer -d '{"question": "Who is Sudas?"}'
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--host", default=SERVICE_HOST, help=f"Interface to bind (default: {SERVICE_HOST})")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help=f"Port (default: {SERVICE_PORT})")
+    parser.add_argument("--workers", type=int, default=SERVICE_RETRIEVAL_WORKERS,
+                        help=f"Retrieval thread pool size (default: {SERVICE_RETRIEVAL_WORKERS})")
+    parser.add_argument("--llm-concurrency", type=int, default=SERVICE_LLM_CONCURRENCY,
+                        help=f"/answer and /agentic requests running at once (default: {SERVICE_LLM_CONCURRENCY})")
+    parser.add_argument("--queue-size", type=int, default=SERVICE_QUEUE_SIZE,
+                        help=f"LLM requests allowed to wait before answering 503 (default: {SERVICE_QUEUE_SIZE})")
+    parser.add_argument("--max-connections", type=int, default=SERVICE_MAX_CONNECTIONS,
+                        help=f"Open connections before answering 503 (default: {SERVICE_MAX_CONNECTIONS})")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+
+    service = RagService(
+        retrieval_workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        queue_size=args.queue_size,
+    )
+    try:
+        service.warm()
+    except Exception as e:
+        logger.exception("Failed to load the index")
+        print(f"Indexing error: {e}")
+        service.close()
+        return
+
+    if args.profile_startup is not None:
+        finish_startup_profile(args.profile_startup)
+        service.close()
+        return
+
+    server = create_server(service, args.host, args.port, args.max_connections)
+    host, port = server.server_address[:2]
+    logger.info(f"Index: {format_footprint(get_index_service().memory_footprint())}")
+    print(f"Serving on http://{host}:{port} (retrieval workers: {args.workers}, "
+          f"LLM concurrency: {args.llm_concurrency}, queue: {args.queue_size}). Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
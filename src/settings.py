@@ -1,6 +1,5 @@
 import asyncio
-import time
-from typing import List
+from typing import TYPE_CHECKING, List
 import os
 
 # Disable tokenizers parallelism warning when forking processes
@@ -14,12 +13,11 @@ except RuntimeError:
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
-from langchain_groq import ChatGroq
-from langchain_ollama import ChatOllama
-from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
-from langchain_huggingface import HuggingFaceEmbeddings
-
+# Provider SDKs (langchain_groq, langchain_google_genai, langchain_ollama,
+# langchain_huggingface) are imported on first use through the registry
 from src.helper import logger
+from src.utils.providers import chat_model_class, embeddings_class, provider_slot
+from src.utils.startup_profile import startup_phase
 from src.config import (
     GROQ_API_KEY,
     GEMINI_API_KEY,
@@ -37,6 +35,9 @@ from src.config import (
     EMBEDDING_PROVIDER,
 )
 
+if TYPE_CHECKING:
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
 # Import parallelization settings
 try:
     from config_parallel import (
@@ -73,40 +74,96 @@ except ImportError:
 
 class RateLimitedEmbeddings:
     """
-    Wrapper around GoogleGenerativeAIEmbeddings that adds rate limiting
-    to avoid hitting the free tier quota (100 requests per minute).
+    Wrapper around GoogleGenerativeAIEmbeddings that enforces the provider
+    quota (free tier: 100 requests per minute) with a shared token bucket.
+
+    `embed_documents` is split into the largest batches a single request may
+    carry, each batch waits for its own quota, and 429 responses are retried
+    after the provider's suggested delay with a temporarily reduced rate.
+    Safe to use from several threads and from asyncio code.
     """
 
-    def __init__(self, base_embeddings: GoogleGenerativeAIEmbeddings, delay: float = 0.65):
+    def __init__(self, base_embeddings: "GoogleGenerativeAIEmbeddings", delay: float = None,
+                 requests_per_minute: float = None, texts_per_minute: float = None,
+                 max_batch_size: int = None, max_retries: int = 5):
         """
         Args:
             base_embeddings: The underlying embedding model
-            delay: Delay in seconds between requests (default 0.65s = ~92 req/min, safe buffer)
+            delay: Legacy minimum seconds between requests; converted to requests_per_minute
+            requests_per_minute: Request quota (default 100, the Gemini free tier)
+            texts_per_minute: Optional quota on embedded texts (None = only requests are limited)
+            max_batch_size: Texts per request (default: the base model's batch_size, else 100)
+            max_retries: Retries per batch after 429 responses
         """
+        from src.utils.rate_limiter import RateLimiter
+
+        if requests_per_minute is None:
+            requests_per_minute = 60.0 / delay if delay else 100
         self.base_embeddings = base_embeddings
-        self.delay = delay
-        self.last_call_time = 0
+        self.max_batch_size = int(max_batch_size or getattr(base_embeddings, "batch_size", None) or 100)
+        self.max_retries = max_retries
+        self.limiter = RateLimiter(
+            requests_per_minute,
+            texts_per_minute=texts_per_minute,
+            text_burst=self.max_batch_size,
+        )
 
-    def _wait_if_needed(self):
-        """Wait if necessary to respect rate limits."""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        size = self.limiter.max_texts_per_request(self.max_batch_size)
+        return [texts[i:i + size] for i in range(0, len(texts), size)]
 
-        if time_since_last_call < self.delay:
-            sleep_time = self.delay - time_since_last_call
-            time.sleep(sleep_time)
+    def _call(self, fn, payload, n_texts: int):
+        """Run one provider request under the limiter, retrying on 429."""
+        from src.utils.rate_limiter import is_rate_limit_error, retry_after_seconds
 
-        self.last_call_time = time.time()
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(n_texts)
+            try:
+                result = fn(payload)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                self.limiter.record_rate_limited(retry_after_seconds(e), attempt)
+                continue
+            self.limiter.record_success()
+            return result
+
+    async def _acall(self, fn, payload, n_texts: int):
+        from src.utils.rate_limiter import is_rate_limit_error, retry_after_seconds
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.aacquire(n_texts)
+            try:
+                result = await fn(payload)
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                self.limiter.record_rate_limited(retry_after_seconds(e), attempt)
+                continue
+            self.limiter.record_success()
+            return result
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Embed a list of documents with rate limiting."""
-        self._wait_if_needed()
-        return self.base_embeddings.embed_documents(texts)
+        """Embed a list of documents in quota-sized batches."""
+        vectors = []
+        for batch in self._batches(list(texts)):
+            vectors.extend(self._call(self.base_embeddings.embed_documents, batch, len(batch)))
+        return vectors
 
     def embed_query(self, text: str) -> List[float]:
         """Embed a single query with rate limiting."""
-        self._wait_if_needed()
-        return self.base_embeddings.embed_query(text)
+        return self._call(self.base_embeddings.embed_query, text, 1)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Async embed_documents; waits for quota without blocking the event loop."""
+        vectors = []
+        for batch in self._batches(list(texts)):
+            vectors.extend(await self._acall(self.base_embeddings.aembed_documents, batch, len(batch)))
+        return vectors
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Async embed_query with rate limiting."""
+        return await self._acall(self.base_embeddings.aembed_query, text, 1)
 
     def __call__(self, text: str) -> List[float]:
         """Make the wrapper callable for compatibility with older LangChain versions."""
@@ -114,6 +171,8 @@ class RateLimitedEmbeddings:
 
     def __getattr__(self, name):
         """Delegate all other attributes to the base embeddings."""
+        if name == "base_embeddings":
+            raise AttributeError(name)
         return getattr(self.base_embeddings, name)
 
 
@@ -125,12 +184,15 @@ class Settings:
     _embed_model = None
     _llm = None  
     _eval_llm = None
+    _regeneration_llm = None
+    _regeneration_llm_ready = False  # None is a valid (disabled) regeneration model
     
     @classmethod
     def get_embed_model(cls):
         """Get embedding model with lazy initialization."""
         if cls._embed_model is None:
-            cls._init_embed_model()
+            with startup_phase("embed_model_load"):
+                cls._init_embed_model()
         return cls._embed_model
         
     @classmethod
@@ -146,6 +208,14 @@ class Settings:
         if cls._eval_llm is None:
             cls._init_eval_llm()
         return cls._eval_llm
+
+    @classmethod
+    def get_regeneration_llm(cls):
+        """Get the low-confidence regeneration LLM (None when disabled or not configured)."""
+        if not cls._regeneration_llm_ready:
+            cls._init_regeneration_llm()
+            cls._regeneration_llm_ready = True
+        return cls._regeneration_llm
     
     @classmethod
     def _init_embed_model(cls):
@@ -162,14 +232,22 @@ class Settings:
                 embed_kwargs["model"] = get_config_value("EMBED_MODEL")
             if get_config_value("GEMINI_API_KEY"):
                 embed_kwargs["google_api_key"] = get_config_value("GEMINI_API_KEY")
-            _base_embed_model = GoogleGenerativeAIEmbeddings(**embed_kwargs)
-            cls._embed_model = RateLimitedEmbeddings(_base_embed_model, delay=0.65)
+            _base_embed_model = embeddings_class("gemini")(**embed_kwargs)
+            cls._embed_model = RateLimitedEmbeddings(
+                _base_embed_model,
+                requests_per_minute=get_config_value("EMBED_REQUESTS_PER_MINUTE", 100, float),
+                texts_per_minute=get_config_value("EMBED_TEXTS_PER_MINUTE", None, float),
+                max_retries=get_config_value("EMBED_MAX_RETRIES", 5, int),
+            )
+            # Cache hits skip the rate limiter; Gemini embeds queries with a
+            # different task type, so queries get their own cache entries
+            cls._wrap_embed_cache(f"gemini:{_base_embed_model.model}", query_uses_document_embedding=False)
 
         elif _provider == "local-best":
             # Sentence Transformers: High Quality (MTEB ~64)
             logger.info("Using local embeddings: sentence-transformers/all-mpnet-base-v2 (best quality)")
             logger.info(f"  • Parallelization: batch_size={get_config_value('EMBEDDING_BATCH_SIZE', 16, int)}, device={get_config_value('EMBEDDING_DEVICE', 'cpu')}")
-            cls._embed_model = HuggingFaceEmbeddings(
+            cls._embed_model = embeddings_class("huggingface")(
                 model_name="sentence-transformers/all-mpnet-base-v2",
                 model_kwargs={
                     'device': get_config_value("EMBEDDING_DEVICE", "cpu"),  # Use GPU if available (mps for Mac, cuda for NVIDIA)
@@ -179,12 +257,13 @@ class Settings:
                     'batch_size': get_config_value("EMBEDDING_BATCH_SIZE", 16, int),  # Batch processing for speed
                 }
             )
+            cls._wrap_embed_cache("hf:sentence-transformers/all-mpnet-base-v2:normalized", query_uses_document_embedding=True)
 
         else:  # default to "local-fast"
             # Sentence Transformers: Fast & High Quality (MTEB ~62)
             logger.info("Using local embeddings: BAAI/bge-small-en-v1.5 (fast & efficient)")
             logger.info(f"  • Parallelization: batch_size={get_config_value('EMBEDDING_BATCH_SIZE', 16, int)}, device={get_config_value('EMBEDDING_DEVICE', 'cpu')}")
-            cls._embed_model = HuggingFaceEmbeddings(
+            cls._embed_model = embeddings_class("huggingface")(
                 model_name="BAAI/bge-small-en-v1.5",
                 model_kwargs={
                     'device': get_config_value("EMBEDDING_DEVICE", "cpu"),  # Use GPU if available
@@ -194,6 +273,25 @@ class Settings:
                     'batch_size': get_config_value("EMBEDDING_BATCH_SIZE", 16, int),  # Batch processing
                 }
             )
+            cls._wrap_embed_cache("hf:BAAI/bge-small-en-v1.5:normalized", query_uses_document_embedding=True)
+
+    @classmethod
+    def _wrap_embed_cache(cls, namespace: str, query_uses_document_embedding: bool):
+        """Put the on-disk embedding cache in front of the freshly built embedding model."""
+        from src.config import get_config_value
+        if not get_config_value("EMBEDDING_CACHE", True, bool):
+            return
+        from src.utils.embedding_cache import wrap_with_cache
+
+        cached = wrap_with_cache(
+            cls._embed_model,
+            namespace=namespace,
+            path=get_config_value("EMBEDDING_CACHE_PATH", os.path.join("embedding_cache", "embeddings.sqlite")),
+            max_bytes=get_config_value("EMBEDDING_CACHE_MAX_MB", 512, int) * 1024 * 1024,
+            query_uses_document_embedding=query_uses_document_embedding,
+        )
+        if cached is not None:
+            cls._embed_model = cached
     
     @classmethod
     def _init_llm(cls):
@@ -204,7 +302,7 @@ class Settings:
         if llm_provider == "ollama":
             logger.info(f"Using Ollama LLM for QA: {get_config_value('OLLAMA_MODEL', 'llama3.1:8b')} at {get_config_value('OLLAMA_BASE_URL', 'http://localhost:11434')}")
             logger.info(f"  • Parallelization: {get_config_value('OLLAMA_QA_NUM_THREAD', 4, int)} threads, GPU enabled (Metal), context={get_config_value('OLLAMA_QA_NUM_CTX', 8192, int)}")
-            cls._llm = ChatOllama(
+            cls._llm = chat_model_class("ollama")(
                 base_url=get_config_value("OLLAMA_BASE_URL", "http://localhost:11434"),
                 model=get_config_value("OLLAMA_MODEL", "llama3.1:8b"),
                 temperature=get_config_value("TEMPERATURE", 0.0, float),
@@ -219,7 +317,7 @@ class Settings:
                 # If GEMINI_API_KEY missing, fall through to Groq branch below
                 groq_model = get_config_value("MODEL") or get_config_value("GROQ_MODEL")
                 logger.info(f"Using Groq LLM for QA: {groq_model}")
-                cls._llm = ChatGroq(
+                cls._llm = chat_model_class("groq")(
                     api_key=get_config_value("GROQ_API_KEY"),
                     model=groq_model,
                     max_tokens=get_config_value("MAX_TOKENS", 2048, int),
@@ -228,7 +326,7 @@ class Settings:
                 )
             else:
                 logger.info(f"Using Google Gemini LLM for QA: {get_config_value('GEMINI_MODEL', 'gemini-2.0-flash-exp')}")
-                cls._llm = ChatGoogleGenerativeAI(
+                cls._llm = chat_model_class("gemini")(
                     model=get_config_value("GEMINI_MODEL", "gemini-2.0-flash-exp"),
                     google_api_key=get_config_value("GEMINI_API_KEY"),
                     temperature=get_config_value("TEMPERATURE", 0.0, float),
@@ -245,7 +343,7 @@ class Settings:
                 )
 
             logger.info(f"Using Groq LLM for QA: {groq_model}")
-            cls._llm = ChatGroq(
+            cls._llm = chat_model_class("groq")(
                 api_key=get_config_value("GROQ_API_KEY"),
                 model=groq_model,
                 max_tokens=get_config_value("MAX_TOKENS", 2048, int),
@@ -262,7 +360,7 @@ class Settings:
         if eval_llm_provider == "ollama":
             logger.info(f"Using Ollama LLM for Evaluation: {get_config_value('OLLAMA_EVAL_MODEL', 'llama3.1:8b')} at {get_config_value('OLLAMA_BASE_URL', 'http://localhost:11434')}")
             logger.info(f"  • Parallelization: {get_config_value('OLLAMA_EVAL_NUM_THREAD', 4, int)} threads, GPU enabled (Metal), context={get_config_value('OLLAMA_EVAL_NUM_CTX', 8192, int)}")
-            cls._eval_llm = ChatOllama(
+            cls._eval_llm = chat_model_class("ollama")(
                 base_url=get_config_value("OLLAMA_BASE_URL", "http://localhost:11434"),
                 model=get_config_value("OLLAMA_EVAL_MODEL", "llama3.1:8b"),
                 temperature=0.3,  # Lower temperature for evaluation
@@ -272,7 +370,7 @@ class Settings:
             )
         elif eval_llm_provider == "gemini":
             logger.info(f"Using Google Gemini LLM for Evaluation: {get_config_value('GEMINI_MODEL', 'gemini-2.0-flash-exp')}")
-            cls._eval_llm = ChatGoogleGenerativeAI(
+            cls._eval_llm = chat_model_class("gemini")(
                 model=get_config_value("GEMINI_MODEL", "gemini-2.0-flash-exp"),
                 google_api_key=get_config_value("GEMINI_API_KEY"),
                 temperature=0.3,
@@ -282,7 +380,7 @@ class Settings:
             )
         else:  # Default to Groq
             logger.info(f"Using Groq LLM for Evaluation: {get_config_value('EVAL_MODEL') or get_config_value('MODEL') or get_config_value('GROQ_MODEL')}")
-            cls._eval_llm = ChatGroq(
+            cls._eval_llm = chat_model_class("groq")(
                 api_key=get_config_value("GROQ_API_KEY"),
                 model=get_config_value("EVAL_MODEL") or get_config_value("MODEL") or get_config_value("GROQ_MODEL"),
                 temperature=0.3,
@@ -291,23 +389,60 @@ class Settings:
                 max_retries=2,
             )
 
+    @classmethod
+    def _init_regeneration_llm(cls):
+        """Initialize the superior model used to regenerate low-confidence answers."""
+        from src.config import get_config_value
+        if not get_config_value("USE_REGENERATION", True, bool):
+            return
+        provider = get_config_value("REGENERATION_PROVIDER", "groq")
+        model = get_config_value("REGENERATION_MODEL", "llama-3.3-70b-versatile")
+
+        if provider == "groq" and get_config_value("GROQ_API_KEY"):
+            cls._regeneration_llm = chat_model_class("groq")(
+                api_key=get_config_value("GROQ_API_KEY"),
+                model=model,
+                temperature=0,
+                max_tokens=2048,
+                timeout=600,
+                max_retries=2,
+            )
+            logger.info(f"Regeneration enabled with Groq: {model}")
+
+        elif provider == "gemini" and get_config_value("GEMINI_API_KEY"):
+            cls._regeneration_llm = chat_model_class("gemini")(
+                model=model,
+                google_api_key=get_config_value("GEMINI_API_KEY"),
+                temperature=0,
+                max_tokens=2048,
+                timeout=600,
+                max_retries=2,
+            )
+            logger.info(f"Regeneration enabled with Gemini: {model}")
+
+        elif provider == "ollama":
+            cls._regeneration_llm = chat_model_class("ollama")(
+                model=model,
+                temperature=0,
+                num_predict=2048,
+            )
+            logger.info(f"Regeneration enabled with Ollama: {model}")
+
+        else:
+            logger.warning(
+                f"USE_REGENERATION=true but provider '{provider}' not configured properly. "
+                "Will use standard refinement."
+            )
+
     @staticmethod
-    def invoke_llm(llm_obj, messages_or_str):
+    def llm_input(messages_or_str):
         """
-        Unified helper to invoke the configured LLM across providers.
+        Provider-compatible input for the configured LLM.
 
         - For Gemini (ChatGoogleGenerativeAI) the client expects a plain string
           for 'invoke', so we flatten message lists into a single prompt.
         - For other providers (Ollama, Groq) we forward the messages list
           (SystemMessage/HumanMessage) as-is.
-
-        Args:
-            llm_obj: The instantiated LLM client (Settings.llm)
-            messages_or_str: Either a single string prompt or a list of message
-                             objects (SystemMessage/HumanMessage/etc.)
-
-        Returns:
-            The LLM response object from the provider.
         """
         from src.config import get_config_value
 
@@ -315,7 +450,7 @@ class Settings:
 
         # If user passed a plain string, just forward it
         if isinstance(messages_or_str, str):
-            return llm_obj.invoke(messages_or_str)
+            return messages_or_str
 
         # If Gemini, flatten messages into a single prompt string
         if provider == "gemini":
@@ -324,8 +459,44 @@ class Settings:
                 # Try to extract `.content` or fall back to str(m)
                 content = getattr(m, "content", None) or str(m)
                 parts.append(content)
-            prompt = "\n\n".join(parts)
-            return llm_obj.invoke(prompt)
+            return "\n\n".join(parts)
 
         # Default: pass the messages list through (Ollama, Groq)
-        return llm_obj.invoke(messages_or_str)
+        return messages_or_str
+
+    @staticmethod
+    def invoke_llm(llm_obj, messages_or_str):
+        """
+        Unified helper to invoke the configured LLM across providers.
+
+        Args:
+            llm_obj: The instantiated LLM client (Settings.llm)
+            messages_or_str: Either a single string prompt or a list of message
+                             objects (SystemMessage/HumanMessage/etc.)
+
+        Returns:
+            The LLM response object from the provider.
+        """
+        return llm_obj.invoke(Settings.llm_input(messages_or_str))
+
+    @staticmethod
+    def stream_llm(llm_obj, messages_or_str, on_token=None):
+        """
+        invoke_llm that streams: calls `on_token(text)` for each piece of the
+        reply as it arrives and returns the whole reply (same `.content`).
+        """
+        from src.utils.answer_stream import chunk_text
+
+        response = None
+        for chunk in llm_obj.stream(Settings.llm_input(messages_or_str)):
+            response = chunk if response is None else response + chunk
+            text = chunk_text(chunk.content)
+            if text and on_token is not None:
+                on_token(text)
+        return response
+
+    @staticmethod
+    async def ainvoke_llm(llm_obj, messages_or_str):
+        """Async invoke_llm, holding one of the provider's concurrency slots."""
+        async with provider_slot(llm_obj):
+            return await llm_obj.ainvoke(Settings.llm_input(messages_or_str))
@@ -21,10 +21,15 @@ from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.documents import Document
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
-from langchain_core.tools import tool
+from langchain_core.tools import tool, StructuredTool
 import operator
 from src.helper import logger
 from src.settings import Settings
+from src.utils.query_analysis import analyze_query
+from src.utils.startup_profile import startup_phase
+from src.utils.node_steps import Call, run_steps, arun_steps
+from src.utils.answer_stream import AnswerStream
+from src.config import AGENTIC_TOOL_FANOUT, DICTIONARY_INDEX_DIR, DICTIONARY_MAX_EDIT_DISTANCE
 from src.utils.citation_enhancer import (
     enhance_corpus_results_with_citations,
     create_enhanced_citations_list,
@@ -32,8 +37,6 @@ from src.utils.citation_enhancer import (
 )
 import re
 
-llm = Settings.get_llm()
-
 # Global shared vector store to avoid Qdrant lock issues
 _SHARED_VECTOR_STORE = None
 _SHARED_DOCS = None
@@ -49,18 +52,23 @@ def set_shared_vector_store(vec_db, docs):
 _SHARED_RETRIEVER = None
 
 def get_shared_retriever():
-    """Get the shared retriever with proper noun variants, or create if not set."""
-    global _SHARED_RETRIEVER, _SHARED_VECTOR_STORE, _SHARED_DOCS
-    if _SHARED_RETRIEVER is None:
-        logger.info("[AGENTIC] Creating shared retriever with proper noun variants")
-        if _SHARED_VECTOR_STORE is None:
-            from src.utils.index_files import create_qdrant_vector_store
-            _SHARED_VECTOR_STORE, _SHARED_DOCS = create_qdrant_vector_store(force_recreate=False)
-
-        # Use the full HybridRetriever with proper noun variants
-        from src.utils.retriever import create_retriever
-        _SHARED_RETRIEVER = create_retriever(_SHARED_VECTOR_STORE, _SHARED_DOCS, top_n=5)
+    """Get the shared retriever with proper noun variants.
 
+    Uses a vector store set with set_shared_vector_store if there is one,
+    otherwise the process-wide index service.
+    """
+    global _SHARED_RETRIEVER
+    if _SHARED_RETRIEVER is not None:
+        return _SHARED_RETRIEVER
+
+    if _SHARED_VECTOR_STORE is None:
+        from src.utils.index_service import get_index_service
+        return get_index_service().retriever
+
+    logger.info("[AGENTIC] Creating shared retriever with proper noun variants")
+    # Use the full HybridRetriever with proper noun variants
+    from src.utils.retriever import create_retriever
+    _SHARED_RETRIEVER = create_retriever(_SHARED_VECTOR_STORE, _SHARED_DOCS, top_n=5)
     return _SHARED_RETRIEVER
 
 
@@ -72,6 +80,7 @@ class AgentState(TypedDict):
     # Extracted information
     english_words: List[str]  # Words to translate ["I", "want", "milk"]
     sanskrit_words: dict  # Dictionary results: {"milk": ["payas", "dugdha"]}
+    dictionary_matches: dict  # Words found under another headword: {"waetr": {"key": "water", "match": "fuzzy"}}
     grammar_rules: List[Document]  # Grammar rules from Macdonell
     corpus_examples: List[Document]  # Usage examples from RV/YV
 
@@ -88,30 +97,49 @@ class AgentState(TypedDict):
 # TOOL 1: DICTIONARY LOOKUP (Enhanced with Monier-Williams)
 # ============================================================
 
-# Load cleaned Monier-Williams dictionary (10,635 high-quality entries)
+# Cleaned Monier-Williams dictionary (10,635 high-quality entries), compiled
+# once into a memory-mapped index (see dictionary_index.py)
 _MONIER_WILLIAMS_DICT = None
 
 def load_monier_williams():
-    """Lazy load cleaned Monier-Williams dictionary"""
+    """Lazy load the compiled Monier-Williams index (built from the JSON on first use)"""
     global _MONIER_WILLIAMS_DICT
     if _MONIER_WILLIAMS_DICT is None:
-        import json
         import os
+        from src.utils.dictionary_index import (
+            DICTIONARY_INDEX_DIRNAME,
+            DictionaryIndex,
+            load_or_build_dictionary_index,
+        )
         # Try cleaned dictionary first, fall back to original if not found
         dict_path = os.path.join(os.path.dirname(__file__), '..', '..', 'sanskrit_dictionary_cleaned.json')
         if not os.path.exists(dict_path):
             dict_path = os.path.join(os.path.dirname(__file__), '..', '..', 'sanskrit_dictionary.json')
-            logger.warning(f"[DICTIONARY] Using original dictionary (may contain OCR errors)")
+            logger.warning("[DICTIONARY] Using original dictionary (may contain OCR errors)")
 
+        index_dir = DICTIONARY_INDEX_DIR or os.path.join(os.path.dirname(dict_path), DICTIONARY_INDEX_DIRNAME)
         try:
-            with open(dict_path, 'r', encoding='utf-8') as f:
-                _MONIER_WILLIAMS_DICT = json.load(f)
-            logger.info(f"[DICTIONARY] Loaded Monier-Williams: {len(_MONIER_WILLIAMS_DICT)} entries from {os.path.basename(dict_path)}")
+            _MONIER_WILLIAMS_DICT = load_or_build_dictionary_index(
+                dict_path, index_dir, max_edit_distance=DICTIONARY_MAX_EDIT_DISTANCE
+            )
+            logger.info(f"[DICTIONARY] Monier-Williams: {len(_MONIER_WILLIAMS_DICT)} entries from {os.path.basename(dict_path)}")
         except FileNotFoundError:
             logger.warning(f"[DICTIONARY] Monier-Williams not found at {dict_path}, using BASIC_LEXICON only")
-            _MONIER_WILLIAMS_DICT = {}
+            _MONIER_WILLIAMS_DICT = DictionaryIndex.build({})
     return _MONIER_WILLIAMS_DICT
 
+def _dictionary_match(word: str):
+    """Exact match first, then inflection stem ("loves" -> "love"), then typo-tolerant match."""
+    match = load_monier_williams().lookup(word, fuzzy=DICTIONARY_MAX_EDIT_DISTANCE > 0)
+    if match is None:
+        logger.warning(f"[DICTIONARY] '{word}' not found in dictionary")
+    elif match.match == "exact":
+        logger.info(f"[DICTIONARY] '{word}' → {match.terms[:3]} (Monier-Williams)")
+    else:
+        logger.info(f"[DICTIONARY] '{word}' → '{match.key}' ({match.match}) → {match.terms[:3]} (Monier-Williams)")
+    return match
+
+
 @tool
 def dictionary_lookup(word: str) -> str:
     """
@@ -124,38 +152,26 @@ def dictionary_lookup(word: str) -> str:
     Returns:
         Sanskrit equivalents with grammar notes
     """
-    word_lower = word.lower()
+    match = _dictionary_match(word)
 
-    # Load Monier-Williams dictionary
-    monier_dict = load_monier_williams()
-
-    # Check Monier-Williams dictionary first (most comprehensive)
-    if word_lower in monier_dict:
-        sanskrit_terms = monier_dict[word_lower]
-        # Filter out noise (terms with numbers or strange chars)
-        clean_terms = [t for t in sanskrit_terms if not any(c.isdigit() for c in t) and len(t) > 2]
-
-        if clean_terms:
-            logger.info(f"[DICTIONARY] '{word}' → {clean_terms[:3]} (Monier-Williams)")
+    if match is not None:
+        # Noise terms (digits, fragments) were filtered out when the index was built
+        clean_terms = match.terms
+        if match.match == "exact":
             return f"Sanskrit for '{word}': {', '.join(clean_terms[:5])}"
-
-    # Fallback: not found
-    logger.warning(f"[DICTIONARY] '{word}' not found in dictionary")
+        if match.match == "fuzzy":
+            return f"Sanskrit for '{word}' (spelling corrected to '{match.key}'): {', '.join(clean_terms[:5])}"
+        return f"Sanskrit for '{word}' (as '{match.key}'): {', '.join(clean_terms[:5])}"
+
+    # Fallback: not found. A real English word is never swapped for a similar
+    # headword ("singing" -> "sinking"), but the headword is offered
+    suggestion = load_monier_williams().suggest(word) if DICTIONARY_MAX_EDIT_DISTANCE > 0 else None
+    if suggestion is not None:
+        return f"'{word}' not found in dictionary. Did you mean '{suggestion[0]}'? Otherwise try a synonym or simpler word."
     return f"'{word}' not found in dictionary. Try a synonym or simpler word."
 
 
-@tool
-def grammar_rules_search(sanskrit_word: str, context: str = "") -> str:
-    """
-    Search grammar texts (Macdonell) for declension/conjugation rules.
-
-    Args:
-        sanskrit_word: Sanskrit word or root to get grammar for
-        context: Additional context (e.g., "accusative case", "present tense")
-
-    Returns:
-        Grammar rules and tables
-    """
+def _grammar_rules_steps(sanskrit_word: str, context: str = ""):
     # TODO: Create separate grammar-only index
     # For now, search in main corpus with grammar filter
     logger.info(f"[GRAMMAR] Searching rules for '{sanskrit_word}' (context: {context})")
@@ -166,7 +182,7 @@ def grammar_rules_search(sanskrit_word: str, context: str = "") -> str:
         # Use shared retriever with proper noun variants
         retriever = get_shared_retriever()
 
-        grammar_docs = retriever.invoke(query)
+        grammar_docs = yield Call(retriever, query)
 
         # Filter for grammar content (contains tables, rules, endings)
         grammar_indicators = ["declension", "conjugation", "case", "ending", "vibhakti", "suffix"]
@@ -184,18 +200,33 @@ def grammar_rules_search(sanskrit_word: str, context: str = "") -> str:
         return f"Grammar lookup failed: {e}"
 
 
-@tool
-def corpus_examples_search(sanskrit_terms: str, pattern: str = "") -> str:
+def _grammar_rules_search(sanskrit_word: str, context: str = "") -> str:
     """
-    Search Vedic corpus (RV/YV) for usage examples or factual information.
+    Search grammar texts (Macdonell) for declension/conjugation rules.
 
     Args:
-        sanskrit_terms: Sanskrit words OR factual question to search for
-        pattern: Sentence pattern to match (e.g., "sentence", "") - empty for factual queries
+        sanskrit_word: Sanskrit word or root to get grammar for
+        context: Additional context (e.g., "accusative case", "present tense")
 
     Returns:
-        Example sentences or relevant corpus passages (raw, without formatting)
+        Grammar rules and tables
     """
+    return run_steps(_grammar_rules_steps(sanskrit_word, context))
+
+
+async def _agrammar_rules_search(sanskrit_word: str, context: str = "") -> str:
+    return await arun_steps(_grammar_rules_steps(sanskrit_word, context))
+
+
+# Sync and async implementations: .ainvoke awaits the async retriever
+grammar_rules_search = StructuredTool.from_function(
+    func=_grammar_rules_search,
+    coroutine=_agrammar_rules_search,
+    name="grammar_rules_search",
+)
+
+
+def _corpus_examples_steps(sanskrit_terms: str, pattern: str = ""):
     logger.info(f"[CORPUS] Searching for '{sanskrit_terms}' (pattern: {pattern})")
 
     # If pattern is empty, treat as factual query - use direct search
@@ -210,7 +241,7 @@ def corpus_examples_search(sanskrit_terms: str, pattern: str = "") -> str:
         # Use shared retriever with proper noun variants
         retriever = get_shared_retriever()
 
-        examples = retriever.invoke(query)
+        examples = yield Call(retriever, query)
 
         if examples:
             # Return raw document content (NO citation formatting here)
@@ -226,6 +257,31 @@ def corpus_examples_search(sanskrit_terms: str, pattern: str = "") -> str:
         return f"Corpus search failed: {e}"
 
 
+def _corpus_examples_search(sanskrit_terms: str, pattern: str = "") -> str:
+    """
+    Search Vedic corpus (RV/YV) for usage examples or factual information.
+
+    Args:
+        sanskrit_terms: Sanskrit words OR factual question to search for
+        pattern: Sentence pattern to match (e.g., "sentence", "") - empty for factual queries
+
+    Returns:
+        Example sentences or relevant corpus passages (raw, without formatting)
+    """
+    return run_steps(_corpus_examples_steps(sanskrit_terms, pattern))
+
+
+async def _acorpus_examples_search(sanskrit_terms: str, pattern: str = "") -> str:
+    return await arun_steps(_corpus_examples_steps(sanskrit_terms, pattern))
+
+
+corpus_examples_search = StructuredTool.from_function(
+    func=_corpus_examples_search,
+    coroutine=_acorpus_examples_search,
+    name="corpus_examples_search",
+)
+
+
 # ============================================================
 # AGENT NODES
 # ============================================================
@@ -237,25 +293,15 @@ def classify_and_plan_node(state: AgentState):
     logger.info("---AGENT: PLANNING---")
     question = state["question"]
 
-    # Classify query type
-    construction_keywords = [
-        "how do i say", "translate", "in sanskrit", "sanskrit for",
-        "how to say", "say in sanskrit", "sanskrit word for",
-        "construct", "write in sanskrit"
-    ]
-    grammar_keywords = ["explain", "what is the rule", "how does", "declension", "conjugation"]
-
-    is_construction = any(kw in question.lower() for kw in construction_keywords)
-    is_grammar = any(kw in question.lower() for kw in grammar_keywords)
+    # Classify query type (shared single-pass analysis, see query_analysis.py)
+    query_type = analyze_query(question).agent_query_type
+    is_construction = query_type == "construction"
 
     if is_construction:
-        query_type = "construction"
         logger.info("[AGENT] Query type: CONSTRUCTION (need dictionary + grammar + examples)")
-    elif is_grammar:
-        query_type = "grammar"
+    elif query_type == "grammar":
         logger.info("[AGENT] Query type: GRAMMAR (need grammar rules + examples)")
     else:
-        query_type = "factual"
         logger.info("[AGENT] Query type: FACTUAL (use standard retrieval)")
 
     # Extract words to translate (for construction queries)
@@ -314,87 +360,131 @@ def classify_and_plan_node(state: AgentState):
     }
 
 
-def execute_tools_node(state: AgentState):
-    """
-    Execute the tools based on agent's decision.
-    """
-    logger.info(f"---AGENT: EXECUTING TOOL: {state['next_action']}---")
+def _dictionary_phase(english_words: List[str]) -> dict:
+    """Look up all English words (in-memory, no retrieval)."""
+    sanskrit_words = {}
+    dictionary_matches = {}
+    for word in english_words:
+        match = _dictionary_match(word)
+        sanskrit_words[word] = match.terms[:5] if match is not None else []
+        # Keep which headword was used, so synthesis does not take "waetr"'s terms as exact
+        if match is not None and match.match != "exact":
+            dictionary_matches[word] = {"key": match.key, "match": match.match}
 
-    next_action = state["next_action"]
+    logger.info(f"[AGENT] Dictionary results: {sanskrit_words}")
+    return {
+        "sanskrit_words": sanskrit_words,
+        "dictionary_matches": dictionary_matches,
+        "messages": [AIMessage(content=f"Found translations: {sanskrit_words}")],
+    }
 
-    if next_action == "dictionary":
-        # Look up all English words
-        sanskrit_words = {}
-        for word in state["english_words"]:
-            result = dictionary_lookup.invoke({"word": word})
-            # Extract Sanskrit terms from result
-            # Format: "Sanskrit for 'word': term1, term2, term3"
-            if ":" in result and "not found" not in result.lower():
-                terms = result.split(":", 1)[1].strip()
-                sanskrit_words[word] = [t.strip() for t in terms.split(", ")]
-            else:
-                sanskrit_words[word] = []
-
-        logger.info(f"[AGENT] Dictionary results: {sanskrit_words}")
-        return {
-            "sanskrit_words": sanskrit_words,
-            "messages": [AIMessage(content=f"Found translations: {sanskrit_words}")],
-            "next_action": "grammar"  # Next: get grammar rules
-        }
 
-    elif next_action == "grammar":
-        # Get grammar rules for Sanskrit words
-        grammar_rules = []
-        for eng_word, sans_words in state.get("sanskrit_words", {}).items():
-            if sans_words:
-                first_term = sans_words[0] if isinstance(sans_words, list) else sans_words
-                # Determine context based on word type
-                context = "declension" if eng_word in ["milk", "water", "fire"] else "conjugation"
-                result = grammar_rules_search.invoke({"sanskrit_word": first_term, "context": context})
-                grammar_rules.append(Document(page_content=result, metadata={"word": eng_word}))
-
-        logger.info(f"[AGENT] Found {len(grammar_rules)} grammar references")
-        return {
-            "grammar_rules": grammar_rules,
-            "messages": [AIMessage(content=f"Retrieved grammar rules for {len(grammar_rules)} words")],
-            "next_action": "corpus"  # Next: find examples
-        }
+def _grammar_phase_steps(sanskrit_words: dict):
+    """Get grammar rules for Sanskrit words: one retrieval per distinct lookup, all at once."""
+    lookups = []
+    for eng_word, sans_words in sanskrit_words.items():
+        if sans_words:
+            first_term = sans_words[0] if isinstance(sans_words, list) else sans_words
+            # Determine context based on word type
+            context = "declension" if eng_word in ["milk", "water", "fire"] else "conjugation"
+            lookups.append((eng_word, (first_term, context)))
+
+    # Words sharing a term and context share one retrieval
+    distinct = list(dict.fromkeys(key for _, key in lookups))
+    results = (yield [
+        Call(grammar_rules_search, {"sanskrit_word": term, "context": context})
+        for term, context in distinct
+    ]) if distinct else []
+    by_key = dict(zip(distinct, results))
+    grammar_rules = [
+        Document(page_content=by_key[key], metadata={"word": eng_word})
+        for eng_word, key in lookups
+    ]
 
-    elif next_action == "corpus":
-        # Get corpus examples - retrieve raw documents directly
-        query_type = state.get("query_type", "")
-
-        if query_type == "construction":
-            # For construction: search using Sanskrit terms from dictionary
-            sanskrit_terms = ", ".join([
-                term for terms in state.get("sanskrit_words", {}).values()
-                for term in (terms if isinstance(terms, list) else [terms])
-            ])
-            query = f"{sanskrit_terms} example sentence usage"
-        else:
-            # For factual/grammar queries: search using the original question
-            question = state.get("question", "")
-            query = question
+    logger.info(f"[AGENT] Found {len(grammar_rules)} grammar references")
+    return {
+        "grammar_rules": grammar_rules,
+        "messages": [AIMessage(content=f"Retrieved grammar rules for {len(grammar_rules)} words")],
+    }
 
-        # Retrieve raw documents directly from retriever (preserves metadata)
-        retriever = get_shared_retriever()
-        corpus_examples = retriever.invoke(query)
-        
-        logger.info(f"[AGENT] Retrieved {len(corpus_examples)} corpus documents with metadata")
-        return {
-            "corpus_examples": corpus_examples,
-            "messages": [AIMessage(content=f"Retrieved {len(corpus_examples)} corpus examples")],
-            "next_action": "synthesize"  # Next: construct answer
-        }
 
+def _corpus_phase_steps(state: AgentState, sanskrit_words: dict):
+    """Get corpus examples - retrieve raw documents directly."""
+    query_type = state.get("query_type", "")
+
+    if query_type == "construction":
+        # For construction: search using Sanskrit terms from dictionary
+        sanskrit_terms = ", ".join([
+            term for terms in sanskrit_words.values()
+            for term in (terms if isinstance(terms, list) else [terms])
+        ])
+        query = f"{sanskrit_terms} example sentence usage"
     else:
+        # For factual/grammar queries: search using the original question
+        question = state.get("question", "")
+        query = question
+
+    # Retrieve raw documents directly from retriever (preserves metadata)
+    retriever = get_shared_retriever()
+    corpus_examples = yield Call(retriever, query)
+
+    logger.info(f"[AGENT] Retrieved {len(corpus_examples)} corpus documents with metadata")
+    return {
+        "corpus_examples": corpus_examples,
+        "messages": [AIMessage(content=f"Retrieved {len(corpus_examples)} corpus examples")],
+    }
+
+
+# Tool phases in plan order, and the action that follows each one
+_TOOL_PHASES = ("dictionary", "grammar", "corpus")
+_AFTER_PHASE = {"dictionary": "grammar", "grammar": "corpus", "corpus": "synthesize"}
+
+
+def _execute_tools_steps(state: AgentState):
+    next_action = state["next_action"]
+    if next_action not in _TOOL_PHASES:
         return {"next_action": "synthesize"}
 
+    # Fan-out: this and every later phase in one hop; otherwise one phase per hop
+    if AGENTIC_TOOL_FANOUT:
+        phases = _TOOL_PHASES[_TOOL_PHASES.index(next_action):]
+    else:
+        phases = (next_action,)
+    logger.info(f"---AGENT: EXECUTING TOOLS: {', '.join(phases)}---")
+
+    update = {"messages": []}
+    sanskrit_words = state.get("sanskrit_words", {})
+    if "dictionary" in phases:
+        update.update(_dictionary_phase(state["english_words"]))
+        sanskrit_words = update["sanskrit_words"]
+
+    # Grammar and corpus only depend on the dictionary results, so they run together
+    independent = []
+    if "grammar" in phases:
+        independent.append(_grammar_phase_steps(sanskrit_words))
+    if "corpus" in phases:
+        independent.append(_corpus_phase_steps(state, sanskrit_words))
+    results = (yield independent) if independent else []
+
+    for result in results:
+        update["messages"] += result.pop("messages")
+        update.update(result)
+    update["next_action"] = _AFTER_PHASE[phases[-1]]
+    return update
 
-def synthesize_answer_node(state: AgentState):
+
+def execute_tools_node(state: AgentState):
     """
-    Agent synthesizes all information into final Sanskrit construction.
+    Execute the tools based on agent's decision.
     """
+    return run_steps(_execute_tools_steps(state))
+
+
+async def aexecute_tools_node(state: AgentState):
+    return await arun_steps(_execute_tools_steps(state))
+
+
+def _synthesize_answer_steps(state: AgentState):
     logger.info("---AGENT: SYNTHESIZING ANSWER---")
 
     question = state["question"]
@@ -403,6 +493,7 @@ def synthesize_answer_node(state: AgentState):
     if query_type == "construction":
         # Gather all information
         dictionary_info = state.get("sanskrit_words", {})
+        dictionary_matches = state.get("dictionary_matches", {})
         grammar_info = state.get("grammar_rules", [])
         examples_info = state.get("corpus_examples", [])
 
@@ -414,9 +505,19 @@ def synthesize_answer_node(state: AgentState):
 
         # Build dictionary lookups text
         dict_text = ""
+        corrected = False
         for eng_word, skt_words in dictionary_info.items():
             if skt_words:
-                dict_text += f"- {eng_word} → {', '.join(skt_words[:3])}\n"
+                match = dictionary_matches.get(eng_word)
+                note = ""
+                if match and match["match"] == "fuzzy":
+                    note = f" (spelling corrected: looked up as '{match['key']}')"
+                    corrected = True
+                elif match:
+                    note = f" (looked up as '{match['key']}')"
+                dict_text += f"- {eng_word} → {', '.join(skt_words[:3])}{note}\n"
+        if corrected:
+            dict_text += "(A spelling-corrected word was not in the dictionary as written: use its entry only if the correction fits the phrase.)\n"
 
         # Create synthesis prompt - simpler and more direct
         synthesis_prompt = f"""You are a Sanskrit tutor. Translate this English phrase to Vedic Sanskrit.
@@ -452,8 +553,9 @@ EXAMPLE FORMAT:
 Now provide the translation for "{english_phrase}":"""
 
         messages = [SystemMessage(content=synthesis_prompt)]
-        # Use provider-compatible invocation (Gemini expects a plain string)
-        response = Settings.invoke_llm(llm, messages)
+        # Use provider-compatible input (Gemini expects a plain string)
+        llm = Settings.get_llm()
+        response = yield Call(llm, Settings.llm_input(messages), llm)
 
         # Debug: Check what we got back
         logger.info(f"[AGENT] LLM response type: {type(response)}")
@@ -527,7 +629,8 @@ INSTRUCTIONS:
 Provide a clear, educational answer with proper citations:"""
 
         messages = [SystemMessage(content=synthesis_prompt)]
-        response = Settings.invoke_llm(llm, messages)
+        llm = Settings.get_llm()
+        response = yield Call(llm, Settings.llm_input(messages), llm)
 
         answer_content = response.content if hasattr(response, 'content') else str(response)
         logger.info(f"[AGENT] Grammar response length: {len(answer_content)} chars")
@@ -587,7 +690,8 @@ Please inform the user that this specific topic is not found in the available co
 Provide a helpful response:"""
 
         messages = [SystemMessage(content=synthesis_prompt)]
-        response = Settings.invoke_llm(llm, messages)
+        llm = Settings.get_llm()
+        response = yield Call(llm, Settings.llm_input(messages), llm)
 
         # Debug LLM response
         logger.info(f"[AGENT] LLM response type: {type(response)}")
@@ -620,6 +724,17 @@ Provide a helpful response:"""
     }
 
 
+def synthesize_answer_node(state: AgentState):
+    """
+    Agent synthesizes all information into final Sanskrit construction.
+    """
+    return run_steps(_synthesize_answer_steps(state))
+
+
+async def asynthesize_answer_node(state: AgentState):
+    return await arun_steps(_synthesize_answer_steps(state))
+
+
 def should_continue(state: AgentState) -> str:
     """
     Router: Decide if agent should continue with tools or synthesize answer.
@@ -640,16 +755,14 @@ def should_continue(state: AgentState) -> str:
 # ============================================================
 # BUILD AGENTIC RAG GRAPH
 # ============================================================
-def create_agentic_rag_graph():
-    """
-    Create the agentic RAG graph with planning, tool execution, and synthesis.
-    """
+def _build_agentic_workflow(execute_tools, synthesize) -> StateGraph:
+    """Wire the agentic graph around the given tool-execution and synthesis nodes."""
     workflow = StateGraph(AgentState)
 
     # Add nodes
     workflow.add_node("classify_and_plan", classify_and_plan_node)
-    workflow.add_node("execute_tools", execute_tools_node)
-    workflow.add_node("synthesize", synthesize_answer_node)
+    workflow.add_node("execute_tools", execute_tools)
+    workflow.add_node("synthesize", synthesize)
 
     # Define edges
     workflow.set_entry_point("classify_and_plan")
@@ -675,29 +788,36 @@ def create_agentic_rag_graph():
     )
 
     workflow.add_edge("synthesize", END)
-
-    return workflow.compile()
+    return workflow
 
 
-def run_agentic_rag(question: str):
+def create_agentic_rag_graph():
     """
-    Run the agentic RAG system on a question.
+    Create the agentic RAG graph with planning, tool execution, and synthesis.
+    """
+    workflow = _build_agentic_workflow(execute_tools_node, synthesize_answer_node)
 
-    Args:
-        question: User's question
+    with startup_phase("graph_compile"):
+        return workflow.compile()
 
-    Returns:
-        Final answer with construction details
+
+def create_async_agentic_rag_graph():
     """
-    logger.info(f"=== AGENTIC RAG START: {question} ===")
+    Agentic graph with async tool execution and synthesis, for `await graph.ainvoke(state)`.
+    """
+    workflow = _build_agentic_workflow(aexecute_tools_node, asynthesize_answer_node)
+
+    with startup_phase("graph_compile"):
+        return workflow.compile()
 
-    graph = create_agentic_rag_graph()
 
-    initial_state = {
+def _initial_agent_state(question: str) -> dict:
+    return {
         "question": question,
         "query_type": "",
         "english_words": [],
         "sanskrit_words": {},
+        "dictionary_matches": {},
         "grammar_rules": [],
         "corpus_examples": [],
         "messages": [],
@@ -706,8 +826,45 @@ def run_agentic_rag(question: str):
         "construction_complete": False
     }
 
-    result = graph.invoke(initial_state)
+
+def run_agentic_rag(question: str):
+    """
+    Run the agentic RAG system on a question.
+
+    Args:
+        question: User's question
+
+    Returns:
+        Final answer with construction details
+    """
+    logger.info(f"=== AGENTIC RAG START: {question} ===")
+
+    graph = create_agentic_rag_graph()
+
+    result = graph.invoke(_initial_agent_state(question))
+
+    logger.info("=== AGENTIC RAG COMPLETE ===")
+
+    return result
+
+
+async def arun_agentic_rag(question: str):
+    """
+    Async run_agentic_rag: concurrent sessions can share one event loop.
+    """
+    logger.info(f"=== AGENTIC RAG START (async): {question} ===")
+
+    result = await create_async_agentic_rag_graph().ainvoke(_initial_agent_state(question))
 
     logger.info("=== AGENTIC RAG COMPLETE ===")
 
     return result
+
+
+def stream_agentic_rag(question: str) -> AnswerStream:
+    """
+    Streaming run_agentic_rag: iterate for the answer text as it is written,
+    then read the final state from `.result`.
+    """
+    logger.info(f"=== AGENTIC RAG START (streaming): {question} ===")
+    return AnswerStream(create_agentic_rag_graph(), _initial_agent_state(question))
@@ -0,0 +1,170 @@
+"""
+Streaming Answers Out of the RAG and Agentic Graphs
+
+Iterating an AnswerStream runs the graph and yields the answer text as the
+model writes it; the final state (what `app.invoke(state)` returns, with
+confidence, citations and chat history) is in `.result` afterwards:
+
+    stream = AnswerStream(app, state)
+    for delta in stream:                 # or `async for` on an async graph
+        print(delta, end="", flush=True)
+    answer = stream.result["answer"]
+
+It uses LangGraph's "messages" stream mode, which streams every chat model
+call made inside a node, so the nodes themselves are unchanged. Only the
+nodes that write the answer (ANSWER_NODES) are shown. The RAG nodes use
+structured output, which arrives as JSON (tool-call arguments or JSON mode
+content); JsonStringField decodes the "answer" string out of it as it
+grows. When a node runs again (refine or regenerate after a low-confidence
+answer), REVISION_SEPARATOR is yielded before the new attempt.
+
+Providers that don't stream yield nothing here; their answer is only in
+`.result`.
+"""
+
+import json
+import re
+from typing import Any, Dict, Optional
+
+from langchain_core.messages import AIMessageChunk
+
+# Node name -> JSON field holding the answer text (None = the reply is the answer)
+ANSWER_NODES: Dict[str, Optional[str]] = {
+    "call_llm": "answer",
+    "refiner": "answer",
+    "regenerator": "answer",
+    "synthesize": None,
+}
+
+REVISION_SEPARATOR = "\n\n---\n\n"
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def chunk_text(content: Any) -> str:
+    """Text of a message's content (a string, or a list of content blocks)."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block if isinstance(block, str) else block.get("text", "")
+            for block in content
+            if isinstance(block, str) or block.get("type") == "text"
+        )
+    return ""
+
+
+class JsonStringField:
+    """Decodes one string field of a JSON object that arrives in pieces.
+
+    `feed` returns the characters of the field's value that became complete
+    with that piece (an escape split across pieces waits for the rest).
+    """
+
+    def __init__(self, field: str):
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._pos: Optional[int] = None
+        self.done = False
+
+    def feed(self, piece: str) -> str:
+        self._buffer += piece
+        if self.done:
+            return ""
+        if self._pos is None:
+            match = self._key.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        buffer, i, out = self._buffer, self._pos, []
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self.done = True
+                break
+            if char != "\\":
+                out.append(char)
+                i += 1
+                continue
+            if i + 1 >= len(buffer):
+                break
+            if buffer[i + 1] != "u":
+                out.append(_ESCAPES.get(buffer[i + 1], buffer[i + 1]))
+                i += 2
+                continue
+            # \uXXXX, or a surrogate pair (\uD83D\uDE00)
+            end = i + 12 if 0xD8 <= _hex_byte(buffer, i + 2) <= 0xDB else i + 6
+            if end > len(buffer):
+                break
+            out.append(json.loads(f'"{buffer[i:end]}"'))
+            i = end
+        self._pos = i
+        return "".join(out)
+
+
+def _hex_byte(buffer: str, i: int) -> int:
+    try:
+        return int(buffer[i:i + 2], 16)
+    except ValueError:
+        return -1
+
+
+class AnswerStream:
+    """Answer text deltas of one graph run; the final state lands in `.result`."""
+
+    def __init__(self, app, state: dict, config: Optional[dict] = None,
+                 nodes: Optional[Dict[str, Optional[str]]] = None):
+        self.app = app
+        self.state = state
+        self.config = config
+        self.nodes = ANSWER_NODES if nodes is None else nodes
+        self.result: Optional[dict] = None
+        self.text = ""  # answer text of the latest attempt
+        self.attempts = 0
+        self._call = None
+        self._field: Optional[JsonStringField] = None
+        self._separator = ""
+
+    def __iter__(self):
+        for mode, payload in self.app.stream(self.state, self.config, stream_mode=["messages", "values"]):
+            delta = self._on_event(mode, payload)
+            if delta:
+                yield delta
+
+    async def __aiter__(self):
+        async for mode, payload in self.app.astream(self.state, self.config, stream_mode=["messages", "values"]):
+            delta = self._on_event(mode, payload)
+            if delta:
+                yield delta
+
+    def _on_event(self, mode: str, payload) -> str:
+        if mode == "values":
+            self.result = payload
+            return ""
+        chunk, metadata = payload
+        node = metadata.get("langgraph_node")
+        # Whole messages are node outputs written to the state, not model tokens
+        if node not in self.nodes or not isinstance(chunk, AIMessageChunk):
+            return ""
+
+        call = chunk.id or (node, metadata.get("langgraph_step"))
+        if call != self._call:
+            self._call = call
+            field = self.nodes[node]
+            self._field = JsonStringField(field) if field else None
+            if self.text:
+                self._separator = REVISION_SEPARATOR
+            self.text = ""
+            self.attempts += 1
+
+        if self._field is None:
+            delta = chunk_text(chunk.content)
+        else:
+            piece = "".join(tc.get("args") or "" for tc in chunk.tool_call_chunks) or chunk_text(chunk.content)
+            delta = self._field.feed(piece)
+        if not delta:
+            return ""
+        self.text += delta
+        delta, self._separator = self._separator + delta, ""
+        return delta
@@ -0,0 +1,367 @@
+"""
+Persistent BM25 Index for the Keyword Retriever
+
+`BM25Retriever.from_documents` re-tokenizes every chunk of the corpus each time
+the CLI, tutor or Streamlit app starts. This module builds the same index once,
+stores it as flat arrays next to the chunk store and memory-maps it on later
+starts, so loading costs a few file opens instead of a corpus pass.
+
+Scoring reproduces `rank_bm25.BM25Okapi` (the engine behind LangChain's
+BM25Retriever) term for term, including the epsilon floor for negative idf and
+the `argsort` tie order, so the keyword results are unchanged.
+
+On-disk layout (one directory, keyed by a corpus fingerprint in meta.json):
+    meta.json             fingerprint, BM25 parameters, corpus statistics
+    vocab.bin             terms sorted by UTF-8 bytes, concatenated
+    vocab_offsets.npy     int64 [n_terms + 1] byte offsets into vocab.bin
+    idf.npy               float64 [n_terms]
+    postings_offsets.npy  int64 [n_terms + 1] offsets into the postings arrays
+    postings_docs.npy     int32 doc ids, ascending within each term
+    postings_tf.npy       int32 term frequencies
+    doc_lengths.npy       int32 [n_docs]
+"""
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import shutil
+import time
+from array import array
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import ConfigDict
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from src.helper import logger
+
+BM25_INDEX_DIRNAME = "bm25_index"
+BM25_INDEX_VERSION = 1
+
+
+def default_tokenizer(text: str) -> List[str]:
+    """Whitespace tokenizer, identical to LangChain's BM25 default preprocessing."""
+    return text.split()
+
+
+def corpus_fingerprint(texts: Iterable[str]) -> str:
+    """Stable fingerprint of an ordered corpus of chunk texts.
+
+    Any change in chunk content or order changes the fingerprint, which is what
+    invalidates the persisted index (postings refer to chunk positions).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    count = 0
+    for text in texts:
+        encoded = text.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+        count += 1
+    digest.update(count.to_bytes(8, "little"))
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """Okapi BM25 over a columnar inverted index (in memory or memory-mapped)."""
+
+    def __init__(self, vocab: Any, vocab_offsets: np.ndarray, idf: np.ndarray,
+                 postings_offsets: np.ndarray, postings_docs: np.ndarray,
+                 postings_tf: np.ndarray, doc_lengths: np.ndarray, avgdl: float,
+                 k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25,
+                 fingerprint: Optional[str] = None):
+        self._vocab = vocab  # bytes or mmap of the concatenated sorted terms
+        self.vocab_offsets = vocab_offsets
+        self.idf = idf
+        self.postings_offsets = postings_offsets
+        self.postings_docs = postings_docs
+        self.postings_tf = postings_tf
+        self.doc_lengths = doc_lengths
+        self.avgdl = avgdl
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.fingerprint = fingerprint
+        # Per-document length normalisation, same expression as rank_bm25
+        self._length_norm = self.k1 * (1 - self.b + self.b * np.asarray(doc_lengths, dtype=np.int64) / self.avgdl)
+
+    @property
+    def corpus_size(self) -> int:
+        return len(self.doc_lengths)
+
+    @property
+    def num_terms(self) -> int:
+        return len(self.idf)
+
+    @classmethod
+    def build(cls, texts: Sequence[str], tokenizer: Callable[[str], List[str]] = default_tokenizer,
+              k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25,
+              fingerprint: Optional[str] = None) -> "BM25Index":
+        """Tokenize the corpus once and build the inverted index."""
+        if len(texts) == 0:
+            raise ValueError("Cannot build a BM25 index over an empty corpus")
+
+        term_ids = {}         # term -> id, in first-occurrence order (matches rank_bm25's dict order)
+        doc_freq = []         # id -> number of documents containing the term
+        posting_docs = []     # id -> array('i') of doc ids
+        posting_tfs = []      # id -> array('i') of term frequencies
+        doc_lengths = array("i")
+        total_tokens = 0
+
+        for doc_id, text in enumerate(texts):
+            tokens = tokenizer(text)
+            doc_lengths.append(len(tokens))
+            total_tokens += len(tokens)
+
+            frequencies = {}
+            for token in tokens:
+                frequencies[token] = frequencies.get(token, 0) + 1
+
+            for token, tf in frequencies.items():
+                term_id = term_ids.get(token)
+                if term_id is None:
+                    term_id = len(term_ids)
+                    term_ids[token] = term_id
+                    doc_freq.append(0)
+                    posting_docs.append(array("i"))
+                    posting_tfs.append(array("i"))
+                doc_freq[term_id] += 1
+                posting_docs[term_id].append(doc_id)
+                posting_tfs[term_id].append(tf)
+
+        corpus_size = len(doc_lengths)
+        avgdl = total_tokens / corpus_size
+
+        # idf with the epsilon floor, accumulated in the same order as rank_bm25
+        idf_by_id = [0.0] * len(term_ids)
+        idf_sum = 0
+        negative = []
+        for term_id, freq in enumerate(doc_freq):
+            idf = math.log(corpus_size - freq + 0.5) - math.log(freq + 0.5)
+            idf_by_id[term_id] = idf
+            idf_sum += idf
+            if idf < 0:
+                negative.append(term_id)
+        average_idf = idf_sum / len(idf_by_id)
+        eps = epsilon * average_idf
+        for term_id in negative:
+            idf_by_id[term_id] = eps
+
+        # Lay terms out sorted by UTF-8 bytes so lookups can binary-search vocab.bin
+        encoded_terms = sorted((term.encode("utf-8"), term_id) for term, term_id in term_ids.items())
+        vocab_offsets = np.zeros(len(encoded_terms) + 1, dtype=np.int64)
+        postings_offsets = np.zeros(len(encoded_terms) + 1, dtype=np.int64)
+        idf_sorted = np.empty(len(encoded_terms), dtype=np.float64)
+        docs_parts = []
+        tf_parts = []
+        for position, (encoded, term_id) in enumerate(encoded_terms):
+            vocab_offsets[position + 1] = vocab_offsets[position] + len(encoded)
+            postings_offsets[position + 1] = postings_offsets[position] + len(posting_docs[term_id])
+            idf_sorted[position] = idf_by_id[term_id]
+            docs_parts.append(np.frombuffer(posting_docs[term_id], dtype=np.int32))
+            tf_parts.append(np.frombuffer(posting_tfs[term_id], dtype=np.int32))
+
+        return cls(
+            vocab=b"".join(encoded for encoded, _ in encoded_terms),
+            vocab_offsets=vocab_offsets,
+            idf=idf_sorted,
+            postings_offsets=postings_offsets,
+            postings_docs=np.concatenate(docs_parts).astype(np.int32, copy=False),
+            postings_tf=np.concatenate(tf_parts).astype(np.int32, copy=False),
+            doc_lengths=np.frombuffer(doc_lengths, dtype=np.int32).copy(),
+            avgdl=avgdl,
+            k1=k1,
+            b=b,
+            epsilon=epsilon,
+            fingerprint=fingerprint,
+        )
+
+    def save(self, index_dir: str):
+        """Write the index atomically (build in a sibling temp dir, then swap)."""
+        tmp_dir = f"{index_dir}.tmp-{os.getpid()}"
+        if os.path.isdir(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        os.makedirs(tmp_dir)
+
+        with open(os.path.join(tmp_dir, "vocab.bin"), "wb") as f:
+            f.write(bytes(self._vocab))
+        np.save(os.path.join(tmp_dir, "vocab_offsets.npy"), np.asarray(self.vocab_offsets))
+        np.save(os.path.join(tmp_dir, "idf.npy"), np.asarray(self.idf))
+        np.save(os.path.join(tmp_dir, "postings_offsets.npy"), np.asarray(self.postings_offsets))
+        np.save(os.path.join(tmp_dir, "postings_docs.npy"), np.asarray(self.postings_docs))
+        np.save(os.path.join(tmp_dir, "postings_tf.npy"), np.asarray(self.postings_tf))
+        np.save(os.path.join(tmp_dir, "doc_lengths.npy"), np.asarray(self.doc_lengths))
+
+        # meta.json is written last: its presence marks a complete index
+        meta = {
+            "version": BM25_INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "k1": self.k1,
+            "b": self.b,
+            "epsilon": self.epsilon,
+            "avgdl": self.avgdl,
+            "corpus_size": self.corpus_size,
+            "num_terms": self.num_terms,
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        if os.path.isdir(index_dir):
+            shutil.rmtree(index_dir)
+        os.replace(tmp_dir, index_dir)
+
+    @staticmethod
+    def read_meta(index_dir: str) -> Optional[dict]:
+        """Return the index metadata, or None if no complete index exists."""
+        meta_path = os.path.join(index_dir, "meta.json")
+        if not os.path.isfile(meta_path):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def load(cls, index_dir: str) -> "BM25Index":
+        """Memory-map a saved index; nothing is read until it is queried."""
+        meta = cls.read_meta(index_dir)
+        if meta is None or meta.get("version") != BM25_INDEX_VERSION:
+            raise FileNotFoundError(f"No compatible BM25 index at {index_dir}")
+
+        def _array(name):
+            return np.load(os.path.join(index_dir, name), mmap_mode="r")
+
+        with open(os.path.join(index_dir, "vocab.bin"), "rb") as f:
+            vocab = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(
+            vocab=vocab,
+            vocab_offsets=_array("vocab_offsets.npy"),
+            idf=_array("idf.npy"),
+            postings_offsets=_array("postings_offsets.npy"),
+            postings_docs=_array("postings_docs.npy"),
+            postings_tf=_array("postings_tf.npy"),
+            doc_lengths=_array("doc_lengths.npy"),
+            avgdl=meta["avgdl"],
+            k1=meta["k1"],
+            b=meta["b"],
+            epsilon=meta["epsilon"],
+            fingerprint=meta.get("fingerprint"),
+        )
+
+    def term_id(self, term: str) -> int:
+        """Binary-search the sorted vocabulary; returns -1 for unknown terms."""
+        target = term.encode("utf-8")
+        offsets = self.vocab_offsets
+        lo, hi = 0, self.num_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = self._vocab[int(offsets[mid]):int(offsets[mid + 1])]
+            if candidate < target:
+                lo = mid + 1
+            elif candidate > target:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def get_scores(self, query_tokens: Sequence[str]) -> np.ndarray:
+        """BM25 score of every document for the tokenized query.
+
+        Only documents in each term's postings list are touched; for all other
+        documents rank_bm25 adds exactly 0.0, so the totals are identical.
+        """
+        scores = np.zeros(self.corpus_size)
+        for token in query_tokens:
+            term_id = self.term_id(token)
+            if term_id < 0:
+                continue
+            idf = float(self.idf[term_id]) or 0
+            start, end = int(self.postings_offsets[term_id]), int(self.postings_offsets[term_id + 1])
+            docs = self.postings_docs[start:end]
+            tf = self.postings_tf[start:end].astype(np.int64)
+            scores[docs] += idf * (tf * (self.k1 + 1) / (tf + self._length_norm[docs]))
+        return scores
+
+    def top_n(self, query_tokens: Sequence[str], n: int) -> List[int]:
+        """Indices of the n best documents, in rank_bm25's `get_top_n` order."""
+        return self.top_n_with_scores(query_tokens, n)[0]
+
+    def top_n_with_scores(self, query_tokens: Sequence[str], n: int) -> Tuple[List[int], List[float]]:
+        """Like top_n, plus the BM25 score of each returned document."""
+        scores = self.get_scores(query_tokens)
+        top = np.argsort(scores)[::-1][:n]
+        return [int(i) for i in top], [float(s) for s in scores[top]]
+
+
+def load_or_build_bm25_index(texts: Sequence[str], index_dir: str,
+                             fingerprint: Optional[str] = None) -> BM25Index:
+    """Open the persisted index if it matches the corpus, otherwise rebuild it.
+
+    Args:
+        texts: Chunk texts in retrieval order
+        index_dir: Directory holding the index (usually next to the chunk store)
+        fingerprint: Precomputed corpus fingerprint (computed from texts if None)
+    """
+    if fingerprint is None:
+        fingerprint = corpus_fingerprint(texts)
+
+    meta = BM25Index.read_meta(index_dir)
+    if meta and meta.get("fingerprint") == fingerprint and meta.get("version") == BM25_INDEX_VERSION:
+        start = time.perf_counter()
+        index = BM25Index.load(index_dir)
+        logger.info(f"Loaded persisted BM25 index from {index_dir} ({index.corpus_size} docs, {index.num_terms} terms) in {time.perf_counter() - start:.3f}s")
+        return index
+
+    if meta:
+        logger.info(f"BM25 index at {index_dir} is stale (corpus fingerprint changed). Rebuilding")
+    else:
+        logger.info(f"No persisted BM25 index at {index_dir}. Building")
+
+    start = time.perf_counter()
+    index = BM25Index.build(texts, fingerprint=fingerprint)
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(index_dir)), exist_ok=True)
+        index.save(index_dir)
+    except OSError as e:
+        logger.warning(f"Could not persist BM25 index to {index_dir}: {e}")
+    logger.info(f"Built BM25 index ({index.corpus_size} docs, {index.num_terms} terms) in {time.perf_counter() - start:.2f}s")
+    return index
+
+
+class PersistentBM25Retriever(BaseRetriever):
+    """Drop-in replacement for LangChain's BM25Retriever backed by a BM25Index."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    index: Any
+    docs: Any  # Sequence[Document] (list or ChunkStore), aligned with the index's doc ids
+    k: int = 4
+    preprocess_func: Callable[[str], List[str]] = default_tokenizer
+
+    @classmethod
+    def from_documents(cls, documents: Sequence[Document], index_dir: str,
+                       fingerprint: Optional[str] = None, **kwargs: Any) -> "PersistentBM25Retriever":
+        # A ChunkStore exposes its texts and fingerprint without building Documents
+        texts = getattr(documents, "texts", None)
+        if texts is None:
+            texts = [doc.page_content for doc in documents]
+        if fingerprint is None:
+            fingerprint = getattr(documents, "fingerprint", None)
+        index = load_or_build_bm25_index(texts, index_dir, fingerprint=fingerprint)
+        return cls(index=index, docs=documents, **kwargs)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun = None
+    ) -> List[Document]:
+        top = self.index.top_n(self.preprocess_func(query), self.k)
+        return [self.docs[i] for i in top]
+
+    def top_n_with_scores(self, query: str, n: int) -> Tuple[List[Document], List[float]]:
+        """Top-n documents for query with their BM25 scores (ignores self.k)."""
+        top, scores = self.index.top_n_with_scores(self.preprocess_func(query), n)
+        return [self.docs[i] for i in top], scores
@@ -0,0 +1,239 @@
+"""
+Columnar Chunk Store
+
+Replaces the pickled `docs_chunks.pkl` list of LangChain Documents. Pickle has
+to rebuild every Document on every start even though retrieval only ever needs
+the handful of chunks a query returns. The chunk store keeps texts and
+metadata in flat files that are memory-mapped on open, and builds a Document
+only when a chunk is actually read.
+
+On-disk layout (one directory next to the Qdrant collection):
+    meta.json              format version, chunk count, corpus fingerprint
+    text.bin               chunk texts, UTF-8, concatenated
+    text_offsets.npy       int64 [n_chunks + 1] byte offsets into text.bin
+    metadata.bin           distinct metadata dicts as JSON, concatenated
+    metadata_offsets.npy   int64 [n_rows + 1] byte offsets into metadata.bin
+    metadata_ids.npy       int32 [n_chunks] metadata row of each chunk
+    chunk_ids.npy          optional fixed-width bytes [n_chunks]: Document.id of
+                           each chunk (the Qdrant point id), when the indexer set one
+
+Chunks split from the same source document share one metadata row, so the
+metadata table stays as small as the number of source files.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import shutil
+from collections.abc import Sequence
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.helper import logger
+from src.utils.bm25_index import corpus_fingerprint
+
+CHUNK_STORE_DIRNAME = "chunk_store"
+LEGACY_CHUNKS_FILENAME = "docs_chunks.pkl"
+CHUNK_STORE_VERSION = 1
+
+
+def _open_blob(path: str):
+    """Memory-map a file read-only (mmap cannot map empty files)."""
+    if os.path.getsize(path) == 0:
+        return b""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _TextColumn(Sequence):
+    """Read-only sequence view over the chunk texts (no Document objects)."""
+
+    def __init__(self, store: "ChunkStore"):
+        self._store = store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._store.text(j) for j in range(*i.indices(len(self)))]
+        return self._store.text(i)
+
+
+class ChunkStore(Sequence):
+    """Lazily loaded, read-only sequence of chunk Documents.
+
+    Behaves like the list previously unpickled from docs_chunks.pkl:
+    `len(store)`, `store[i]`, `store[a:b]` and iteration all work, and each
+    access builds a fresh Document from the memory-mapped columns.
+    """
+
+    def __init__(self, store_dir: str):
+        meta = self.read_meta(store_dir)
+        if meta is None or meta.get("version") != CHUNK_STORE_VERSION:
+            raise FileNotFoundError(f"No compatible chunk store at {store_dir}")
+
+        self.store_dir = store_dir
+        self.fingerprint = meta.get("fingerprint")
+        self._size = int(meta["n_chunks"])
+        self._text = _open_blob(os.path.join(store_dir, "text.bin"))
+        self._text_offsets = np.load(os.path.join(store_dir, "text_offsets.npy"), mmap_mode="r")
+        self._metadata = _open_blob(os.path.join(store_dir, "metadata.bin"))
+        self._metadata_offsets = np.load(os.path.join(store_dir, "metadata_offsets.npy"), mmap_mode="r")
+        self._metadata_ids = np.load(os.path.join(store_dir, "metadata_ids.npy"), mmap_mode="r")
+        ids_path = os.path.join(store_dir, "chunk_ids.npy")
+        self._chunk_ids = np.load(ids_path, mmap_mode="r") if os.path.isfile(ids_path) else None
+
+    @staticmethod
+    def read_meta(store_dir: str) -> Optional[dict]:
+        """Return the store metadata, or None if no complete store exists."""
+        meta_path = os.path.join(store_dir, "meta.json")
+        if not os.path.isfile(meta_path):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def exists(cls, store_dir: str) -> bool:
+        meta = cls.read_meta(store_dir)
+        return meta is not None and meta.get("version") == CHUNK_STORE_VERSION
+
+    @classmethod
+    def write(cls, documents: Iterable[Document], store_dir: str) -> "ChunkStore":
+        """Serialize documents to `store_dir` (atomically) and open the result."""
+        tmp_dir = f"{store_dir}.tmp-{os.getpid()}"
+        if os.path.isdir(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        os.makedirs(tmp_dir)
+
+        texts = []
+        chunk_ids = []
+        text_offsets = [0]
+        metadata_rows = {}  # serialized metadata -> row id
+        metadata_offsets = [0]
+        metadata_ids = []
+
+        with open(os.path.join(tmp_dir, "text.bin"), "wb") as text_f, \
+                open(os.path.join(tmp_dir, "metadata.bin"), "wb") as meta_f:
+            for doc in documents:
+                encoded = doc.page_content.encode("utf-8")
+                text_f.write(encoded)
+                text_offsets.append(text_offsets[-1] + len(encoded))
+                texts.append(doc.page_content)
+                chunk_ids.append(doc.id)
+
+                serialized = json.dumps(doc.metadata or {}, ensure_ascii=False)
+                row = metadata_rows.get(serialized)
+                if row is None:
+                    row = len(metadata_rows)
+                    metadata_rows[serialized] = row
+                    encoded_meta = serialized.encode("utf-8")
+                    meta_f.write(encoded_meta)
+                    metadata_offsets.append(metadata_offsets[-1] + len(encoded_meta))
+                metadata_ids.append(row)
+
+        np.save(os.path.join(tmp_dir, "text_offsets.npy"), np.asarray(text_offsets, dtype=np.int64))
+        np.save(os.path.join(tmp_dir, "metadata_offsets.npy"), np.asarray(metadata_offsets, dtype=np.int64))
+        np.save(os.path.join(tmp_dir, "metadata_ids.npy"), np.asarray(metadata_ids, dtype=np.int32))
+        has_ids = bool(chunk_ids) and all(chunk_id is not None for chunk_id in chunk_ids)
+        if has_ids:
+            np.save(os.path.join(tmp_dir, "chunk_ids.npy"), np.array([str(c).encode("utf-8") for c in chunk_ids], dtype=bytes))
+
+        # meta.json is written last: its presence marks a complete store
+        meta = {
+            "version": CHUNK_STORE_VERSION,
+            "n_chunks": len(texts),
+            "n_metadata_rows": len(metadata_rows),
+            "has_ids": has_ids,
+            "fingerprint": corpus_fingerprint(texts),
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        if os.path.isdir(store_dir):
+            shutil.rmtree(store_dir)
+        os.replace(tmp_dir, store_dir)
+        logger.info(f"Wrote chunk store with {len(texts)} chunks ({len(metadata_rows)} metadata rows) to {store_dir}")
+        return cls(store_dir)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _check_index(self, i: int) -> int:
+        i = int(i)
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(f"chunk index {i} out of range for {self._size} chunks")
+        return i
+
+    def text(self, i: int) -> str:
+        """Text of chunk i, without building a Document."""
+        i = self._check_index(i)
+        start, end = int(self._text_offsets[i]), int(self._text_offsets[i + 1])
+        return bytes(self._text[start:end]).decode("utf-8")
+
+    @property
+    def has_ids(self) -> bool:
+        """True when every chunk carries the id of its Qdrant point."""
+        return self._chunk_ids is not None
+
+    def chunk_id(self, i: int) -> Optional[str]:
+        """Id of chunk i (its Qdrant point id), or None for stores written without ids."""
+        if self._chunk_ids is None:
+            return None
+        return bytes(self._chunk_ids[self._check_index(i)]).decode("utf-8")
+
+    def metadata(self, i: int) -> dict:
+        """Metadata of chunk i (a fresh dict on every call)."""
+        row = int(self._metadata_ids[self._check_index(i)])
+        start, end = int(self._metadata_offsets[row]), int(self._metadata_offsets[row + 1])
+        return json.loads(bytes(self._metadata[start:end]).decode("utf-8"))
+
+    @property
+    def texts(self) -> _TextColumn:
+        """Sequence of chunk texts, e.g. for building the BM25 index."""
+        return _TextColumn(self)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.get(range(*i.indices(self._size)))
+        return Document(page_content=self.text(i), metadata=self.metadata(i), id=self.chunk_id(i))
+
+    def get(self, ids: Iterable[int]) -> List[Document]:
+        """Materialize Documents for the given chunk ids, in the given order."""
+        return [self[i] for i in ids]
+
+    def __iter__(self) -> Iterator[Document]:
+        for i in range(self._size):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"ChunkStore({self.store_dir!r}, n_chunks={self._size})"
+
+
+def open_chunk_store(collection_dir: str) -> Optional[ChunkStore]:
+    """Open the chunk store for a collection directory.
+
+    A legacy `docs_chunks.pkl` in the same directory is converted once, so
+    existing indexes keep working without a full re-index. Returns None when
+    neither exists.
+    """
+    store_dir = os.path.join(collection_dir, CHUNK_STORE_DIRNAME)
+    if ChunkStore.exists(store_dir):
+        return ChunkStore(store_dir)
+
+    legacy_file = os.path.join(collection_dir, LEGACY_CHUNKS_FILENAME)
+    if os.path.isfile(legacy_file):
+        logger.info(f"Converting legacy chunks file {legacy_file} to chunk store at {store_dir}")
+        with open(legacy_file, "rb") as f:
+            chunks = pickle.load(f)
+        return ChunkStore.write(chunks, store_dir)
+
+    return None
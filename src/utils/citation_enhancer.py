@@ -11,13 +11,32 @@ Key Features:
 - Maps chunks back to original hymn/sutra references
 - Provides verifiable citations with translatable identifiers
 - Supports multiple Vedic text formats
+- References are computed once per chunk at index time (add_citation_metadata)
+  and stored as chunk metadata; chunks indexed before that are scanned in one
+  batch at answer time
 """
 
 import re
-from typing import Dict, List, Optional, Tuple
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
 from langchain_core.documents import Document
 
 
+# Chunk metadata key -> the VedicCitationExtractor patterns it records, in
+# priority order; the keys themselves follow PATTERNS order, so the citation of
+# a chunk is its first non-empty reference
+CITATION_REF_KEYS = {
+    'rv_ref': ('bracket_reference', 'rigveda_hymn'),
+    'yv_ref': ('yajurveda_griffith', 'yajurveda_verse'),
+    'pbr_ref': ('pancavamsa_reference',),
+    'sb_ref': ('brahmana_reference',),
+    'section_ref': ('mantra_number', 'heading_pattern', 'book_canto_pattern'),
+}
+CITATION_TITLE_KEY = 'citation_title'
+# Citations come from the start of a chunk
+CITATION_SCAN_CHARS = 500
+
+
 class VedicCitationExtractor:
     """Extract and map Vedic text citations to specific hymns/verses."""
 
@@ -45,14 +64,68 @@ class VedicCitationExtractor:
         Returns:
             Citation string like "RV 1.1.1" or None if not found
         """
-        # Try each pattern
-        for pattern_name, pattern in VedicCitationExtractor.PATTERNS.items():
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                return VedicCitationExtractor._format_citation(pattern_name, match)
+        # The first pattern (in PATTERNS order) that matches anywhere wins
+        first_matches = VedicCitationExtractor._first_matches([text])[0]
+        for pattern_name in VedicCitationExtractor.PATTERNS:
+            if pattern_name in first_matches:
+                return VedicCitationExtractor._format_match(pattern_name, text, first_matches[pattern_name])
 
         return None
 
+    @staticmethod
+    def extract_citation_refs(texts: Iterable[str]) -> List[Dict[str, str]]:
+        """
+        Extract the citation references of several texts in one pass.
+
+        Args:
+            texts: Texts to search (usually the first CITATION_SCAN_CHARS of each chunk)
+
+        Returns:
+            One dict per text with every key of CITATION_REF_KEYS; "" where the
+            text has no reference of that kind
+
+        Example:
+            >>> VedicCitationExtractor.extract_citation_refs(["[02-033] HYMN XXXIII. Rudra"])
+            [{'rv_ref': 'RV 2.33', 'yv_ref': '', 'pbr_ref': '', 'sb_ref': '', 'section_ref': ''}]
+        """
+        texts = list(texts)
+        refs = []
+        for text, first_matches in zip(texts, VedicCitationExtractor._first_matches(texts)):
+            doc_refs = {}
+            for key, pattern_names in CITATION_REF_KEYS.items():
+                doc_refs[key] = ""
+                for pattern_name in pattern_names:
+                    if pattern_name in first_matches:
+                        doc_refs[key] = VedicCitationExtractor._format_match(pattern_name, text, first_matches[pattern_name])
+                        break
+            refs.append(doc_refs)
+        return refs
+
+    @staticmethod
+    def _first_matches(texts: List[str]) -> List[Dict[str, int]]:
+        """Position of each pattern's first match in each text, from one scan of all texts."""
+        # No pattern can match across the separator (\x00 is neither a digit nor
+        # whitespace), and the newline keeps "^" anchored at the start of each text
+        joined = "\x00\n".join(texts)
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 2
+
+        first_matches = [{} for _ in texts]
+        for match in _COMBINED_PATTERN.finditer(joined):
+            doc = bisect_right(starts, match.start()) - 1
+            for pattern_name, value in match.groupdict().items():
+                if value is not None and pattern_name not in first_matches[doc]:
+                    first_matches[doc][pattern_name] = match.start() - starts[doc]
+        return first_matches
+
+    @staticmethod
+    def _format_match(pattern_name: str, text: str, position: int) -> str:
+        match = _COMPILED_PATTERNS[pattern_name].match(text, position)
+        return VedicCitationExtractor._format_citation(pattern_name, match)
+
     @staticmethod
     def _format_citation(pattern_name: str, match) -> str:
         """Format matched groups into proper citation format."""
@@ -171,17 +244,36 @@ class VedicCitationExtractor:
         return total
 
 
+_COMPILED_PATTERNS = {
+    name: re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for name, pattern in VedicCitationExtractor.PATTERNS.items()
+}
+# One pass over the text finds every position where some pattern matches and,
+# through one optional lookahead per pattern, which patterns match there. The
+# leading character class (the first character of every pattern) lets the scan
+# skip most positions without trying the alternatives.
+_COMBINED_PATTERN = re.compile(
+    r"(?=[\[#HRVYPSBMAC])"
+    + "(?=" + "|".join(VedicCitationExtractor.PATTERNS.values()) + ")"
+    + "".join(f"(?=(?P<{name}>{pattern}))?" for name, pattern in VedicCitationExtractor.PATTERNS.items()),
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
 class CitationFormatter:
     """Format citations for display in RAG responses."""
 
     @staticmethod
-    def format_citation_with_source(doc: Document, passage_number: int) -> Tuple[str, str]:
+    def format_citation_with_source(doc: Document, passage_number: int,
+                                    refs: Optional[Dict[str, str]] = None) -> Tuple[str, str]:
         """
         Create a formatted citation from a document.
 
         Args:
             doc: LangChain Document object
             passage_number: Sequential passage number for fallback
+            refs: The document's citation references when already extracted
+                (default: its metadata if indexed with them, else its text)
 
         Returns:
             Tuple of (citation_label, source_identifier)
@@ -190,12 +282,20 @@ class CitationFormatter:
         # Try to extract from metadata first
         citation = VedicCitationExtractor.extract_from_metadata(doc.metadata)
 
-        # If not in metadata, try to extract from content
+        # If not in metadata, use the references found in the content
         if not citation:
-            citation = VedicCitationExtractor.extract_verse_reference(doc.page_content[:500])
+            if refs is None and has_citation_refs(doc.metadata):
+                refs = doc.metadata
+            if refs is not None:
+                citation = citation_from_refs(refs)
+            else:
+                citation = VedicCitationExtractor.extract_verse_reference(doc.page_content[:CITATION_SCAN_CHARS])
 
         # Extract section title
-        section_title = VedicCitationExtractor.extract_section_title(doc.page_content)
+        if CITATION_TITLE_KEY in doc.metadata:
+            section_title = doc.metadata[CITATION_TITLE_KEY] or None
+        else:
+            section_title = VedicCitationExtractor.extract_section_title(doc.page_content)
 
         # Get source identifier
         source_identifier = doc.metadata.get('filename', 'unknown_source')
@@ -238,6 +338,45 @@ class CitationFormatter:
         return fragment
 
 
+def has_citation_refs(metadata: Dict) -> bool:
+    """Whether a chunk was indexed with its citation references."""
+    return all(key in metadata for key in CITATION_REF_KEYS)
+
+
+def citation_from_refs(refs: Dict[str, str]) -> Optional[str]:
+    """The citation of a chunk from its references (what extract_verse_reference finds)."""
+    return next((refs[key] for key in CITATION_REF_KEYS if refs.get(key)), None)
+
+
+def add_citation_metadata(chunks: List[Document]) -> List[Document]:
+    """
+    Store each chunk's citation references and section title in its metadata.
+
+    Run at index time, so answering reads the citation instead of running the
+    patterns over every retrieved chunk. Chunks without a reference get "".
+    """
+    refs = VedicCitationExtractor.extract_citation_refs(
+        chunk.page_content[:CITATION_SCAN_CHARS] for chunk in chunks
+    )
+    for chunk, chunk_refs in zip(chunks, refs):
+        chunk.metadata.update(chunk_refs)
+        chunk.metadata[CITATION_TITLE_KEY] = VedicCitationExtractor.extract_section_title(chunk.page_content) or ""
+    return chunks
+
+
+def _citation_refs(examples: List[Document]) -> List[Dict[str, str]]:
+    """Citation references of each document: stored ones, the rest extracted in one batch."""
+    refs = [doc.metadata for doc in examples]
+    missing = [i for i, doc in enumerate(examples) if not has_citation_refs(doc.metadata)]
+    if missing:
+        extracted = VedicCitationExtractor.extract_citation_refs(
+            examples[i].page_content[:CITATION_SCAN_CHARS] for i in missing
+        )
+        for i, doc_refs in zip(missing, extracted):
+            refs[i] = doc_refs
+    return refs
+
+
 def enhance_corpus_results_with_citations(examples: List[Document]) -> str:
     """
     Convert retrieved documents to formatted text with proper citations.
@@ -255,8 +394,8 @@ def enhance_corpus_results_with_citations(examples: List[Document]) -> str:
     char_limit = 500
     formatted_passages = []
 
-    for i, doc in enumerate(examples):
-        citation_label, source = CitationFormatter.format_citation_with_source(doc, i + 1)
+    for i, (doc, refs) in enumerate(zip(examples, _citation_refs(examples))):
+        citation_label, source = CitationFormatter.format_citation_with_source(doc, i + 1, refs)
 
         # Truncate content
         content = doc.page_content[:char_limit]
@@ -277,8 +416,8 @@ def create_enhanced_citations_list(examples: List[Document]) -> List[Dict]:
     """
     citations = []
 
-    for i, doc in enumerate(examples):
-        citation_label, source = CitationFormatter.format_citation_with_source(doc, i + 1)
+    for i, (doc, refs) in enumerate(zip(examples, _citation_refs(examples))):
+        citation_label, source = CitationFormatter.format_citation_with_source(doc, i + 1, refs)
         citation_ref = CitationFormatter.create_citation_reference(citation_label, source, i)
         citations.append(citation_ref)
 
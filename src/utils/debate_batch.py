@@ -0,0 +1,165 @@
+"""
+Batch Migration Debates with a Resumable Ledger
+
+Runs one debate per verse of a verse list on a bounded thread pool and
+appends one JSON line per finished verse to a ledger:
+
+    {"verse_ref": "RV 7.95.2", "status": "done", "seconds": 41.8,
+     "transcript": "migration_debates/...json", "finished_at": "..."}
+
+A verse with a "done" line is skipped when the same ledger is used again,
+so an interrupted run picks up where it stopped; failed verses are retried.
+Each line is flushed and fsynced as it is written, and a line cut short by a
+crash is ignored on the next read.
+
+Verse lists are plain text, one reference per line; blank lines and
+everything after a `#` are ignored:
+
+    # River hymns
+    RV 10.75      # Nadistuti
+    RV 3.33
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+def read_verse_list(path: str) -> List[str]:
+    """Verse references from a verse list file, in order, without duplicates."""
+    refs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            ref = " ".join(line.split("#", 1)[0].split())
+            if ref:
+                refs.append(ref)
+    return list(dict.fromkeys(refs))
+
+
+class DebateLedger:
+    """Append-only JSONL record of finished verses; safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def entries(self) -> List[dict]:
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # partial line from an interrupted write
+                if isinstance(entry, dict) and "verse_ref" in entry:
+                    entries.append(entry)
+        return entries
+
+    def completed(self) -> Dict[str, dict]:
+        """verse_ref -> its "done" entry."""
+        return {entry["verse_ref"]: entry for entry in self.entries() if entry.get("status") == "done"}
+
+    def record(self, verse_ref: str, status: str, seconds: float, **fields) -> dict:
+        entry = {
+            "verse_ref": verse_ref,
+            "status": status,
+            "seconds": round(seconds, 3),
+            **fields,
+            "finished_at": datetime.now().isoformat(),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a+b") as f:
+                end = f.seek(0, os.SEEK_END)
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b"\n":
+                        line = "\n" + line  # end a line cut short by a crash
+                f.write(line.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+        return entry
+
+
+def run_debate_batch(verse_refs: List[str], run_one: Callable[[str], Optional[str]],
+                     ledger: DebateLedger, workers: int = 1) -> dict:
+    """
+    Run `run_one(verse_ref)` for every verse not yet done in the ledger.
+
+    Args:
+        verse_refs: Verses in list order
+        run_one: Runs one debate; returns the transcript path (or None), raises on failure
+        ledger: Where finished verses are recorded and looked up
+        workers: Debates running at once
+
+    Returns:
+        Summary dict (see print_batch_summary)
+    """
+    done = ledger.completed()
+    pending = [ref for ref in verse_refs if ref not in done]
+    skipped = len(verse_refs) - len(pending)
+    if skipped:
+        print(f"⏭️  Skipping {skipped} verse(s) already done in {ledger.path}")
+
+    results = []
+    lock = threading.Lock()
+
+    def run(ref):
+        start = time.perf_counter()
+        try:
+            transcript = run_one(ref)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            entry = ledger.record(ref, "failed", time.perf_counter() - start, error=error)
+            status = f"❌ {ref} failed after {entry['seconds']:.1f}s: {error}"
+        else:
+            entry = ledger.record(ref, "done", time.perf_counter() - start, transcript=transcript)
+            status = f"✅ {ref} in {entry['seconds']:.1f}s"
+        with lock:
+            results.append(entry)
+            print(f"[{len(results)}/{len(pending)}] {status}")
+
+    start = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="debate-batch")
+    try:
+        for future in [pool.submit(run, ref) for ref in pending]:
+            future.result()
+    finally:
+        # On Ctrl-C, drop queued verses; debates already running finish and are recorded
+        pool.shutdown(wait=True, cancel_futures=True)
+    elapsed = time.perf_counter() - start
+
+    completed = [entry for entry in results if entry["status"] == "done"]
+    return {
+        "total": len(verse_refs),
+        "skipped": skipped,
+        "completed": len(completed),
+        "failed": [entry["verse_ref"] for entry in results if entry["status"] != "done"],
+        "workers": max(1, workers),
+        "elapsed_seconds": elapsed,
+        "mean_debate_seconds": sum(e["seconds"] for e in completed) / len(completed) if completed else 0.0,
+        "debates_per_hour": len(completed) * 3600 / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def print_batch_summary(summary: dict):
+    print(f"\n{'='*80}")
+    print("📊 BATCH SUMMARY")
+    print(f"{'='*80}")
+    print(f"Verses:     {summary['total']} ({summary['skipped']} already done)")
+    print(f"Completed:  {summary['completed']}")
+    print(f"Failed:     {len(summary['failed'])}" + (f" ({', '.join(summary['failed'])})" if summary["failed"] else ""))
+    print(f"Workers:    {summary['workers']}")
+    print(f"Wall time:  {summary['elapsed_seconds']:.1f}s")
+    print(f"Per debate: {summary['mean_debate_seconds']:.1f}s average")
+    print(f"Throughput: {summary['debates_per_hour']:.1f} debates/hour")
+    print(f"{'='*80}\n")
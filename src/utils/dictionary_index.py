@@ -0,0 +1,514 @@
+"""
+Compiled Monier-Williams Dictionary Index
+
+`sanskrit_dictionary_cleaned.json` maps English headwords to Sanskrit terms.
+Loading it means parsing the whole JSON into a dict on every start, and the
+dict only answers exact lowercase matches. This module compiles the JSON once
+into flat, memory-mapped arrays that support:
+
+    exact     "milk"    -> dugdha, kṣīra, payas, ...
+    stem      "loves"   -> "love" (English inflection rules checked against the keys)
+    prefix    "hors"    -> "horse", "horsemanship", ...
+    fuzzy     "waetr"   -> "water" (edit distance <= 2, SymSpell-style deletes index;
+                                   English words the dictionary lacks are left alone)
+    reverse   "payas"   -> "milk", ... (Sanskrit -> English; diacritics optional)
+
+Noise terms (containing digits, or shorter than 3 characters) are dropped at
+build time, so lookups return terms as stored.
+
+On-disk layout (one directory, keyed by the source JSON's fingerprint in meta.json):
+    meta.json               fingerprint, counts, fuzzy parameters
+    keys.bin                English keys sorted by UTF-8 bytes, concatenated
+    key_offsets.npy         int64 [n_keys + 1] byte offsets into keys.bin
+    terms.bin               distinct Sanskrit terms, concatenated
+    term_offsets.npy        int64 [n_terms + 1] byte offsets into terms.bin
+    entry_offsets.npy       int64 [n_keys + 1] offsets into entry_terms.npy
+    entry_terms.npy         int32 term ids of each key, in dictionary order
+    reverse.bin             folded Sanskrit terms sorted by UTF-8 bytes, concatenated
+    reverse_offsets.npy     int64 [n_reverse + 1] byte offsets into reverse.bin
+    reverse_key_offsets.npy int64 [n_reverse + 1] offsets into reverse_keys.npy
+    reverse_keys.npy        int32 key ids for each folded term
+    deletes_hash.npy        uint32 CRC32 of each key-prefix delete, ascending
+    deletes_keys.npy        int32 key id of each delete
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import time
+import unicodedata
+import zlib
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.helper import logger
+
+DICTIONARY_INDEX_DIRNAME = "dictionary_index"
+DICTIONARY_INDEX_VERSION = 1
+
+# English inflections tried by `stem`, in order: (suffix, replacement)
+_STEM_RULES = [
+    ("ies", "y"), ("ied", "y"), ("ves", "f"), ("ves", "fe"),
+    ("ing", ""), ("ing", "e"), ("ed", ""), ("ed", "e"), ("es", ""), ("s", ""),
+    ("ers", ""), ("er", ""), ("est", ""), ("ly", ""),
+]
+
+# Endings of English inflections and derivations: a word with one of these is
+# a real word the dictionary lacks ("singing", "lightning"), not a typo
+_ENGLISH_SUFFIXES = (
+    "ing", "ed", "ly", "tion", "sion", "ness", "ment", "ful", "less", "ous",
+    "able", "ible", "ive", "ity", "ism", "ist",
+)
+
+
+def is_clean_term(term: str) -> bool:
+    """The noise filter dictionary_lookup used to apply on every call."""
+    return len(term) > 2 and not any(c.isdigit() for c in term)
+
+
+def fold_sanskrit(term: str) -> str:
+    """Reverse-lookup key: casefolded, and without diacritics for romanized terms.
+
+    Devanagari keeps its combining signs (they are letters there), so only
+    IAST-style input is folded to ASCII: "kṣīra" -> "ksira".
+    """
+    if any("ऀ" <= c <= "ॿ" for c in term):
+        return unicodedata.normalize("NFC", term).casefold()
+    decomposed = unicodedata.normalize("NFD", term)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def osa_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions).
+
+    Returns max_distance + 1 as soon as the distance is known to exceed it.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word: str, max_distance: int) -> set:
+    """The word and every string obtained by deleting up to max_distance characters."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - results
+        results |= frontier
+    return results
+
+
+def _crc(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def _pack(strings: Sequence[str]) -> Tuple[bytes, np.ndarray]:
+    """Concatenate UTF-8 strings; return the blob and its [n + 1] offsets."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return b"".join(encoded), offsets
+
+
+def source_fingerprint(path: str) -> str:
+    """Fingerprint of the dictionary JSON's bytes."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+class DictionaryMatch(NamedTuple):
+    word: str          # what was looked up
+    key: str           # the English headword that matched
+    terms: List[str]   # its Sanskrit terms
+    match: str         # "exact" | "stem" | "fuzzy"
+    distance: int = 0  # edit distance for fuzzy matches
+
+
+class _Strings:
+    """Read-only view over a concatenated UTF-8 blob and its offsets."""
+
+    def __init__(self, blob, offsets: np.ndarray):
+        self._blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def raw(self, i: int) -> bytes:
+        return self._blob[int(self.offsets[i]):int(self.offsets[i + 1])]
+
+    def __getitem__(self, i: int) -> str:
+        return self.raw(i).decode("utf-8")
+
+    def lower_bound(self, target: bytes) -> int:
+        """First position whose bytes are >= target (the blob is sorted)."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.raw(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, text: str) -> int:
+        """Position of text, or -1."""
+        target = text.encode("utf-8")
+        i = self.lower_bound(target)
+        return i if i < len(self) and self.raw(i) == target else -1
+
+
+class DictionaryIndex:
+    """English -> Sanskrit dictionary over sorted, memory-mappable arrays."""
+
+    _ARRAYS = (
+        "key_offsets", "term_offsets", "entry_offsets", "entry_terms", "reverse_offsets",
+        "reverse_key_offsets", "reverse_keys", "deletes_hash", "deletes_keys",
+    )
+    _BLOBS = ("keys", "terms", "reverse")
+
+    def __init__(self, keys, key_offsets, terms, term_offsets, entry_offsets, entry_terms,
+                 reverse, reverse_offsets, reverse_key_offsets, reverse_keys,
+                 deletes_hash, deletes_keys, max_edit_distance: int = 2, prefix_length: int = 7,
+                 fingerprint: Optional[str] = None):
+        self._keys = _Strings(keys, key_offsets)
+        self._terms = _Strings(terms, term_offsets)
+        self._reverse = _Strings(reverse, reverse_offsets)
+        self.entry_offsets = entry_offsets
+        self.entry_terms = entry_terms
+        self.reverse_key_offsets = reverse_key_offsets
+        self.reverse_keys = reverse_keys
+        self.deletes_hash = deletes_hash
+        self.deletes_keys = deletes_keys
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.fingerprint = fingerprint
+        self._words: Optional[frozenset] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def num_terms(self) -> int:
+        return len(self._terms)
+
+    @classmethod
+    def build(cls, entries: Mapping[str, Iterable[str]], max_edit_distance: int = 2,
+              prefix_length: int = 7, fingerprint: Optional[str] = None) -> "DictionaryIndex":
+        """Compile {english: [sanskrit, ...]}; keys are lowercased, noise terms dropped."""
+        cleaned: Dict[str, List[str]] = {}
+        for key, terms in entries.items():
+            clean = [t for t in terms if is_clean_term(t)]
+            if clean:
+                merged = cleaned.setdefault(key.lower(), [])
+                merged.extend(t for t in clean if t not in merged)
+
+        keys = sorted(cleaned, key=lambda k: k.encode("utf-8"))
+        term_ids: Dict[str, int] = {}
+        entry_offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        entry_terms = []
+        reverse: Dict[str, List[int]] = {}
+        for key_id, key in enumerate(keys):
+            for term in cleaned[key]:
+                entry_terms.append(term_ids.setdefault(term, len(term_ids)))
+                key_ids = reverse.setdefault(fold_sanskrit(term), [])
+                if not key_ids or key_ids[-1] != key_id:
+                    key_ids.append(key_id)
+            entry_offsets[key_id + 1] = len(entry_terms)
+
+        folded = sorted(reverse, key=lambda t: t.encode("utf-8"))
+        reverse_key_offsets = np.zeros(len(folded) + 1, dtype=np.int64)
+        np.cumsum([len(reverse[t]) for t in folded], out=reverse_key_offsets[1:])
+
+        # SymSpell: every delete (up to max_edit_distance) of each key's prefix
+        delete_pairs = sorted({
+            (_crc(delete), key_id)
+            for key_id, key in enumerate(keys)
+            for delete in _deletes(key[:prefix_length], max_edit_distance)
+        })
+
+        keys_blob, key_offsets = _pack(keys)
+        terms_blob, term_offsets = _pack(list(term_ids))
+        reverse_blob, reverse_offsets = _pack(folded)
+        return cls(
+            keys=keys_blob,
+            key_offsets=key_offsets,
+            terms=terms_blob,
+            term_offsets=term_offsets,
+            entry_offsets=entry_offsets,
+            entry_terms=np.asarray(entry_terms, dtype=np.int32),
+            reverse=reverse_blob,
+            reverse_offsets=reverse_offsets,
+            reverse_key_offsets=reverse_key_offsets,
+            reverse_keys=np.asarray([k for t in folded for k in reverse[t]], dtype=np.int32),
+            deletes_hash=np.asarray([h for h, _ in delete_pairs], dtype=np.uint32),
+            deletes_keys=np.asarray([k for _, k in delete_pairs], dtype=np.int32),
+            max_edit_distance=max_edit_distance,
+            prefix_length=prefix_length,
+            fingerprint=fingerprint,
+        )
+
+    def save(self, index_dir: str):
+        """Write the index atomically (build in a sibling temp dir, then swap)."""
+        tmp_dir = f"{index_dir}.tmp-{os.getpid()}"
+        if os.path.isdir(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        os.makedirs(tmp_dir)
+
+        strings = [("keys", "key_offsets", self._keys), ("terms", "term_offsets", self._terms),
+                   ("reverse", "reverse_offsets", self._reverse)]
+        for blob_name, offsets_name, column in strings:
+            with open(os.path.join(tmp_dir, f"{blob_name}.bin"), "wb") as f:
+                f.write(bytes(column._blob))
+            np.save(os.path.join(tmp_dir, f"{offsets_name}.npy"), np.asarray(column.offsets))
+        for name in ("entry_offsets", "entry_terms", "reverse_key_offsets", "reverse_keys",
+                     "deletes_hash", "deletes_keys"):
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(getattr(self, name)))
+
+        # meta.json is written last: its presence marks a complete index
+        meta = {
+            "version": DICTIONARY_INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "num_keys": len(self),
+            "num_terms": self.num_terms,
+            "max_edit_distance": self.max_edit_distance,
+            "prefix_length": self.prefix_length,
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        if os.path.isdir(index_dir):
+            shutil.rmtree(index_dir)
+        os.replace(tmp_dir, index_dir)
+
+    @staticmethod
+    def read_meta(index_dir: str) -> Optional[dict]:
+        """Return the index metadata, or None if no complete index exists."""
+        meta_path = os.path.join(index_dir, "meta.json")
+        if not os.path.isfile(meta_path):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def load(cls, index_dir: str) -> "DictionaryIndex":
+        """Memory-map a saved index; nothing is read until it is queried."""
+        meta = cls.read_meta(index_dir)
+        if meta is None or meta.get("version") != DICTIONARY_INDEX_VERSION:
+            raise FileNotFoundError(f"No compatible dictionary index at {index_dir}")
+
+        def _array(name):
+            return np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r")
+
+        def _blob(name):
+            path = os.path.join(index_dir, f"{name}.bin")
+            if os.path.getsize(path) == 0:
+                return b""
+            with open(path, "rb") as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(
+            **{name: _blob(name) for name in cls._BLOBS},
+            **{name: _array(name) for name in cls._ARRAYS},
+            max_edit_distance=meta["max_edit_distance"],
+            prefix_length=meta["prefix_length"],
+            fingerprint=meta.get("fingerprint"),
+        )
+
+    # --- Lookups ---
+
+    def key(self, key_id: int) -> str:
+        return self._keys[key_id]
+
+    def terms(self, key_id: int) -> List[str]:
+        start, end = int(self.entry_offsets[key_id]), int(self.entry_offsets[key_id + 1])
+        return [self._terms[int(t)] for t in self.entry_terms[start:end]]
+
+    def key_id(self, word: str) -> int:
+        """Binary-search the sorted keys; returns -1 for unknown words."""
+        return self._keys.find(word.lower())
+
+    def get(self, word: str) -> Optional[List[str]]:
+        """Sanskrit terms for an exact (case-insensitive) English key."""
+        key_id = self.key_id(word)
+        return self.terms(key_id) if key_id >= 0 else None
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[str]:
+        """Keys starting with prefix, in sorted order."""
+        target = prefix.lower().encode("utf-8")
+        results = []
+        i = self._keys.lower_bound(target)
+        while i < len(self) and len(results) < limit and self._keys.raw(i).startswith(target):
+            results.append(self._keys[i])
+            i += 1
+        return results
+
+    def stem(self, word: str) -> Optional[str]:
+        """The first key reached by undoing a common English inflection ("loves" -> "love")."""
+        word = word.lower()
+        for suffix, replacement in _STEM_RULES:
+            if len(word) - len(suffix) < 2 or not word.endswith(suffix):
+                continue
+            base = word[: -len(suffix)]
+            candidates = [base + replacement]
+            # Doubled final consonant: "running" -> "run", "stopped" -> "stop"
+            if not replacement and len(base) > 2 and base[-1] == base[-2] and base[-1] not in "aeiou":
+                candidates.append(base[:-1])
+            for candidate in candidates:
+                if self.key_id(candidate) >= 0:
+                    return candidate
+        return None
+
+    def fuzzy(self, word: str, max_distance: Optional[int] = None, limit: int = 5) -> List[Tuple[str, int]]:
+        """Keys within max_distance edits of word, closest first: [(key, distance), ...]."""
+        word = word.lower()
+        if max_distance is None:
+            max_distance = self.max_edit_distance
+        max_distance = min(max_distance, self.max_edit_distance)
+
+        hashes = np.asarray(sorted({_crc(d) for d in _deletes(word[:self.prefix_length], max_distance)}),
+                            dtype=np.uint32)
+        starts = np.searchsorted(self.deletes_hash, hashes, side="left")
+        ends = np.searchsorted(self.deletes_hash, hashes, side="right")
+        candidates = {int(k) for s, e in zip(starts, ends) for k in self.deletes_keys[s:e]}
+
+        matches = []
+        for key_id in candidates:
+            key = self._keys[key_id]
+            distance = osa_distance(word, key, max_distance)
+            if distance <= max_distance:
+                # Ties: typos rarely change the first letter, then prefer similar length
+                matches.append((distance, key[:1] != word[:1], abs(len(key) - len(word)), key))
+        matches.sort()
+        return [(key, distance) for distance, _, _, key in matches[:limit]]
+
+    def reverse(self, sanskrit: str) -> List[str]:
+        """English keys whose terms include sanskrit (case and IAST diacritics ignored)."""
+        i = self._reverse.find(fold_sanskrit(sanskrit))
+        if i < 0:
+            return []
+        start, end = int(self.reverse_key_offsets[i]), int(self.reverse_key_offsets[i + 1])
+        return [self._keys[int(k)] for k in self.reverse_keys[start:end]]
+
+    @property
+    def words(self) -> frozenset:
+        """Every word of every English headword ("a barren cow" -> a, barren, cow), built on first use."""
+        if self._words is None:
+            self._words = frozenset(
+                word for key_id in range(len(self)) for word in self.key(key_id).split() if word.isalpha()
+            )
+        return self._words
+
+    def is_english_word(self, word: str) -> bool:
+        """Whether word looks like a real English word rather than a typo.
+
+        True for words used in any headword ("singing" in "singing praises") and
+        for words with a common English ending ("lightning", "walked").
+        """
+        word = word.lower()
+        if word in self.words:
+            return True
+        return any(word.endswith(suffix) and len(word) - len(suffix) >= 3 for suffix in _ENGLISH_SUFFIXES)
+
+    def suggest(self, word: str) -> Optional[Tuple[str, int]]:
+        """The headword word is most likely a typo of, as (key, distance), or None.
+
+        Only typos are corrected: short words are never changed (see
+        lookup_distance), and the key must be a plain word with the same first
+        letter, so names like "indra" or "sudas" get no suggestion.
+        """
+        max_distance = lookup_distance(word, self.max_edit_distance)
+        if max_distance == 0:
+            return None
+        first = word[:1].lower()
+        for key, distance in self.fuzzy(word, max_distance, limit=20):
+            if key[:1] == first and key.isalpha():
+                return key, distance
+        return None
+
+    def lookup(self, word: str, fuzzy: bool = True) -> Optional[DictionaryMatch]:
+        """Exact match, else an inflection stem, else the closest fuzzy match.
+
+        The fuzzy match (see suggest) is only used for words that are not
+        themselves English (see is_english_word): "waetr" becomes "water", but
+        "singing" is not turned into "sinking". Callers can offer suggest(word)
+        as a "did you mean" for those.
+        """
+        key_id = self.key_id(word)
+        if key_id >= 0:
+            return DictionaryMatch(word, self.key(key_id), self.terms(key_id), "exact")
+        stem = self.stem(word)
+        if stem is not None:
+            return DictionaryMatch(word, stem, self.get(stem), "stem")
+        if fuzzy and not self.is_english_word(word):
+            suggestion = self.suggest(word)
+            if suggestion is not None:
+                key, distance = suggestion
+                return DictionaryMatch(word, key, self.get(key), "fuzzy", distance)
+        return None
+
+
+def lookup_distance(word: str, max_edit_distance: int = 2) -> int:
+    """Edits lookup allows for word: none up to 4 letters, 1 up to 7, then max_edit_distance."""
+    if len(word) <= 4:
+        return 0
+    if len(word) <= 7:
+        return min(1, max_edit_distance)
+    return max_edit_distance
+
+
+def load_or_build_dictionary_index(source_path: str, index_dir: str, max_edit_distance: int = 2,
+                                   prefix_length: int = 7) -> DictionaryIndex:
+    """Open the compiled index if it matches the source JSON, otherwise rebuild it."""
+    fingerprint = source_fingerprint(source_path)
+
+    meta = DictionaryIndex.read_meta(index_dir)
+    if (
+        meta
+        and meta.get("version") == DICTIONARY_INDEX_VERSION
+        and meta.get("fingerprint") == fingerprint
+        and meta.get("max_edit_distance") == max_edit_distance
+        and meta.get("prefix_length") == prefix_length
+    ):
+        start = time.perf_counter()
+        index = DictionaryIndex.load(index_dir)
+        logger.info(f"[DICTIONARY] Loaded compiled index from {index_dir} ({len(index)} keys) in {time.perf_counter() - start:.3f}s")
+        return index
+
+    if meta:
+        logger.info(f"[DICTIONARY] Index at {index_dir} is stale. Rebuilding")
+    else:
+        logger.info(f"[DICTIONARY] No compiled index at {index_dir}. Building")
+
+    start = time.perf_counter()
+    with open(source_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    index = DictionaryIndex.build(entries, max_edit_distance, prefix_length, fingerprint=fingerprint)
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(index_dir)), exist_ok=True)
+        index.save(index_dir)
+    except OSError as e:
+        logger.warning(f"[DICTIONARY] Could not persist index to {index_dir}: {e}")
+    logger.info(f"[DICTIONARY] Built index ({len(index)} keys, {index.num_terms} terms) in {time.perf_counter() - start:.2f}s")
+    return index
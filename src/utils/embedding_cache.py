@@ -0,0 +1,262 @@
+"""
+Content-Addressed Embedding Cache
+
+Wraps any LangChain embeddings object so identical text is embedded once across
+re-indexing runs, upload scripts and repeated queries. Vectors live in a local
+SQLite file keyed by (model namespace, kind, SHA-256 of the text):
+
+- namespace identifies the model and its normalisation, so switching models
+  never returns stale vectors
+- kind separates document from query embeddings for providers that embed them
+  differently (Gemini task types); sentence-transformers embed both the same
+  way, so their queries reuse document entries
+
+Vectors are stored as float32, the precision Qdrant stores and
+sentence-transformers produce, so cached and fresh vectors index identically.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.helper import logger
+
+# SQLite limits the number of bound parameters per statement
+_SQL_BATCH = 500
+
+
+class EmbeddingCacheStore:
+    """Thread-safe SQLite store of float32 vectors with LRU eviction by size."""
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key BLOB PRIMARY KEY,"
+                " vector BLOB NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)")
+            self._conn.commit()
+            row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()
+        self._entries, self._bytes = int(row[0]), int(row[1])
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, List[float]]:
+        """Look up keys; found entries are marked as recently used."""
+        found = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), _SQL_BATCH):
+                batch = list(keys[start:start + _SQL_BATCH])
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32).tolist()
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, items: Dict[bytes, List[float]]):
+        """Insert vectors, then evict least recently used entries if over budget."""
+        if not items:
+            return
+        now = time.time()
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in items.items()]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+            if self._conn.total_changes - before == len(rows):
+                self._entries += len(rows)
+                self._bytes += sum(len(blob) for _, blob, _ in rows)
+            else:
+                # Another process inserted some of the same keys; recount
+                row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()
+                self._entries, self._bytes = int(row[0]), int(row[1])
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop the least recently used entries down to 90% of the budget (lock held)."""
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        while self._bytes > target and self._entries > 0:
+            rows = self._conn.execute(
+                "SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_used LIMIT ?", (_SQL_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            victims = []
+            for key, size in rows:
+                if self._bytes <= target:
+                    break
+                victims.append((key,))
+                self._bytes -= size
+                self._entries -= 1
+            self._conn.executemany("DELETE FROM embeddings WHERE key = ?", victims)
+            removed += len(victims)
+        self._conn.commit()
+        logger.info(f"Embedding cache: evicted {removed} entries ({self._bytes / 1e6:.1f} MB kept)")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._entries, self._bytes = 0, 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that serves repeated texts from an EmbeddingCacheStore.
+
+    Misses are batch-aware: a call with N texts sends only the distinct
+    uncached ones to the underlying model, in a single call.
+    """
+
+    def __init__(self, base_embeddings, store: EmbeddingCacheStore, namespace: str,
+                 query_uses_document_embedding: bool = False):
+        """
+        Args:
+            base_embeddings: The underlying embedding model
+            store: Shared vector store for the cache
+            namespace: Model identity (name + normalisation) used in every key
+            query_uses_document_embedding: True when embed_query(t) equals
+                embed_documents([t])[0] for the base model, so queries and
+                documents can share cache entries and be batched together
+        """
+        self.base_embeddings = base_embeddings
+        self.store = store
+        self.namespace = namespace
+        self.query_uses_document_embedding = query_uses_document_embedding
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def _key(self, kind: str, text: str) -> bytes:
+        digest = hashlib.sha256()
+        digest.update(self.namespace.encode("utf-8"))
+        digest.update(b"\0" + kind.encode("utf-8") + b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.digest()
+
+    def _count(self, hits: int, misses: int):
+        with self._counter_lock:
+            self.hits += hits
+            self.misses += misses
+
+    def _cached_batch(self, texts: List[str], kind: str, embed_missing) -> List[List[float]]:
+        keys = [self._key(kind, text) for text in texts]
+        found = self.store.get_many(list(dict.fromkeys(keys)))
+
+        missing = {}  # key -> text, distinct and in first-seen order
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        self._count(len(texts) - sum(1 for key in keys if key in missing), len(missing))
+
+        if missing:
+            vectors = embed_missing(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self.store.put_many(computed)
+            # Serve fresh entries at the stored precision so hits and misses agree
+            for key, vector in computed.items():
+                found[key] = np.asarray(vector, dtype=np.float32).tolist()
+        return [found[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, calling the base model only for uncached texts."""
+        if not texts:
+            return []
+        return self._cached_batch(list(texts), "doc", self.base_embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, sharing document entries when the model allows it."""
+        if self.query_uses_document_embedding:
+            return self.embed_documents([text])[0]
+        return self._cached_batch([text], "query", lambda missing: [self.base_embeddings.embed_query(missing[0])])[0]
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for this process plus the size of the shared store."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self.store),
+            "size_mb": self.store.size_bytes / 1e6,
+        }
+
+    def __call__(self, text: str) -> List[float]:
+        """Make the wrapper callable for compatibility with older LangChain versions."""
+        return self.embed_query(text)
+
+    def __getattr__(self, name):
+        """Delegate all other attributes to the base embeddings."""
+        if name == "base_embeddings":
+            raise AttributeError(name)
+        return getattr(self.base_embeddings, name)
+
+
+_stores: Dict[str, EmbeddingCacheStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_cache_store(path: str, max_bytes: int) -> EmbeddingCacheStore:
+    """One store per cache file per process, shared by every wrapper."""
+    path = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = EmbeddingCacheStore(path, max_bytes=max_bytes)
+            _stores[path] = store
+        return store
+
+
+def wrap_with_cache(base_embeddings, namespace: str, path: str, max_bytes: int,
+                    query_uses_document_embedding: bool = False) -> Optional[CachedEmbeddings]:
+    """Wrap embeddings with the on-disk cache; returns None if the cache cannot be opened."""
+    try:
+        store = get_cache_store(path, max_bytes)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Embedding cache unavailable at {path} ({e}); embedding without cache")
+        return None
+    logger.info(f"Embedding cache: {path} ({len(store)} entries, {store.size_bytes / 1e6:.1f} MB), namespace={namespace}")
+    return CachedEmbeddings(
+        base_embeddings,
+        store,
+        namespace,
+        query_uses_document_embedding=query_uses_document_embedding,
+    )
@@ -4,10 +4,13 @@ from langchain_core.documents import Document
 from langgraph.graph import StateGraph, END
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-import groq
 import re
 from settings import Settings
 from helper import logger
+from utils.providers import provider_exception
+from utils.node_steps import Call, run_steps, arun_steps
+from utils.answer_stream import ANSWER_NODES, AnswerStream
+from utils.startup_profile import startup_phase
 from utils.prompts import (
     FOLLOW_UP,
     REPHRASE,
@@ -17,7 +20,9 @@ from utils.prompts import (
     RAG_PROMPT,
     EVALUATION_PROMPT,
     REFINE_PROMPT,
+    TUTOR_PROMPT,
 )
+from src.utils.query_analysis import analyze_query
 from utils.structure_output import RAGResponse, ConfidenceScore, InitialRAGResponse, SimpleRAGResponse
 from utils.sanskrit_lexicon import (
     enrich_query_with_sanskrit,
@@ -31,59 +36,15 @@ from config import (
     TOPIC_CHANGE_WINDOW,
     USE_REGENERATION,
     REGENERATION_PROVIDER,
-    REGENERATION_MODEL,
-    GROQ_API_KEY,
-    GEMINI_API_KEY,
     MAX_REGENERATION_ATTEMPTS,
-    ENABLE_CITATIONS
+    ENABLE_CITATIONS,
+    SPECULATIVE_RETRIEVAL,
+    SPECULATIVE_REUSE_SIMILARITY
 )
 
-llm = Settings.get_llm()
-evaluator_llm = Settings.get_eval_llm()
-
-# Initialize regeneration LLM based on provider
-regeneration_llm = None
-
-if USE_REGENERATION:
-    if REGENERATION_PROVIDER == "groq" and GROQ_API_KEY:
-        from langchain_groq import ChatGroq
-        regeneration_llm = ChatGroq(
-            api_key=GROQ_API_KEY,
-            model=REGENERATION_MODEL,
-            temperature=0,
-            max_tokens=2048,
-            timeout=600,
-            max_retries=2,
-        )
-        logger.info(f"Regeneration enabled with Groq: {REGENERATION_MODEL}")
-
-    elif REGENERATION_PROVIDER == "gemini" and GEMINI_API_KEY:
-        from langchain_google_genai import ChatGoogleGenerativeAI
-        regeneration_llm = ChatGoogleGenerativeAI(
-            model=REGENERATION_MODEL,
-            google_api_key=GEMINI_API_KEY,
-            temperature=0,
-            max_tokens=2048,
-            timeout=600,
-            max_retries=2,
-        )
-        logger.info(f"Regeneration enabled with Gemini: {REGENERATION_MODEL}")
-
-    elif REGENERATION_PROVIDER == "ollama":
-        from langchain_ollama import ChatOllama
-        regeneration_llm = ChatOllama(
-            model=REGENERATION_MODEL,
-            temperature=0,
-            num_predict=2048,
-        )
-        logger.info(f"Regeneration enabled with Ollama: {REGENERATION_MODEL}")
-
-    else:
-        logger.warning(
-            f"USE_REGENERATION=true but provider '{REGENERATION_PROVIDER}' not configured properly. "
-            "Will use standard refinement."
-        )
-
+# LLM clients are built on first use (Settings caches them), so importing this
+# module does not load any provider SDK.
+_BAD_REQUEST = ("groq", "BadRequestError")
 
 
 class GraphState(TypedDict):
@@ -100,9 +61,21 @@ class GraphState(TypedDict):
     reset_history: bool
     regeneration_count: int  # Track regeneration attempts to prevent infinite loops
     error_occurred: bool  # Flag to prevent refinement loops when errors occur
+    system_prompt: str  # Tutor instructions given to the answer nodes as a system message (optional)
+    skip_evaluation: bool  # Accept the first answer without scoring it (optional)
 
 
-def retrieve_and_rerank_node(state: GraphState, reranking_retriever):
+def _answer_prompt(template: str, state: GraphState) -> ChatPromptTemplate:
+    """Prompt of an answer node, after the state's system prompt when it has one."""
+    system_prompt = state.get("system_prompt")
+    if not system_prompt:
+        return ChatPromptTemplate.from_template(template)
+    # Literal text, not a template: escape any braces in it
+    system_prompt = system_prompt.replace("{", "{{").replace("}", "}}")
+    return ChatPromptTemplate.from_messages([("system", system_prompt), ("human", template)])
+
+
+def _retrieve_and_rerank_steps(state: GraphState, reranking_retriever):
     """
     Retrieves and reranks documents based on the enhanced question.
     Now with Sanskrit lexicon enrichment for better semantic matching.
@@ -129,7 +102,7 @@ def retrieve_and_rerank_node(state: GraphState, reranking_retriever):
         enhanced_question = enriched_question
 
     # Use the combined retriever with the reranker
-    retrieved_docs = reranking_retriever.invoke(enhanced_question)
+    retrieved_docs = yield Call(reranking_retriever, enhanced_question)
 
     # Log what was retrieved for debugging
     logger.info(f"Query: {enhanced_question}")
@@ -142,10 +115,18 @@ def retrieve_and_rerank_node(state: GraphState, reranking_retriever):
     return {"documents": retrieved_docs}
 
 
+def retrieve_and_rerank_node(state: GraphState, reranking_retriever):
+    return run_steps(_retrieve_and_rerank_steps(state, reranking_retriever))
+
+
+async def aretrieve_and_rerank_node(state: GraphState, reranking_retriever):
+    return await arun_steps(_retrieve_and_rerank_steps(state, reranking_retriever))
+
+
 # --- Nodes with LLM calls ---
 
 
-def check_follow_up_node(state: GraphState):
+def _check_follow_up_steps(state: GraphState):
     """Checks if the user's question is a follow-up using an LLM."""
     logger.info("---CHECKING FOLLOW-UP---")
     question = state["question"]
@@ -157,19 +138,28 @@ def check_follow_up_node(state: GraphState):
         else chat_history
     )
     # Define LLM chains for specific tasks
+    llm = Settings.get_llm()
     follow_up_chain = (
         ChatPromptTemplate.from_template(FOLLOW_UP) | llm | StrOutputParser()
     )
 
-    response = follow_up_chain.invoke(
-        {"chat_history": short_chat_history, "question": question}
+    response = yield Call(
+        follow_up_chain, {"chat_history": short_chat_history, "question": question}, llm
     )
     is_follow_up = response.strip().lower() == "yes"
 
     return {"is_follow_up": is_follow_up}
 
 
-def process_follow_up_node(state: GraphState):
+def check_follow_up_node(state: GraphState):
+    return run_steps(_check_follow_up_steps(state))
+
+
+async def acheck_follow_up_node(state: GraphState):
+    return await arun_steps(_check_follow_up_steps(state))
+
+
+def _process_follow_up_steps(state: GraphState):
     """Processes a follow-up question, getting intent and checking for a topic change using LLMs."""
     logger.info("---PROCESSING FOLLOW-UP---")
     question = state["question"]
@@ -180,28 +170,35 @@ def process_follow_up_node(state: GraphState):
         else chat_history
     )
 
+    llm = Settings.get_llm()
+    inputs = {"chat_history": short_chat_history, "question": question}
     rephrase_chain = (
         ChatPromptTemplate.from_template(REPHRASE) | llm | StrOutputParser()
     )
-
-    # Get the enhanced question by rephrasing with LLM
-    enhanced_question = rephrase_chain.invoke(
-        {"chat_history": short_chat_history, "question": question}
-    )
-
     topic_change_chain = (
         ChatPromptTemplate.from_template(TOPIC_CHANGE) | llm | StrOutputParser()
     )
-    # Check for a complete topic change with LLM
-    topic_change_response = topic_change_chain.invoke(
-        {"chat_history": short_chat_history, "question": question}
-    )
+
+    # Get the enhanced question by rephrasing with LLM and check for a complete
+    # topic change (independent calls, so they run together)
+    enhanced_question, topic_change_response = yield [
+        Call(rephrase_chain, inputs, llm),
+        Call(topic_change_chain, inputs, llm),
+    ]
     reset_history = topic_change_response.strip().lower() == "yes"
 
     return {"enhanced_question": enhanced_question, "reset_history": reset_history}
 
 
-def correct_grammar_node(state: GraphState):
+def process_follow_up_node(state: GraphState):
+    return run_steps(_process_follow_up_steps(state))
+
+
+async def aprocess_follow_up_node(state: GraphState):
+    return await arun_steps(_process_follow_up_steps(state))
+
+
+def _correct_grammar_steps(state: GraphState):
     """Corrects the grammar of a standalone question using an LLM.
 
     Preserves words enclosed in quotes to prevent grammar correction.
@@ -226,9 +223,10 @@ def correct_grammar_node(state: GraphState):
     if quoted_words:
         logger.info(f"Protected {len(quoted_words)} quoted word(s) from grammar correction: {quoted_words}")
 
+    llm = Settings.get_llm()
     grammar_chain = ChatPromptTemplate.from_template(GRAMMER) | llm | StrOutputParser()
 
-    enhanced_question = grammar_chain.invoke({"question": protected_question})
+    enhanced_question = yield Call(grammar_chain, {"question": protected_question}, llm)
 
     # Restore protected words
     for placeholder, original in placeholders.items():
@@ -240,6 +238,73 @@ def correct_grammar_node(state: GraphState):
     return {"enhanced_question": enhanced_question}
 
 
+def correct_grammar_node(state: GraphState):
+    return run_steps(_correct_grammar_steps(state))
+
+
+async def acorrect_grammar_node(state: GraphState):
+    return await arun_steps(_correct_grammar_steps(state))
+
+
+def _rewrite_question_steps(state: GraphState):
+    """check_follow_up, then process_follow_up or correct_grammar, as one chain of steps."""
+    update = yield from _check_follow_up_steps(state)
+    rewrite = _process_follow_up_steps if update["is_follow_up"] else _correct_grammar_steps
+    update.update((yield from rewrite(state)))
+    return update
+
+
+def _query_words(question: str) -> set:
+    """Words of the BM25 keyword query, case kept (the keyword index is case-sensitive)."""
+    return set(re.findall(r"\w+", analyze_query(question).keyword_query))
+
+
+def same_retrieval_query(original: str, rewritten: str) -> bool:
+    """True if the rewrite did not change what the retriever uses: the same proper nouns
+    (they drive variant expansion) and keyword words overlapping by at least
+    SPECULATIVE_REUSE_SIMILARITY. Punctuation and stopwords do not count, case does:
+    "sudas" is not the name "Sudas"."""
+    if set(analyze_query(original).proper_nouns) != set(analyze_query(rewritten).proper_nouns):
+        return False
+    original_words, rewritten_words = _query_words(original), _query_words(rewritten)
+    if original_words == rewritten_words:
+        return True
+    union = original_words | rewritten_words
+    return bool(union) and len(original_words & rewritten_words) / len(union) >= SPECULATIVE_REUSE_SIMILARITY
+
+
+def _speculative_retrieve_steps(state: GraphState, reranking_retriever):
+    """
+    Retrieves on the raw question while the follow-up check and the rewrite
+    (rephrase + topic change, or grammar correction) are in flight.
+
+    The speculative documents are kept when the rewritten question matches the
+    raw one; otherwise retrieval runs again on the rewritten question.
+    """
+    logger.info("---SPECULATIVE RETRIEVAL---")
+    raw_state = {**state, "enhanced_question": state["question"]}
+    update, speculative = yield [
+        _rewrite_question_steps(state),
+        _retrieve_and_rerank_steps(raw_state, reranking_retriever),
+    ]
+
+    if same_retrieval_query(state["question"], update["enhanced_question"]):
+        logger.info("Speculative retrieval reused")
+        update.update(speculative)
+    else:
+        logger.info(f"Question rewritten to '{update['enhanced_question']}', retrieving again")
+        update.update((yield from _retrieve_and_rerank_steps({**state, **update}, reranking_retriever)))
+    return update
+
+
+def speculative_retrieve_node(state: GraphState, reranking_retriever):
+    return run_steps(_speculative_retrieve_steps(state, reranking_retriever))
+
+
+async def aspeculative_retrieve_node(state: GraphState, reranking_retriever):
+    return await arun_steps(_speculative_retrieve_steps(state, reranking_retriever))
+
+
 def expand_query_node(state: GraphState):
     """Expands query with entities from chat history to improve retrieval."""
     logger.info("---EXPANDING QUERY---")
@@ -258,7 +323,7 @@ def expand_query_node(state: GraphState):
     )
 
     expansion_chain = (
-        ChatPromptTemplate.from_template(QUERY_EXPANSION) | llm | StrOutputParser()
+        ChatPromptTemplate.from_template(QUERY_EXPANSION) | Settings.get_llm() | StrOutputParser()
     )
 
     expanded_question = expansion_chain.invoke(
@@ -323,7 +388,7 @@ def parse_failed_generation(error_message: str):
         return "Parsing error: Could not extract a valid answer.", []
 
 
-def call_llm_node(state: GraphState):
+def _call_llm_steps(state: GraphState):
     """
     Calls the main RAG LLM to get the final structured answer (without evaluation fields).
     """
@@ -362,14 +427,13 @@ def call_llm_node(state: GraphState):
         logger.info("Using simplified prompt (citations disabled for Ollama compatibility)")
 
     # Bind to the appropriate model
-    rag_chain = ChatPromptTemplate.from_template(
-        prompt_text
-    ) | llm.with_structured_output(response_model)
+    llm = Settings.get_llm()
+    rag_chain = _answer_prompt(prompt_text, state) | llm.with_structured_output(response_model)
 
     try:
         logger.info("Invoking LLM with structured output (this may take 10-30 seconds)...")
         # Invoke the chain
-        structured_response = rag_chain.invoke(inputs)
+        structured_response = yield Call(rag_chain, inputs, llm)
         logger.info("✅ LLM response received successfully")
 
         # Return the Pydantic object directly
@@ -380,7 +444,7 @@ def call_llm_node(state: GraphState):
 
         return {"answer": response_dict}
 
-    except groq.BadRequestError as e:
+    except provider_exception(*_BAD_REQUEST) as e:
         logger.error(f"Response does not conform to InitialRagResponse: {e}")
         try:
             # Convert error to string before parsing
@@ -438,6 +502,54 @@ def call_llm_node(state: GraphState):
         }
 
 
+def call_llm_node(state: GraphState):
+    """
+    Calls the main RAG LLM to get the final structured answer (without evaluation fields).
+    """
+    return run_steps(_call_llm_steps(state))
+
+
+async def acall_llm_node(state: GraphState):
+    return await arun_steps(_call_llm_steps(state))
+
+
+def _tutor_answer_steps(state: GraphState, llm):
+    """
+    Tutor-mode answer: one plain-text call to the tutor's LLM that teaches from
+    the retrieved documents, following the state's system prompt.
+    """
+    logger.info("---CALLING TUTOR LLM---")
+    chat_history = state["chat_history"]
+    short_chat_history = (
+        chat_history[:CHAT_MEMORY_WINDOW]
+        if len(chat_history) > CHAT_MEMORY_WINDOW
+        else chat_history
+    )
+    inputs = {
+        "question": state["enhanced_question"],
+        "documents": state["documents"],
+        "chat_history": short_chat_history,
+    }
+    tutor_chain = _answer_prompt(TUTOR_PROMPT, state) | llm | StrOutputParser()
+
+    try:
+        answer = yield Call(tutor_chain, inputs, llm)
+        return {"answer": {"answer": answer, "citations": []}}
+    except Exception as e:
+        logger.error(f"Tutor LLM call failed: {e}")
+        return {
+            "answer": {
+                "answer": f"An unexpected error occurred: {type(e).__name__}. Please check logs.",
+                "citations": [],
+            },
+            "error_occurred": True  # Flag to prevent refinement loop
+        }
+
+
+def tutor_answer_node(state: GraphState, llm):
+    return run_steps(_tutor_answer_steps(state, llm))
+
+
 def parse_confidence_score_from_error(error_message: str):
     """
     Parses a Groq API error message to extract the confidence score
@@ -488,7 +600,7 @@ def parse_confidence_score_from_error(error_message: str):
         return {"confidence_score": -1, "reasoning": "Could not Evaluate."}
 
 
-def evaluate_response_node(state: GraphState):
+def _evaluate_response_steps(state: GraphState):
     """
     Evaluates the AI's response and provides a confidence score.
     """
@@ -496,9 +608,10 @@ def evaluate_response_node(state: GraphState):
 
     # The evaluation LLM chain
     # evaluator_llm = ChatGoogleGenerativeAI(model="gemini-1.5-pro-latest")
+    eval_llm = Settings.get_eval_llm()
     evaluator_chain = ChatPromptTemplate.from_template(
         EVALUATION_PROMPT
-    ) | evaluator_llm.with_structured_output(ConfidenceScore)
+    ) | eval_llm.with_structured_output(ConfidenceScore)
 
     # Get the necessary state variables
     documents = state["documents"]
@@ -514,18 +627,20 @@ def evaluate_response_node(state: GraphState):
     try:
         # Invoke the evaluator chain
         # The AI answer is a dictionary, so we need to get the 'answer' field
-        evaluation_result = evaluator_chain.invoke(
+        evaluation_result = yield Call(
+            evaluator_chain,
             {
                 "documents": documents,
                 "chat_history": short_chat_history,
                 "question": enhanced_question,
                 "answer": answer_dict.get("answer", "No answer provided."),
-            }
+            },
+            eval_llm,
         )
         evals = evaluation_result.model_dump()
         # confidence_score is now an int from the schema, no conversion needed
         answer_dict["confidence"] = evals
-    except groq.BadRequestError as e:
+    except provider_exception(*_BAD_REQUEST) as e:
         logger.info(f"Evaluation output not as expected {e}. using fallback")
         # Convert error to string before parsing
         conf_dict = parse_confidence_score_from_error(str(e))
@@ -542,7 +657,18 @@ def evaluate_response_node(state: GraphState):
     }
 
 
-def refine_response_node(state: GraphState):
+def evaluate_response_node(state: GraphState):
+    """
+    Evaluates the AI's response and provides a confidence score.
+    """
+    return run_steps(_evaluate_response_steps(state))
+
+
+async def aevaluate_response_node(state: GraphState):
+    return await arun_steps(_evaluate_response_steps(state))
+
+
+def _refine_response_steps(state: GraphState):
     """
     If evaluation results in less than 75% score then refine the output
     """
@@ -568,18 +694,17 @@ def refine_response_node(state: GraphState):
         "suggested_improvements": suggested_improvements,
     }
 
-    refine_chain = ChatPromptTemplate.from_template(
-        REFINE_PROMPT
-    ) | llm.with_structured_output(RAGResponse)
+    llm = Settings.get_llm()
+    refine_chain = _answer_prompt(REFINE_PROMPT, state) | llm.with_structured_output(RAGResponse)
 
     try:
         # The chain now returns a Pydantic object
-        structured_response = refine_chain.invoke(inputs)
+        structured_response = yield Call(refine_chain, inputs, llm)
 
         # Return the Pydantic object directly
         return {"answer": structured_response.model_dump()}
 
-    except groq.BadRequestError as e:
+    except provider_exception(*_BAD_REQUEST) as e:
         logger.info(f"Response does not conform to RAGResponse: {e}. Falling back")
         # Convert error to string before parsing
         part_answer, citations = parse_failed_generation(str(e))
@@ -603,7 +728,18 @@ def refine_response_node(state: GraphState):
         }
 
 
-def regenerate_with_groq_node(state: GraphState):
+def refine_response_node(state: GraphState):
+    """
+    If evaluation results in less than 75% score then refine the output
+    """
+    return run_steps(_refine_response_steps(state))
+
+
+async def arefine_response_node(state: GraphState):
+    return await arun_steps(_refine_response_steps(state))
+
+
+def _regenerate_steps(state: GraphState):
     """
     Regenerates answer with a superior model when confidence is low.
     This uses a better model to generate a fresh answer from scratch,
@@ -633,19 +769,18 @@ def regenerate_with_groq_node(state: GraphState):
     # Use RAG_PROMPT (not REFINE_PROMPT) - start fresh!
     # This is key: we don't give it the bad answer to "improve",
     # we let it generate a completely new answer
-    rag_chain = ChatPromptTemplate.from_template(
-        RAG_PROMPT
-    ) | regeneration_llm.with_structured_output(RAGResponse)
+    regeneration_llm = Settings.get_regeneration_llm()
+    rag_chain = _answer_prompt(RAG_PROMPT, state) | regeneration_llm.with_structured_output(RAGResponse)
 
     try:
-        structured_response = rag_chain.invoke(inputs)
+        structured_response = yield Call(rag_chain, inputs, regeneration_llm)
         logger.info(f"Successfully regenerated answer with {REGENERATION_PROVIDER.upper()}")
         return {
             "answer": structured_response.model_dump(),
             "regeneration_count": regeneration_count + 1  # Increment counter
         }
 
-    except groq.BadRequestError as e:
+    except provider_exception(*_BAD_REQUEST) as e:
         logger.error(f"Regeneration failed with BadRequestError: {e}")
         # Try to parse partial response
         try:
@@ -673,6 +808,27 @@ def regenerate_with_groq_node(state: GraphState):
         return {"regeneration_count": regeneration_count + 1}  # Still increment to prevent retry
 
 
+def regenerate_with_groq_node(state: GraphState):
+    """
+    Regenerates answer with a superior model when confidence is low.
+
+    IMPORTANT: Increments regeneration_count to prevent infinite loops.
+    """
+    return run_steps(_regenerate_steps(state))
+
+
+async def aregenerate_node(state: GraphState):
+    return await arun_steps(_regenerate_steps(state))
+
+
+def route_after_answer(state: GraphState) -> Literal["evaluate", "end"]:
+    """Score the answer unless the caller asked to skip evaluation (tutor modes)."""
+    if state.get("skip_evaluation", False):
+        logger.info("Evaluation skipped for this question.")
+        return "end"
+    return "evaluate"
+
+
 def route_to_refiner(state: GraphState) -> Literal["refine", "regenerate", "end"]:
     """
     Determines whether to refine, regenerate, or end based on confidence score.
@@ -706,7 +862,7 @@ def route_to_refiner(state: GraphState) -> Literal["refine", "regenerate", "end"
     # Treat -1 (not enough info) and scores < 75 as low confidence
     if confidence_score is not None and (confidence_score == -1 or confidence_score < 75):
         # Low confidence - need to improve answer
-        if USE_REGENERATION and regeneration_llm is not None:
+        if USE_REGENERATION and Settings.get_regeneration_llm() is not None:
             logger.info(
                 f"Confidence is low ({confidence_score}). "
                 f"Regenerating with {REGENERATION_PROVIDER.upper()} (attempt {regeneration_count + 1}/{MAX_REGENERATION_ATTEMPTS})..."
@@ -751,40 +907,43 @@ def update_chat_history_node(state: GraphState):
     return result
 
 
-# --- Building the Graph (no changes needed here) ---
-def create_langgraph_app(retriever):
+# --- Building the Graph ---
+def _build_workflow(nodes: dict) -> StateGraph:
+    """Wire the RAG graph from a name -> node function mapping.
+
+    With a "speculative_retrieve" node, it replaces the follow-up check,
+    rewrite and retrieval hops (they run inside it, overlapped).
+    """
     workflow = StateGraph(GraphState)
-    workflow.add_node("check_follow_up", check_follow_up_node)
-    workflow.add_node("process_follow_up", process_follow_up_node)
-    workflow.add_node("correct_grammar", correct_grammar_node)
-    # Removed expand_query node - query expansion now in retriever
-    workflow.add_node(
-        "retrieve_documents", lambda state: retrieve_and_rerank_node(state, retriever)
-    )
-    workflow.add_node("call_llm", call_llm_node)
-    workflow.add_node("evaluator", evaluate_response_node)
-    workflow.add_node("refiner", refine_response_node)
-    workflow.add_node("regenerator", regenerate_with_groq_node)
-    workflow.add_node("update_chat_history", update_chat_history_node)
+    for name, node in nodes.items():
+        workflow.add_node(name, node)
 
-    workflow.set_entry_point("check_follow_up")
+    if "speculative_retrieve" in nodes:
+        workflow.set_entry_point("speculative_retrieve")
+        workflow.add_edge("speculative_retrieve", "call_llm")
+    else:
+        workflow.set_entry_point("check_follow_up")
 
+        workflow.add_conditional_edges(
+            "check_follow_up",
+            lambda state: "follow_up" if state["is_follow_up"] else "standalone",
+            {
+                "follow_up": "process_follow_up",
+                "standalone": "correct_grammar",
+            },
+        )
+
+        # Removed expand_query node - it was rewriting questions incorrectly
+        # Query expansion now happens in retriever via proper noun association
+        workflow.add_edge("process_follow_up", "retrieve_documents")
+        workflow.add_edge("correct_grammar", "retrieve_documents")
+        workflow.add_edge("retrieve_documents", "call_llm")
     workflow.add_conditional_edges(
-        "check_follow_up",
-        lambda state: "follow_up" if state["is_follow_up"] else "standalone",
-        {
-            "follow_up": "process_follow_up",
-            "standalone": "correct_grammar",
-        },
+        "call_llm",
+        route_after_answer,
+        {"evaluate": "evaluator", "end": "update_chat_history"},
     )
 
-    # Removed expand_query node - it was rewriting questions incorrectly
-    # Query expansion now happens in retriever via proper noun association
-    workflow.add_edge("process_follow_up", "retrieve_documents")
-    workflow.add_edge("correct_grammar", "retrieve_documents")
-    workflow.add_edge("retrieve_documents", "call_llm")
-    workflow.add_edge("call_llm", "evaluator")
-
     # Add the conditional edge from the evaluator
     # Routes to regenerate (Groq 70B) if enabled, otherwise refine (same model)
     workflow.add_conditional_edges(
@@ -801,8 +960,93 @@ def create_langgraph_app(retriever):
     workflow.add_edge("refiner", "evaluator")
     workflow.add_edge("regenerator", "evaluator")
     workflow.add_edge("update_chat_history", END)
+    return workflow
 
-    app = workflow.compile()
+
+def _front_nodes(retriever, speculative: bool) -> dict:
+    """Nodes from the question to the retrieved documents."""
+    if speculative:
+        return {"speculative_retrieve": lambda state: speculative_retrieve_node(state, retriever)}
+    return {
+        "check_follow_up": check_follow_up_node,
+        "process_follow_up": process_follow_up_node,
+        "correct_grammar": correct_grammar_node,
+        # Removed expand_query node - query expansion now in retriever
+        "retrieve_documents": lambda state: retrieve_and_rerank_node(state, retriever),
+    }
+
+
+def create_langgraph_app(retriever, speculative: bool = SPECULATIVE_RETRIEVAL):
+    workflow = _build_workflow({
+        **_front_nodes(retriever, speculative),
+        "call_llm": call_llm_node,
+        "evaluator": evaluate_response_node,
+        "refiner": refine_response_node,
+        "regenerator": regenerate_with_groq_node,
+        "update_chat_history": update_chat_history_node,
+    })
+
+    with startup_phase("graph_compile"):
+        app = workflow.compile()
+
+    return app
+
+
+def create_async_langgraph_app(retriever, speculative: bool = SPECULATIVE_RETRIEVAL):
+    """Same graph with async nodes, for `await app.ainvoke(state)`.
+
+    LLM calls use `ainvoke` under the provider's concurrency limit and the
+    retriever is awaited, so many sessions can share one event loop.
+    """
+    async def retrieve_documents(state: GraphState):
+        return await aretrieve_and_rerank_node(state, retriever)
+
+    async def speculative_retrieve(state: GraphState):
+        return await aspeculative_retrieve_node(state, retriever)
+
+    if speculative:
+        front = {"speculative_retrieve": speculative_retrieve}
+    else:
+        front = {
+            "check_follow_up": acheck_follow_up_node,
+            "process_follow_up": aprocess_follow_up_node,
+            "correct_grammar": acorrect_grammar_node,
+            "retrieve_documents": retrieve_documents,
+        }
+    workflow = _build_workflow({
+        **front,
+        "call_llm": acall_llm_node,
+        "evaluator": aevaluate_response_node,
+        "refiner": arefine_response_node,
+        "regenerator": aregenerate_node,
+        "update_chat_history": update_chat_history_node,
+    })
+
+    with startup_phase("graph_compile"):
+        app = workflow.compile()
+
+    return app
+
+
+def create_tutor_langgraph_app(retriever, llm, speculative: bool = SPECULATIVE_RETRIEVAL):
+    """Tutor-mode graph: the answer is written by the tutor's `llm` in one call.
+
+    Set "system_prompt" in the state to the tutoring instructions (they also
+    reach the refiner and regenerator), and "skip_evaluation" to accept the
+    answer without scoring it. The answer is plain text, so stream it with
+    stream_tutor_with_langgraph.
+    """
+    workflow = _build_workflow({
+        **_front_nodes(retriever, speculative),
+        "call_llm": lambda state: tutor_answer_node(state, llm),
+        "evaluator": evaluate_response_node,
+        "refiner": refine_response_node,
+        "regenerator": regenerate_with_groq_node,
+        "update_chat_history": update_chat_history_node,
+    })
+
+    with startup_phase("graph_compile"):
+        app = workflow.compile()
 
     return app
 
@@ -816,6 +1060,26 @@ def run_rag_with_langgraph(state: GraphState, app):
     return result
 
 
+async def arun_rag_with_langgraph(state: GraphState, app):
+    """Async counterpart of run_rag_with_langgraph for create_async_langgraph_app."""
+    return await app.ainvoke(state)
+
+
+def stream_rag_with_langgraph(state: GraphState, app) -> AnswerStream:
+    """Streaming run_rag_with_langgraph: iterate (or `async for` with the async
+    app) for the answer text, then read the final state from `.result`."""
+    return AnswerStream(app, state)
+
+
+# The tutor graph's first answer is plain text, its revisions are JSON
+TUTOR_ANSWER_NODES = {**ANSWER_NODES, "call_llm": None}
+
+
+def stream_tutor_with_langgraph(state: GraphState, app) -> AnswerStream:
+    """stream_rag_with_langgraph for create_tutor_langgraph_app."""
+    return AnswerStream(app, state, nodes=TUTOR_ANSWER_NODES)
+
+
 if __name__ == "__main__":
     # Example 1: Standalone question
     initial_state_1 = {
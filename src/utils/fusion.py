@@ -0,0 +1,144 @@
+"""
+Result Fusion for the Hybrid Retriever
+
+Combines the semantic (Qdrant) and keyword (BM25) candidate lists into one
+ranking. Three strategies are available (FUSION_METHOD in config):
+
+- "rank_heuristic": the original HybridRetriever scoring. Inverse rank times
+  SEMANTIC_WEIGHT / KEYWORD_WEIGHT, with the keyword contribution doubled for
+  chunks found by both retrievers
+- "rrf": weighted reciprocal rank fusion, weight / (rrf_k + rank)
+- "weighted_score": min-max normalised similarity and BM25 scores, combined
+  with the same weights (falls back to rank-derived scores when a retriever
+  cannot report scores)
+
+Chunks are deduplicated on a stable chunk id: the Qdrant point id, which the
+indexer also stores in the chunk store. Indexes built before chunk ids existed
+fall back to a digest of the chunk text. Scoring is vectorised with NumPy, so
+large candidate pools (e.g. top-50 per retriever) cost little.
+"""
+
+import hashlib
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+FUSION_METHODS = ("rank_heuristic", "rrf", "weighted_score")
+
+
+def content_key(text: str) -> str:
+    """Process-independent digest of a chunk's text (unlike the salted built-in hash)."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def chunk_key(doc: Document, use_point_ids: bool = False) -> str:
+    """Stable identity of a chunk across both retrievers.
+
+    With use_point_ids, Qdrant results are keyed by their point id
+    (metadata "_id") and chunk-store documents by Document.id, which the
+    indexer sets to the same value. Otherwise the chunk text digest is used.
+    """
+    if use_point_ids:
+        point_id = (doc.metadata or {}).get("_id")
+        if point_id is None:
+            point_id = doc.id
+        if point_id is not None:
+            return str(point_id)
+    return content_key(doc.page_content)
+
+
+def _first_occurrences(keys: Sequence[str]) -> List[int]:
+    """Positions of the first occurrence of each key (duplicates keep their best rank)."""
+    seen = set()
+    positions = []
+    for i, key in enumerate(keys):
+        if key not in seen:
+            seen.add(key)
+            positions.append(i)
+    return positions
+
+
+def _normalise(scores: Optional[Sequence[float]], n: int) -> np.ndarray:
+    """Min-max normalise scores to [0, 1]; rank-derived scores when none are available."""
+    if scores is None or len(scores) != n:
+        return (n - np.arange(n)) / max(n, 1)
+    values = np.asarray(scores, dtype=np.float64)
+    low, high = values.min(initial=0.0), values.max(initial=0.0)
+    if n and high > low:
+        return (values - low) / (high - low)
+    return np.ones(n)
+
+
+def fuse(
+    semantic_docs: Sequence[Document],
+    keyword_docs: Sequence[Document],
+    semantic_scores: Optional[Sequence[float]] = None,
+    keyword_scores: Optional[Sequence[float]] = None,
+    method: str = "rank_heuristic",
+    semantic_weight: float = 0.7,
+    keyword_weight: float = 0.3,
+    key: Callable[[Document], str] = chunk_key,
+    rrf_k: int = 60,
+) -> Tuple[List[Document], List[float], List[str]]:
+    """Fuse two ranked candidate lists.
+
+    Args:
+        semantic_docs / keyword_docs: Candidates in each retriever's rank order
+        semantic_scores / keyword_scores: Raw scores aligned with the candidates (optional)
+        method: One of FUSION_METHODS
+        semantic_weight / keyword_weight: Relative importance of each retriever
+        key: Chunk identity used for deduplication
+        rrf_k: Rank offset for reciprocal rank fusion
+
+    Returns:
+        (docs, fused scores, chunk keys), best first. Ties keep semantic-first
+        insertion order, matching the original merge.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method '{method}'. Choose from {FUSION_METHODS}")
+
+    semantic_keys = [key(doc) for doc in semantic_docs]
+    keyword_keys = [key(doc) for doc in keyword_docs]
+
+    # One slot per distinct chunk, in semantic-then-keyword insertion order
+    slots = {}
+    fused_docs = []
+    for doc, k in zip(list(semantic_docs) + list(keyword_docs), semantic_keys + keyword_keys):
+        if k not in slots:
+            slots[k] = len(fused_docs)
+            fused_docs.append(doc)
+    if not fused_docs:
+        return [], [], []
+
+    n_sem, n_kw = len(semantic_docs), len(keyword_docs)
+    sem_pos = np.array(_first_occurrences(semantic_keys), dtype=np.int64)
+    kw_pos = np.array(_first_occurrences(keyword_keys), dtype=np.int64)
+    sem_slots = np.array([slots[semantic_keys[i]] for i in sem_pos], dtype=np.int64)
+    kw_slots = np.array([slots[keyword_keys[i]] for i in kw_pos], dtype=np.int64)
+
+    if method == "rank_heuristic":
+        sem_contrib = (n_sem - sem_pos) * semantic_weight
+        kw_contrib = (n_kw - kw_pos) * keyword_weight
+        in_semantic = np.zeros(len(fused_docs), dtype=bool)
+        in_semantic[sem_slots] = True
+        # Chunks found by both retrievers get double the keyword boost
+        kw_contrib = np.where(in_semantic[kw_slots], kw_contrib * 2, kw_contrib)
+    elif method == "rrf":
+        sem_contrib = semantic_weight / (rrf_k + sem_pos + 1)
+        kw_contrib = keyword_weight / (rrf_k + kw_pos + 1)
+    else:  # weighted_score
+        sem_contrib = semantic_weight * _normalise(semantic_scores, n_sem)[sem_pos]
+        kw_contrib = keyword_weight * _normalise(keyword_scores, n_kw)[kw_pos]
+
+    fused = np.zeros(len(fused_docs))
+    fused[sem_slots] += sem_contrib
+    fused[kw_slots] += kw_contrib
+
+    order = np.argsort(-fused, kind="stable")
+    keys = list(slots)
+    return (
+        [fused_docs[i] for i in order],
+        [float(fused[i]) for i in order],
+        [keys[i] for i in order],
+    )
@@ -1,19 +1,26 @@
 import os
 import json
-import pickle
+import time
+import hashlib
+import shutil
 import tempfile
-from uuid import uuid4
-from pathlib import Path
+from uuid import uuid4, uuid5, NAMESPACE_URL
 from dotenv import load_dotenv
 from langchain_qdrant import QdrantVectorStore
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from src.helper import logger
-from src.config import LOCAL_FOLDER, COLLECTION_NAME, VECTORDB_FOLDER
+from src.config import LOCAL_FOLDER, COLLECTION_NAME, VECTORDB_FOLDER, EMBEDDING_PROVIDER, EMBED_MODEL
 from src.settings import Settings
+from src.utils.chunk_store import ChunkStore, open_chunk_store, CHUNK_STORE_DIRNAME
+from src.utils.citation_enhancer import add_citation_metadata
+from src.utils.startup_profile import startup_phase
+
+INDEX_MANIFEST_FILENAME = "index_manifest.json"
+INDEX_MANIFEST_VERSION = 1
 
 
 # load all processed markdown files
@@ -64,6 +71,9 @@ def chunk_doc(doc: List[Document], chunk_size: int = 512, chunk_overlap: int = 6
     # LlamaIndex ensures metadata propagates to the generated nodes.
     chunks = text_splitter.split_documents(doc)
 
+    # Citation references (rv_ref, yv_ref, ...) are read from metadata when answering
+    add_citation_metadata(chunks)
+
     return chunks
 
 
@@ -87,7 +97,8 @@ def create_qdrant_vector_store(force_recreate: bool = True) -> tuple[QdrantVecto
     if QDRANT_URL and QDRANT_API_KEY:
         # Use Qdrant Cloud
         from qdrant_client import QdrantClient
-        client = QdrantClient(url=str(QDRANT_URL), api_key=str(QDRANT_API_KEY))
+        with startup_phase("qdrant_connect"):
+            client = QdrantClient(url=str(QDRANT_URL), api_key=str(QDRANT_API_KEY))
         logger.info("Using Qdrant Cloud")
         use_cloud = True
     else:
@@ -99,27 +110,40 @@ def create_qdrant_vector_store(force_recreate: bool = True) -> tuple[QdrantVecto
     if not use_cloud:
         vec_store = os.path.join(str(VECTORDB_FOLDER), str(COLLECTION_NAME))
         os.makedirs(vec_store, exist_ok=True)
-    CHUNKS_FILE = os.path.join(str(VECTORDB_FOLDER), str(COLLECTION_NAME), "docs_chunks.pkl") if not use_cloud else os.path.join("vector_store", str(COLLECTION_NAME), "docs_chunks.pkl")
+    CHUNKS_DIR = os.path.join(str(VECTORDB_FOLDER), str(COLLECTION_NAME)) if not use_cloud else os.path.join("vector_store", str(COLLECTION_NAME))
+    # Memory-mapped chunk store; replaces the legacy docs_chunks.pkl pickle
+    CHUNK_STORE_DIR = os.path.join(CHUNKS_DIR, CHUNK_STORE_DIRNAME)
+    CHUNKS_FILE = os.path.join(CHUNKS_DIR, "docs_chunks.pkl")
 
     # If the caller asked to force recreation, remove any existing chunks file
     # so we always re-index. Previously the function only re-indexed when the
     # chunks file was missing which made "force_recreate=True" a no-op if the
     # file was present. Remove the file (when possible) and proceed to
     # re-indexing below.
-    if force_recreate and Path(CHUNKS_FILE).is_file():
-        logger.info(
-            "force_recreate=True: removing existing chunks file %s to force re-index",
-            CHUNKS_FILE,
-        )
-        try:
-            os.remove(CHUNKS_FILE)
-        except Exception:
-            logger.exception(
-                "Failed to remove existing chunks file %s; will attempt to re-index anyway",
-                CHUNKS_FILE,
+    if force_recreate:
+        for stale in (CHUNKS_FILE, CHUNK_STORE_DIR):
+            if not os.path.exists(stale):
+                continue
+            logger.info(
+                "force_recreate=True: removing existing chunks %s to force re-index",
+                stale,
             )
+            try:
+                if os.path.isdir(stale):
+                    shutil.rmtree(stale)
+                else:
+                    os.remove(stale)
+            except Exception:
+                logger.exception(
+                    "Failed to remove existing chunks %s; will attempt to re-index anyway",
+                    stale,
+                )
+
+    # Opens the chunk store lazily (converting a legacy pickle once if needed)
+    with startup_phase("chunk_load"):
+        existing_chunks = open_chunk_store(CHUNKS_DIR)
 
-    if not Path(CHUNKS_FILE).is_file():
+    if existing_chunks is None:
         if use_cloud:
             logger.info(f"Using Qdrant Cloud - assuming collection '{COLLECTION_NAME}' already exists")
             # For cloud deployment, assume collection exists and just connect
@@ -133,17 +157,21 @@ def create_qdrant_vector_store(force_recreate: bool = True) -> tuple[QdrantVecto
             # For now, return empty list - the agentic RAG should handle this
             chunks = []
         else:
-            logger.info(f"Document Chunks file: {CHUNKS_FILE} does not exist. Re-Indexing")
+            logger.info(f"Document chunk store: {CHUNK_STORE_DIR} does not exist. Re-Indexing")
             # chunk documents
             documents = load_documents_with_metadata(
                 os.path.join(str(LOCAL_FOLDER), str(COLLECTION_NAME))
             )
             chunks = chunk_doc(documents)
+            # Stable chunk ids, used both as Qdrant point ids and in the chunk
+            # store, so the hybrid retriever can match results across retrievers
+            for i, chunk in enumerate(chunks):
+                chunk.id = str(uuid5(NAMESPACE_URL, f"{COLLECTION_NAME}#{i}"))
 
             # save chunks for retrieval
-            with open(CHUNKS_FILE, "wb") as f:
-                pickle.dump(chunks, f)
+            chunk_store = ChunkStore.write(chunks, CHUNK_STORE_DIR)
             # Create the Qdrant vector store from the documents
+            vector_store = None
             try:
                 vector_store = QdrantVectorStore.from_documents(
                     documents=chunks,
@@ -161,139 +189,145 @@ def create_qdrant_vector_store(force_recreate: bool = True) -> tuple[QdrantVecto
                     "QdrantVectorStore.from_documents failed with AssertionError (%s). Falling back to manual collection creation.",
                     e,
                 )
-            try:
-                from qdrant_client import QdrantClient
-                from qdrant_client.http.models import VectorParams, Distance
-
-                # Ensure the directory exists for local Qdrant
+            if vector_store is None:
                 try:
-                    client = QdrantClient(path=str(VECTORDB_FOLDER))
-                except RuntimeError as rte:
-                    # Local Qdrant storage may be locked by another process. Fall
-                    # back to creating a temporary local storage to avoid the lock.
-                    logger.warning(
-                        "Could not open local Qdrant at %s: %s. Creating temporary storage.",
-                        VECTORDB_FOLDER,
-                        rte,
-                    )
-                    tmp_folder = str(VECTORDB_FOLDER) + f"_tmp_{uuid4().hex}"
-                    os.makedirs(tmp_folder, exist_ok=True)
-                    client = QdrantClient(path=tmp_folder)
-                # Ensure the client has a `search` method expected by
-                # langchain_community.vectorstores.qdrant. Newer qdrant-client
-                # exposes `query_points`, so we monkeypatch a compatible
-                # `search` method when absent.
-                try:
-                    import types
-
-                    if not hasattr(client, "search"):
-                        def _search(
-                            self,
-                            collection_name,
-                            query_vector,
-                            query_filter=None,
-                            search_params=None,
-                            limit=4,
-                            offset=0,
-                            with_payload=True,
-                            with_vectors=False,
-                            score_threshold=None,
-                            consistency=None,
-                            **kwargs,
-                        ):
-                            # Delegate to query_points which has a compatible signature
-                            res = self.query_points(
-                                collection_name=collection_name,
-                                query=query_vector,
-                                query_filter=query_filter,
-                                search_params=search_params,
-                                limit=limit,
-                                offset=offset,
-                                with_payload=with_payload,
-                                with_vectors=with_vectors,
-                                score_threshold=score_threshold,
-                                consistency=consistency,
+                    from qdrant_client import QdrantClient
+                    from qdrant_client.http.models import VectorParams, Distance
+
+                    # Ensure the directory exists for local Qdrant
+                    try:
+                        client = QdrantClient(path=str(VECTORDB_FOLDER))
+                    except RuntimeError as rte:
+                        # Local Qdrant storage may be locked by another process. Fall
+                        # back to creating a temporary local storage to avoid the lock.
+                        logger.warning(
+                            "Could not open local Qdrant at %s: %s. Creating temporary storage.",
+                            VECTORDB_FOLDER,
+                            rte,
+                        )
+                        tmp_folder = str(VECTORDB_FOLDER) + f"_tmp_{uuid4().hex}"
+                        os.makedirs(tmp_folder, exist_ok=True)
+                        client = QdrantClient(path=tmp_folder)
+                    # Ensure the client has a `search` method expected by
+                    # langchain_community.vectorstores.qdrant. Newer qdrant-client
+                    # exposes `query_points`, so we monkeypatch a compatible
+                    # `search` method when absent.
+                    try:
+                        import types
+
+                        if not hasattr(client, "search"):
+                            def _search(
+                                self,
+                                collection_name,
+                                query_vector,
+                                query_filter=None,
+                                search_params=None,
+                                limit=4,
+                                offset=0,
+                                with_payload=True,
+                                with_vectors=False,
+                                score_threshold=None,
+                                consistency=None,
                                 **kwargs,
-                            )
-                            # qdrant-client returns a QueryResponse object with a
-                            # `.points` attribute. LangChain expects an iterable of
-                            # scored-point-like objects; return `.points` when
-                            # available, otherwise try to coerce to list.
-                            if hasattr(res, "points"):
-                                return res.points
-                            try:
-                                return list(res)
-                            except Exception:
-                                return res
-
-                        client.search = types.MethodType(_search, client)
-                except Exception:
-                    logger.exception("Failed to attach 'search' shim to QdrantClient; search may fail.")
+                            ):
+                                # Delegate to query_points which has a compatible signature
+                                res = self.query_points(
+                                    collection_name=collection_name,
+                                    query=query_vector,
+                                    query_filter=query_filter,
+                                    search_params=search_params,
+                                    limit=limit,
+                                    offset=offset,
+                                    with_payload=with_payload,
+                                    with_vectors=with_vectors,
+                                    score_threshold=score_threshold,
+                                    consistency=consistency,
+                                    **kwargs,
+                                )
+                                # qdrant-client returns a QueryResponse object with a
+                                # `.points` attribute. LangChain expects an iterable of
+                                # scored-point-like objects; return `.points` when
+                                # available, otherwise try to coerce to list.
+                                if hasattr(res, "points"):
+                                    return res.points
+                                try:
+                                    return list(res)
+                                except Exception:
+                                    return res
 
-                # Determine vector size by embedding one chunk (may duplicate work)
-                if len(chunks) == 0:
-                    raise ValueError("No document chunks available to determine embedding size")
-                sample_vec = Settings.get_embed_model().embed_documents([chunks[0].page_content])[0]
-                dim = len(sample_vec)
+                            client.search = types.MethodType(_search, client)
+                    except Exception:
+                        logger.exception("Failed to attach 'search' shim to QdrantClient; search may fail.")
 
-                vectors_config = VectorParams(size=dim, distance=Distance.COSINE)
+                    # Determine vector size by embedding one chunk (may duplicate work)
+                    if len(chunks) == 0:
+                        raise ValueError("No document chunks available to determine embedding size")
+                    sample_vec = Settings.get_embed_model().embed_documents([chunks[0].page_content])[0]
+                    dim = len(sample_vec)
 
-                # Create collection if it doesn't exist
-                try:
-                    client.create_collection(collection_name=str(COLLECTION_NAME), vectors_config=vectors_config)
-                except Exception:
-                    # If creation fails because collection exists, ignore
-                    logger.debug("create_collection raised; continuing and attempting to upsert")
+                    vectors_config = VectorParams(size=dim, distance=Distance.COSINE)
 
-                # Construct the LangChain Qdrant wrapper and add documents
-                qdrant_store = QdrantVectorStore(client=client, collection_name=str(COLLECTION_NAME), embedding=Settings.get_embed_model())
-                try:
-                    qdrant_store.add_documents(chunks)
-                    vector_store = qdrant_store
-                except Exception as e:
-                    # If embedding or upsert fails (quota, network, etc), attempt to
-                    # remove any partially created collection and the chunks file so
-                    # subsequent runs will reindex cleanly instead of returning a
-                    # partially-populated index.
-                    logger.exception("Failed while adding documents to Qdrant: %s", e)
+                    # Create collection if it doesn't exist
                     try:
-                        # Try to delete the collection if it exists
-                        client.delete_collection(collection_name=str(COLLECTION_NAME))
-                        logger.info("Deleted partial collection %s due to failure", COLLECTION_NAME)
+                        client.create_collection(collection_name=str(COLLECTION_NAME), vectors_config=vectors_config)
                     except Exception:
-                        logger.debug("Could not delete partial collection (it may not exist)")
-                    # Remove the chunks file so a future run will re-create it
+                        # If creation fails because collection exists, ignore
+                        logger.debug("create_collection raised; continuing and attempting to upsert")
+
+                    # Construct the LangChain Qdrant wrapper and add documents
+                    qdrant_store = QdrantVectorStore(client=client, collection_name=str(COLLECTION_NAME), embedding=Settings.get_embed_model())
                     try:
-                        if Path(CHUNKS_FILE).is_file():
-                            os.remove(CHUNKS_FILE)
-                            logger.info("Removed chunks file %s after failed indexing", CHUNKS_FILE)
-                    except Exception:
-                        logger.exception("Failed to remove chunks file after failed indexing")
-                    # Re-raise to surface the original error to callers
+                        qdrant_store.add_documents(chunks)
+                        vector_store = qdrant_store
+                    except Exception as e:
+                        # If embedding or upsert fails (quota, network, etc), attempt to
+                        # remove any partially created collection and the chunks file so
+                        # subsequent runs will reindex cleanly instead of returning a
+                        # partially-populated index.
+                        logger.exception("Failed while adding documents to Qdrant: %s", e)
+                        try:
+                            # Try to delete the collection if it exists
+                            client.delete_collection(collection_name=str(COLLECTION_NAME))
+                            logger.info("Deleted partial collection %s due to failure", COLLECTION_NAME)
+                        except Exception:
+                            logger.debug("Could not delete partial collection (it may not exist)")
+                        # Remove the chunk store so a future run will re-create it
+                        try:
+                            if os.path.isdir(CHUNK_STORE_DIR):
+                                shutil.rmtree(CHUNK_STORE_DIR)
+                                logger.info("Removed chunk store %s after failed indexing", CHUNK_STORE_DIR)
+                        except Exception:
+                            logger.exception("Failed to remove chunk store after failed indexing")
+                        # Re-raise to surface the original error to callers
+                        raise
+                except Exception:
+                    logger.exception("Failed to create Qdrant collection via fallback path")
                     raise
-            except Exception:
-                logger.exception("Failed to create Qdrant collection via fallback path")
-                raise
+            # Serve reads from the memory-mapped store rather than the in-memory list
+            chunks = chunk_store
         logger.info(
             f"Successfully created vector store at {VECTORDB_FOLDER}/{COLLECTION_NAME}"
         )
     else:
         logger.info(
-            f"Document Chunks file: {CHUNKS_FILE} Present. Returning existing Index"
+            f"Document chunk store: {CHUNK_STORE_DIR} Present. Returning existing Index"
         )
-        with open(CHUNKS_FILE, "rb") as f:
-            chunks = pickle.load(f)
+        chunks = existing_chunks
 
         # Connect to existing Qdrant vector store WITHOUT re-embedding
         # This is much faster since embeddings already exist in the collection
         try:
             # Create vector store by connecting to existing collection (no re-embedding)
-            vector_store = QdrantVectorStore(
-                client=client,
-                collection_name=str(COLLECTION_NAME),
-                embedding=Settings.get_embed_model(),
-                vector_name="embedding" if use_cloud else "",  # Specify vector name for cloud
-            )
+            with startup_phase("qdrant_connect"):
+                if not use_cloud:
+                    from qdrant_client import QdrantClient
+                    client = QdrantClient(path=str(VECTORDB_FOLDER))
+                vector_store = QdrantVectorStore(
+                    client=client,
+                    collection_name=str(COLLECTION_NAME),
+                    embedding=Settings.get_embed_model(),
+                    vector_name="embedding" if use_cloud else "",  # Specify vector name for cloud
+                )
             logger.info(f"Loaded existing collection '{COLLECTION_NAME}' with {len(chunks)} chunks")
 
         except Exception as e:
@@ -305,13 +339,210 @@ def create_qdrant_vector_store(force_recreate: bool = True) -> tuple[QdrantVecto
                 # For cloud, can't recreate easily, raise error
                 raise
             else:
-                vector_store = QdrantVectorStore.from_documents(
-                    documents=chunks,
-                    embedding=Settings.get_embed_model(),
-                    path=str(VECTORDB_FOLDER),
-                    collection_name=str(COLLECTION_NAME),
-                    force_recreate=False,
-                )
+                with startup_phase("qdrant_reindex"):
+                    vector_store = QdrantVectorStore.from_documents(
+                        documents=chunks,
+                        embedding=Settings.get_embed_model(),
+                        path=str(VECTORDB_FOLDER),
+                        collection_name=str(COLLECTION_NAME),
+                        force_recreate=False,
+                    )
 
         logger.info(f"Returning existing vector store at {VECTORDB_FOLDER}")
     return vector_store, chunks
+
+
+def _source_files(main_folder: str) -> Dict[str, Tuple[str, str]]:
+    """Map each processed document name to its (markdown, metadata) paths, sorted by name."""
+    sources = {}
+    for filename in sorted(os.listdir(main_folder)):
+        file_path = os.path.join(main_folder, filename)
+        if not os.path.isdir(file_path):
+            continue
+        md_file = os.path.join(file_path, f"{filename}.md")
+        json_file = os.path.join(file_path, f"{filename}_metadata.json")
+        if os.path.exists(md_file) and os.path.exists(json_file):
+            sources[filename] = (md_file, json_file)
+        else:
+            logger.error(f"File does not exists {md_file} and {json_file}")
+    return sources
+
+
+def _file_content_hash(paths) -> str:
+    """SHA-256 over the contents of the given files (markdown + metadata)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def chunk_point_id(filename: str, chunk_index: int) -> str:
+    """Deterministic Qdrant point id for the chunk_index-th chunk of a document.
+
+    Re-indexing a changed file overwrites its points in place instead of
+    leaving orphans behind, and a retried run upserts the same ids again.
+    """
+    return str(uuid5(NAMESPACE_URL, f"{COLLECTION_NAME}/{filename}#{chunk_index}"))
+
+
+def _load_manifest(manifest_path: str) -> Optional[dict]:
+    if not os.path.isfile(manifest_path):
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        logger.warning(f"Unreadable index manifest {manifest_path}; doing a full re-index")
+        return None
+    if manifest.get("version") != INDEX_MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def _save_manifest(manifest: dict, manifest_path: str):
+    tmp_path = f"{manifest_path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def update_qdrant_vector_store(chunk_size: int = 512, chunk_overlap: int = 64) -> tuple[QdrantVectorStore, ChunkStore]:
+    """
+    Incrementally index LOCAL_FOLDER/COLLECTION_NAME into the local Qdrant store.
+
+    A manifest next to the chunk store records, for every processed document,
+    a hash of its markdown and metadata, its chunk range in the chunk store and
+    its Qdrant point ids. Only new or changed documents are chunked and
+    embedded; points of removed documents (and surplus points of documents
+    that shrank) are deleted. Without a manifest, or when the chunking or
+    embedding settings changed, the collection is rebuilt from scratch.
+
+    The manifest is written only after Qdrant has been updated, so an
+    interrupted run simply redoes the same upserts next time.
+
+    Returns:
+        tuple: (QdrantVectorStore, ChunkStore) like create_qdrant_vector_store
+    """
+    from src.config import QDRANT_URL, QDRANT_API_KEY
+
+    if QDRANT_URL and QDRANT_API_KEY:
+        raise ValueError("Incremental indexing only supports the local Qdrant store")
+
+    start = time.perf_counter()
+    collection_dir = os.path.join(str(VECTORDB_FOLDER), str(COLLECTION_NAME))
+    os.makedirs(collection_dir, exist_ok=True)
+    chunk_store_dir = os.path.join(collection_dir, CHUNK_STORE_DIRNAME)
+    manifest_path = os.path.join(collection_dir, INDEX_MANIFEST_FILENAME)
+
+    sources = _source_files(os.path.join(str(LOCAL_FOLDER), str(COLLECTION_NAME)))
+    hashes = {name: _file_content_hash(paths) for name, paths in sources.items()}
+
+    index_settings = {
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "embedding_provider": EMBEDDING_PROVIDER,
+        "embed_model": EMBED_MODEL,
+    }
+    manifest = _load_manifest(manifest_path)
+    full_rebuild = manifest is None or manifest.get("settings") != index_settings
+    if full_rebuild:
+        logger.info("No usable index manifest (missing or settings changed). Re-indexing all documents")
+    old_files = {} if full_rebuild else manifest.get("files", {})
+
+    changed = [name for name in sources if old_files.get(name, {}).get("hash") != hashes[name]]
+    removed = [name for name in old_files if name not in sources]
+    logger.info(
+        f"Incremental index: {len(sources)} documents, {len(changed)} new/changed, "
+        f"{len(removed)} removed, {len(sources) - len(changed)} unchanged"
+    )
+
+    # Unchanged documents are copied from the current chunk store when it is the
+    # one the manifest describes; otherwise they are re-chunked (but not re-embedded)
+    old_store = None if full_rebuild else open_chunk_store(collection_dir)
+    reuse_store = old_store is not None and manifest.get("chunk_store_fingerprint") == old_store.fingerprint
+
+    new_chunks = {}
+    for name in sources:
+        if name in changed or not reuse_store:
+            md_file, json_file = sources[name]
+            with open(md_file, "r", encoding="utf-8") as f:
+                md_content = f.read()
+            with open(json_file, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            new_chunks[name] = chunk_doc([Document(page_content=md_content, metadata=metadata)], chunk_size, chunk_overlap)
+            for i, chunk in enumerate(new_chunks[name]):
+                chunk.id = chunk_point_id(name, i)
+
+    upsert_docs, upsert_ids, stale_ids = [], [], []
+    for name in changed:
+        ids = [chunk_point_id(name, i) for i in range(len(new_chunks[name]))]
+        upsert_docs.extend(new_chunks[name])
+        upsert_ids.extend(ids)
+        stale_ids.extend(set(old_files.get(name, {}).get("point_ids", [])) - set(ids))
+    for name in removed:
+        stale_ids.extend(old_files[name].get("point_ids", []))
+
+    embed_model = Settings.get_embed_model()
+    if full_rebuild:
+        if not upsert_docs:
+            raise ValueError("No document chunks available to index")
+        vector_store = QdrantVectorStore.from_documents(
+            documents=upsert_docs,
+            embedding=embed_model,
+            ids=upsert_ids,
+            path=str(VECTORDB_FOLDER),
+            collection_name=str(COLLECTION_NAME),
+            force_recreate=True,
+        )
+    else:
+        vector_store = QdrantVectorStore.from_existing_collection(
+            embedding=embed_model,
+            path=str(VECTORDB_FOLDER),
+            collection_name=str(COLLECTION_NAME),
+        )
+        if stale_ids:
+            vector_store.delete(ids=stale_ids)
+            logger.info(f"Deleted {len(stale_ids)} stale points")
+        if upsert_docs:
+            vector_store.add_documents(upsert_docs, ids=upsert_ids)
+    logger.info(f"Embedded and upserted {len(upsert_docs)} chunks")
+
+    if not changed and not removed and reuse_store:
+        chunk_store = old_store
+    else:
+        def _ordered_chunks():
+            for name in sources:
+                if name in new_chunks:
+                    yield from new_chunks[name]
+                else:
+                    entry = old_files[name]
+                    yield from old_store[entry["chunk_start"]:entry["chunk_start"] + entry["n_chunks"]]
+
+        chunk_store = ChunkStore.write(_ordered_chunks(), chunk_store_dir)
+
+    files = {}
+    chunk_start = 0
+    for name in sources:
+        n_chunks = len(new_chunks[name]) if name in new_chunks else old_files[name]["n_chunks"]
+        files[name] = {
+            "hash": hashes[name],
+            "chunk_start": chunk_start,
+            "n_chunks": n_chunks,
+            "point_ids": [chunk_point_id(name, i) for i in range(n_chunks)],
+        }
+        chunk_start += n_chunks
+    _save_manifest(
+        {
+            "version": INDEX_MANIFEST_VERSION,
+            "settings": index_settings,
+            "chunk_store_fingerprint": chunk_store.fingerprint,
+            "files": files,
+        },
+        manifest_path,
+    )
+
+    logger.info(f"Incremental index of {len(chunk_store)} chunks up to date in {time.perf_counter() - start:.2f}s")
+    return vector_store, chunk_store
@@ -0,0 +1,240 @@
+"""
+Process-Wide Index Service
+
+One read-only bundle of the loaded index per process: the Qdrant vector
+store, the chunk store, the hybrid retriever (with its BM25 index) and the
+proper-noun variant manager. Streamlit sessions and CLI code share it instead
+of each reopening local Qdrant and rebuilding BM25, so concurrent users do not
+multiply memory or trip over the local Qdrant lock (which only one client per
+process may hold).
+
+    service = get_index_service()          # loads on first call, thread-safe
+    docs = service.retriever.invoke("Who is Sudas?")
+    service.memory_footprint()             # bytes per component and process RSS
+
+`rebuild_index_service()` closes the current Qdrant client before reindexing,
+then swaps in the new bundle; callers holding the old one should fetch the
+service again.
+"""
+
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.helper import logger
+
+
+@dataclass(frozen=True)
+class IndexService:
+    """Loaded index components; never mutated after construction."""
+
+    vector_store: Any
+    chunks: Any  # ChunkStore (local index) or list of Documents
+    retriever: Any  # HybridRetriever, or the plain Qdrant retriever if BM25 is unavailable
+    variant_manager: Any
+    load_seconds: float
+    loaded_at: float
+
+    @property
+    def bm25_index(self):
+        """The BM25Index behind the hybrid retriever, if it uses the persistent one."""
+        keyword_retriever = getattr(self.retriever, "keyword_retriever", None)
+        return getattr(keyword_retriever, "index", None)
+
+    def memory_footprint(self) -> Dict[str, Any]:
+        """Approximate bytes held by each component, plus the process RSS.
+
+        Memory-mapped data (chunk store, persistent BM25 index) sits in the OS
+        page cache and is shared between sessions and processes, so it is
+        reported apart from heap bytes.
+        """
+        chunk_heap, chunk_mapped = _array_bytes(self.chunks)
+        if isinstance(self.chunks, list):
+            chunk_heap = _deep_sizeof(self.chunks)
+
+        footprint: Dict[str, Any] = {
+            "process_rss_bytes": _process_rss(),
+            "chunks": {"count": len(self.chunks), "heap_bytes": chunk_heap, "mapped_bytes": chunk_mapped},
+            "vector_store": _vector_store_footprint(self.vector_store),
+            "variant_manager": {
+                "variants": len(getattr(self.variant_manager, "variant_to_canonical", {})),
+                "heap_bytes": _deep_sizeof(vars(self.variant_manager)) if self.variant_manager is not None else 0,
+            },
+        }
+
+        bm25 = self.bm25_index
+        if bm25 is not None:
+            bm25_heap, bm25_mapped = _array_bytes(bm25)
+            footprint["bm25"] = {"terms": bm25.num_terms, "heap_bytes": bm25_heap, "mapped_bytes": bm25_mapped}
+        else:
+            keyword_retriever = getattr(self.retriever, "keyword_retriever", None)
+            footprint["bm25"] = {"heap_bytes": _deep_sizeof(keyword_retriever) if keyword_retriever is not None else 0}
+
+        cache = getattr(self.retriever, "result_cache", None)
+        if cache is not None:
+            footprint["retrieval_cache"] = cache.stats()
+        return footprint
+
+    def close(self):
+        """Release the Qdrant client (and with it the local storage lock)."""
+        client = getattr(self.vector_store, "client", None)
+        if client is not None and hasattr(client, "close"):
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close Qdrant client: {e}")
+
+
+def _array_bytes(obj) -> Tuple[int, int]:
+    """(heap, mapped) bytes of the numpy arrays and mmaps held directly by obj."""
+    heap = mapped = 0
+    for value in vars(obj).values() if hasattr(obj, "__dict__") else ():
+        if isinstance(value, np.memmap):
+            mapped += value.nbytes
+        elif isinstance(value, np.ndarray):
+            heap += value.nbytes
+        elif type(value).__name__ == "mmap":
+            mapped += len(value)
+        elif isinstance(value, (bytes, bytearray)):
+            heap += len(value)
+    return heap, mapped
+
+
+def _deep_sizeof(obj, _seen: Optional[set] = None) -> int:
+    """Recursive sys.getsizeof over containers and plain objects."""
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif isinstance(obj, np.ndarray):
+        size += 0 if isinstance(obj, np.memmap) else obj.nbytes
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        size += _deep_sizeof(vars(obj), seen)
+    return size
+
+
+def _process_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (Linux), else the peak RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None
+
+
+def _vector_store_footprint(vector_store) -> Dict[str, Any]:
+    """Point count and an estimate of the float32 vector bytes held by Qdrant."""
+    client = getattr(vector_store, "client", None)
+    collection = getattr(vector_store, "collection_name", None)
+    if client is None or collection is None:
+        return {}
+    try:
+        info = client.get_collection(collection)
+        points = info.points_count or 0
+        vectors = info.config.params.vectors
+        dims = sum(v.size for v in vectors.values()) if isinstance(vectors, dict) else vectors.size
+        return {"points": points, "dimensions": dims, "vector_bytes": points * dims * 4}
+    except Exception as e:
+        logger.debug(f"Could not inspect Qdrant collection {collection}: {e}")
+        return {}
+
+
+def format_footprint(footprint: Dict[str, Any]) -> str:
+    """One-line MB summary of memory_footprint() for logs and UIs."""
+    def mb(value) -> str:
+        return f"{value / (1024 * 1024):.1f} MB" if value is not None else "n/a"
+
+    parts = [f"RSS {mb(footprint.get('process_rss_bytes'))}"]
+    chunks = footprint.get("chunks", {})
+    parts.append(f"chunks {chunks.get('count', 0)} ({mb(chunks.get('heap_bytes', 0))} heap, {mb(chunks.get('mapped_bytes', 0))} mapped)")
+    bm25 = footprint.get("bm25", {})
+    parts.append(f"BM25 {mb(bm25.get('heap_bytes', 0))} heap, {mb(bm25.get('mapped_bytes', 0))} mapped")
+    vectors = footprint.get("vector_store", {})
+    if vectors:
+        parts.append(f"vectors {vectors['points']} x {vectors['dimensions']} (~{mb(vectors['vector_bytes'])})")
+    parts.append(f"variants {mb(footprint.get('variant_manager', {}).get('heap_bytes', 0))}")
+    return ", ".join(parts)
+
+
+_lock = threading.Lock()
+_service: Optional[IndexService] = None
+
+
+def _load(force_recreate: bool = False, update: bool = False) -> IndexService:
+    from src.utils.index_files import create_qdrant_vector_store, update_qdrant_vector_store
+    from src.utils.retriever import create_retriever
+    from src.utils.proper_noun_variants import get_manager
+
+    start = time.perf_counter()
+    if update and not force_recreate:
+        vector_store, chunks = update_qdrant_vector_store()
+    else:
+        vector_store, chunks = create_qdrant_vector_store(force_recreate=force_recreate)
+    retriever = create_retriever(vector_store, chunks)
+    service = IndexService(
+        vector_store=vector_store,
+        chunks=chunks,
+        retriever=retriever,
+        variant_manager=get_manager(),
+        load_seconds=time.perf_counter() - start,
+        loaded_at=time.time(),
+    )
+    logger.info(f"Index service ready in {service.load_seconds:.1f}s: {format_footprint(service.memory_footprint())}")
+    return service
+
+
+def get_index_service() -> IndexService:
+    """The process-wide index, loaded on first use (once, even with concurrent callers)."""
+    global _service
+    service = _service
+    if service is None:
+        with _lock:
+            if _service is None:
+                _service = _load()
+            service = _service
+    return service
+
+
+def index_service_loaded() -> bool:
+    """Whether this process already holds the index (and so the local Qdrant lock)."""
+    return _service is not None
+
+
+def rebuild_index_service(force_recreate: bool = True, update: bool = False) -> IndexService:
+    """Reindex and replace the process-wide index.
+
+    The old Qdrant client is closed first: local Qdrant storage can only be
+    opened by one client at a time.
+    """
+    global _service
+    with _lock:
+        old, _service = _service, None
+        if old is not None:
+            old.close()
+        _service = _load(force_recreate=force_recreate, update=update)
+        return _service
+
+
+def reset_index_service():
+    """Drop the process-wide index, closing its Qdrant client."""
+    global _service
+    with _lock:
+        old, _service = _service, None
+    if old is not None:
+        old.close()
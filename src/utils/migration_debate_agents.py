@@ -10,10 +10,24 @@ Based on scholarly arguments, textual evidence, and archaeological data.
 """
 
 from typing import Optional
+import contextvars
 import json
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from settings import Settings
+from config import DEBATE_AGENT_TIMEOUT, DEBATE_PARALLEL
+
+_END_OF_REPLY = object()
+
+
+def _reply(llm, messages, on_token=None) -> str:
+    """The LLM's reply text; streamed to `on_token(text)` as it arrives when given."""
+    if on_token is None:
+        return Settings.invoke_llm(llm, messages).content
+    return Settings.stream_llm(llm, messages, on_token).content
 
 
 class AMTAgent:
@@ -142,7 +156,7 @@ Remember: Your goal is scholarly analysis, not ideological victory. Present the
 fairly while acknowledging its limitations and competing theories."""
 
     def analyze_verse(self, verse_ref: str, griffith_text: str, sharma_text: str,
-                     context: str = "") -> str:
+                     context: str = "", on_token=None) -> str:
         """Generate AMT analysis of a verse."""
 
         prompt = f"""Analyze the following Rigvedic verse from an AMT (Aryan Migration Theory) perspective.
@@ -171,9 +185,7 @@ Focus on textual evidence, geographic clues, cultural indicators, and archaeolog
             {"role": "user", "content": prompt}
         ]
         # Use unified invocation to support different LLM providers
-        from settings import Settings
-        response = Settings.invoke_llm(self.llm, messages)
-        return response.content
+        return _reply(self.llm, messages, on_token)
 
 
 class OITAgent:
@@ -308,7 +320,7 @@ Remember: Your goal is rigorous scholarship, not cultural advocacy. Present OIT
 while acknowledging mainstream consensus and limitations of the theory."""
 
     def analyze_verse(self, verse_ref: str, griffith_text: str, sharma_text: str,
-                     context: str = "") -> str:
+                     context: str = "", on_token=None) -> str:
         """Generate OIT analysis of a verse."""
 
         prompt = f"""Analyze the following Rigvedic verse from an OIT (Out of India Theory) / Indigenous Aryan perspective.
@@ -332,9 +344,7 @@ Focus on Sarasvati evidence, indigenous markers, homeland language, and Harappan
             {"role": "user", "content": prompt}
         ]
         # Use unified invocation to support different LLM providers
-        from settings import Settings
-        response = Settings.invoke_llm(self.llm, messages)
-        return response.content
+        return _reply(self.llm, messages, on_token)
 
 
 class MigrationDebateOrchestrator:
@@ -343,12 +353,24 @@ class MigrationDebateOrchestrator:
 
     Goal: Evaluate specific verses for evidence supporting or contradicting
     migration theories, without predetermined conclusions.
+
+    The two scholars of a round only read the previous round, so with
+    `parallel` their calls run at the same time. Replies still print AMT
+    first: each one as soon as it and everything before it is done. An agent
+    that takes longer than `agent_timeout` seconds (0 = no limit) gets a
+    placeholder reply and the debate goes on. With `echo` off nothing is
+    printed, for debates running side by side.
     """
 
-    def __init__(self, amt_agent: AMTAgent, oit_agent: OITAgent, synthesis_llm):
+    def __init__(self, amt_agent: AMTAgent, oit_agent: OITAgent, synthesis_llm,
+                 parallel: bool = DEBATE_PARALLEL, agent_timeout: float = DEBATE_AGENT_TIMEOUT,
+                 echo: bool = True):
         self.amt_agent = amt_agent
         self.oit_agent = oit_agent
         self.synthesis_llm = synthesis_llm
+        self.parallel = parallel
+        self.agent_timeout = agent_timeout
+        self.echo = echo
 
         self.synthesis_prompt = """You are a neutral scholar synthesizing competing interpretations of Rigvedic verses
 in the context of Aryan Migration Theory (AMT) vs Out of India Theory (OIT).
@@ -628,21 +650,21 @@ composition dates, and authorship - without predetermined conclusions."""
         Returns:
             Dictionary with debate transcript
         """
-        print(f"\n{'='*80}")
-        print(f"📖 VERSE: {verse_ref}")
-        print(f"🎯 DEBATE: AMT vs OIT Analysis")
-        print(f"{'='*80}\n")
+        self._echo(f"\n{'='*80}")
+        self._echo(f"📖 VERSE: {verse_ref}")
+        self._echo(f"🎯 DEBATE: AMT vs OIT Analysis")
+        self._echo(f"{'='*80}\n")
 
-        print("🔵 GRIFFITH'S TRANSLATION:")
-        print(f"{griffith_text}\n")
+        self._echo("🔵 GRIFFITH'S TRANSLATION:")
+        self._echo(f"{griffith_text}\n")
 
-        print("🟢 SHARMA'S TRANSLATION:")
-        print(f"{sharma_text}\n")
+        self._echo("🟢 SHARMA'S TRANSLATION:")
+        self._echo(f"{sharma_text}\n")
 
         if context:
-            print(f"📋 CONTEXT:\n{context}\n")
+            self._echo(f"📋 CONTEXT:\n{context}\n")
 
-        print(f"{'='*80}\n")
+        self._echo(f"{'='*80}\n")
 
         debate_history = {
             "verse_ref": verse_ref,
@@ -655,30 +677,27 @@ composition dates, and authorship - without predetermined conclusions."""
         }
 
         # Initial analyses
-        print(f"🎯 ROUND 1: Initial Analyses\n")
-        print(f"{'-'*80}")
-        print("AMT SCHOLAR (Migration Theory Perspective)\n")
-
-        amt_analysis = self.amt_agent.analyze_verse(verse_ref, griffith_text, sharma_text, context)
-        print(amt_analysis)
-        print(f"\n{'-'*80}")
-        print("OIT SCHOLAR (Indigenous Theory Perspective)\n")
+        self._echo(f"🎯 ROUND 1: Initial Analyses\n")
+        self._echo(f"{'-'*80}")
 
-        oit_analysis = self.oit_agent.analyze_verse(verse_ref, griffith_text, sharma_text, context)
-        print(oit_analysis)
-        print(f"\n{'='*80}\n")
+        (amt_analysis, oit_analysis), timed_out = self._run_round([
+            ("AMT SCHOLAR (Migration Theory Perspective)", self.amt_agent,
+             lambda on_token: self.amt_agent.analyze_verse(verse_ref, griffith_text, sharma_text, context, on_token)),
+            ("OIT SCHOLAR (Indigenous Theory Perspective)", self.oit_agent,
+             lambda on_token: self.oit_agent.analyze_verse(verse_ref, griffith_text, sharma_text, context, on_token)),
+        ])
 
         debate_history["rounds"].append({
             "round": 1,
             "amt_analysis": amt_analysis,
-            "oit_analysis": oit_analysis
+            "oit_analysis": oit_analysis,
+            **({"timed_out": timed_out} if timed_out else {})
         })
 
         # Additional rounds (rebuttals)
         for round_num in range(2, rounds + 1):
-            print(f"🔄 ROUND {round_num}: Rebuttals\n")
-            print(f"{'-'*80}")
-            print("AMT SCHOLAR (Response to OIT)\n")
+            self._echo(f"🔄 ROUND {round_num}: Rebuttals\n")
+            self._echo(f"{'-'*80}")
 
             amt_rebuttal_prompt = f"""The OIT scholar argues:
 
@@ -691,16 +710,6 @@ Provide a focused rebuttal (max 300 words):
 
 Be concise and direct."""
 
-            amt_messages = [
-                {"role": "system", "content": self.amt_agent.system_prompt[:800]},  # Truncate system prompt
-                {"role": "user", "content": f"Verse: {verse_ref}\n\n{amt_rebuttal_prompt}"}
-            ]
-            amt_rebuttal = Settings.invoke_llm(self.amt_agent.llm, amt_messages).content
-            print(amt_rebuttal)
-
-            print(f"\n{'-'*80}")
-            print("OIT SCHOLAR (Response to AMT)\n")
-
             oit_rebuttal_prompt = f"""The AMT scholar argues:
 
 {amt_analysis[:1500]}...
@@ -712,18 +721,18 @@ Provide a focused rebuttal (max 300 words):
 
 Be concise and direct."""
 
-            oit_messages = [
-                {"role": "system", "content": self.oit_agent.system_prompt[:800]},  # Truncate system prompt
-                {"role": "user", "content": f"Verse: {verse_ref}\n\n{oit_rebuttal_prompt}"}
-            ]
-            oit_rebuttal = Settings.invoke_llm(self.oit_agent.llm, oit_messages).content
-            print(oit_rebuttal)
-            print(f"\n{'='*80}\n")
+            (amt_rebuttal, oit_rebuttal), timed_out = self._run_round([
+                ("AMT SCHOLAR (Response to OIT)", self.amt_agent,
+                 lambda on_token: self._rebuttal(self.amt_agent, verse_ref, amt_rebuttal_prompt, on_token)),
+                ("OIT SCHOLAR (Response to AMT)", self.oit_agent,
+                 lambda on_token: self._rebuttal(self.oit_agent, verse_ref, oit_rebuttal_prompt, on_token)),
+            ])
 
             debate_history["rounds"].append({
                 "round": round_num,
                 "amt_rebuttal": amt_rebuttal,
-                "oit_rebuttal": oit_rebuttal
+                "oit_rebuttal": oit_rebuttal,
+                **({"timed_out": timed_out} if timed_out else {})
             })
 
             # Update for next round
@@ -731,7 +740,7 @@ Be concise and direct."""
             oit_analysis = oit_rebuttal
 
         # Synthesis
-        print(f"🎓 NEUTRAL SYNTHESIS: Evidence-Based Assessment\n")
+        self._echo(f"🎓 NEUTRAL SYNTHESIS: Evidence-Based Assessment\n")
 
         synthesis_prompt = f"""Verse Reference: {verse_ref}
 
@@ -781,9 +790,9 @@ Apply ALL error-prevention rules from your system prompt, especially:
             {"role": "user", "content": synthesis_prompt}
         ]
 
-        synthesis = Settings.invoke_llm(self.synthesis_llm, synthesis_messages).content
-        print(synthesis)
-        print(f"\n{'='*80}\n")
+        synthesis = _reply(self.synthesis_llm, synthesis_messages, self._echo_token if self.echo else None)
+        self._echo()
+        self._echo(f"\n{'='*80}\n")
 
         debate_history["synthesis"] = synthesis
 
@@ -793,8 +802,94 @@ Apply ALL error-prevention rules from your system prompt, especially:
 
         return debate_history
 
-    def _save_debate(self, verse_ref: str, debate_history: dict):
-        """Save debate transcript to JSON file."""
+    @staticmethod
+    def _rebuttal(agent, verse_ref: str, rebuttal_prompt: str, on_token=None) -> str:
+        messages = [
+            {"role": "system", "content": agent.system_prompt[:800]},  # Truncate system prompt
+            {"role": "user", "content": f"Verse: {verse_ref}\n\n{rebuttal_prompt}"}
+        ]
+        return _reply(agent.llm, messages, on_token)
+
+    def _run_round(self, turns: list) -> tuple:
+        """
+        Run one round's agent calls and print the replies in turn order.
+
+        Each reply streams to the terminal as it is written once the turns
+        before it are printed; until then its tokens wait in a queue.
+
+        Args:
+            turns: (heading, agent, call) per agent, in print order;
+                   call(on_token) returns the reply text
+
+        Returns:
+            (replies in turn order, names of the agents that timed out)
+        """
+        pool = ThreadPoolExecutor(max_workers=len(turns) if self.parallel else 1,
+                                  thread_name_prefix="debate-agent")
+        tokens = [queue.SimpleQueue() for _ in turns]
+
+        def submit(i, call):
+            def run():
+                try:
+                    return call(tokens[i].put if self.echo else None)
+                finally:
+                    tokens[i].put(_END_OF_REPLY)
+            return pool.submit(contextvars.copy_context().run, run), self._deadline()
+
+        try:
+            pending = [submit(i, call) for i, (_, _, call) in enumerate(turns)] if self.parallel else []
+            replies, timed_out = [], []
+            for i, (heading, agent, call) in enumerate(turns):
+                future, deadline = pending[i] if self.parallel else submit(i, call)
+                if i:
+                    self._echo(f"\n{'-'*80}")
+                self._echo(f"{heading}\n")
+                streamed, finished = self._print_tokens(tokens[i], deadline)
+                if finished:
+                    reply = future.result()
+                else:
+                    reply = f"[{agent.name} did not respond within {self.agent_timeout}s]"
+                    timed_out.append(agent.name)
+                if streamed != reply:
+                    if streamed:
+                        self._echo()
+                    self._echo(reply)
+                else:
+                    self._echo()
+                replies.append(reply)
+            self._echo(f"\n{'='*80}\n")
+            return replies, timed_out
+        finally:
+            # A timed-out call can't be interrupted; let it finish in the background
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _print_tokens(self, tokens: queue.SimpleQueue, deadline: Optional[float]) -> tuple:
+        """Print a reply's tokens until it ends or the deadline passes; returns (text, finished)."""
+        pieces = []
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                piece = tokens.get(timeout=timeout)
+            except queue.Empty:
+                return "".join(pieces), False
+            if piece is _END_OF_REPLY:
+                return "".join(pieces), True
+            pieces.append(piece)
+            self._echo_token(piece)
+
+    def _echo(self, *args):
+        if self.echo:
+            print(*args)
+
+    def _echo_token(self, text: str):
+        if self.echo:
+            print(text, end="", flush=True)
+
+    def _deadline(self) -> Optional[float]:
+        return time.monotonic() + self.agent_timeout if self.agent_timeout else None
+
+    def _save_debate(self, verse_ref: str, debate_history: dict) -> Path:
+        """Save debate transcript to JSON file; returns its path."""
         debates_dir = Path("migration_debates")
         debates_dir.mkdir(exist_ok=True)
 
@@ -807,4 +902,5 @@ Apply ALL error-prevention rules from your system prompt, especially:
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(debate_history, f, indent=2, ensure_ascii=False)
 
-        print(f"💾 Debate saved to: {filepath}")
+        self._echo(f"💾 Debate saved to: {filepath}")
+        return filepath
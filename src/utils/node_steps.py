@@ -0,0 +1,113 @@
+"""
+Graph Nodes Written Once, Run Sync or Async
+
+A node's logic is a generator that yields each blocking call it needs (an LLM
+chain, a retriever) as a `Call`, or a list of Calls and nested step
+generators that may run together, and gets the result back from the yield:
+
+    def _follow_up_steps(state):
+        response = yield Call(chain, inputs, llm)
+        return {"is_follow_up": response.strip().lower() == "yes"}
+
+    def check_follow_up_node(state):            # blocking graph
+        return run_steps(_follow_up_steps(state))
+
+    async def acheck_follow_up_node(state):     # async graph
+        return await arun_steps(_follow_up_steps(state))
+
+`run_steps` calls `.invoke` (a list runs on short-lived threads), `arun_steps`
+awaits `.ainvoke` (a list runs as concurrent tasks) while holding the
+provider's concurrency slot for LLM calls. A nested generator in a list is
+driven the same way, so a retrieval can run while a chain of dependent LLM
+calls is in flight. An exception raised by a call is thrown back into the
+generator at its yield, so try/except around a yield works the same as around
+`.invoke`.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Generator, List, NamedTuple, Optional, Union
+
+from src.utils.providers import provider_slot
+
+
+class Call(NamedTuple):
+    """One blocking call: runnable.invoke(input). `llm` is the chat model behind it, if any."""
+
+    runnable: Any
+    input: Any
+    llm: Optional[Any] = None
+
+    def invoke(self):
+        return self.runnable.invoke(self.input)
+
+    async def ainvoke(self):
+        async with provider_slot(self.llm):
+            return await self.runnable.ainvoke(self.input)
+
+
+Steps = Generator[Union[Call, List[Any]], Any, Any]
+
+
+def _run_one(request):
+    return request.invoke() if isinstance(request, Call) else run_steps(request)
+
+
+async def _arun_one(request):
+    if isinstance(request, Call):
+        return await request.ainvoke()
+    return await arun_steps(request)
+
+
+def _run_together(requests: list) -> list:
+    """Run the first request on this thread and the rest on their own threads.
+
+    A fresh executor per list (not a shared pool) so nested lists can never
+    wait on a pool their own parents are holding.
+    """
+    if len(requests) < 2:
+        return [_run_one(request) for request in requests]
+    with ThreadPoolExecutor(max_workers=len(requests) - 1, thread_name_prefix="node-steps") as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, _run_one, request)
+            for request in requests[1:]
+        ]
+        first = _run_one(requests[0])
+        return [first] + [future.result() for future in futures]
+
+
+def run_steps(steps: Steps):
+    """Drive a node's steps with blocking calls; returns the generator's return value."""
+    try:
+        request = next(steps)
+        while True:
+            try:
+                if isinstance(request, list):
+                    result = _run_together(request)
+                else:
+                    result = request.invoke()
+            except Exception as e:
+                request = steps.throw(e)
+            else:
+                request = steps.send(result)
+    except StopIteration as done:
+        return done.value
+
+
+async def arun_steps(steps: Steps):
+    """Drive a node's steps on the event loop; lists run concurrently."""
+    try:
+        request = next(steps)
+        while True:
+            try:
+                if isinstance(request, list):
+                    result = list(await asyncio.gather(*(_arun_one(r) for r in request)))
+                else:
+                    result = await request.ainvoke()
+            except Exception as e:
+                request = steps.throw(e)
+            else:
+                request = steps.send(result)
+    except StopIteration as done:
+        return done.value
@@ -417,3 +417,21 @@ Suggested Improvements:
 
 Final Answer:
 """
+
+TUTOR_PROMPT = """
+Teach the student using the passages from the Vedic texts below. Ground your explanation in them and quote or cite them (e.g. RV 1.1.1) where they support a point; if they do not cover the question, say so and teach from what you know.
+
+NAME PRESERVATION:
+- Keep ALL names EXACTLY as they appear in the student's question
+- Do NOT add diacritical marks to names that the student wrote without them
+
+Chat History:
+{chat_history}
+
+Context from Vedic texts:
+{documents}
+
+Student's question: {question}
+
+Provide a clear, pedagogical explanation:
+"""
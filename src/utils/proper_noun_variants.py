@@ -12,24 +12,119 @@ Usage:
 
     disambiguation = disambiguate_proper_noun("Bharata", context="battle")
     # Returns: Bharata (tribe), not Bharata (sage)
+
+The JSON is compiled once into a closure table (every lowercase name -> its
+canonical entry with interned variants and context) plus the confederation
+tables, and the compiled form is cached next to the JSON
+(proper_noun_variants.compiled.json), keyed by the JSON's size/mtime and hash.
 """
 
+import hashlib
 import json
-from typing import List, Dict, Optional, Tuple
+import os
+import sys
+from types import MappingProxyType
+from typing import Iterable, List, Dict, Mapping, NamedTuple, Optional, Tuple
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+VARIANT_CATEGORIES = ('sages', 'tribes_and_kingdoms', 'kings_and_heroes', 'deities', 'plants_and_materials')
+VARIANTS_CACHE_VERSION = 1
+
+# Constituent tribe -> confederation (only when the JSON has tribes_and_kingdoms)
+_PANCHALA_CONSTITUENTS = ['krivis', 'krivi', 'turvashas', 'turvasha', 'turvasa',
+                          'srinjayas', 'srinjaya', 'somakas', 'somaka',
+                          'keshins', 'keshin']
+# Kuru formation (Bharatas + Purus)
+_KURU_CONSTITUENTS = ['bharatas', 'bharata', 'purus', 'puru']
+
+
+class VariantEntry(NamedTuple):
+    """Everything known about one canonical proper noun (read-only)."""
+    canonical: str
+    variants: Tuple[str, ...]   # canonical first, then variants from every category
+    context: Mapping            # first category's data plus 'category' and 'canonical'
+
+
+def compile_variants(variants_data: Dict) -> Dict:
+    """Resolve the variants JSON into its lookup tables (a JSON-serializable dict)."""
+    # Variant → Canonical mapping (later categories win on collisions, as before)
+    variant_to_canonical = {}
+    for category in VARIANT_CATEGORIES:
+        for canonical, data in variants_data.get(category, {}).items():
+            # Map canonical name to itself
+            variant_to_canonical[canonical.lower()] = canonical
+            # Map all variants to canonical
+            for variant in data.get('variants', []):
+                variant_to_canonical[variant.lower()] = canonical
+
+    entries = {}
+    for canonical in dict.fromkeys(variant_to_canonical.values()):
+        variants = [canonical]  # Always include canonical
+        context = None
+        for category in VARIANT_CATEGORIES:
+            data = variants_data.get(category, {}).get(canonical)
+            if data is None:
+                continue
+            variants.extend(data.get('variants', []))
+            if context is None:
+                context = dict(data, category=category, canonical=canonical)
+        # Deduplicate (keeping order, so results do not depend on hash seeding)
+        entries[canonical] = {"variants": list(dict.fromkeys(variants)), "context": context}
+
+    confederations = {}
+    constituents = {}
+    if 'tribes_and_kingdoms' in variants_data:
+        tribes_data = variants_data['tribes_and_kingdoms']
+        confederations.update(dict.fromkeys(_PANCHALA_CONSTITUENTS, "Panchalas"))
+        confederations.update(dict.fromkeys(_KURU_CONSTITUENTS, "Kurus"))
+        if 'Panchalas' in tribes_data:
+            formation = tribes_data['Panchalas'].get('formation', {})
+            # Extract just the names (remove parenthetical descriptions)
+            panchalas = [c.split('(')[0].strip() for c in formation.get('constituent_tribes', [])]
+            constituents.update(dict.fromkeys(['panchalas', 'panchala'], panchalas))
+        # Bharatas + Purus formed Kurus
+        constituents.update(dict.fromkeys(['kurus', 'kuru'], ["Bharatas", "Purus"]))
+
+    return {
+        "variant_to_canonical": variant_to_canonical,
+        "entries": entries,
+        "homonyms": variants_data.get('homonyms'),
+        "confederations": confederations,
+        "constituents": constituents,
+    }
+
+
+def _file_fingerprint(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
 
 class ProperNounVariantManager:
     """Manages proper noun variants and disambiguation across Vedic translations."""
 
-    def __init__(self, variants_file: str = "proper_noun_variants.json"):
-        """Initialize with variants database."""
+    def __init__(self, variants_file: str = "proper_noun_variants.json", cache_file: Optional[str] = None):
+        """Initialize with variants database.
+
+        Args:
+            variants_file: The variants JSON
+            cache_file: Where to cache the compiled tables (default: next to the JSON;
+                "" disables the cache)
+        """
         self.variants_file = Path(variants_file)
-        self.variants_data = self._load_variants()
-        self._build_lookup_tables()
+        if cache_file is None:
+            cache_file = str(self.variants_file.with_name(self.variants_file.stem + ".compiled.json"))
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._variants_data = None
+        self._install(self._load_compiled())
+
+    @property
+    def variants_data(self) -> Dict:
+        """The raw variants JSON (read on first access; lookups use the compiled tables)."""
+        if self._variants_data is None:
+            self._variants_data = self._load_variants()
+        return self._variants_data
 
     def _load_variants(self) -> Dict:
         """Load variants from JSON file."""
@@ -44,27 +139,72 @@ class ProperNounVariantManager:
             logger.error(f"Error loading variants file: {e}")
             return {}
 
-    def _build_lookup_tables(self):
-        """Build reverse lookup tables for fast variant resolution."""
-        # Variant → Canonical mapping
-        self.variant_to_canonical = {}
-
-        # Process all categories
-        for category in ['sages', 'tribes_and_kingdoms', 'kings_and_heroes', 'deities', 'plants_and_materials']:
-            if category not in self.variants_data:
-                continue
-
-            for canonical, data in self.variants_data[category].items():
-                # Map canonical name to itself
-                self.variant_to_canonical[canonical.lower()] = canonical
-
-                # Map all variants to canonical
-                if 'variants' in data:
-                    for variant in data['variants']:
-                        self.variant_to_canonical[variant.lower()] = canonical
+    def _load_compiled(self) -> Dict:
+        """The compiled tables: from the cache if it matches the JSON, else compiled now."""
+        if not self.variants_file.exists():
+            return compile_variants(self.variants_data)
+
+        stat = self.variants_file.stat()
+        source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        cached = None
+        if self.cache_file is not None and self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                cached = None
+        if cached and cached.get("version") == VARIANTS_CACHE_VERSION:
+            # Same size and mtime, or same bytes (e.g. after a checkout touched the file)
+            if cached.get("source") == source or cached.get("fingerprint") == _file_fingerprint(self.variants_file):
+                logger.info(f"Loaded compiled variants from {self.cache_file}")
+                return cached["tables"]
+
+        tables = compile_variants(self.variants_data)
+        if self.cache_file is not None:
+            payload = {
+                "version": VARIANTS_CACHE_VERSION,
+                "source": source,
+                "fingerprint": _file_fingerprint(self.variants_file),
+                "tables": tables,
+            }
+            tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.tmp-{os.getpid()}")
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f, ensure_ascii=False)
+                os.replace(tmp_file, self.cache_file)
+            except OSError as e:
+                logger.warning(f"Could not cache compiled variants to {self.cache_file}: {e}")
+        return tables
+
+    def _install(self, tables: Dict):
+        """Freeze the compiled tables into interned, read-only lookup structures."""
+        intern = sys.intern
+        entries = {}
+        for canonical, entry in tables["entries"].items():
+            canonical = intern(canonical)
+            context = entry["context"]
+            entries[canonical] = VariantEntry(
+                canonical=canonical,
+                variants=tuple(intern(v) for v in entry["variants"]),
+                context=MappingProxyType(context) if context is not None else None,
+            )
+
+        # Variant → Canonical mapping, and every lowercase name → its entry
+        self.variant_to_canonical = {
+            intern(name): entries[canonical].canonical
+            for name, canonical in tables["variant_to_canonical"].items()
+        }
+        self._entries = {name: entries[canonical] for name, canonical in self.variant_to_canonical.items()}
+        self._homonyms = tables["homonyms"]
+        self._confederations = tables["confederations"]
+        self._constituents = {name: tuple(tribes) for name, tribes in tables["constituents"].items()}
 
         logger.info(f"Built lookup table with {len(self.variant_to_canonical)} variant mappings")
 
+    def get_entry(self, proper_noun: str) -> Optional[VariantEntry]:
+        """The compiled entry for a canonical name or any of its variants (O(1))."""
+        return self._entries.get(proper_noun.strip().lower())
+
     def get_variants(self, proper_noun: str) -> List[str]:
         """Get all spelling variants for a proper noun.
 
@@ -78,46 +218,32 @@ class ProperNounVariantManager:
             >>> manager.get_variants("Kashyapa")
             ["Kashyapa", "Kasyapa", "Kāśyapa", "Kashyap"]
         """
-        # Normalize input
-        normalized = proper_noun.strip()
-        canonical = self.variant_to_canonical.get(normalized.lower(), normalized)
-
-        # Find all variants for this canonical form
-        variants = [canonical]  # Always include canonical
+        entry = self.get_entry(proper_noun)
+        if entry is None:
+            return [proper_noun.strip()]
+        return list(entry.variants)
 
-        # Search all categories
-        for category in ['sages', 'tribes_and_kingdoms', 'kings_and_heroes', 'deities', 'plants_and_materials']:
-            if category not in self.variants_data:
-                continue
-
-            if canonical in self.variants_data[category]:
-                data = self.variants_data[category][canonical]
-                if 'variants' in data:
-                    variants.extend(data['variants'])
-
-        # Deduplicate and return
-        return list(set(variants))
+    def get_variants_many(self, proper_nouns: Iterable[str]) -> Dict[str, List[str]]:
+        """get_variants for several nouns at once: {noun: variants}."""
+        return {noun: self.get_variants(noun) for noun in proper_nouns}
 
     def get_context(self, proper_noun: str) -> Optional[Dict]:
         """Get contextual information about a proper noun.
 
         Returns role, context, sources, and other metadata.
         """
-        normalized = proper_noun.strip()
-        canonical = self.variant_to_canonical.get(normalized.lower(), normalized)
-
-        # Search all categories
-        for category in ['sages', 'tribes_and_kingdoms', 'kings_and_heroes', 'deities', 'plants_and_materials']:
-            if category not in self.variants_data:
-                continue
+        entry = self.get_entry(proper_noun)
+        if entry is None or entry.context is None:
+            return None
+        return dict(entry.context)
 
-            if canonical in self.variants_data[category]:
-                data = self.variants_data[category][canonical].copy()
-                data['category'] = category
-                data['canonical'] = canonical
-                return data
+    def get_confederation_for_tribe(self, tribe_name: str) -> Optional[str]:
+        """The confederation a constituent tribe belongs to, or None."""
+        return self._confederations.get(tribe_name.strip().lower())
 
-        return None
+    def get_constituent_tribes(self, confederation_name: str) -> List[str]:
+        """The constituent tribes that formed a confederation."""
+        return list(self._constituents.get(confederation_name.strip().lower(), ()))
 
     def disambiguate(self, proper_noun: str, context: str = "") -> Tuple[str, str]:
         """Disambiguate homonyms based on context.
@@ -140,14 +266,15 @@ class ProperNounVariantManager:
         context_lower = context.lower()
 
         # Check if this is a known homonym
-        if 'homonyms' not in self.variants_data:
+        homonyms = self._homonyms
+        if homonyms is None:
             return (normalized, "Unknown")
 
         # Check for Bharata disambiguation
         # NOTE: Bharatas were multi-faceted - both military tribe AND priestly lineage
         # Only distinguish when there's VERY specific context for individual sage "Bharata (Rshi)"
         if normalized.lower() in ['bharata', 'bharatas']:
-            for entry in self.variants_data['homonyms'].get('Bharata', []):
+            for entry in homonyms.get('Bharata', []):
                 # Only return individual sage form if explicitly mentioned with Devavata or in Yajurveda-only context
                 if 'individual sage' in entry.get('form', '').lower() or 'Rshi' in entry.get('form', ''):
                     individual_sage_hints = ['devavata', 'with devavata', 'bharata and devavata']
@@ -161,7 +288,7 @@ class ProperNounVariantManager:
 
         # Check for Purusha vs Puru
         if normalized.lower() in ['puru', 'purus', 'purusha']:
-            for entry in self.variants_data['homonyms'].get('Purusha_vs_Puru', []):
+            for entry in homonyms.get('Purusha_vs_Puru', []):
                 tribe_hints = ['battle', 'war', 'bharata', 'defeated', 'tribe']
                 if any(hint in context_lower for hint in tribe_hints):
                     if 'Puru' in entry['form'] and 'Tribe' in entry['role']:
@@ -174,7 +301,7 @@ class ProperNounVariantManager:
 
         # Check for Prajapati
         if normalized.lower() == 'prajapati':
-            for entry in self.variants_data['homonyms'].get('Prajapati', []):
+            for entry in homonyms.get('Prajapati', []):
                 if 'devata' in context_lower or 'deity' in context_lower:
                     if 'Devata' in entry['form']:
                         return (entry['form'], entry['role'])
@@ -232,6 +359,11 @@ def get_proper_noun_context(proper_noun: str) -> Optional[Dict]:
     return get_manager().get_context(proper_noun)
 
 
+def get_proper_noun_variants_many(proper_nouns: Iterable[str]) -> Dict[str, List[str]]:
+    """Get spelling variants for several proper nouns: {noun: variants}."""
+    return get_manager().get_variants_many(proper_nouns)
+
+
 def get_confederation_for_tribe(tribe_name: str) -> Optional[str]:
     """Get the confederation that a constituent tribe belongs to.
 
@@ -247,27 +379,7 @@ def get_confederation_for_tribe(tribe_name: str) -> Optional[str]:
         >>> get_confederation_for_tribe("Bharatas")
         "Kurus"  # (if Bharatas merged into Kurus)
     """
-    manager = get_manager()
-    tribe_normalized = tribe_name.strip().lower()
-
-    # Check tribes_and_kingdoms for confederations
-    if 'tribes_and_kingdoms' not in manager.variants_data:
-        return None
-
-    # Panchala constituents
-    panchala_constituents = ['krivis', 'krivi', 'turvashas', 'turvasha', 'turvasa',
-                             'srinjayas', 'srinjaya', 'somakas', 'somaka',
-                             'keshins', 'keshin']
-    if tribe_normalized in panchala_constituents:
-        return "Panchalas"
-
-    # Kuru formation (Bharatas + Purus)
-    kuru_constituents = ['bharatas', 'bharata', 'purus', 'puru']
-    if tribe_normalized in kuru_constituents:
-        # Check if context explicitly mentions merger
-        return "Kurus"
-
-    return None
+    return get_manager().get_confederation_for_tribe(tribe_name)
 
 
 def get_constituent_tribes(confederation_name: str) -> List[str]:
@@ -283,29 +395,7 @@ def get_constituent_tribes(confederation_name: str) -> List[str]:
         >>> get_constituent_tribes("Panchalas")
         ["Krivis", "Turvashas", "Srinjayas", "Somakas", "Keshins"]
     """
-    manager = get_manager()
-    confed_normalized = confederation_name.strip().lower()
-
-    # Direct lookup in metadata
-    if 'tribes_and_kingdoms' not in manager.variants_data:
-        return []
-
-    tribes_data = manager.variants_data['tribes_and_kingdoms']
-
-    # Check Panchalas
-    if confed_normalized in ['panchalas', 'panchala']:
-        if 'Panchalas' in tribes_data:
-            formation = tribes_data['Panchalas'].get('formation', {})
-            constituents = formation.get('constituent_tribes', [])
-            # Extract just the names (remove parenthetical descriptions)
-            return [c.split('(')[0].strip() for c in constituents]
-
-    # Check Kurus
-    if confed_normalized in ['kurus', 'kuru']:
-        # Bharatas + Purus formed Kurus
-        return ["Bharatas", "Purus"]
-
-    return []
+    return get_manager().get_constituent_tribes(confederation_name)
 
 
 # Example usage
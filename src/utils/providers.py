@@ -0,0 +1,126 @@
+"""
+Lazy Provider Registry
+
+Maps provider names to the LangChain classes that implement them, without
+importing any provider SDK up front. A provider's package (langchain_groq,
+langchain_google_genai, langchain_ollama, langchain_huggingface) is imported
+the first time that provider is actually used, so importing settings or an
+entry point never pays for SDKs the current configuration does not select.
+
+    ChatGroq = chat_model_class("groq")          # imports langchain_groq now
+    llm = create_chat_model("ollama", model=...)
+
+Async callers share a per-provider concurrency limit (`provider_slot`), so
+many sessions on one event loop never have more than LLM_MAX_CONCURRENCY
+(or e.g. GROQ_MAX_CONCURRENCY) requests in flight to the same provider.
+"""
+
+import asyncio
+import importlib
+import sys
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+
+# provider name -> (module, class name)
+CHAT_MODEL_PROVIDERS: Dict[str, Tuple[str, str]] = {
+    "groq": ("langchain_groq", "ChatGroq"),
+    "gemini": ("langchain_google_genai", "ChatGoogleGenerativeAI"),
+    "ollama": ("langchain_ollama", "ChatOllama"),
+    # Older Ollama client still used by the tutor front ends
+    "ollama-community": ("langchain_community.chat_models", "ChatOllama"),
+}
+EMBEDDING_PROVIDERS: Dict[str, Tuple[str, str]] = {
+    "gemini": ("langchain_google_genai", "GoogleGenerativeAIEmbeddings"),
+    "huggingface": ("langchain_huggingface", "HuggingFaceEmbeddings"),
+}
+
+
+def _load(module: str, attr: str):
+    return getattr(importlib.import_module(module), attr)
+
+
+def _lookup(registry: Dict[str, Tuple[str, str]], kind: str, provider: str) -> Tuple[str, str]:
+    try:
+        return registry[provider]
+    except KeyError:
+        raise ValueError(f"Unknown {kind} provider '{provider}'. Choose from {sorted(registry)}") from None
+
+
+def chat_model_class(provider: str):
+    """Chat model class for a provider, importing its SDK on first use."""
+    return _load(*_lookup(CHAT_MODEL_PROVIDERS, "chat model", provider))
+
+
+def embeddings_class(provider: str):
+    """Embeddings class for a provider, importing its SDK on first use."""
+    return _load(*_lookup(EMBEDDING_PROVIDERS, "embedding", provider))
+
+
+def create_chat_model(provider: str, **kwargs):
+    """Instantiate a provider's chat model."""
+    return chat_model_class(provider)(**kwargs)
+
+
+def register_chat_model(provider: str, module: str, class_name: str):
+    """Add or override a chat model provider (e.g. a stub model in tests)."""
+    CHAT_MODEL_PROVIDERS[provider] = (module, class_name)
+
+
+def loaded_class(module: str, attr: str) -> Optional[type]:
+    """A class from a module only if that module is already imported.
+
+    Lets isinstance checks and except clauses refer to provider types without
+    importing the SDK: if the module was never imported, no object of that
+    type can exist.
+    """
+    loaded = sys.modules.get(module)
+    return getattr(loaded, attr, None) if loaded is not None else None
+
+
+class _NeverRaised(Exception):
+    """Placeholder for exception types of SDKs that have not been imported."""
+
+
+def provider_exception(module: str, name: str) -> type:
+    """Exception class from a provider SDK, usable in `except` without importing it."""
+    return loaded_class(module, name) or _NeverRaised
+
+
+def provider_of(llm) -> str:
+    """Registered provider name of a chat model instance ("other" if not registered)."""
+    cls = type(llm)
+    for name, (module, class_name) in CHAT_MODEL_PROVIDERS.items():
+        if cls.__name__ == class_name and cls.__module__.startswith(module):
+            return name
+    return "other"
+
+
+def provider_concurrency(provider: str) -> int:
+    """Concurrent async requests allowed per provider (<PROVIDER>_MAX_CONCURRENCY, else LLM_MAX_CONCURRENCY)."""
+    from src.config import get_config_value, LLM_MAX_CONCURRENCY
+
+    key = provider.upper().replace("-", "_") + "_MAX_CONCURRENCY"
+    return max(1, get_config_value(key, LLM_MAX_CONCURRENCY, int))
+
+
+# Semaphores belong to the event loop that uses them
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """The running loop's semaphore for a provider."""
+    per_loop = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    if provider not in per_loop:
+        per_loop[provider] = asyncio.Semaphore(provider_concurrency(provider))
+    return per_loop[provider]
+
+
+@asynccontextmanager
+async def provider_slot(llm):
+    """Hold one of the provider's concurrency slots while calling `llm` (no-op for None)."""
+    if llm is None:
+        yield
+        return
+    async with provider_semaphore(provider_of(llm)):
+        yield
@@ -0,0 +1,191 @@
+"""
+Single-Pass Query Analysis
+
+The retriever, the agentic planner and the LangGraph retrieval node all used to
+scan each query on their own: source-text detection, the BM25 stopword strip,
+diacritic removal, proper-noun extraction and several `any(word in query)`
+keyword lists. `analyze_query` does all of it once, with keyword lists
+compiled into single regex alternations at import time, and returns a frozen
+`QueryAnalysis`. Results are memoized per query string, so every stage that
+sees the same query shares the same object.
+
+Matching semantics are unchanged: keyword lists still match as case-insensitive
+substrings, and proper nouns use the same capitalisation heuristics.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+
+def _compile_substrings(phrases: Iterable[str]) -> "re.Pattern":
+    """One alternation matching any phrase as a substring; the lookahead reports overlapping matches."""
+    alternation = "|".join(re.escape(p) for p in sorted(set(phrases), key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))")
+
+
+# Source texts named in a query ('griffith rigveda' etc. contain these forms)
+_SOURCE_PATTERNS = (
+    ("rigveda", _compile_substrings(["rigveda", "rig veda", "rig-veda", "rgveda"])),
+    ("yajurveda", _compile_substrings(["yajurveda", "yajur veda", "yajur-veda"])),
+)
+
+# Action and function words dropped from the BM25 query
+_KEYWORD_STOPWORDS = re.compile(
+    r'\b(summarize|explain|describe|tell|about|what|who|when|where|why|how|is|are|the|a|an|in|on|at|for)\b',
+    flags=re.IGNORECASE,
+)
+_NON_KEYWORD_CHARS = re.compile(r'[^\w\s\[\]\-]')
+_NON_WORD_CHARS = re.compile(r'[^\w]')
+
+LOCATION_KEYWORDS = (
+    'where', 'location', 'place', 'river', 'rivers', 'cross', 'crossed', 'crossing',
+    'dwell', 'dwelling', 'lived', 'live', 'settled', 'settlement', 'bank', 'banks',
+)
+TRIBAL_KEYWORDS = (
+    'tribe', 'tribes', 'enemy', 'enemies', 'ally', 'allies', 'fought with', 'fought against',
+    'confederat', 'coalition', 'ten kings',
+)
+_LOCATION_RE = _compile_substrings(LOCATION_KEYWORDS)
+_TRIBAL_RE = _compile_substrings(TRIBAL_KEYWORDS)
+
+# Query types used to route Sanskrit questions (sanskrit_lexicon.classify_query_type)
+_CONSTRUCTION_RE = _compile_substrings([
+    "how do i say", "translate to sanskrit", "what is", "in sanskrit",
+    "how to say", "say in vedic", "sanskrit for", "vedic word for",
+    "translate", "in devanagari", "construct",
+])
+_GRAMMAR_RE = _compile_substrings([
+    "explain", "what is the rule", "how does", "why", "grammar",
+    "declension", "conjugation", "sandhi", "vibhakti", "case ending",
+    "verb form", "how to form",
+])
+
+# Query types used by the agentic planner (narrower construction/grammar cues)
+_AGENT_CONSTRUCTION_RE = _compile_substrings([
+    "how do i say", "translate", "in sanskrit", "sanskrit for",
+    "how to say", "say in sanskrit", "sanskrit word for",
+    "construct", "write in sanskrit",
+])
+_AGENT_GRAMMAR_RE = _compile_substrings(["explain", "what is the rule", "how does", "declension", "conjugation"])
+
+# Capitalised words that are not proper nouns
+COMMON_WORDS = frozenset({
+    # Question words
+    'What', 'When', 'Where', 'Which', 'Who', 'Whom', 'Whose', 'Why', 'How',
+    # Pronouns
+    'I', 'You', 'He', 'She', 'It', 'We', 'They', 'This', 'That', 'These', 'Those',
+    # Conjunctions
+    'And', 'But', 'Or', 'Nor', 'For', 'Yet', 'So', 'If', 'Then', 'Because',
+    # Prepositions
+    'In', 'On', 'At', 'By', 'With', 'From', 'To', 'Of', 'Into', 'Through', 'During', 'Before', 'After', 'Above', 'Below', 'Between', 'Among',
+    # Articles
+    'The', 'A', 'An',
+    # Common verbs (past participle often capitalized)
+    'Is', 'Are', 'Was', 'Were', 'Be', 'Been', 'Being', 'Have', 'Has', 'Had', 'Do', 'Does', 'Did', 'Will', 'Would', 'Could', 'Should', 'May', 'Might', 'Must', 'Can',
+    # Generic nouns that might appear capitalized
+    'War', 'Wars', 'Battle', 'Battles', 'King', 'Kings', 'Queen', 'Queens', 'Hymn', 'Hymns', 'Book', 'Books', 'Chapter', 'Chapters',
+    'Ten', 'Twenty', 'Thirty', 'Forty', 'Fifty', 'Hundred', 'Thousand',
+    # Question starters
+    'Tell', 'Explain', 'Describe', 'Name', 'List', 'Give', 'Show', 'Find',
+    # Determiners
+    'All', 'Some', 'Any', 'Each', 'Every', 'Both', 'Either', 'Neither', 'Many', 'Few', 'Several',
+    # Modal auxiliaries
+    'Shall',
+})
+
+
+def _matches(pattern: "re.Pattern", text: str) -> Tuple[str, ...]:
+    """Distinct phrases of a compiled alternation found in text, in order of appearance."""
+    return tuple(dict.fromkeys(m.group(1) for m in pattern.finditer(text)))
+
+
+def _strip_diacritics(text: str) -> str:
+    decomposed = unicodedata.normalize('NFD', text)
+    return ''.join(char for char in decomposed if unicodedata.category(char) != 'Mn')
+
+
+def extract_proper_nouns(tokens: Iterable[str]) -> Tuple[str, ...]:
+    """Likely names of people, places and tribes among whitespace tokens.
+
+    Skips the first word (sentence capitalisation), short words, common
+    capitalised words and all-caps acronyms.
+    """
+    proper_nouns = []
+    seen = set()
+    for i, word in enumerate(tokens):
+        if i == 0:
+            continue
+        clean_word = _NON_WORD_CHARS.sub('', word)
+        if not clean_word or len(clean_word) < 3 or not clean_word[0].isupper():
+            continue
+        if clean_word in COMMON_WORDS or clean_word.isupper() or clean_word in seen:
+            continue
+        proper_nouns.append(clean_word)
+        seen.add(clean_word)
+    return tuple(proper_nouns)
+
+
+@dataclass(frozen=True)
+class QueryAnalysis:
+    """Everything the retrieval and planning stages derive from the query text."""
+
+    query: str
+    tokens: Tuple[str, ...]
+    # Source texts named in the query ('rigveda', 'yajurveda'); strict when exactly one
+    source_filters: Tuple[str, ...]
+    strict_source_filter: bool
+    # Stopword-free, diacritic-free query for BM25
+    keyword_query: str
+    proper_nouns: Tuple[str, ...]
+    location_keywords: Tuple[str, ...]
+    tribal_keywords: Tuple[str, ...]
+    # "construction" | "grammar" | "factual" for lexicon routing and for the agentic planner
+    query_type: str
+    agent_query_type: str
+
+    @property
+    def is_location_query(self) -> bool:
+        return bool(self.location_keywords)
+
+    @property
+    def is_tribal_query(self) -> bool:
+        return bool(self.tribal_keywords)
+
+
+def _query_type(text: str, construction: "re.Pattern", grammar: "re.Pattern") -> str:
+    if construction.search(text):
+        return "construction"
+    if grammar.search(text):
+        return "grammar"
+    return "factual"
+
+
+@lru_cache(maxsize=1024)
+def analyze_query(query: str) -> QueryAnalysis:
+    """Analyze a query once; repeated calls with the same text return the same object."""
+    query_lower = query.lower()
+    tokens = tuple(query.split())
+
+    source_filters = tuple(source for source, pattern in _SOURCE_PATTERNS if pattern.search(query_lower))
+
+    keyword_query = _KEYWORD_STOPWORDS.sub('', query).strip()
+    keyword_query = _NON_KEYWORD_CHARS.sub('', _strip_diacritics(keyword_query)).strip()
+    if len(keyword_query) < 2:
+        # Stripped too much: fall back to the original query
+        keyword_query = query
+
+    return QueryAnalysis(
+        query=query,
+        tokens=tokens,
+        source_filters=source_filters,
+        strict_source_filter=len(source_filters) == 1,
+        keyword_query=keyword_query,
+        proper_nouns=extract_proper_nouns(tokens),
+        location_keywords=_matches(_LOCATION_RE, query_lower),
+        tribal_keywords=_matches(_TRIBAL_RE, query_lower),
+        query_type=_query_type(query_lower, _CONSTRUCTION_RE, _GRAMMAR_RE),
+        agent_query_type=_query_type(query_lower, _AGENT_CONSTRUCTION_RE, _AGENT_GRAMMAR_RE),
+    )
@@ -0,0 +1,125 @@
+"""
+Token-Bucket Rate Limiting for Provider Quotas
+
+Provider quotas are expressed per minute (e.g. Gemini free tier: 100 embedding
+requests per minute). `RateLimiter` enforces a requests-per-minute and an
+optional texts-per-minute budget with two token buckets, shared safely by
+threads and asyncio tasks, and backs off when the provider answers 429.
+
+Each bucket holds at most `burst` tokens and refills at (limit - burst) / 60
+per second, so no 60-second window ever admits more than `limit` units while
+steady-state throughput stays at the quota ceiling. Callers reserve tokens up
+front (the balance may go negative) and sleep for the returned delay, which
+keeps waiting callers in arrival order without polling.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from typing import Optional
+
+from src.helper import logger
+
+
+class TokenBucket:
+    """Per-minute budget refilled continuously (not thread-safe on its own)."""
+
+    def __init__(self, per_minute: float, burst: float = 1.0):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.per_minute = float(per_minute)
+        # Keep at least half the budget for steady refill
+        self.burst = float(max(1.0, min(burst, per_minute / 2)))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """Refill rate in tokens per second."""
+        return max(self.per_minute - self.burst, self.per_minute / 2) / 60.0
+
+    def reserve(self, amount: float, now: float, rate_scale: float = 1.0) -> float:
+        """Take `amount` tokens and return how long the caller must wait before using them."""
+        rate = self.rate * rate_scale
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / rate
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for provider quota errors (HTTP 429 / RESOURCE_EXHAUSTED)."""
+    if getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error)
+    return "429" in message or "RESOURCE_EXHAUSTED" in message or "rate limit" in message.lower()
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Extract a server-suggested retry delay from a 429 error, if present."""
+    match = re.search(r"retry (?:in|after) ([\d.]+)\s*s", str(error), flags=re.IGNORECASE)
+    if match:
+        return float(match.group(1))
+    match = re.search(r"retry_delay\s*\{\s*seconds:\s*(\d+)", str(error))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+class RateLimiter:
+    """Thread-safe and asyncio-compatible limiter for requests and texts per minute.
+
+    On a 429 the limiter pauses every caller until the provider's retry delay
+    has passed and halves its refill rate; each later success restores a
+    little of it (additive increase, multiplicative decrease).
+    """
+
+    def __init__(self, requests_per_minute: float, texts_per_minute: Optional[float] = None,
+                 request_burst: float = 1.0, text_burst: float = 1.0, min_rate_scale: float = 0.1):
+        self.requests = TokenBucket(requests_per_minute, burst=request_burst)
+        self.texts = TokenBucket(texts_per_minute, burst=text_burst) if texts_per_minute else None
+        self.min_rate_scale = min_rate_scale
+        self.rate_scale = 1.0
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, texts: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            wait = self.requests.reserve(1, now, self.rate_scale)
+            if self.texts is not None:
+                wait = max(wait, self.texts.reserve(texts, now, self.rate_scale))
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self, texts: int = 1):
+        """Block until one request carrying `texts` texts may be sent."""
+        wait = self._reserve(texts)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, texts: int = 1):
+        """Async variant of acquire; sleeps without blocking the event loop."""
+        wait = self._reserve(texts)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def max_texts_per_request(self, cap: int) -> int:
+        """Largest batch a single request may carry under the texts budget."""
+        if self.texts is None:
+            return cap
+        return max(1, min(cap, int(self.texts.per_minute)))
+
+    def record_success(self):
+        with self._lock:
+            self.rate_scale = min(1.0, self.rate_scale + 0.05)
+
+    def record_rate_limited(self, retry_after: Optional[float], attempt: int) -> float:
+        """Register a 429; returns the pause applied to all callers."""
+        pause = retry_after if retry_after is not None else min(60.0, 2.0 ** attempt)
+        with self._lock:
+            self.rate_scale = max(self.min_rate_scale, self.rate_scale / 2)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+            scale = self.rate_scale
+        logger.warning(f"Rate limited by provider; pausing {pause:.1f}s and slowing to {scale:.0%} of quota")
+        return pause
@@ -0,0 +1,234 @@
+"""
+Query-Result Cache for the Hybrid Retriever
+
+The tutor, the CLI and the agentic graph ask the same questions over and over
+("Who is Indra?", canned quiz and translation prompts), and each one reruns
+BM25, Qdrant and the proper-noun expansion. `RetrievalCache` keeps the final
+document list per query:
+
+- keys combine the normalised query (Unicode NFC, collapsed whitespace) with
+  the retriever configuration; case and punctuation are kept because
+  proper-noun detection and the embeddings depend on them
+- entries belong to an index fingerprint (corpus + collection + embedding
+  model); binding a new fingerprint drops everything cached for the old index
+- the in-memory tier is an LRU bounded by entry count and serialized bytes,
+  with an optional time-to-live
+- an optional SQLite tier (same layout as the embedding cache) lets warm
+  restarts reuse results
+
+Documents are stored as JSON, so every hit returns fresh Document objects that
+callers may modify freely.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from src.helper import logger
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query for cache lookups."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", query)).strip()
+
+
+def _serialize(docs: List[Document]) -> Optional[bytes]:
+    try:
+        return json.dumps(
+            [[doc.page_content, doc.metadata, doc.id] for doc in docs], ensure_ascii=False
+        ).encode("utf-8")
+    except (TypeError, ValueError):
+        return None  # metadata that JSON cannot represent: not cacheable
+
+
+def _deserialize(blob: bytes) -> List[Document]:
+    return [Document(page_content=text, metadata=metadata, id=doc_id) for text, metadata, doc_id in json.loads(blob)]
+
+
+class _DiskTier:
+    """SQLite table of serialized results, LRU-evicted by size."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key BLOB PRIMARY KEY,"
+            " fingerprint TEXT NOT NULL,"
+            " value BLOB NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results(last_used)")
+        self._conn.commit()
+
+    def drop_other_fingerprints(self, fingerprint: str) -> int:
+        removed = self._conn.execute("DELETE FROM results WHERE fingerprint != ?", (fingerprint,)).rowcount
+        self._conn.commit()
+        return removed
+
+    def get(self, key: bytes, ttl: float) -> Optional[bytes]:
+        now = time.time()
+        row = self._conn.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if ttl and now - row[1] > ttl:
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return bytes(row[0])
+
+    def put(self, key: bytes, fingerprint: str, value: bytes, created: float):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (key, fingerprint, value, created, last_used) VALUES (?, ?, ?, ?, ?)",
+            (key, fingerprint, value, created, created),
+        )
+        total = self._conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM results").fetchone()[0]
+        if total > self.max_bytes:
+            # Drop the least recently used rows down to 90% of the budget
+            target = int(self.max_bytes * 0.9)
+            for victim, size in self._conn.execute(
+                "SELECT key, LENGTH(value) FROM results ORDER BY last_used"
+            ).fetchall():
+                if total <= target:
+                    break
+                self._conn.execute("DELETE FROM results WHERE key = ?", (victim,))
+                total -= size
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute("DELETE FROM results")
+        self._conn.commit()
+
+
+class RetrievalCache:
+    """Thread-safe two-tier cache of retrieval results, scoped to one index fingerprint."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024, ttl: float = 0,
+                 disk_path: Optional[str] = None, disk_max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            max_entries: In-memory entry limit
+            max_bytes: In-memory limit on serialized result size
+            ttl: Seconds before an entry expires (0 = never)
+            disk_path: SQLite file for the persistent tier (None = memory only)
+            disk_max_bytes: Size budget of the persistent tier
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.fingerprint = ""
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()  # key -> (value, created)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk = _DiskTier(disk_path, disk_max_bytes) if disk_path else None
+
+    def bind(self, fingerprint: str):
+        """Scope the cache to an index; entries cached for any other index are dropped."""
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return
+            self._entries.clear()
+            self._bytes = 0
+            self.fingerprint = fingerprint
+            if self._disk is not None:
+                removed = self._disk.drop_other_fingerprints(fingerprint)
+                if removed:
+                    logger.info(f"Retrieval cache: index changed, dropped {removed} stored results")
+
+    def make_key(self, query: str, config: Dict[str, Any]) -> bytes:
+        """Key for a query under a retriever configuration (and the bound fingerprint)."""
+        digest = hashlib.sha256()
+        digest.update(self.fingerprint.encode("utf-8") + b"\0")
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode("utf-8") + b"\0")
+        digest.update(normalize_query(query).encode("utf-8"))
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[List[Document]]:
+        """Cached documents for key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and now - entry[1] > self.ttl:
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _deserialize(entry[0])
+
+            value = self._disk.get(key, self.ttl) if self._disk is not None else None
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._insert(key, value, now)
+        return _deserialize(value)
+
+    def put(self, key: bytes, docs: List[Document]):
+        value = _serialize(docs)
+        if value is None:
+            return
+        now = time.time()
+        with self._lock:
+            self._insert(key, value, now)
+            if self._disk is not None:
+                self._disk.put(key, self.fingerprint, value, now)
+
+    def _insert(self, key: bytes, value: bytes, created: float):
+        """Add to the memory tier and evict least recently used entries (lock held)."""
+        if len(value) > self.max_bytes:
+            return
+        self._drop(key)
+        self._entries[key] = (value, created)
+        self._bytes += len(value)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def _drop(self, key: bytes):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[0])
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._disk is not None:
+                self._disk.clear()
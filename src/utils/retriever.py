@@ -1,12 +1,42 @@
 from helper import logger
-from config import RETRIEVAL_K, SEMANTIC_WEIGHT, KEYWORD_WEIGHT, EXPANSION_DOCS
-from typing import List
+from config import (
+    RETRIEVAL_K,
+    SEMANTIC_WEIGHT,
+    KEYWORD_WEIGHT,
+    EXPANSION_DOCS,
+    EXPANSION_BATCH_SEARCH,
+    EXPANSION_MAX_WORKERS,
+    PERSISTENT_BM25,
+    VERSE_INDEX,
+    VERSE_SOURCE_FOLDER,
+    FUSION_METHOD,
+    FUSION_CANDIDATES,
+    RRF_K,
+    RETRIEVAL_CACHE,
+    RETRIEVAL_CACHE_MAX_ENTRIES,
+    RETRIEVAL_CACHE_MAX_MB,
+    RETRIEVAL_CACHE_TTL,
+    RETRIEVAL_CACHE_PATH,
+    ASYNC_RETRIEVAL_WORKERS,
+    VECTORDB_FOLDER,
+    COLLECTION_NAME,
+)
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import Field
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
-from langchain_core.callbacks import CallbackManagerForRetrieverRun
-import re
+from langchain_core.callbacks import CallbackManagerForRetrieverRun, AsyncCallbackManagerForRetrieverRun
+import asyncio
+import os
+import threading
+from src.utils.fusion import fuse, chunk_key
+from src.utils.retrieval_cache import RetrievalCache
+from src.utils.query_analysis import analyze_query
+from src.utils.providers import loaded_class
+from src.utils.startup_profile import startup_phase
 from src.utils.proper_noun_variants import (
     get_proper_noun_variants,
+    get_proper_noun_variants_many,
     disambiguate_proper_noun,
     get_confederation_for_tribe,
     get_constituent_tribes
@@ -23,6 +53,21 @@ except ImportError:
     RETRIEVAL_MAX_WORKERS = 1
     PARALLEL_ENABLED = False
 
+# Threads for retrieval awaited from the async graphs (created on first use)
+_async_pool: Optional[ThreadPoolExecutor] = None
+_async_pool_lock = threading.Lock()
+
+
+def _async_retrieval_pool() -> ThreadPoolExecutor:
+    global _async_pool
+    if _async_pool is None:
+        with _async_pool_lock:
+            if _async_pool is None:
+                _async_pool = ThreadPoolExecutor(
+                    max_workers=max(1, ASYNC_RETRIEVAL_WORKERS), thread_name_prefix="async-retrieval"
+                )
+    return _async_pool
+
 
 class HybridRetriever(BaseRetriever):
     """Custom hybrid retriever that combines semantic and keyword search.
@@ -36,8 +81,19 @@ class HybridRetriever(BaseRetriever):
     semantic_retriever: BaseRetriever
     keyword_retriever: BaseRetriever
     k: int = 10
-
-    def _get_transliteration_variants(self, word: str) -> List[str]:
+    # Fusion strategy (see src/utils/fusion.py) and candidates fetched per retriever (0 = each retriever's own k)
+    fusion_method: str = FUSION_METHOD
+    candidate_pool: int = FUSION_CANDIDATES
+    # True when BM25 documents carry their Qdrant point id (chunk stores written with ids)
+    use_point_ids: bool = False
+    # Wall time (seconds) per retrieval stage of the most recent query, for diagnostics
+    last_stage_timings: Dict[str, float] = Field(default_factory=dict)
+    # Cache of final results per query (bound to the index fingerprint by create_retriever)
+    result_cache: Optional[RetrievalCache] = None
+    # Verse reference -> chunks (src/utils/verse_index.py); queries naming a verse skip the search
+    verse_index: Optional[Any] = None
+
+    def _get_transliteration_variants(self, word: str, db_variants: Optional[List[str]] = None) -> List[str]:
         """Get transliteration variants for Sanskrit/Vedic proper nouns.
 
         Now uses comprehensive ProperNounVariantManager with data from:
@@ -47,11 +103,15 @@ class HybridRetriever(BaseRetriever):
         - Griffith-Yajurveda (296 sections, 979 proper nouns)
 
         Total: 43,706 proper noun references across 4 translations
+
+        db_variants: the database variants when already looked up in bulk
+        (get_proper_noun_variants_many)
         """
         variants = [word]  # Always include original
 
         # Get comprehensive variants from database (includes all 4 translations)
-        db_variants = get_proper_noun_variants(word)
+        if db_variants is None:
+            db_variants = get_proper_noun_variants(word)
         if db_variants:
             variants.extend(db_variants)
             logger.info(f"HybridRetriever: Found {len(db_variants)} database variants for '{word}': {db_variants}")
@@ -69,72 +129,16 @@ class HybridRetriever(BaseRetriever):
             elif 's' in word.lower() and 'sh' not in word.lower():
                 variants.append(word.replace('s', 'sh').replace('S', 'Sh'))
 
-        return list(set(variants))  # Remove duplicates
+        return list(dict.fromkeys(variants))  # Remove duplicates, keeping a reproducible order
 
     def _extract_proper_nouns(self, text: str) -> List[str]:
         """Extract proper nouns from query using heuristics.
 
         Targets: Names of people, places, tribes (Pakthas, Sudas, Vashistha, etc.)
         Excludes: Common words, question words, prepositions, generic nouns
+        (see query_analysis.COMMON_WORDS)
         """
-        # Comprehensive blacklist of common English words that get capitalized
-        common_words = {
-            # Question words
-            'What', 'When', 'Where', 'Which', 'Who', 'Whom', 'Whose', 'Why', 'How',
-            # Pronouns
-            'I', 'You', 'He', 'She', 'It', 'We', 'They', 'This', 'That', 'These', 'Those',
-            # Conjunctions
-            'And', 'But', 'Or', 'Nor', 'For', 'Yet', 'So', 'If', 'Then', 'Because',
-            # Prepositions
-            'In', 'On', 'At', 'By', 'For', 'With', 'From', 'To', 'Of', 'Into', 'Through', 'During', 'Before', 'After', 'Above', 'Below', 'Between', 'Among',
-            # Articles
-            'The', 'A', 'An',
-            # Common verbs (past participle often capitalized)
-            'Is', 'Are', 'Was', 'Were', 'Be', 'Been', 'Being', 'Have', 'Has', 'Had', 'Do', 'Does', 'Did', 'Will', 'Would', 'Could', 'Should', 'May', 'Might', 'Must', 'Can',
-            # Generic nouns that might appear capitalized
-            'War', 'Wars', 'Battle', 'Battles', 'King', 'Kings', 'Queen', 'Queens', 'Hymn', 'Hymns', 'Book', 'Books', 'Chapter', 'Chapters',
-            'Ten', 'Twenty', 'Thirty', 'Forty', 'Fifty', 'Hundred', 'Thousand',
-            # Question starters
-            'Tell', 'Explain', 'Describe', 'Name', 'List', 'Give', 'Show', 'Find',
-            # Determiners
-            'All', 'Some', 'Any', 'Each', 'Every', 'Both', 'Either', 'Neither', 'Many', 'Few', 'Several',
-            # Modal auxiliaries
-            'Shall', 'Should', 'Will', 'Would', 'Can', 'Could', 'May', 'Might', 'Must',
-        }
-
-        words = text.split()
-        proper_nouns = []
-        seen = set()  # Deduplicate
-
-        for i, word in enumerate(words):
-            # Skip first word (sentence start capitalization)
-            if i == 0:
-                continue
-
-            # Remove punctuation from word
-            clean_word = re.sub(r'[^\w]', '', word)
-
-            # Must start with uppercase and be at least 3 characters
-            if not clean_word or len(clean_word) < 3 or not clean_word[0].isupper():
-                continue
-
-            # Skip if it's a common word
-            if clean_word in common_words:
-                continue
-
-            # Skip if it's all uppercase (likely acronym or emphasis, not a name)
-            if clean_word.isupper():
-                continue
-
-            # Skip if already seen
-            if clean_word in seen:
-                continue
-
-            # Likely a proper noun (person, place, tribe name)
-            proper_nouns.append(clean_word)
-            seen.add(clean_word)
-
-        return proper_nouns
+        return list(analyze_query(text).proper_nouns)
 
     def _disambiguate_proper_noun(self, noun: str, query: str) -> str:
         """Apply context-based disambiguation for homonyms.
@@ -165,41 +169,9 @@ class HybridRetriever(BaseRetriever):
             "Compare X in Rigveda and Yajurveda" -> (['rigveda', 'yajurveda'], False)
             "Tell me about X" -> ([], False)
         """
-        query_lower = query.lower()
-
-        # Define source text identifiers and their variations
-        source_mapping = {
-            'rigveda': ['rigveda', 'rig veda', 'rig-veda', 'rgveda'],
-            'yajurveda': ['yajurveda', 'yajur veda', 'yajur-veda'],
-            'griffith-rigveda': ['griffith rigveda', 'griffith\'s rigveda', 'griffith rig veda'],
-            'griffith-yajurveda': ['griffith yajurveda', 'griffith\'s yajurveda', 'griffith yajur veda'],
-        }
-
-        detected_sources = []
-
-        # Check for each source
-        for source_key, variations in source_mapping.items():
-            for variation in variations:
-                if variation in query_lower:
-                    # Determine the base source (rigveda or yajurveda)
-                    if 'rigveda' in source_key or 'rig' in source_key:
-                        if 'rigveda' not in detected_sources:
-                            detected_sources.append('rigveda')
-                    elif 'yajurveda' in source_key or 'yajur' in source_key:
-                        if 'yajurveda' not in detected_sources:
-                            detected_sources.append('yajurveda')
-                    break
-
-        # Determine if strict filtering (only one source mentioned)
-        strict_filter = len(detected_sources) == 1
-
-        # Check for comparative queries (both texts mentioned)
-        comparative_keywords = ['both', 'compare', 'comparison', 'versus', 'vs', 'and', 'between']
-        is_comparative = any(keyword in query_lower for keyword in comparative_keywords)
-
-        # If comparative, ensure balanced retrieval (not strict)
-        if is_comparative and len(detected_sources) > 1:
-            strict_filter = False
+        analysis = analyze_query(query)
+        detected_sources = list(analysis.source_filters)
+        strict_filter = analysis.strict_source_filter
 
         if detected_sources:
             filter_type = "strict (single source)" if strict_filter else "balanced (multiple sources)"
@@ -244,38 +216,202 @@ class HybridRetriever(BaseRetriever):
             logger.info(f"HybridRetriever: Balanced filter - {len(matching_docs)} docs from {source_filters} prioritized, {len(non_matching_docs)} others included")
             return matching_docs + non_matching_docs
 
+    def _cache_config(self) -> Dict[str, Any]:
+        """Everything besides the query that determines the results."""
+        return {
+            "k": self.k,
+            "fusion": self.fusion_method,
+            "candidates": self.candidate_pool,
+            "point_ids": self.use_point_ids,
+            "weights": (SEMANTIC_WEIGHT, KEYWORD_WEIGHT, RRF_K),
+            "expansion_docs": EXPANSION_DOCS,
+            "semantic": getattr(self.semantic_retriever, "search_kwargs", None),
+            "keyword_k": getattr(self.keyword_retriever, "k", None),
+        }
+
+    def _chunk_key(self, doc: Document) -> str:
+        return chunk_key(doc, self.use_point_ids)
+
+    def _semantic_candidates(self, query: str) -> Tuple[List[Document], Optional[List[float]]]:
+        """Top semantic candidates with their similarity scores (None if unavailable)."""
+        vectorstore = getattr(self.semantic_retriever, "vectorstore", None)
+        search_kwargs = dict(getattr(self.semantic_retriever, "search_kwargs", {}) or {})
+        n = self.candidate_pool or search_kwargs.get("k", 4)
+        if (
+            vectorstore is not None
+            and getattr(self.semantic_retriever, "search_type", "similarity") == "similarity"
+            and hasattr(vectorstore, "similarity_search_with_score")
+        ):
+            search_kwargs.pop("k", None)
+            pairs = vectorstore.similarity_search_with_score(query, k=n, **search_kwargs)
+            return [doc for doc, _ in pairs], [float(score) for _, score in pairs]
+        return self.semantic_retriever.invoke(query), None
+
+    def _keyword_candidates(self, query: str) -> Tuple[List[Document], Optional[List[float]]]:
+        """Top BM25 candidates with their scores (None if unavailable)."""
+        retriever = self.keyword_retriever
+        n = self.candidate_pool or getattr(retriever, "k", 4)
+        if hasattr(retriever, "top_n_with_scores"):
+            return retriever.top_n_with_scores(query, n)
+        vectorizer = getattr(retriever, "vectorizer", None)
+        if vectorizer is not None and hasattr(retriever, "preprocess_func"):
+            # LangChain BM25Retriever: same ranking as get_top_n, keeping the scores
+            import numpy as np
+
+            scores = vectorizer.get_scores(retriever.preprocess_func(query))
+            top = np.argsort(scores)[::-1][:n]
+            return [retriever.docs[i] for i in top], [float(scores[i]) for i in top]
+        return retriever.invoke(query), None
+
+    def _batch_semantic_search(self, queries: List[str], timings: Dict[str, float]) -> Optional[List[List[Document]]]:
+        """Embed all queries in one batch and run them as a single batched Qdrant request.
+
+        Returns one result list per query (same order), or None when the semantic
+        retriever is not a plain dense Qdrant similarity search. Query embeddings
+        are computed with `embed_documents`, so this path is only taken for
+        sentence-transformers models (bare or behind the embedding cache), which
+        embed queries and documents identically (Gemini uses different task
+        types for the two).
+        """
+        try:
+            from langchain_qdrant import QdrantVectorStore, RetrievalMode
+            from qdrant_client import models
+        except ImportError:
+            return None
+
+        vectorstore = getattr(self.semantic_retriever, "vectorstore", None)
+        if not isinstance(vectorstore, QdrantVectorStore) or vectorstore.retrieval_mode != RetrievalMode.DENSE:
+            return None
+        if getattr(self.semantic_retriever, "search_type", "similarity") != "similarity":
+            return None
+
+        embeddings = vectorstore.embeddings
+        if getattr(embeddings, "query_uses_document_embedding", False):
+            pass  # CachedEmbeddings over a model that embeds queries like documents
+        else:
+            # Only an already-imported SDK can have produced the embeddings object
+            hf_embeddings = loaded_class("langchain_huggingface", "HuggingFaceEmbeddings")
+            if hf_embeddings is None or not isinstance(embeddings, hf_embeddings) or embeddings.query_encode_kwargs:
+                return None
+
+        search_kwargs = dict(getattr(self.semantic_retriever, "search_kwargs", {}) or {})
+        k = search_kwargs.pop("k", 4)
+        query_filter = search_kwargs.pop("filter", None)
+
+        start = time.perf_counter()
+        vectors = embeddings.embed_documents(queries)
+        timings["expansion_embed"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        requests = [
+            models.QueryRequest(
+                query=vector,
+                using=vectorstore.vector_name,
+                filter=query_filter,
+                limit=k,
+                with_payload=True,
+            )
+            for vector in vectors
+        ]
+        responses = vectorstore.client.query_batch_points(
+            collection_name=vectorstore.collection_name,
+            requests=requests,
+        )
+        timings["expansion_search"] = time.perf_counter() - start
+
+        return [
+            [
+                vectorstore._document_from_point(
+                    point,
+                    vectorstore.collection_name,
+                    vectorstore.content_payload_key,
+                    vectorstore.metadata_payload_key,
+                )
+                for point in response.points
+            ]
+            for response in responses
+        ]
+
+    def _prefetch_expansion_searches(self, queries: List[str], timings: Dict[str, float]) -> Dict[str, List[Document]]:
+        """Run the semantic searches for all expansion variants up front.
+
+        Tries a single batched embed + Qdrant request first, then a bounded
+        thread pool. Returns {} when both are disabled, in which case the
+        expansion loop falls back to searching lazily one variant at a time.
+        """
+        unique_queries = list(dict.fromkeys(queries))
+        if not unique_queries:
+            return {}
+
+        if EXPANSION_BATCH_SEARCH:
+            try:
+                batched = self._batch_semantic_search(unique_queries, timings)
+                if batched is not None:
+                    logger.info(f"HybridRetriever: Batched expansion search for {len(unique_queries)} variants")
+                    return dict(zip(unique_queries, batched))
+            except Exception as e:
+                logger.warning(f"HybridRetriever: Batched expansion search failed ({e}); falling back to per-variant search")
+
+        if EXPANSION_MAX_WORKERS > 1:
+            start = time.perf_counter()
+            workers = min(EXPANSION_MAX_WORKERS, len(unique_queries))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self.semantic_retriever.invoke, unique_queries))
+            timings["expansion_search"] = time.perf_counter() - start
+            logger.info(f"HybridRetriever: Parallel expansion search for {len(unique_queries)} variants ({workers} workers)")
+            return dict(zip(unique_queries, results))
+
+        return {}
+
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun = None
     ) -> List[Document]:
         """Get relevant documents from both retrievers and merge."""
 
         logger.info(f"HybridRetriever: Query = '{query}'")
+        stage_timings: Dict[str, float] = {}
+        query_start = time.perf_counter()
+        # Return top k primary results + limited expansion docs
+        # For Groq: Keep total manageable to stay under 6K token limit
+        max_expansion = EXPANSION_DOCS * 2 if EXPANSION_DOCS > 0 else 0
+
+        # "RV 2.33", "RV 7.95.2": fetch the referenced chunks directly
+        if self.verse_index is not None:
+            verse_docs = self.verse_index.documents_for_query(query)
+            if verse_docs:
+                source_filters, strict_filter = self._detect_source_text_filter(query)
+                verse_docs = self._filter_docs_by_source(verse_docs, source_filters, strict_filter)
+                stage_timings["verse_index"] = stage_timings["total"] = time.perf_counter() - query_start
+                self.last_stage_timings = stage_timings
+                logger.info(f"HybridRetriever: Verse reference resolved to {len(verse_docs)} chunks; skipping search")
+                return verse_docs[:self.k + max_expansion]
+
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self.result_cache.make_key(query, self._cache_config())
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                stage_timings["cache"] = stage_timings["total"] = time.perf_counter() - query_start
+                self.last_stage_timings = stage_timings
+                logger.info(
+                    f"HybridRetriever: Result cache hit ({len(cached)} docs, "
+                    f"hit rate {self.result_cache.hit_rate:.0%})"
+                )
+                return cached
+
+        # One pass over the query: source filters, BM25 keyword query, proper nouns, intents
+        analysis = analyze_query(query)
 
         # Detect source text filters (Rigveda, Yajurveda, etc.)
         source_filters, strict_filter = self._detect_source_text_filter(query)
 
-        # Extract keywords for BM25 (remove action words like "summarize", "explain", etc.)
-        # This helps BM25 match on the actual content patterns like hymn numbers or specific terms
-        import re
-        import unicodedata
-        # Keep hymn references, numbers in brackets, and important nouns
-        keyword_query = re.sub(r'\b(summarize|explain|describe|tell|about|what|who|when|where|why|how|is|are|the|a|an|in|on|at|for)\b', '', query, flags=re.IGNORECASE)
-        keyword_query = keyword_query.strip()
-
-        # Strip diacritical marks for BM25 (e.g., Sūdaḥ → Sudas, ā → a)
-        # This helps match Sanskrit terms that may be transliterated differently
-        keyword_query_normalized = unicodedata.normalize('NFD', keyword_query)
-        keyword_query_normalized = ''.join(char for char in keyword_query_normalized if unicodedata.category(char) != 'Mn')
-
-        # Remove punctuation except hyphens and brackets (keep hymn references intact)
-        keyword_query_normalized = re.sub(r'[^\w\s\[\]\-]', '', keyword_query_normalized)
-        keyword_query_normalized = keyword_query_normalized.strip()
-
-        # If we stripped too much, fall back to original query
-        if len(keyword_query_normalized) < 2:
-            keyword_query_normalized = query
+        # Keywords for BM25: action words ("summarize", "explain", ...), diacritics
+        # (Sūdaḥ → Sudas) and punctuation other than hymn-reference brackets removed
+        keyword_query_normalized = analysis.keyword_query
 
         logger.info(f"HybridRetriever: Keyword query for BM25 = '{keyword_query_normalized}'")
+        stage_timings["analysis"] = time.perf_counter() - query_start
+        stage_start = time.perf_counter()
 
         # Get results from both retrievers - WITH PARALLELIZATION
         if PARALLEL_ENABLED and RETRIEVAL_PARALLEL_QUERIES:
@@ -285,19 +421,21 @@ class HybridRetriever(BaseRetriever):
             # Execute semantic and keyword retrieval in parallel
             with ThreadPoolExecutor(max_workers=2) as executor:
                 # Submit both retrieval tasks
-                keyword_future = executor.submit(self.keyword_retriever.invoke, keyword_query_normalized)
-                semantic_future = executor.submit(self.semantic_retriever.invoke, query)
+                keyword_future = executor.submit(self._keyword_candidates, keyword_query_normalized)
+                semantic_future = executor.submit(self._semantic_candidates, query)
 
                 # Wait for both to complete
-                keyword_docs = keyword_future.result()
-                semantic_docs = semantic_future.result()
+                keyword_docs, keyword_scores = keyword_future.result()
+                semantic_docs, semantic_scores = semantic_future.result()
 
             elapsed = time.time() - start_time
             logger.info(f"⚡ Parallel retrieval completed in {elapsed:.2f}s")
         else:
             # Sequential retrieval (original behavior)
-            keyword_docs = self.keyword_retriever.invoke(keyword_query_normalized)
-            semantic_docs = self.semantic_retriever.invoke(query)
+            keyword_docs, keyword_scores = self._keyword_candidates(keyword_query_normalized)
+            semantic_docs, semantic_scores = self._semantic_candidates(query)
+        stage_timings["primary_retrieval"] = time.perf_counter() - stage_start
+        stage_start = time.perf_counter()
 
         logger.info(f"HybridRetriever: BM25 returned {len(keyword_docs)} docs, Qdrant returned {len(semantic_docs)} docs")
         if keyword_docs:
@@ -310,46 +448,32 @@ class HybridRetriever(BaseRetriever):
         # Merge with WEIGHTED scoring: Semantic + Keyword
         # SEMANTIC_WEIGHT (default 70%): Prioritizes conceptual understanding (e.g., "Vashistha" associated with "Sudas")
         # KEYWORD_WEIGHT (default 30%): Boosts exact matches (e.g., specific hymn numbers, exact phrases)
-        seen_content = {}
-        doc_scores = {}
-
-        # Score semantic results
-        for i, doc in enumerate(semantic_docs):
-            content_hash = hash(doc.page_content)
-            # Higher position = higher score (inverse rank)
-            score = (len(semantic_docs) - i) * SEMANTIC_WEIGHT
-            seen_content[content_hash] = doc
-            doc_scores[content_hash] = score
-
-        # Score keyword results (boosts if already in semantic)
-        for i, doc in enumerate(keyword_docs):
-            content_hash = hash(doc.page_content)
-            score = (len(keyword_docs) - i) * KEYWORD_WEIGHT
-
-            if content_hash in doc_scores:
-                # Document appears in BOTH - boost it significantly
-                doc_scores[content_hash] += score * 2  # Double the keyword boost
-            else:
-                # Keyword-only result (rare, but possible for exact matches)
-                seen_content[content_hash] = doc
-                doc_scores[content_hash] = score
-
-        # Sort by combined score (highest first)
-        sorted_hashes = sorted(doc_scores.keys(), key=lambda h: doc_scores[h], reverse=True)
-        merged_docs = [seen_content[h] for h in sorted_hashes]
+        merged_docs, fused_scores, merged_keys = fuse(
+            semantic_docs,
+            keyword_docs,
+            semantic_scores=semantic_scores,
+            keyword_scores=keyword_scores,
+            method=self.fusion_method,
+            semantic_weight=SEMANTIC_WEIGHT,
+            keyword_weight=KEYWORD_WEIGHT,
+            key=self._chunk_key,
+            rrf_k=RRF_K,
+        )
 
-        logger.info(f"HybridRetriever: Merged to {len(merged_docs)} unique docs, returning top {self.k}")
+        logger.info(f"HybridRetriever: Merged to {len(merged_docs)} unique docs ({self.fusion_method}), returning top {self.k}")
         if merged_docs and len(merged_docs) > 0:
-            top_score = doc_scores[sorted_hashes[0]]
+            top_score = fused_scores[0]
             logger.info(f"HybridRetriever: Top doc score={top_score:.2f} (semantic {SEMANTIC_WEIGHT:.0%}, keyword {KEYWORD_WEIGHT:.0%})")
 
         # APPLY SOURCE TEXT FILTERING (if specific texts mentioned in query)
         if source_filters:
             merged_docs = self._filter_docs_by_source(merged_docs, source_filters, strict_filter)
+        stage_timings["merge"] = time.perf_counter() - stage_start
 
         # QUERY EXPANSION: Add documents related to proper nouns in the query
         if EXPANSION_DOCS > 0:
-            proper_nouns = self._extract_proper_nouns(query)
+            stage_start = time.perf_counter()
+            proper_nouns = list(analysis.proper_nouns)
 
             # Apply context-based disambiguation for homonyms
             # Example: "Bharata in battle" → searches for Bharata tribe, not sage
@@ -368,15 +492,11 @@ class HybridRetriever(BaseRetriever):
                 if original != disambiguated:
                     logger.info(f"HybridRetriever: Query expansion using '{disambiguated}' instead of '{original}'")            # LOCATION-AWARE EXPANSION: Detect queries about geographic locations
             # Triggers for: "where", "which river", "cross", "location", "place", "dwell", "live"
-            location_keywords = ['where', 'location', 'place', 'river', 'rivers', 'cross', 'crossed', 'crossing',
-                               'dwell', 'dwelling', 'lived', 'live', 'settled', 'settlement', 'bank', 'banks']
-            is_location_query = any(word in query.lower() for word in location_keywords)
+            is_location_query = analysis.is_location_query
 
             # TRIBAL EXPANSION: Detect queries about tribes, enemies, allies in Ten Kings battle
             # Triggers for: "tribes", "enemies", "allies", "fought with", "fought against", "ten kings"
-            tribal_keywords = ['tribe', 'tribes', 'enemy', 'enemies', 'ally', 'allies', 'fought with', 'fought against',
-                             'confederat', 'coalition', 'ten kings']
-            is_tribal_query = any(keyword in query.lower() for keyword in tribal_keywords)
+            is_tribal_query = analysis.is_tribal_query
 
             if is_location_query:
                 # Search for documents mentioning entities + comprehensive Vedic geographic locations
@@ -424,7 +544,7 @@ class HybridRetriever(BaseRetriever):
                     'forests', 'forest',    # Forest regions (Yajurveda)
                     'plains', 'valleys',    # Geographic features
                 ]
-                logger.info(f"HybridRetriever: Location query detected (keywords: {[k for k in location_keywords if k in query.lower()]})")
+                logger.info(f"HybridRetriever: Location query detected (keywords: {list(analysis.location_keywords)})")
                 # Add location names to proper nouns for expansion (use original nouns, not disambiguated)
                 nouns_for_expansion = [orig for orig, _, _ in proper_nouns_disambiguated] + common_locations
             elif is_tribal_query:
@@ -432,20 +552,20 @@ class HybridRetriever(BaseRetriever):
                 # Ten Kings battle: Pakthas, Bhalanas, Alinas, Sivas, Visanins, Druhyus, Anavas, Purus, etc.
                 known_tribes = ['Pakthas', 'Bhalanas', 'Alinas', 'Sivas', 'Visanins', 'Druhyus', 'Anavas', 'Purus',
                               'Anu', 'Vaikarna', 'Kavasa', 'Bhrgus']
-                logger.info(f"HybridRetriever: Tribal query detected (keywords: {[k for k in tribal_keywords if k in query.lower()]})")
+                logger.info(f"HybridRetriever: Tribal query detected (keywords: {list(analysis.tribal_keywords)})")
                 # Add tribal names to proper nouns for expansion (use original nouns)
                 nouns_for_expansion = [orig for orig, _, _ in proper_nouns_disambiguated] + known_tribes
 
                 # CONFEDERATION EXPANSION: If constituent tribes detected, add confederation names
-                confederation_expansions = set()
+                confederation_expansions = {}  # insertion-ordered set, so expansion order is reproducible
                 for noun in nouns_for_expansion:
                     confed = get_confederation_for_tribe(noun)
                     if confed:
-                        confederation_expansions.add(confed)
+                        confederation_expansions[confed] = None
                         logger.info(f"HybridRetriever: Detected constituent tribe '{noun}' → adding confederation '{confed}'")
                         # Also add the constituent tribes of that confederation
                         constituents = get_constituent_tribes(confed)
-                        confederation_expansions.update(constituents)
+                        confederation_expansions.update(dict.fromkeys(constituents))
                         logger.info(f"HybridRetriever: Adding all '{confed}' constituents: {constituents}")
 
                 # Add confederations to expansion list
@@ -457,25 +577,39 @@ class HybridRetriever(BaseRetriever):
             if nouns_for_expansion:
                 logger.info(f"HybridRetriever: Found proper nouns for expansion: {nouns_for_expansion}")
                 expansion_docs = []
-                expansion_seen = set(sorted_hashes)  # Don't duplicate primary results
+                expansion_seen = set(merged_keys)  # Don't duplicate primary results
 
                 # For each proper noun, get related documents
                 # Increased limit to 12 for tribal/location queries (more entities to search)
                 expansion_limit = 12 if (is_location_query or is_tribal_query) else 8
+                expansion_plan = []
+                db_variants = get_proper_noun_variants_many(nouns_for_expansion[:expansion_limit])
                 for noun in nouns_for_expansion[:expansion_limit]:
                     # Get transliteration variants (e.g., Sudas → Sudasa, Vasishtha → Vasistha)
-                    variants = self._get_transliteration_variants(noun)
+                    variants = self._get_transliteration_variants(noun, db_variants[noun])
                     logger.info(f"HybridRetriever: Searching variants for '{noun}': {variants}")
+                    expansion_plan.append((noun, variants))
+
+                # Search every variant in one round trip instead of one embed+search
+                # per variant; the selection loop below then consumes the prefetched
+                # results in the same order, so the chosen docs are unchanged.
+                prefetched = self._prefetch_expansion_searches(
+                    [variant for _, variants in expansion_plan for variant in variants],
+                    stage_timings,
+                )
 
+                for noun, variants in expansion_plan:
                     # Search semantically for the proper noun and all its variants
                     for variant in variants:
-                        noun_docs = self.semantic_retriever.invoke(variant)
+                        noun_docs = prefetched.get(variant)
+                        if noun_docs is None:
+                            noun_docs = self.semantic_retriever.invoke(variant)
 
                         for doc in noun_docs[:EXPANSION_DOCS]:
-                            content_hash = hash(doc.page_content)
-                            if content_hash not in expansion_seen:
+                            doc_key = self._chunk_key(doc)
+                            if doc_key not in expansion_seen:
                                 expansion_docs.append(doc)
-                                expansion_seen.add(content_hash)
+                                expansion_seen.add(doc_key)
                                 # Break after getting EXPANSION_DOCS per noun
                                 if len(expansion_docs) >= EXPANSION_DOCS * len(proper_nouns[:3]):
                                     break
@@ -493,18 +627,63 @@ class HybridRetriever(BaseRetriever):
                     merged_docs = merged_docs[:self.k] + expansion_docs
                     logger.info(f"HybridRetriever: Total docs (primary + expansion) = {len(merged_docs)}")
 
-        # Return top k primary results + limited expansion docs
-        # For Groq: Keep total manageable to stay under 6K token limit
-        max_expansion = EXPANSION_DOCS * 2 if EXPANSION_DOCS > 0 else 0
-        return merged_docs[:self.k + max_expansion]
+            stage_timings["expansion"] = time.perf_counter() - stage_start
 
+        stage_timings["total"] = time.perf_counter() - query_start
+        self.last_stage_timings = stage_timings
+        logger.info(
+            "HybridRetriever: Stage timings (ms): "
+            + ", ".join(f"{stage}={seconds * 1000:.1f}" for stage, seconds in stage_timings.items())
+        )
+
+        results = merged_docs[:self.k + max_expansion]
+        if cache_key is not None:
+            self.result_cache.put(cache_key, results)
+        return results
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun = None
+    ) -> List[Document]:
+        """Async retrieval for the async graphs.
+
+        BM25 scoring, fusion and expansion are CPU-bound, so the hybrid search
+        runs in a bounded thread pool (ASYNC_RETRIEVAL_WORKERS) and the event
+        loop stays free for other sessions' LLM calls.
+        """
+        sync_manager = run_manager.get_sync() if run_manager is not None else None
+        return await asyncio.get_running_loop().run_in_executor(
+            _async_retrieval_pool(),
+            lambda: self._get_relevant_documents(query, run_manager=sync_manager),
+        )
 
-def create_retriever(vec_db, documents, top_n=5):
+
+def _index_fingerprint(vec_db, documents) -> str:
+    """Identity of the indexed corpus, collection and embedding model, for cache invalidation."""
+    from src.utils.bm25_index import corpus_fingerprint
+
+    fingerprint = getattr(documents, "fingerprint", None)
+    if fingerprint is None:
+        fingerprint = corpus_fingerprint([doc.page_content for doc in documents])
+    embeddings = getattr(vec_db, "embeddings", None)
+    model = (
+        getattr(embeddings, "namespace", None)
+        or getattr(embeddings, "model_name", None)
+        or getattr(embeddings, "model", None)
+        or type(embeddings).__name__
+    )
+    collection = getattr(vec_db, "collection_name", COLLECTION_NAME)
+    return f"{collection}:{model}:{fingerprint}"
+
+
+def create_retriever(vec_db, documents, top_n=5, index_dir: Optional[str] = None):
     """Create a hybrid retriever combining semantic (Qdrant) and keyword (BM25) search.
 
     This combines the best of both:
     - BM25 for exact matches: specific hymn numbers, exact phrases
     - Semantic for concepts: understanding meanings, associations, relationships
+
+    index_dir is where the persistent BM25 index lives (default: next to the
+    collection's chunk store).
     """
 
     # Configure Qdrant semantic retriever
@@ -516,17 +695,52 @@ def create_retriever(vec_db, documents, top_n=5):
         # Create BM25 keyword retriever
         logger.info(f"Creating BM25 retriever with {len(documents)} documents")
 
-        bm25_retriever = BM25Retriever.from_documents(documents=documents)
+        bm25_retriever = None
+        with startup_phase("bm25_build"):
+            if PERSISTENT_BM25 and documents:
+                # Memory-mapped index stored next to the chunk store; rebuilt only when the corpus changes
+                try:
+                    from src.utils.bm25_index import PersistentBM25Retriever, BM25_INDEX_DIRNAME
+
+                    bm25_dir = os.path.join(index_dir or os.path.join(VECTORDB_FOLDER, COLLECTION_NAME), BM25_INDEX_DIRNAME)
+                    bm25_retriever = PersistentBM25Retriever.from_documents(documents, index_dir=bm25_dir)
+                except Exception as e:
+                    logger.warning(f"Persistent BM25 index unavailable ({e}). Building in memory.")
+
+            if bm25_retriever is None:
+                bm25_retriever = BM25Retriever.from_documents(documents=documents)
         bm25_retriever.k = RETRIEVAL_K
 
         # Create custom hybrid retriever
         hybrid = HybridRetriever(
             semantic_retriever=qdrant_retriever,
             keyword_retriever=bm25_retriever,
-            k=RETRIEVAL_K
+            k=RETRIEVAL_K,
+            use_point_ids=bool(getattr(documents, "has_ids", False)),
         )
 
-        logger.info(f"Hybrid retriever created: BM25 (keywords) + Qdrant (semantic), k={RETRIEVAL_K}")
+        if VERSE_INDEX and documents:
+            with startup_phase("verse_index"):
+                try:
+                    from src.utils.verse_index import load_or_build_verse_index, VERSE_INDEX_DIRNAME
+
+                    verse_dir = os.path.join(index_dir or os.path.join(VECTORDB_FOLDER, COLLECTION_NAME), VERSE_INDEX_DIRNAME)
+                    hybrid.verse_index = load_or_build_verse_index(
+                        documents, verse_dir, source_dir=VERSE_SOURCE_FOLDER or None
+                    )
+                except Exception as e:
+                    logger.warning(f"Verse index unavailable ({e}). Verse references go through search.")
+
+        if RETRIEVAL_CACHE:
+            hybrid.result_cache = RetrievalCache(
+                max_entries=RETRIEVAL_CACHE_MAX_ENTRIES,
+                max_bytes=RETRIEVAL_CACHE_MAX_MB * 1024 * 1024,
+                ttl=RETRIEVAL_CACHE_TTL,
+                disk_path=RETRIEVAL_CACHE_PATH or None,
+            )
+            hybrid.result_cache.bind(_index_fingerprint(vec_db, documents))
+
+        logger.info(f"Hybrid retriever created: BM25 (keywords) + Qdrant (semantic), k={RETRIEVAL_K}, fusion={FUSION_METHOD}, candidates={FUSION_CANDIDATES or RETRIEVAL_K}")
         return hybrid
 
     except Exception as e:
@@ -5,6 +5,8 @@ This bridges the semantic gap between Modern English queries and Vedic texts.
 
 from typing import List, Dict
 
+from src.utils.query_analysis import analyze_query
+
 # Basic lexicon - expand this with Monier-Williams dictionary later
 BASIC_LEXICON: Dict[str, List[str]] = {
     # Common nouns
@@ -113,32 +115,13 @@ def classify_query_type(query: str) -> str:
     Classify query into: construction, grammar, or factual.
     This enables routing to specialized retrievers.
 
+    Construction and grammar cues are matched by the shared query analysis
+    (see query_analysis.py), so callers reuse one pass over the query.
+
     Returns:
         "construction" | "grammar" | "factual"
     """
-    query_lower = query.lower()
-
-    # Construction indicators
-    construction_patterns = [
-        "how do i say", "translate to sanskrit", "what is", "in sanskrit",
-        "how to say", "say in vedic", "sanskrit for", "vedic word for",
-        "translate", "in devanagari", "construct"
-    ]
-
-    # Grammar indicators
-    grammar_patterns = [
-        "explain", "what is the rule", "how does", "why", "grammar",
-        "declension", "conjugation", "sandhi", "vibhakti", "case ending",
-        "verb form", "how to form"
-    ]
-
-    # Check patterns
-    if any(pattern in query_lower for pattern in construction_patterns):
-        return "construction"
-    elif any(pattern in query_lower for pattern in grammar_patterns):
-        return "grammar"
-    else:
-        return "factual"
+    return analyze_query(query).query_type
 
 
 # Quick lookup dictionaries for common queries
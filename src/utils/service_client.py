@@ -0,0 +1,111 @@
+"""
+Thin Client for the Local RAG Service
+
+Talks to `src/serve.py` over HTTP with the standard library only, so scripts
+and frontends can query one warm process instead of loading the embedding
+model, index and LLM clients themselves.
+
+    client = ServiceClient("http://127.0.0.1:8765")
+    docs = client.retrieve("Who is Sudas?", k=3)["documents"]
+    result = client.answer("Who is Sudas?")
+    result = client.answer("And his enemies?", chat_history=result["chat_history"])
+
+503 responses (LLM queue or connection limit full) are retried after the
+server's Retry-After delay, up to `retries` times, then raised as ServiceBusy.
+"""
+
+import json
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+from src.config import SERVICE_HOST, SERVICE_PORT, SERVICE_REQUEST_TIMEOUT
+
+DEFAULT_URL = f"http://{SERVICE_HOST}:{SERVICE_PORT}"
+
+
+class ServiceError(Exception):
+    """The service answered with an error status (or could not be reached: status 0)."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}" if status else message)
+        self.status = status
+        self.message = message
+
+
+class ServiceBusy(ServiceError):
+    """The service is at capacity; retry after `retry_after` seconds."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(503, message)
+        self.retry_after = retry_after
+
+
+def history_to_json(chat_history) -> List[Dict[str, str]]:
+    """Accept LangChain messages or {role, content} dicts; return the wire format."""
+    converted = []
+    for message in chat_history or []:
+        if isinstance(message, dict):
+            converted.append(message)
+        else:
+            role = "user" if getattr(message, "type", "human") == "human" else "assistant"
+            converted.append({"role": role, "content": message.content})
+    return converted
+
+
+class ServiceClient:
+    """Calls the /retrieve, /answer, /agentic and /health endpoints."""
+
+    def __init__(self, base_url: str = DEFAULT_URL, timeout: float = SERVICE_REQUEST_TIMEOUT, retries: int = 2):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+
+    def _request(self, method: str, path: str, payload: Optional[dict] = None) -> Dict[str, Any]:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        for attempt in range(self.retries + 1):
+            request = urllib.request.Request(
+                self.base_url + path,
+                data=data,
+                method=method,
+                headers={"Content-Type": "application/json"},
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return json.loads(response.read().decode("utf-8"))
+            except urllib.error.HTTPError as e:
+                try:
+                    message = json.loads(e.read().decode("utf-8")).get("error", e.reason)
+                except (ValueError, AttributeError):
+                    message = str(e.reason)
+                if e.code != 503:
+                    raise ServiceError(e.code, message) from None
+                retry_after = float(e.headers.get("Retry-After") or 1)
+                if attempt == self.retries:
+                    raise ServiceBusy(message, retry_after) from None
+                time.sleep(retry_after)
+            except urllib.error.URLError as e:
+                raise ServiceError(0, f"Cannot reach {self.base_url}: {e.reason}") from None
+
+    def health(self) -> Dict[str, Any]:
+        return self._request("GET", "/health")
+
+    def retrieve(self, query: str, k: Optional[int] = None) -> Dict[str, Any]:
+        """Documents ({page_content, metadata}) for a query."""
+        payload = {"query": query}
+        if k is not None:
+            payload["k"] = k
+        return self._request("POST", "/retrieve", payload)
+
+    def answer(self, question: str, chat_history=None, debug: bool = False) -> Dict[str, Any]:
+        """Run the RAG graph; pass the returned chat_history back for follow-ups."""
+        return self._request("POST", "/answer", {
+            "question": question,
+            "chat_history": history_to_json(chat_history),
+            "debug": debug,
+        })
+
+    def agentic(self, question: str) -> Dict[str, Any]:
+        """Run the agentic (dictionary, grammar, corpus) pipeline."""
+        return self._request("POST", "/agentic", {"question": question})
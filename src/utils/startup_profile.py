@@ -0,0 +1,311 @@
+"""
+Startup Profiler
+
+Records where cold-start time goes in the entry points (cli_run,
+vedic_sanskrit_tutor, sanskrit_tutor_frontend, migration_debate_cli) when they
+are run with `--profile-startup`:
+
+- imports: wall time of the entry point's import block, with a per-package
+  breakdown of module execution time (self time, like `python -X importtime`)
+- config: time spent executing the config module (.env and secrets lookups)
+- embed_model_load, chunk_load, bm25_build, qdrant_connect, graph_compile,
+  llm_init: marked by the code that does the work via `startup_phase`
+
+The entry point writes the report as JSON and exits before its interactive
+loop, so runs can be compared across releases:
+
+    python src/cli_run.py --no-cleanup-prompt --profile-startup startup.json
+
+When no profiler is active, `startup_phase` and `startup_checkpoint` are no-ops.
+"""
+
+import importlib.abc
+import json
+import platform
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Entry points run from src/ import this module as utils.startup_profile,
+# library code as src.utils.startup_profile; register both names so there is
+# only ever one active profiler.
+for _name in ("utils.startup_profile", "src.utils.startup_profile"):
+    sys.modules.setdefault(_name, sys.modules[__name__])
+
+PROFILE_FLAG = "--profile-startup"
+DEFAULT_REPORT_PATH = "startup_profile.json"
+CONFIG_MODULES = ("config", "src.config")
+_SRC_DIR = str(Path(__file__).resolve().parent.parent)
+_TOP_PACKAGES = 30
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path hook that times module execution.
+
+    It finds specs through the remaining finders and wraps the loader's
+    exec_module, attributing to each module its own execution time minus the
+    time of the imports it triggered.
+    """
+
+    def __init__(self):
+        self.self_times: Dict[str, float] = defaultdict(float)
+        self.first_party = set()
+        self.active = True
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if not self.active or getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._local.finding = False
+
+        loader = getattr(spec, "loader", None)
+        # Class-level loaders (builtins, frozen) are shared; already-wrapped loaders keep their wrapper
+        if loader is None or isinstance(loader, type) or "exec_module" in vars(loader):
+            return spec
+        try:
+            loader.exec_module = self._timed(loader.exec_module)
+        except AttributeError:
+            pass
+        return spec
+
+    def _timed(self, exec_module):
+        def timed_exec_module(module):
+            if not self.active:
+                return exec_module(module)
+            stack = self._local.__dict__.setdefault("stack", [])
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                name = module.__name__
+                self.self_times[name] += elapsed - children
+                if str(getattr(module, "__file__", "") or "").startswith(_SRC_DIR):
+                    self.first_party.add(name)
+
+        return timed_exec_module
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        self.active = False
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def summary(self) -> dict:
+        by_package: Dict[str, float] = defaultdict(float)
+        for name, seconds in self.self_times.items():
+            if name not in self.first_party:
+                by_package[name.partition(".")[0]] += seconds
+        first_party = {name: self.self_times[name] for name in self.first_party}
+        return {
+            "modules": len(self.self_times),
+            "seconds": round(sum(self.self_times.values()), 4),
+            "by_package": _ranked(by_package, _TOP_PACKAGES),
+            "first_party": _ranked(first_party),
+        }
+
+
+def _ranked(times: Dict[str, float], limit: Optional[int] = None) -> List[dict]:
+    ranked = sorted(times.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{"name": name, "seconds": round(seconds, 4)} for name, seconds in ranked]
+
+
+class StartupProfiler:
+    """Wall-clock phases of one entry point's startup, plus import timings."""
+
+    def __init__(self, entry_point: str, time_imports: bool = True):
+        self.entry_point = entry_point
+        self.started = time.perf_counter()
+        self.phases: List[dict] = []
+        self._open: List[dict] = []
+        self._last_checkpoint = self.started
+        self._lock = threading.RLock()
+        self._ids = 0
+        self._imports = _ImportTimer() if time_imports else None
+        if self._imports is not None:
+            self._imports.install()
+
+    def _record(self, name: str, start: float, end: float, phase_id: Optional[int] = None) -> dict:
+        with self._lock:
+            parent = self._open[-1] if self._open else None
+            record = {
+                "id": phase_id if phase_id is not None else self._next_id(),
+                "name": name,
+                "parent": parent["name"] if parent else None,
+                "parent_id": parent["id"] if parent else None,
+                "depth": len(self._open),
+                "start": round(start - self.started, 4),
+                "seconds": round(end - start, 4),
+            }
+            self.phases.append(record)
+            return record
+
+    def _next_id(self) -> int:
+        self._ids += 1
+        return self._ids
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block; phases opened inside it are recorded as its children."""
+        start = time.perf_counter()
+        with self._lock:
+            marker = {"id": self._next_id(), "name": name}
+            self._open.append(marker)
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self._open.remove(marker)
+            self._record(name, start, end, marker["id"])
+
+    def checkpoint(self, name: str):
+        """Record the time since the previous checkpoint (or profiler start) as a phase."""
+        now = time.perf_counter()
+        self._record(name, self._last_checkpoint, now)
+        self._last_checkpoint = now
+
+    def report(self) -> dict:
+        total = time.perf_counter() - self.started
+        phases = sorted((dict(p) for p in self.phases), key=lambda p: (p["start"], p["depth"]))
+        imports = self._imports.summary() if self._imports is not None else None
+
+        if self._imports is not None:
+            config_seconds = sum(self._imports.self_times.get(name, 0.0) for name in CONFIG_MODULES)
+            imports_phase = next((p for p in phases if p["name"] == "imports"), None)
+            if config_seconds and imports_phase is not None:
+                # Executed inside the import block, so reported as its child
+                phases.append({
+                    "id": self._next_id(),
+                    "name": "config",
+                    "parent": "imports",
+                    "parent_id": imports_phase["id"],
+                    "depth": imports_phase["depth"] + 1,
+                    "start": None,
+                    "seconds": round(config_seconds, 4),
+                })
+
+        # Self time: a phase's wall time not covered by its children
+        for p in phases:
+            children = sum(c["seconds"] for c in phases if c["parent_id"] == p["id"])
+            p["self_seconds"] = round(max(p["seconds"] - children, 0.0), 4)
+
+        totals: Dict[str, float] = defaultdict(float)
+        for p in phases:
+            totals[p["name"]] += p["seconds"]
+        top_level = sum(p["seconds"] for p in phases if p["depth"] == 0)
+
+        return {
+            "entry_point": self.entry_point,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "total_seconds": round(total, 4),
+            "unattributed_seconds": round(max(total - top_level, 0.0), 4),
+            "phase_totals": {name: round(seconds, 4) for name, seconds in totals.items()},
+            "phases": phases,
+            "imports": imports,
+        }
+
+    def stop(self):
+        if self._imports is not None:
+            self._imports.uninstall()
+
+
+_active: Optional[StartupProfiler] = None
+
+
+def profiling_requested(argv: Optional[List[str]] = None) -> bool:
+    """Whether the command line asks for a startup profile (checked before argparse runs)."""
+    argv = sys.argv[1:] if argv is None else argv
+    return any(arg == PROFILE_FLAG or arg.startswith(PROFILE_FLAG + "=") for arg in argv)
+
+
+def start_startup_profile(entry_point: str, argv: Optional[List[str]] = None) -> Optional[StartupProfiler]:
+    """Start profiling if `--profile-startup` is on the command line.
+
+    Call this before the entry point's heavy imports. Returns the active
+    profiler (the first entry point to start one keeps it) or None.
+    """
+    global _active
+    if _active is None and profiling_requested(argv):
+        _active = StartupProfiler(entry_point)
+    return _active
+
+
+def active_profiler() -> Optional[StartupProfiler]:
+    return _active
+
+
+@contextmanager
+def startup_phase(name: str):
+    """Record a startup phase when profiling; otherwise do nothing."""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    with profiler.phase(name):
+        yield
+
+
+def startup_checkpoint(name: str, entry_point: Optional[str] = None):
+    """Record the time since the last checkpoint as a phase when profiling.
+
+    With `entry_point`, only records when that entry point started the profiler,
+    so an entry point imported by another (cli_run by migration_debate_cli)
+    does not split the importer's phases.
+    """
+    if _active is not None and entry_point in (None, _active.entry_point):
+        _active.checkpoint(name)
+
+
+def add_profile_argument(parser):
+    """Add the `--profile-startup [PATH]` option to an entry point's parser."""
+    parser.add_argument(
+        PROFILE_FLAG,
+        nargs="?",
+        const=DEFAULT_REPORT_PATH,
+        default=None,
+        metavar="PATH",
+        help=f"Time startup phases, write a JSON report to PATH (default: {DEFAULT_REPORT_PATH}, '-' for stdout) and exit",
+    )
+
+
+def finish_startup_profile(path: Optional[str] = DEFAULT_REPORT_PATH) -> Optional[dict]:
+    """Stop profiling and write the report to `path` ('-' for stdout). Returns the report."""
+    global _active
+    profiler = _active
+    if profiler is None:
+        return None
+    _active = None
+    profiler.stop()
+    report = profiler.report()
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if path in (None, "-"):
+        print(text)
+    else:
+        Path(path).write_text(text + "\n", encoding="utf-8")
+        print(f"Startup profile written to {path} ({report['total_seconds']:.2f}s total)", file=sys.stderr)
+    return report
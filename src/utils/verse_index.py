@@ -0,0 +1,452 @@
+"""
+Verse Reference Index
+
+Queries such as "RV 2.33" or "RV 7.95.2" used to go through BM25/semantic search
+and a regex over the results to find the hymn. This module maps every verse
+reference in the corpus to the chunks that contain it and to its byte range in
+the source .txt, so such queries become a dictionary lookup.
+
+References are read from the texts' own structure:
+    [02-033] HYMN XXXIII.     Griffith Rigveda hymn; verses are numbered "1", "2", ...
+    Mandala 2/Sukta 33        Sharma Rigveda sukta (no verse numbers)
+    PBr. XIV. 3. 2            Pancavamsa Brahmana reference cited in a paragraph
+
+Canonical references use the citation labels of citation_enhancer ("RV 2.33",
+"RV 2.33.5", "PB 14.3.2"). A verse missing from a source (Sharma numbers no
+verses) falls back to its hymn in that source.
+
+On-disk layout (one directory next to the chunk store, keyed like bm25_index):
+    meta.json     version, corpus fingerprint, source file signatures
+    refs.json     reference -> {source: {"chunks": [...], "spans": [[start, end], ...]}}
+"""
+
+import json
+import os
+import re
+import shutil
+import time
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import zip_longest
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from src.helper import logger
+from src.utils.bm25_index import corpus_fingerprint
+from src.utils.citation_enhancer import VedicCitationExtractor
+
+VERSE_INDEX_DIRNAME = "verse_index"
+VERSE_INDEX_VERSION = 1
+
+# Section markers at the start of a line
+_SECTION_PATTERN = re.compile(
+    r"^(?:\[(?P<hymn_mandala>\d{2})-(?P<hymn_sukta>\d{3})\]\s+HYMN\b"
+    r"|Mandala\s+(?P<sukta_mandala>\d+)\s*/\s*Sukta\s+(?P<sukta_sukta>\d+)[ \t]*$)",
+    re.MULTILINE,
+)
+# Pancavamsa references cited in running text (same pattern as the citations)
+_MENTION_PATTERN = re.compile(VedicCitationExtractor.PATTERNS['pancavamsa_reference'], re.IGNORECASE)
+# References in a query: "RV 2.33", "Rigveda 7.95.2", "[02-033]", "YV 13.3", "PBr. XIV.3.2"
+_QUERY_PATTERN = re.compile(
+    r"\b(?P<text>RV|Rig\s*-?\s*veda|YV|Yajur\s*-?\s*veda)\s*(?P<a>\d+)(?:\s*[.:]\s*|\s+)(?P<b>\d+)"
+    r"(?:\s*[.:]\s*(?P<c>\d+))?"
+    r"|\[(?P<hymn_mandala>\d{2})-(?P<hymn_sukta>\d{3})\]"
+    r"|\bPBr?\.?\s*(?P<pb_book>\d+|[IVX]+)\s*\.\s*(?P<pb_section>\d+)(?:\s*\.\s*(?P<pb_verse>\d+))?",
+    re.IGNORECASE,
+)
+
+
+class VerseRef(NamedTuple):
+    """Canonical reference: text ("RV", "YV", "PB"), mandala/book, sukta/section, verse (0 = whole)."""
+    text: str
+    mandala: int
+    sukta: int
+    verse: int = 0
+
+    @property
+    def key(self) -> str:
+        verse_part = f".{self.verse}" if self.verse else ""
+        return f"{self.text} {self.mandala}.{self.sukta}{verse_part}"
+
+    @property
+    def hymn(self) -> "VerseRef":
+        return self._replace(verse=0)
+
+
+class VerseLocation(NamedTuple):
+    """Where one source has a reference."""
+    source: str                          # document filename (chunk metadata 'filename')
+    ref: VerseRef                        # the entry found (the hymn when the source numbers no verses)
+    chunks: Tuple[int, ...]              # chunk indices in the chunk store, in order
+    spans: Tuple[Tuple[int, int], ...]   # byte ranges in <source_dir>/<source>.txt
+
+
+def find_verse_refs(text: str) -> List[VerseRef]:
+    """Every verse reference in a query, in order of appearance (duplicates removed)."""
+    refs = {}
+    for match in _QUERY_PATTERN.finditer(text):
+        if match.group('text'):
+            label = "RV" if match.group('text').upper().startswith("R") else "YV"
+            ref = VerseRef(label, int(match.group('a')), int(match.group('b')), int(match.group('c') or 0))
+        elif match.group('hymn_mandala'):
+            ref = VerseRef("RV", int(match.group('hymn_mandala')), int(match.group('hymn_sukta')))
+        else:
+            ref = _pancavamsa_ref(match.group('pb_book'), match.group('pb_section'), match.group('pb_verse'))
+        refs[ref] = None
+    return list(refs)
+
+
+def parse_verse_ref(reference) -> Optional[VerseRef]:
+    """A VerseRef from "RV 7.95.2" (or a VerseRef); None if there is no reference."""
+    if isinstance(reference, VerseRef):
+        return reference
+    refs = find_verse_refs(reference)
+    return refs[0] if refs else None
+
+
+def _pancavamsa_ref(book: str, section: str, verse: Optional[str]) -> VerseRef:
+    book = str(VedicCitationExtractor._roman_to_int(book.upper())) if not book.isdigit() else book
+    return VerseRef("PB", int(book), int(section), int(verse or 0))
+
+
+@lru_cache(maxsize=512)
+def _verse_pattern(number: int) -> "re.Pattern":
+    # Griffith numbers verses inline: "Rudra. 1. FATHER of Maruts ... 2 With the most ..."
+    return re.compile(r"(?<![\w.,])%d\.?\s+(?=\S)" % number)
+
+
+class _ScanState:
+    """Section and verse in effect at the current position; carried across chunks."""
+
+    def __init__(self):
+        self.section: Optional[VerseRef] = None
+        self.verse: Optional[VerseRef] = None
+        self.numbered = False
+
+    def current(self) -> List[VerseRef]:
+        return [ref for ref in (self.section, self.verse) if ref is not None]
+
+
+def _scan(text: str, state: _ScanState) -> List[Tuple[int, VerseRef, str]]:
+    """(position, reference, kind) events in text; kind is "section", "verse" or "mention"."""
+    events = []
+    markers = list(_SECTION_PATTERN.finditer(text))
+    segment_ends = [marker.start() for marker in markers] + [len(text)]
+    segments = [(0, segment_ends[0], None)] + [
+        (marker.end(), segment_ends[i + 1], marker) for i, marker in enumerate(markers)
+    ]
+    for start, end, marker in segments:
+        if marker is not None:
+            if marker.group('hymn_mandala'):
+                ref = VerseRef("RV", int(marker.group('hymn_mandala')), int(marker.group('hymn_sukta')))
+            else:
+                ref = VerseRef("RV", int(marker.group('sukta_mandala')), int(marker.group('sukta_sukta')))
+            # Chunk overlap repeats a marker; the section is already open
+            if ref != state.section or bool(marker.group('hymn_mandala')) != state.numbered:
+                state.section, state.verse = ref, None
+                state.numbered = bool(marker.group('hymn_mandala'))
+                events.append((marker.start(), ref, "section"))
+        if state.section is None or not state.numbered:
+            continue
+        position = start
+        while True:
+            number = state.verse.verse + 1 if state.verse else 1
+            match = _verse_pattern(number).search(text, position, end)
+            if match is None:
+                break
+            state.verse = state.section._replace(verse=number)
+            events.append((match.start(), state.verse, "verse"))
+            position = match.end()
+
+    for match in _MENTION_PATTERN.finditer(text):
+        events.append((match.start(), _pancavamsa_ref(*match.groups()), "mention"))
+    return sorted(events, key=lambda event: event[0])
+
+
+def _trim(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Drop trailing whitespace and the "-----" rule between Griffith hymns."""
+    while end > start and text[end - 1] in " \t\r\n-":
+        end -= 1
+    return start, end
+
+
+def _source_spans(text: str) -> Dict[VerseRef, List[Tuple[int, int]]]:
+    """Character range of every reference in a whole source text."""
+    events = _scan(text, _ScanState())
+    section_starts = [position for position, _, kind in events if kind == "section"] + [len(text)]
+    spans: Dict[VerseRef, List[Tuple[int, int]]] = {}
+    section_end = len(text)
+    last_verse = None
+    for position, ref, kind in events:
+        if kind == "mention":
+            # The paragraph citing the reference
+            start = text.rfind("\n\n", 0, position)
+            end = text.find("\n\n", position)
+            span = (0 if start < 0 else start + 2, len(text) if end < 0 else end)
+            spans.setdefault(ref, []).append(_trim(text, *span))
+            continue
+        if last_verse is not None:
+            # A verse runs up to the next verse or section
+            start = spans[last_verse][-1][0]
+            spans[last_verse][-1] = _trim(text, start, min(position, section_end))
+            last_verse = None
+        if kind == "section":
+            section_end = section_starts[bisect_right(section_starts, position)]
+        else:
+            last_verse = ref
+        spans.setdefault(ref, []).append(_trim(text, position, section_end))
+    return spans
+
+
+def _byte_offsets(text: str, positions: Iterable[int]) -> Dict[int, int]:
+    """Byte offset (UTF-8) of each character position."""
+    offsets = {}
+    char_position = byte_position = 0
+    for position in sorted(set(positions)):
+        byte_position += len(text[char_position:position].encode("utf-8", "surrogateescape"))
+        char_position = position
+        offsets[position] = byte_position
+    return offsets
+
+
+def _file_signature(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class VerseIndex:
+    """Reference -> chunks and source byte ranges, looked up in O(1)."""
+
+    def __init__(self, refs: Dict[str, Dict[str, dict]], source_dir: Optional[str] = None,
+                 fingerprint: Optional[str] = None, sources: Optional[Dict[str, Optional[List[int]]]] = None):
+        self.refs = refs
+        self.source_dir = source_dir
+        self.fingerprint = fingerprint
+        self.sources = sources or {}
+        # Chunks the chunk indices refer to (set by load_or_build_verse_index)
+        self.docs: Optional[Sequence[Document]] = None
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def __contains__(self, reference) -> bool:
+        return bool(self.locate(reference))
+
+    @classmethod
+    def build(cls, documents: Sequence[Document], source_dir: Optional[str] = None,
+              fingerprint: Optional[str] = None) -> "VerseIndex":
+        """Index the references of a chunk sequence and of its documents' source .txt files.
+
+        Args:
+            documents: Chunks in chunk-store order (a ChunkStore or a list of Documents)
+            source_dir: Folder with <filename>.txt for each document (None = no byte ranges)
+            fingerprint: Corpus fingerprint the index belongs to
+        """
+        refs: Dict[str, Dict[str, dict]] = {}
+        states: Dict[str, _ScanState] = {}
+
+        def _entry(ref, source):
+            return refs.setdefault(ref.key, {}).setdefault(source, {"chunks": [], "spans": []})
+
+        # Chunks follow each other within a document, so one scan state per document
+        # tells which hymn and verse a chunk without a marker continues.
+        # A ChunkStore reads text and metadata without building Documents.
+        read_text = getattr(documents, "text", None)
+        for i in range(len(documents)):
+            if read_text is not None:
+                text, metadata = read_text(i), documents.metadata(i)
+            else:
+                text, metadata = documents[i].page_content, documents[i].metadata
+            source = metadata.get("filename", "unknown_source")
+            state = states.setdefault(source, _ScanState())
+            chunk_refs = dict.fromkeys(state.current())
+            chunk_refs.update((ref, None) for _, ref, _ in _scan(text, state))
+            for ref in chunk_refs:
+                chunks = _entry(ref, source)["chunks"]
+                if not chunks or chunks[-1] != i:
+                    chunks.append(i)
+
+        sources = {}
+        for source in sorted(states):
+            path = os.path.join(source_dir, f"{source}.txt") if source_dir else None
+            sources[source] = _file_signature(path) if path else None
+            if sources[source] is None:
+                continue
+            with open(path, "rb") as f:
+                text = f.read().decode("utf-8", "surrogateescape")
+            spans = _source_spans(text)
+            offsets = _byte_offsets(text, (p for ranges in spans.values() for span in ranges for p in span))
+            for ref, ranges in spans.items():
+                _entry(ref, source)["spans"] = [[offsets[start], offsets[end]] for start, end in ranges]
+
+        return cls(refs, source_dir=source_dir, fingerprint=fingerprint, sources=sources)
+
+    def save(self, index_dir: str):
+        """Write the index atomically (build in a sibling temp dir, then swap)."""
+        tmp_dir = f"{index_dir}.tmp-{os.getpid()}"
+        if os.path.isdir(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        os.makedirs(tmp_dir)
+
+        with open(os.path.join(tmp_dir, "refs.json"), "w", encoding="utf-8") as f:
+            json.dump(self.refs, f, separators=(",", ":"))
+
+        # meta.json is written last: its presence marks a complete index
+        meta = {
+            "version": VERSE_INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "source_dir": self.source_dir,
+            "sources": self.sources,
+            "num_refs": len(self.refs),
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        if os.path.isdir(index_dir):
+            shutil.rmtree(index_dir)
+        os.replace(tmp_dir, index_dir)
+
+    @staticmethod
+    def read_meta(index_dir: str) -> Optional[dict]:
+        """Return the index metadata, or None if no complete index exists."""
+        meta_path = os.path.join(index_dir, "meta.json")
+        if not os.path.isfile(meta_path):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def load(cls, index_dir: str) -> "VerseIndex":
+        meta = cls.read_meta(index_dir)
+        if meta is None or meta.get("version") != VERSE_INDEX_VERSION:
+            raise FileNotFoundError(f"No compatible verse index at {index_dir}")
+        with open(os.path.join(index_dir, "refs.json"), "r", encoding="utf-8") as f:
+            refs = json.load(f)
+        return cls(refs, source_dir=meta.get("source_dir"), fingerprint=meta.get("fingerprint"),
+                   sources=meta.get("sources"))
+
+    def locate(self, reference, source: Optional[str] = None) -> List[VerseLocation]:
+        """Where each source has a reference, by source name.
+
+        Args:
+            reference: A VerseRef or a string such as "RV 7.95.2"
+            source: Only sources whose name contains this (e.g. "griffith")
+        """
+        ref = parse_verse_ref(reference)
+        if ref is None:
+            return []
+        entries = {name: (ref, entry) for name, entry in self.refs.get(ref.key, {}).items()}
+        if ref.verse:
+            # Sources without verse numbers (Sharma) give the whole hymn
+            for name, entry in self.refs.get(ref.hymn.key, {}).items():
+                entries.setdefault(name, (ref.hymn, entry))
+        return [
+            VerseLocation(name, found, tuple(entry["chunks"]), tuple(tuple(span) for span in entry["spans"]))
+            for name, (found, entry) in sorted(entries.items())
+            if source is None or source.lower() in name.lower()
+        ]
+
+    def _chunks(self, ids: List[int]) -> List[Document]:
+        if self.docs is None:
+            return []
+        # ChunkStore.get builds only the requested Documents
+        get = getattr(self.docs, "get", None)
+        return get(ids) if get is not None else [self.docs[i] for i in ids]
+
+    def documents(self, reference, source: Optional[str] = None) -> List[Document]:
+        """The chunks of a reference, per source in name order."""
+        return self._chunks([i for location in self.locate(reference, source) for i in location.chunks])
+
+    def documents_for_query(self, query: str) -> List[Document]:
+        """The chunks of every reference in a query; [] if any reference is not indexed.
+
+        Sources are interleaved (each one's first chunk, then each one's second, ...),
+        so a caller that keeps only the first few chunks still gets the start of the
+        hymn from every translation rather than all of one.
+        """
+        locations = [self.locate(ref) for ref in find_verse_refs(query)]
+        if not locations or not all(locations):
+            return []
+        per_source = [location.chunks for found in locations for location in found]
+        ids = dict.fromkeys(i for chunks in zip_longest(*per_source) for i in chunks if i is not None)
+        return self._chunks(list(ids))
+
+    def text(self, reference, source: str) -> Optional[str]:
+        """The text of a reference in one source (e.g. "griffith"), read by byte range.
+
+        Falls back to the joined chunks when the source .txt is unavailable.
+        """
+        locations = self.locate(reference, source)
+        if not locations:
+            return None
+        location = locations[0]
+        if location.spans and self.source_dir:
+            path = os.path.join(self.source_dir, f"{location.source}.txt")
+            try:
+                parts = []
+                with open(path, "rb") as f:
+                    for start, end in location.spans:
+                        f.seek(start)
+                        parts.append(f.read(end - start).decode("utf-8", "replace").strip())
+                return "\n\n".join(parts)
+            except OSError as e:
+                logger.warning(f"Could not read {path}: {e}")
+        return "\n\n".join(doc.page_content for doc in self._chunks(list(location.chunks))) or None
+
+
+def load_or_build_verse_index(documents: Sequence[Document], index_dir: str,
+                              source_dir: Optional[str] = None,
+                              fingerprint: Optional[str] = None) -> VerseIndex:
+    """Open the persisted index if it matches the corpus and source files, otherwise rebuild it.
+
+    Args:
+        documents: Chunks in chunk-store order
+        index_dir: Directory holding the index (usually next to the chunk store)
+        source_dir: Folder with the source .txt files (None = chunks only)
+        fingerprint: Precomputed corpus fingerprint (computed from the texts if None)
+    """
+    if fingerprint is None:
+        fingerprint = getattr(documents, "fingerprint", None)
+    if fingerprint is None:
+        texts = getattr(documents, "texts", None) or [doc.page_content for doc in documents]
+        fingerprint = corpus_fingerprint(texts)
+
+    meta = VerseIndex.read_meta(index_dir)
+    if (
+        meta
+        and meta.get("version") == VERSE_INDEX_VERSION
+        and meta.get("fingerprint") == fingerprint
+        and meta.get("source_dir") == source_dir
+        and all(
+            (_file_signature(os.path.join(source_dir, f"{name}.txt")) if source_dir else None) == signature
+            for name, signature in (meta.get("sources") or {}).items()
+        )
+    ):
+        start = time.perf_counter()
+        index = VerseIndex.load(index_dir)
+        index.docs = documents
+        logger.info(f"Loaded verse index from {index_dir} ({len(index)} references) in {time.perf_counter() - start:.3f}s")
+        return index
+
+    if meta:
+        logger.info(f"Verse index at {index_dir} is stale (corpus or source files changed). Rebuilding")
+    else:
+        logger.info(f"No verse index at {index_dir}. Building")
+
+    start = time.perf_counter()
+    index = VerseIndex.build(documents, source_dir=source_dir, fingerprint=fingerprint)
+    index.docs = documents
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(index_dir)), exist_ok=True)
+        index.save(index_dir)
+    except OSError as e:
+        logger.warning(f"Could not persist verse index to {index_dir}: {e}")
+    logger.info(f"Built verse index ({len(index)} references) in {time.perf_counter() - start:.2f}s")
+    return index
@@ -23,22 +23,35 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Must start before the heavy imports below so they are timed (no-op without --profile-startup)
+from src.utils.startup_profile import (
+    start_startup_profile,
+    startup_checkpoint,
+    startup_phase,
+    add_profile_argument,
+    finish_startup_profile,
+)
+start_startup_profile("vedic_sanskrit_tutor")
+
 import argparse
 import random
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
 from src.helper import project_root, logger
-from src.config import LOCAL_FOLDER, COLLECTION_NAME, VECTORDB_FOLDER
+from src.config import LOCAL_FOLDER, COLLECTION_NAME, VECTORDB_FOLDER, STREAM_ANSWERS, TUTOR_SKIP_EVALUATION
 from src.utils.index_files import create_qdrant_vector_store
 from src.utils.retriever import create_retriever
-from src.utils.final_block_rag import create_langgraph_app, run_rag_with_langgraph
+from src.utils.final_block_rag import (
+    create_tutor_langgraph_app,
+    run_rag_with_langgraph,
+    stream_tutor_with_langgraph,
+)
 
-from langchain_community.chat_models import ChatOllama
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, SystemMessage
-from src.settings import OLLAMA_BASE_URL, OLLAMA_MODEL, GEMINI_MODEL, Settings
+from src.settings import OLLAMA_BASE_URL, OLLAMA_MODEL, GEMINI_MODEL
+from src.utils.providers import chat_model_class
 
+startup_checkpoint("imports", "vedic_sanskrit_tutor")
 
 # Learning Modules
 MODULES = {
@@ -54,20 +67,23 @@ MODULES = {
 class VedicSanskritTutor:
     """Interactive Vedic Sanskrit learning assistant."""
 
-    def __init__(self, rag_app, retriever, llm_provider="ollama", model_name="llama3.1:8b"):
-        self.rag_app = rag_app
+    def __init__(self, retriever, llm_provider="ollama", model_name="llama3.1:8b",
+                 stream=STREAM_ANSWERS, skip_evaluation=TUTOR_SKIP_EVALUATION):
         self.retriever = retriever
         self.chat_history = []
+        self.stream = stream  # print replies token by token
+        # Modes answered without the confidence check
+        self.skip_evaluation = {mode.strip() for mode in skip_evaluation.split(",") if mode.strip()}
 
         # Initialize LLM for teaching
         if llm_provider == "gemini":
-            self.llm = ChatGoogleGenerativeAI(
+            self.llm = chat_model_class("gemini")(
                 model=GEMINI_MODEL,
                 temperature=0.7,
                 timeout=180
             )
         else:
-            self.llm = ChatOllama(
+            self.llm = chat_model_class("ollama-community")(
                 base_url=OLLAMA_BASE_URL,
                 model=model_name,  # Use the specified model
                 temperature=0.7,
@@ -75,6 +91,9 @@ class VedicSanskritTutor:
                 num_predict=2048
             )
 
+        # The tutor LLM writes the answer inside the RAG graph, with the mode's system prompt
+        self.rag_app = create_tutor_langgraph_app(retriever, self.llm)
+
         self.user_level = "beginner"  # beginner, intermediate, advanced
         self.learned_words = set()
 
@@ -168,7 +187,7 @@ Have a natural conversation about Sanskrit:
         }
 
         query = topics.get(choice, topics["4"])
-        return self._ask_tutor(query, mode="grammar")
+        return self._teach(query, mode="grammar")
 
     def vocabulary_builder(self):
         """Build vocabulary with examples from corpus."""
@@ -191,7 +210,7 @@ Have a natural conversation about Sanskrit:
         }
 
         query = topics.get(choice, topics["4"])
-        return self._ask_tutor(query, mode="vocabulary")
+        return self._teach(query, mode="vocabulary")
 
     def translation_practice(self):
         """Practice translating verses."""
@@ -219,7 +238,7 @@ Have a natural conversation about Sanskrit:
             verse_ref = verses.get(choice, "RV 1.1.1")
 
         query = f"Help me translate {verse_ref}. Show the original Sanskrit, break it down word-by-word, explain grammar, and provide Hindi and English translations."
-        return self._ask_tutor(query, mode="translation")
+        return self._teach(query, mode="translation")
 
     def pronunciation_practice(self):
         """Practice pronunciation and transliteration."""
@@ -233,7 +252,7 @@ Have a natural conversation about Sanskrit:
             word = "अग्नि"  # Default example
 
         query = f"Teach me the correct pronunciation of '{word}'. Show both Devanagari and IAST, explain vowel lengths, and provide pronunciation tips."
-        return self._ask_tutor(query, mode="pronunciation")
+        return self._teach(query, mode="pronunciation")
 
     def quiz_mode(self):
         """Interactive quiz."""
@@ -256,13 +275,34 @@ Have a natural conversation about Sanskrit:
         level = levels.get(choice, "beginner")
 
         query = f"Give me a {level}-level Sanskrit quiz question. Make it multiple choice or fill-in-the-blank. Cover grammar, vocabulary, or translation."
-        return self._ask_tutor(query, mode="quiz")
-
-    def _ask_tutor(self, query: str, mode: str = "conversation") -> str:
-        """Ask the tutor a question using RAG."""
-        system_prompt = self.get_system_prompt(mode)
+        return self._teach(query, mode="quiz")
+
+    def _teach(self, query: str, mode: str = "conversation") -> str:
+        """Ask the tutor and print the reply, streamed as it is written when `self.stream`."""
+        print("\n🧑‍🏫 Tutor: ", end="", flush=True)
+        if not self.stream:
+            response = self._ask_tutor(query, mode=mode)
+            print(response)
+            return response
+
+        streamed = []
+
+        def on_token(text):
+            streamed.append(text)
+            print(text, end="", flush=True)
+
+        response = self._ask_tutor(query, mode=mode, on_token=on_token)
+        # A regenerated answer streams after the first; error messages aren't streamed
+        if not "".join(streamed).endswith(response):
+            print(response)
+        else:
+            print()
+        return response
 
-        # Use RAG to get relevant context from Vedic texts
+    def _ask_tutor(self, query: str, mode: str = "conversation", on_token=None) -> str:
+        """Ask the tutor a question using RAG; `on_token(text)` receives the reply as it streams."""
+        # One pass: the graph retrieves from the Vedic texts and the tutor LLM
+        # answers with the mode's system prompt
         graph_state = {
             "question": query,
             "chat_history": self.chat_history,
@@ -272,28 +312,24 @@ Have a natural conversation about Sanskrit:
             "is_follow_up": False,
             "reset_history": False,
             "regeneration_count": 0,
-            "debug": False
+            "debug": False,
+            "system_prompt": self.get_system_prompt(mode),
+            "skip_evaluation": mode in self.skip_evaluation,
         }
 
         try:
-            result = run_rag_with_langgraph(graph_state, self.rag_app)
+            if on_token is None:
+                result = run_rag_with_langgraph(graph_state, self.rag_app)
+            else:
+                answer_stream = stream_tutor_with_langgraph(graph_state, self.rag_app)
+                for text in answer_stream:
+                    on_token(text)
+                result = answer_stream.result
 
             if isinstance(result, dict):
                 answer = result.get("answer", "")
-
-                # Enhance with LLM for teaching
-                messages = [
-                    SystemMessage(content=system_prompt),
-                    HumanMessage(content=f"Context from Vedic texts:\n{answer}\n\nStudent's question: {query}\n\nProvide a clear, pedagogical explanation:")
-                ]
-
-                enhanced_answer = Settings.invoke_llm(self.llm, messages).content
-
-                # Update chat history
-                self.chat_history.append(HumanMessage(content=query))
-                self.chat_history.append(HumanMessage(content=enhanced_answer))
-
-                return enhanced_answer
+                self.chat_history = result.get("chat_history", self.chat_history)
+                return answer.get("answer", "") if isinstance(answer, dict) else str(answer)
             else:
                 return str(result)
 
@@ -317,8 +353,7 @@ Have a natural conversation about Sanskrit:
             if not query:
                 continue
 
-            response = self._ask_tutor(query, mode="conversation")
-            print(f"\n🧑‍🏫 Tutor: {response}")
+            self._teach(query, mode="conversation")
 
 
 def main():
@@ -327,6 +362,7 @@ def main():
                        help="LLM provider for teaching (default: ollama)")
     parser.add_argument("--model", type=str, default="llama3.1:8b",
                        help="Ollama model to use (default: llama3.1:8b). Try phi3.5:mini for faster responses!")
+    add_profile_argument(parser)
     args = parser.parse_args()
 
     print("\n" + "🕉️ "*20)
@@ -344,7 +380,6 @@ def main():
     try:
         vec_db, docs = create_qdrant_vector_store(force_recreate=False)
         retriever = create_retriever(vec_db, docs)
-        rag_app = create_langgraph_app(retriever)
         print("✓ Corpus loaded successfully!")
     except Exception as e:
         logger.error(f"Failed to load corpus: {e}")
@@ -352,12 +387,16 @@ def main():
         return
 
     # Initialize tutor
-    tutor = VedicSanskritTutor(
-        rag_app,
-        retriever,
-        llm_provider=args.llm,
-        model_name=args.model if args.llm == "ollama" else None
-    )
+    with startup_phase("llm_init"):
+        tutor = VedicSanskritTutor(
+            retriever,
+            llm_provider=args.llm,
+            model_name=args.model if args.llm == "ollama" else None
+        )
+
+    if args.profile_startup is not None:
+        finish_startup_profile(args.profile_startup)
+        return
 
     if args.llm == "ollama":
         print(f"\n🤖 Using Ollama ({args.model}) as your tutor")
@@ -0,0 +1,205 @@
+"""
+Stub chat model and retriever shared by the test scripts.
+
+StubChatModel answers the RAG, agentic and tutor graphs without a provider:
+text prompts get canned replies, structured output (through tool calls, as
+with_structured_output binds it) gets canned objects, every call is recorded,
+and the peak number of calls in flight is tracked. StubRetriever returns
+documents built from a template and records its queries the same way.
+
+use_llm installs a model as the pipeline's LLMs for the duration of a test;
+patched does the same for module attributes.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from langchain_core.documents import Document
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.retrievers import BaseRetriever
+from pydantic import Field
+
+import settings as entry_settings
+import src.settings as library_settings
+
+STUB_ANSWER = "Sudas is a king of the Bharatas, victorious in the Battle of the Ten Kings."
+CANNED = {"answer": STUB_ANSWER, "citations": [], "confidence_score": 90, "reasoning": "stub"}
+
+
+class StubChatModel(BaseChatModel):
+    """Canned replies; records every call as (schema name or "text", messages).
+
+    Text prompts get the reply of the first `replies` key found in the last
+    message, else `reply`. Structured output for a schema gets the next object
+    of `script[schema name]` (the last one repeats), else the `canned` fields
+    the schema has. Each call takes `delay` seconds; streamed replies arrive
+    `piece` characters at a time. With `fail_structured`, answer schemas raise.
+    """
+
+    reply: str = "no"
+    replies: dict = Field(default_factory=dict)
+    script: dict = Field(default_factory=dict)
+    canned: dict = Field(default_factory=lambda: dict(CANNED))
+    delay: float = 0.0
+    piece: int = 5
+    fail_structured: bool = False
+    calls: list = Field(default_factory=list)
+    schemas: dict = Field(default_factory=dict)
+    in_flight: int = 0
+    peak: int = 0
+    lock: object = Field(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def bind_tools(self, tools, **kwargs):
+        schema = tools[0]
+        self.schemas[schema.__name__] = schema
+        return self.bind(schema=schema.__name__)
+
+    def kinds(self):
+        return [kind for kind, _ in self.calls]
+
+    def _enter(self, messages, schema):
+        with self.lock:
+            self.calls.append((schema or "text", messages))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def _leave(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def _reply(self, messages, schema):
+        if schema is None:
+            prompt = messages[-1].content
+            return next((reply for key, reply in self.replies.items() if key in prompt), self.reply)
+        fields = self.schemas[schema].model_fields
+        if self.fail_structured and "answer" in fields:
+            raise RuntimeError("provider unavailable")
+        if schema in self.script:
+            replies = self.script[schema]
+            reply = replies.pop(0) if len(replies) > 1 else replies[0]
+        else:
+            reply = {k: v for k, v in self.canned.items() if k in fields}
+        return json.dumps(reply, ensure_ascii=False)
+
+    def _call(self, messages, schema):
+        self._enter(messages, schema)
+        try:
+            time.sleep(self.delay)
+            return self._reply(messages, schema)
+        finally:
+            self._leave()
+
+    @staticmethod
+    def _result(text, schema):
+        if schema is None:
+            message = AIMessage(content=text)
+        else:
+            message = AIMessage(content="", tool_calls=[{"name": schema, "args": json.loads(text), "id": "call_0"}])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, schema=None, **kwargs):
+        return self._result(self._call(messages, schema), schema)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, schema=None, **kwargs):
+        self._enter(messages, schema)
+        try:
+            await asyncio.sleep(self.delay)
+            text = self._reply(messages, schema)
+        finally:
+            self._leave()
+        return self._result(text, schema)
+
+    def _stream(self, messages, stop=None, run_manager=None, schema=None, **kwargs):
+        text = self._call(messages, schema)
+        for i in range(0, len(text), self.piece):
+            piece = text[i:i + self.piece]
+            if schema is None:
+                chunk = AIMessageChunk(content=piece)
+            else:
+                chunk = AIMessageChunk(content="", tool_call_chunks=[
+                    {"name": schema if i == 0 else None, "args": piece, "id": "call_0" if i == 0 else None, "index": 0}
+                ])
+            yield ChatGenerationChunk(message=chunk)
+
+
+class StubRetriever(BaseRetriever):
+    """`count` documents from `template` after `delay` seconds; records queries and peak concurrency.
+
+    The template may use {i} (position), {query} and {words} (the query's
+    lowercased words, so rewrites differing only in case or punctuation give
+    equal documents). With `fail`, retrieval raises ZeroDivisionError.
+    """
+
+    template: str = "HYMN VII.18. Sudas and the Ten Kings ({i})"
+    count: int = 3
+    metadata: dict = Field(default_factory=dict)
+    delay: float = 0.0
+    fail: bool = False
+    queries: list = Field(default_factory=list)
+    in_flight: int = 0
+    peak: int = 0
+    lock: object = Field(default_factory=threading.Lock)
+
+    def _enter(self, query):
+        if self.fail:
+            raise ZeroDivisionError("division by zero")
+        with self.lock:
+            self.queries.append(query)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def _leave(self, query):
+        with self.lock:
+            self.in_flight -= 1
+        words = " ".join(re.findall(r"\w+", query.lower()))
+        return [
+            Document(page_content=self.template.format(i=i, query=query, words=words), metadata={**self.metadata, "chunk": i})
+            for i in range(self.count)
+        ]
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        self._enter(query)
+        time.sleep(self.delay)
+        return self._leave(query)
+
+    async def _aget_relevant_documents(self, query, *, run_manager=None):
+        self._enter(query)
+        await asyncio.sleep(self.delay)
+        return self._leave(query)
+
+
+@contextlib.contextmanager
+def patched(target, **attributes):
+    """Set attributes on a module or class, restoring them on exit."""
+    saved = {name: getattr(target, name) for name in attributes}
+    for name, value in attributes.items():
+        setattr(target, name, value)
+    try:
+        yield target
+    finally:
+        for name, value in saved.items():
+            setattr(target, name, value)
+
+
+@contextlib.contextmanager
+def use_llm(llm):
+    """Make llm the main, evaluation and regeneration LLM of both settings modules."""
+    llms = {"_llm": llm, "_eval_llm": llm, "_regeneration_llm": llm, "_regeneration_llm_ready": True}
+    with patched(entry_settings.Settings, **llms), patched(library_settings.Settings, **llms):
+        yield llm
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the agentic tool fan-out (execute_tools_node).
+
+Tests:
+1. A five-word construction query costs about one retrieval latency
+2. Fan-out gives the same state as one tool phase per graph hop
+3. Words sharing a term and context share one grammar retrieval
+4. The async graph fans out the same way
+5. Factual and grammar queries run their remaining phases in one hop
+
+Uses the stub retriever (with a fixed delay) and stub chat model from
+stubs.py, so no index or provider is needed (the Monier-Williams JSON in the repo is used).
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from src.utils import agentic_rag
+from src.utils.node_steps import run_steps
+from stubs import StubChatModel, StubRetriever, patched, use_llm
+
+DELAY = 0.1
+QUESTION = "How do I say 'king want milk water horse' in Sanskrit?"
+
+
+def _with_stubs(test, fanout=True):
+    """Run test(retriever) with a slow grammar-flavoured retriever and a stub LLM."""
+    retriever = StubRetriever(template="{query}: declension table", count=2, delay=DELAY)
+    with use_llm(StubChatModel(reply="rājā payas icchati")):
+        with patched(agentic_rag, _SHARED_RETRIEVER=retriever, AGENTIC_TOOL_FANOUT=fanout):
+            return test(retriever)
+
+
+def _run_with_hops(question):
+    """Final state and the number of execute_tools hops."""
+    state = agentic_rag._initial_agent_state(question)
+    hops = 0
+    for update in agentic_rag.create_agentic_rag_graph().stream(state, stream_mode="updates"):
+        hops += "execute_tools" in update
+    return agentic_rag.run_agentic_rag(question), hops
+
+
+def _comparable(result):
+    return {
+        "query_type": result["query_type"],
+        "sanskrit_words": result["sanskrit_words"],
+        "grammar_rules": [(d.page_content, d.metadata) for d in result["grammar_rules"]],
+        "corpus_examples": [d.page_content for d in result["corpus_examples"]],
+        "messages": [m.content for m in result["messages"]],
+        "answer": result["answer"],
+    }
+
+
+def test_one_retrieval_latency():
+    """Five grammar lookups and the corpus search run at the same time."""
+    print("=" * 70)
+    print("TEST 1: Five-word construction query")
+    print("=" * 70)
+
+    def run(retriever):
+        state = agentic_rag._initial_agent_state(QUESTION)
+        state.update(agentic_rag.classify_and_plan_node(state))
+        assert len(state["english_words"]) == 5, state["english_words"]
+        agentic_rag.load_monier_williams()  # time the tools, not the first JSON load
+
+        start = time.perf_counter()
+        update = agentic_rag.execute_tools_node(state)
+        elapsed = time.perf_counter() - start
+
+        assert update["next_action"] == "synthesize"
+        assert len(update["grammar_rules"]) == 5 and update["corpus_examples"]
+        assert retriever.peak == len(retriever.queries) == 6, (retriever.peak, retriever.queries)
+        assert elapsed < 2 * DELAY, elapsed
+        print(f"  ✅ 6 retrievals, all in flight at once, in {elapsed:.2f}s (one retrieval = {DELAY:.2f}s)")
+
+    _with_stubs(run)
+
+
+def test_same_as_hops():
+    """One fan-out hop produces the state of three sequential hops."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Fan-out matches hop-by-hop")
+    print("=" * 70)
+
+    sequential, sequential_hops = _with_stubs(lambda r: _run_with_hops(QUESTION), fanout=False)
+    fanned, fanned_hops = _with_stubs(lambda r: _run_with_hops(QUESTION))
+
+    assert (sequential_hops, fanned_hops) == (3, 1)
+    assert _comparable(fanned) == _comparable(sequential)
+    print(f"  ✅ {sequential_hops} hops -> {fanned_hops}; identical words, rules, examples, messages and answer")
+
+
+def test_shared_lookups():
+    """Duplicate (term, context) pairs retrieve once and still give one rule per word."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Shared grammar lookups")
+    print("=" * 70)
+
+    def run(retriever):
+        update = run_steps(agentic_rag._grammar_phase_steps({"want": ["icchāmi"], "wish": ["icchāmi"], "cow": []}))
+        assert len(retriever.queries) == 1
+        assert [d.metadata["word"] for d in update["grammar_rules"]] == ["want", "wish"]
+        assert update["grammar_rules"][0].page_content == update["grammar_rules"][1].page_content
+        print("  ✅ 2 words, 1 retrieval")
+
+    _with_stubs(run)
+
+
+def test_async_fanout():
+    """The async graph overlaps the same retrievals and returns the same state."""
+    print("\n" + "=" * 70)
+    print("TEST 4: Async fan-out")
+    print("=" * 70)
+
+    def run(retriever):
+        sync_result = agentic_rag.run_agentic_rag(QUESTION)
+        retriever.peak = 0
+        async_result = asyncio.run(agentic_rag.arun_agentic_rag(QUESTION))
+        assert _comparable(async_result) == _comparable(sync_result)
+        assert retriever.peak == 6, retriever.peak
+        print(f"  ✅ Peak {retriever.peak} concurrent retrievals, same result")
+
+    _with_stubs(run)
+
+
+def test_other_query_types():
+    """Factual queries search the corpus once; grammar queries finish in one hop too."""
+    print("\n" + "=" * 70)
+    print("TEST 5: Factual and grammar queries")
+    print("=" * 70)
+
+    def run(retriever):
+        result, hops = _run_with_hops("Who is Sudas?")
+        assert result["query_type"] == "factual" and hops == 1
+        assert retriever.queries == ["Who is Sudas?"] * 2  # stream + run
+
+        retriever.queries.clear()
+        question = "Explain the declension of a-stem nouns"
+        result, hops = _run_with_hops(question)
+        assert result["query_type"] == "grammar" and hops == 1
+        assert result["grammar_rules"] == [] and retriever.queries == [question] * 2
+        print("  ✅ One hop each")
+
+    _with_stubs(run)
+
+
+def main():
+    test_one_retrieval_latency()
+    test_same_as_hops()
+    test_shared_lookups()
+    test_async_fanout()
+    test_other_query_types()
+    print("\n✅ All agentic fan-out tests passed")
+
+
+if __name__ == "__main__":
+    main()
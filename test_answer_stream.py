@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test script to validate streamed answers.
+
+Tests:
+1. The answer field is decoded from JSON that arrives a few characters at a time
+2. The RAG graph streams its answer; the final state matches a blocking run
+3. A low-confidence answer streams its regeneration after a separator
+4. The async graph streams with `async for`
+5. A plain-text answer node (agentic synthesis) streams its reply
+6. Settings.stream_llm passes tokens on and returns the whole reply
+7. The debate CLI streams each reply once, AMT before OIT
+
+Uses the stub chat model (streaming its replies in small pieces) and stub
+retriever from stubs.py, so no provider or index is needed.
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+from typing import TypedDict
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from langgraph.graph import END, StateGraph
+
+import src.settings as library_settings
+from stubs import StubChatModel, StubRetriever, use_llm
+from test_debate_parallel import GRIFFITH, SHARMA, VERSE, _orchestrator
+from utils.answer_stream import REVISION_SEPARATOR, AnswerStream, JsonStringField
+from utils.final_block_rag import (
+    create_async_langgraph_app,
+    create_langgraph_app,
+    run_rag_with_langgraph,
+    stream_rag_with_langgraph,
+)
+
+ANSWER = 'Sudas defeated the "Ten Kings" on the Parushni.\nSee RV 7.18 — the Tṛtsus fought beside him.'
+BETTER_ANSWER = "Sudas, king of the Bharatas, won the Battle of the Ten Kings (RV 7.18, 7.33, 7.83)."
+
+
+def _initial_state(question):
+    return {
+        "question": question,
+        "chat_history": [],
+        "documents": [],
+        "answer": "",
+        "enhanced_question": "",
+        "is_follow_up": False,
+        "reset_history": False,
+        "regeneration_count": 0,
+    }
+
+
+def _scripted_llm(scores=(90,), answers=(ANSWER,)):
+    answer = [{"answer": text, "citations": []} for text in answers]
+    return StubChatModel(script={
+        "InitialRAGResponse": answer,
+        "SimpleRAGResponse": answer,
+        "RAGResponse": [{"answer": BETTER_ANSWER, "citations": []}],
+        "ConfidenceScore": [{"confidence_score": score, "reasoning": "scripted"} for score in scores],
+    })
+
+
+def test_json_string_field():
+    print("=" * 70)
+    print("TEST 1: Incremental JSON string decoding")
+    print("=" * 70)
+
+    text = 'Agni \\ "Indra"\n\tSoma — ṛta 😀 /'
+    document = json.dumps({"citations": [], "answer": text, "confidence": 90})
+    for size in range(1, 8):
+        field = JsonStringField("answer")
+        decoded = "".join(field.feed(document[i:i + size]) for i in range(0, len(document), size))
+        assert decoded == text and field.done, (size, decoded)
+    assert JsonStringField("answer").feed('{"reasoning": "x"') == ""
+    print("  ✅ Escapes, \\u escapes and surrogate pairs decode at every piece size")
+
+
+def test_graph_stream():
+    print("\n" + "=" * 70)
+    print("TEST 2: RAG graph streams its answer")
+    print("=" * 70)
+
+    with use_llm(_scripted_llm()):
+        app = create_langgraph_app(StubRetriever(), speculative=False)
+        stream = stream_rag_with_langgraph(_initial_state("Who is Sudas?"), app)
+        deltas = list(stream)
+        blocking = run_rag_with_langgraph(_initial_state("Who is Sudas?"), app)
+    assert "".join(deltas) == ANSWER == stream.text and len(deltas) > 10
+    assert stream.attempts == 1
+    assert stream.result["answer"]["answer"] == ANSWER
+    assert stream.result["answer"]["confidence"]["confidence_score"] == 90
+    assert stream.result["answer"] == blocking["answer"] and len(stream.result["chat_history"]) == 2
+    print(f"  ✅ {len(deltas)} deltas; final state has confidence and chat history")
+
+
+def test_revision():
+    print("\n" + "=" * 70)
+    print("TEST 3: Regenerated answer after a separator")
+    print("=" * 70)
+
+    with use_llm(_scripted_llm(scores=(40, 90))):
+        app = create_langgraph_app(StubRetriever(), speculative=False)
+        stream = AnswerStream(app, _initial_state("Who is Sudas?"))
+        shown = "".join(stream)
+    assert shown == ANSWER + REVISION_SEPARATOR + BETTER_ANSWER, shown
+    assert stream.attempts == 2 and stream.text == BETTER_ANSWER
+    assert stream.result["answer"]["answer"] == BETTER_ANSWER
+    print("  ✅ First answer, separator, regenerated answer; .text holds the regeneration")
+
+
+def test_async_stream():
+    print("\n" + "=" * 70)
+    print("TEST 4: Async iteration")
+    print("=" * 70)
+
+    async def collect(stream):
+        return [delta async for delta in stream]
+
+    with use_llm(_scripted_llm()):
+        app = create_async_langgraph_app(StubRetriever(), speculative=False)
+        stream = stream_rag_with_langgraph(_initial_state("Who is Sudas?"), app)
+        deltas = asyncio.run(collect(stream))
+    assert "".join(deltas) == ANSWER and stream.result["answer"]["answer"] == ANSWER
+    print(f"  ✅ {len(deltas)} deltas from the async graph")
+
+
+def test_text_node():
+    print("\n" + "=" * 70)
+    print("TEST 5: Plain-text answer node")
+    print("=" * 70)
+
+    class State(TypedDict):
+        question: str
+        final_answer: str
+
+    llm = StubChatModel()
+
+    def plan(state):
+        llm.invoke("plan")  # not an answer node: not shown
+        return {}
+
+    def synthesize(state):
+        return {"final_answer": llm.invoke(state["question"]).content}
+
+    workflow = StateGraph(State)
+    workflow.add_node("plan", plan)
+    workflow.add_node("synthesize", synthesize)
+    workflow.set_entry_point("plan")
+    workflow.add_edge("plan", "synthesize")
+    workflow.add_edge("synthesize", END)
+
+    stream = AnswerStream(workflow.compile(), {"question": "Is Sudas a king?", "final_answer": ""})
+    assert list(stream) == ["no"] and stream.result["final_answer"] == "no"
+    print("  ✅ Only the synthesize node's reply is shown")
+
+
+def test_stream_llm():
+    print("\n" + "=" * 70)
+    print("TEST 6: Settings.stream_llm")
+    print("=" * 70)
+
+    llm = StubChatModel()
+    tokens = []
+    reply = library_settings.Settings.stream_llm(llm, "Is Sudas a king?", tokens.append)
+    assert tokens == ["no"] and reply.content == "no"
+    assert library_settings.Settings.stream_llm(llm, "Is Sudas a king?").content == "no"
+    print("  ✅ Tokens passed on; reply has the same .content as invoke_llm")
+
+
+def test_debate_echo():
+    print("\n" + "=" * 70)
+    print("TEST 7: Streamed debate replies")
+    print("=" * 70)
+
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        history = _orchestrator(amt_delay=0.3, oit_delay=0.05, parallel=True).run_debate(
+            VERSE, GRIFFITH, SHARMA, rounds=1, save=False
+        )
+    out = out.getvalue()
+    first = history["rounds"][0]
+    assert out.count(first["amt_analysis"]) == 1 and out.count(first["oit_analysis"]) == 1
+    assert out.index("AMT SCHOLAR") < out.index(first["amt_analysis"]) < out.index("OIT SCHOLAR")
+    assert out.count(history["synthesis"]) == 1
+    print("  ✅ Each reply printed once, in AMT/OIT order")
+
+
+def main():
+    test_json_string_field()
+    test_graph_stream()
+    test_revision()
+    test_async_stream()
+    test_text_node()
+    test_stream_llm()
+    test_debate_echo()
+    print("\n✅ All answer stream tests passed")
+
+
+if __name__ == "__main__":
+    main()
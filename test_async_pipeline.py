@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the async RAG and agentic pipelines.
+
+Tests:
+1. The async graph gives the same answers as the blocking graph
+2. Concurrent sessions share one event loop; per-provider concurrency is capped
+3. Errors raised by async calls reach the same fallbacks as blocking calls
+4. The async agentic graph runs grammar lookups concurrently, same result
+5. HybridRetriever.ainvoke matches invoke and runs off the event loop
+
+Uses the stub chat model (with a fixed delay) and stub retriever from stubs.py,
+so no provider or index is needed (test 5 builds a small in-memory Qdrant index).
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from stubs import STUB_ANSWER, StubChatModel, StubRetriever, patched, use_llm
+from utils.final_block_rag import (
+    arun_rag_with_langgraph,
+    create_async_langgraph_app,
+    create_langgraph_app,
+    run_rag_with_langgraph,
+)
+from src.utils import agentic_rag
+from src.utils.node_steps import Call, arun_steps, run_steps
+
+DELAY = 0.05
+
+
+def _retriever(**kwargs):
+    return StubRetriever(template="HYMN VII.18. Sudas, the declension of the Ten Kings ({i})", **kwargs)
+
+
+def _initial_state(question, chat_history=None):
+    return {
+        "question": question,
+        "chat_history": chat_history or [],
+        "documents": [],
+        "answer": "",
+        "enhanced_question": "",
+        "is_follow_up": False,
+        "reset_history": False,
+        "regeneration_count": 0,
+    }
+
+
+def test_same_answers():
+    """Blocking and async graphs produce the same state."""
+    print("=" * 70)
+    print("TEST 1: Async graph matches the blocking graph")
+    print("=" * 70)
+
+    with use_llm(StubChatModel(delay=DELAY)):
+        retriever = _retriever()
+        history = [HumanMessage(content="Who is Sudas?"), AIMessage(content="A king.")]
+        sync_result = run_rag_with_langgraph(_initial_state("And his enemies?", history), create_langgraph_app(retriever))
+        async_result = asyncio.run(
+            arun_rag_with_langgraph(_initial_state("And his enemies?", history), create_async_langgraph_app(retriever))
+        )
+        for key in ("answer", "enhanced_question", "documents", "chat_history"):
+            assert sync_result[key] == async_result[key], key
+        assert async_result["answer"]["answer"] == STUB_ANSWER
+        print(f"  ✅ Same answer, {len(async_result['documents'])} documents, {len(async_result['chat_history'])} messages")
+
+
+def test_concurrent_sessions():
+    """Sessions overlap on one loop, but never exceed the provider limit."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Concurrent sessions and provider limits")
+    print("=" * 70)
+
+    with use_llm(StubChatModel(delay=DELAY)) as llm:
+        app = create_async_langgraph_app(_retriever())
+        sessions = 8
+
+        async def main(limit):
+            os.environ["OTHER_MAX_CONCURRENCY"] = str(limit)
+            llm.peak = 0
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(arun_rag_with_langgraph(_initial_state(f"Who is Sudas? ({i})"), app) for i in range(sessions))
+            )
+            return results, time.perf_counter() - start
+
+        try:
+            results, unlimited = asyncio.run(main(sessions))
+            assert all(r["answer"]["answer"] == STUB_ANSWER for r in results)
+            assert llm.peak == sessions, llm.peak
+            # 4 sequential LLM calls per session: follow-up check, grammar, answer, evaluation
+            serial = sessions * 4 * DELAY
+            assert unlimited < serial / 2, (unlimited, serial)
+
+            _, limited = asyncio.run(main(2))
+            assert llm.peak == 2, llm.peak
+        finally:
+            os.environ.pop("OTHER_MAX_CONCURRENCY", None)
+        print(f"  ✅ {sessions} sessions in {unlimited:.2f}s (serial ~{serial:.2f}s); limit 2 -> peak 2, {limited:.2f}s")
+
+
+def test_error_fallbacks():
+    """Exceptions from awaited calls are thrown back into the node's try/except."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Error fallbacks")
+    print("=" * 70)
+
+    def steps():
+        try:
+            yield Call(RunnableLambda(lambda _: 1 / 0), None)
+        except ZeroDivisionError:
+            both = yield [Call(RunnableLambda(lambda x: x + 1), 1), Call(RunnableLambda(lambda x: x * 3), 2)]
+            return both
+        return None
+
+    assert run_steps(steps()) == [2, 6]
+    assert asyncio.run(arun_steps(steps())) == [2, 6]
+
+    with use_llm(StubChatModel(delay=DELAY)) as llm:
+        llm.fail_structured = True
+        retriever = _retriever()
+        sync_answer = run_rag_with_langgraph(_initial_state("Who is Sudas?"), create_langgraph_app(retriever))["answer"]
+        async_answer = asyncio.run(
+            arun_rag_with_langgraph(_initial_state("Who is Sudas?"), create_async_langgraph_app(retriever))
+        )["answer"]
+        assert sync_answer == async_answer
+        assert "RuntimeError" in async_answer["answer"]
+        print(f"  ✅ Both graphs fall back to: {async_answer['answer']}")
+
+
+def test_async_agentic():
+    """Grammar lookups for several words run concurrently; result matches the blocking graph."""
+    print("\n" + "=" * 70)
+    print("TEST 4: Async agentic graph")
+    print("=" * 70)
+
+    with use_llm(StubChatModel(delay=DELAY)):
+        retriever = _retriever(delay=DELAY)
+        with patched(agentic_rag, _SHARED_RETRIEVER=retriever):
+            question = "How do I say 'I want milk and water' in Sanskrit?"
+            sync_result = agentic_rag.run_agentic_rag(question)
+            retriever.peak = 0
+            async_result = asyncio.run(agentic_rag.arun_agentic_rag(question))
+
+        assert async_result["query_type"] == sync_result["query_type"] == "construction"
+        assert async_result["answer"] == sync_result["answer"]
+        assert [d.page_content for d in async_result["grammar_rules"]] == [d.page_content for d in sync_result["grammar_rules"]]
+        words = len(async_result["grammar_rules"])
+        assert words >= 2 and retriever.peak >= 2, (words, retriever.peak)
+        print(f"  ✅ {words} grammar lookups, up to {retriever.peak} at once; answers identical")
+
+
+def test_hybrid_retriever_async():
+    """HybridRetriever.ainvoke returns invoke's results from a worker thread."""
+    print("\n" + "=" * 70)
+    print("TEST 5: Async hybrid retrieval")
+    print("=" * 70)
+
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from langchain_qdrant import QdrantVectorStore
+    from src.utils.retriever import create_retriever
+
+    chunks = [
+        Document(page_content=f"HYMN {i}. Indra and Agni are praised by Sudas and Vasishtha, verse {i}.", metadata={"chunk": i})
+        for i in range(30)
+    ]
+    vec_db = QdrantVectorStore.from_documents(
+        chunks, DeterministicFakeEmbedding(size=16), location=":memory:", collection_name="async_test"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        retriever = create_retriever(vec_db, chunks, index_dir=tmp)
+        retriever.result_cache = None
+        threads = []
+        original = retriever.__class__._get_relevant_documents
+
+        def recording(self, query, *, run_manager=None):
+            threads.append(threading.current_thread().name)
+            return original(self, query, run_manager=run_manager)
+
+        retriever.__class__._get_relevant_documents = recording
+        try:
+            expected = retriever.invoke("Who is Sudas?")
+
+            async def main():
+                return await asyncio.gather(*(retriever.ainvoke("Who is Sudas?") for _ in range(3)))
+
+            results = asyncio.run(main())
+        finally:
+            retriever.__class__._get_relevant_documents = original
+
+    assert all([d.page_content for d in r] == [d.page_content for d in expected] for r in results)
+    assert threads[0] == threading.current_thread().name
+    assert all(name.startswith("async-retrieval") for name in threads[1:]), threads
+    print(f"  ✅ {len(expected)} documents, async calls ran on {sorted(set(threads[1:]))}")
+
+
+def main():
+    test_same_answers()
+    test_concurrent_sessions()
+    test_error_fallbacks()
+    test_async_agentic()
+    test_hybrid_retriever_async()
+    print("\n✅ All async pipeline tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the persistent BM25 index against LangChain's BM25Retriever.
+
+Tests:
+1. Scores and top-k results match rank_bm25 exactly
+2. Reopening the index memory-maps it instead of rebuilding
+3. A changed corpus invalidates the stored index
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_community.retrievers import BM25Retriever
+
+from src.utils.bm25_index import BM25Index, PersistentBM25Retriever, corpus_fingerprint
+
+CORPUS = [
+    "Indra slew Vritra and released the waters",
+    "Agni the priest of the sacrifice, the divine minister",
+    "Sudas defeated the ten kings on the banks of the Parushni",
+    "Soma purified flows for Indra, soma for the gods",
+    "The Dasas and Dasyus were subdued by Indra",
+    "Rudra, the father of the Maruts, RV 2.33",
+    "Vasishtha praised Sudas in the battle of ten kings",
+    "Mitra and Varuna uphold the cosmic order",
+]
+
+QUERIES = [
+    "Indra Vritra",
+    "ten kings Sudas",
+    "soma soma",
+    "RV 2.33",
+    "unknownterm",
+    "the of and",
+]
+
+
+def test_matches_rank_bm25():
+    """Persistent index must return the same scores and order as BM25Retriever."""
+    print("=" * 70)
+    print("TEST 1: Parity with rank_bm25")
+    print("=" * 70)
+
+    docs = [Document(page_content=text, metadata={"id": i}) for i, text in enumerate(CORPUS)]
+    baseline = BM25Retriever.from_documents(docs)
+    baseline.k = 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        retriever = PersistentBM25Retriever.from_documents(docs, index_dir=os.path.join(tmp, "bm25_index"), k=3)
+        for query in QUERIES:
+            expected = [d.metadata["id"] for d in baseline.invoke(query)]
+            actual = [d.metadata["id"] for d in retriever.invoke(query)]
+            assert expected == actual, f"{query!r}: {expected} != {actual}"
+            assert np.array_equal(
+                baseline.vectorizer.get_scores(query.split()),
+                retriever.index.get_scores(query.split()),
+            ), f"Scores differ for {query!r}"
+            print(f"  ✅ '{query}' → {actual}")
+
+
+def test_reload_and_invalidation():
+    """Reopening reuses the stored index; a changed corpus triggers a rebuild."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Reload and fingerprint invalidation")
+    print("=" * 70)
+
+    docs = [Document(page_content=text) for text in CORPUS]
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = os.path.join(tmp, "bm25_index")
+        PersistentBM25Retriever.from_documents(docs, index_dir=index_dir)
+        meta = BM25Index.read_meta(index_dir)
+        assert meta["fingerprint"] == corpus_fingerprint(CORPUS)
+
+        reopened = PersistentBM25Retriever.from_documents(docs, index_dir=index_dir)
+        assert isinstance(reopened.index.postings_docs, np.memmap), "Expected a memory-mapped index"
+        print("  ✅ Existing index memory-mapped on reopen")
+
+        changed = docs + [Document(page_content="Sarasvati, best of rivers")]
+        rebuilt = PersistentBM25Retriever.from_documents(changed, index_dir=index_dir)
+        assert rebuilt.index.corpus_size == len(changed)
+        assert BM25Index.read_meta(index_dir)["fingerprint"] == corpus_fingerprint(d.page_content for d in changed)
+        print("  ✅ Changed corpus rebuilt the index")
+
+
+def main():
+    test_matches_rank_bm25()
+    test_reload_and_invalidation()
+    print("\n✅ All BM25 index tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the columnar chunk store that replaces docs_chunks.pkl.
+
+Tests:
+1. Round trip: texts and metadata survive write/open unchanged
+2. Sequence behaviour: len, indexing, slicing, get(ids), iteration
+3. A legacy docs_chunks.pkl is converted on first open
+4. The persistent BM25 index accepts the store directly
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from langchain_core.documents import Document
+
+from src.utils.bm25_index import PersistentBM25Retriever, corpus_fingerprint
+from src.utils.chunk_store import ChunkStore, open_chunk_store, CHUNK_STORE_DIRNAME
+
+GRIFFITH = {"title": "Rig Veda (Griffith)", "source": "rigveda-griffith", "book": 2}
+SHARMA = {"title": "Ṛgveda (Sharma)", "source": "rigveda-sharma", "urls": ["a", "b"]}
+
+CHUNKS = [
+    Document(page_content="Rudra, father of the Maruts", metadata=GRIFFITH),
+    Document(page_content="Indra slew Vṛtra and released the waters", metadata=GRIFFITH),
+    Document(page_content="", metadata=SHARMA),
+    Document(page_content="Sudas and the battle of the ten kings", metadata=SHARMA),
+    Document(page_content="Agni, the priest", metadata={}),
+]
+
+
+def test_round_trip():
+    """Written chunks read back identical, with shared metadata stored once."""
+    print("=" * 70)
+    print("TEST 1: Round trip")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChunkStore.write(CHUNKS, os.path.join(tmp, CHUNK_STORE_DIRNAME))
+        assert len(store) == len(CHUNKS)
+        assert ChunkStore.read_meta(store.store_dir)["n_metadata_rows"] == 3
+        assert store.fingerprint == corpus_fingerprint(c.page_content for c in CHUNKS)
+        for original, loaded in zip(CHUNKS, store):
+            assert loaded.page_content == original.page_content
+            assert loaded.metadata == original.metadata
+        print(f"  ✅ {len(store)} chunks round-tripped")
+
+
+def test_sequence_access():
+    """The store can stand in for the list of Documents."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Sequence access")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChunkStore.write(CHUNKS, os.path.join(tmp, CHUNK_STORE_DIRNAME))
+        assert store[-1].page_content == "Agni, the priest"
+        assert [d.page_content for d in store[1:3]] == [CHUNKS[1].page_content, ""]
+        assert [d.metadata["source"] for d in store.get([3, 0])] == ["rigveda-sharma", "rigveda-griffith"]
+        assert list(store.texts) == [c.page_content for c in CHUNKS]
+
+        # Each access returns an independent metadata dict
+        store[0].metadata["book"] = 99
+        assert store[0].metadata["book"] == 2
+
+        try:
+            store[len(CHUNKS)]
+            raise AssertionError("Expected IndexError")
+        except IndexError:
+            pass
+        print("  ✅ len, indexing, slicing, get and iteration work")
+
+
+def test_legacy_pickle_conversion():
+    """open_chunk_store converts an existing docs_chunks.pkl once."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Legacy pickle conversion")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert open_chunk_store(tmp) is None
+        with open(os.path.join(tmp, "docs_chunks.pkl"), "wb") as f:
+            pickle.dump(CHUNKS, f)
+
+        store = open_chunk_store(tmp)
+        assert len(store) == len(CHUNKS)
+        assert ChunkStore.exists(os.path.join(tmp, CHUNK_STORE_DIRNAME))
+        assert open_chunk_store(tmp).fingerprint == store.fingerprint
+        print("  ✅ Legacy pickle converted to chunk store")
+
+
+def test_bm25_over_store():
+    """The BM25 retriever reads texts and fingerprint straight from the store."""
+    print("\n" + "=" * 70)
+    print("TEST 4: BM25 over chunk store")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChunkStore.write(CHUNKS, os.path.join(tmp, CHUNK_STORE_DIRNAME))
+        retriever = PersistentBM25Retriever.from_documents(store, index_dir=os.path.join(tmp, "bm25_index"), k=1)
+        assert retriever.index.fingerprint == store.fingerprint
+        result = retriever.invoke("ten kings")
+        assert result[0].metadata["source"] == "rigveda-sharma"
+        print(f"  ✅ 'ten kings' → {result[0].page_content!r}")
+
+
+def main():
+    test_round_trip()
+    test_sequence_access()
+    test_legacy_pickle_conversion()
+    test_bm25_over_store()
+    print("\n✅ All chunk store tests passed")
+
+
+if __name__ == "__main__":
+    main()
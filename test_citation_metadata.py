@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test script to validate index-time citation metadata.
+
+Tests:
+1. The one-pass scan gives extract_verse_reference's old answer on corpus text
+2. chunk_doc stores rv_ref / yv_ref / pbr_ref / sb_ref / section_ref and the title
+3. Answer-time citations read the metadata and match the text-scanning path
+4. Chunks indexed without the metadata are scanned in one batch
+
+The old per-pattern search is reimplemented here as the reference.
+"""
+
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from langchain_core.documents import Document
+
+import src.utils.citation_enhancer as citation_enhancer
+from src.utils.citation_enhancer import (
+    CITATION_REF_KEYS,
+    CitationFormatter,
+    VedicCitationExtractor,
+    add_citation_metadata,
+    citation_from_refs,
+    create_enhanced_citations_list,
+    enhance_corpus_results_with_citations,
+)
+from src.utils.index_files import chunk_doc
+
+CORPUS_FILES = [
+    "rigveda-griffith_COMPLETE_english_with_metadata.txt",
+    "yajurveda-griffith_COMPLETE_english_with_metadata.txt",
+    "rigveda-sharma_COMPLETE_english_with_metadata.txt",
+]
+EDGE_CASES = [
+    "# Hymn 3: To Indra\nThe hymn",
+    "see PBr. XIV.3.2 and SB 1.2.3.4",
+    "Adhyaya 4 Mantra 2",
+    "Book IV of the Canto",
+    "Verse 3.4",
+    "VSKSE 13.3",
+    "Sudas won at the Parushni",
+    "",
+]
+
+
+def _old_extract_verse_reference(text):
+    """extract_verse_reference before the combined pattern: one search per pattern."""
+    for pattern_name, pattern in VedicCitationExtractor.PATTERNS.items():
+        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+        if match:
+            return VedicCitationExtractor._format_citation(pattern_name, match)
+    return None
+
+
+def _corpus_windows(step=450, limit=400_000):
+    texts = []
+    for name in CORPUS_FILES:
+        with open(os.path.join(ROOT, name), "r", encoding="utf-8") as f:
+            text = f.read(limit)
+        texts.extend(text[i:i + 500] for i in range(0, len(text), step))
+    return texts + EDGE_CASES
+
+
+def _docs():
+    return [
+        Document(page_content="[07-018] HYMN XVIII.\n\n[Names (Griffith-Rigveda): Sudas, Indra]\n\nSudas the king...",
+                 metadata={"filename": "rigveda-griffith_COMPLETE_english_with_metadata"}),
+        Document(page_content="## Yajurveda\nVSKSE 13.3 Agni is the head...",
+                 metadata={"filename": "yajurveda-griffith_COMPLETE_english_with_metadata"}),
+        Document(page_content="PBr. XIV.3.2 The Saman of Vasistha", metadata={"filename": "pancavamsa"}),
+        Document(page_content="No reference at all here", metadata={"filename": "notes"}),
+    ]
+
+
+def test_scan_parity():
+    print("=" * 70)
+    print("TEST 1: One-pass scan matches the per-pattern search")
+    print("=" * 70)
+
+    texts = _corpus_windows()
+    refs = VedicCitationExtractor.extract_citation_refs(texts)
+    found = 0
+    for text, text_refs in zip(texts, refs):
+        expected = _old_extract_verse_reference(text)
+        assert VedicCitationExtractor.extract_verse_reference(text) == expected, text
+        assert citation_from_refs(text_refs) == expected, text
+        assert set(text_refs) == set(CITATION_REF_KEYS)
+        found += expected is not None
+    assert VedicCitationExtractor.extract_citation_refs([]) == []
+    edge = dict(zip(EDGE_CASES, VedicCitationExtractor.extract_citation_refs(EDGE_CASES)))
+    assert edge["see PBr. XIV.3.2 and SB 1.2.3.4"]["pbr_ref"] == "PB 14.3.2"
+    assert edge["see PBr. XIV.3.2 and SB 1.2.3.4"]["sb_ref"] == "SB 1.2.3.4"
+    assert edge["# Hymn 3: To Indra\nThe hymn"]["section_ref"] == "Hymn 3 (To Indra)"
+    print(f"  ✅ {len(texts)} texts, {found} with a citation, all identical")
+
+
+def test_chunk_metadata():
+    print("\n" + "=" * 70)
+    print("TEST 2: chunk_doc stores citation metadata")
+    print("=" * 70)
+
+    chunks = chunk_doc(_docs())
+    for chunk in chunks:
+        for key in list(CITATION_REF_KEYS) + ["citation_title"]:
+            assert isinstance(chunk.metadata[key], str), key
+    assert chunks[0].metadata["rv_ref"] == "RV 7.18"
+    assert chunks[0].metadata["citation_title"] == "Sudas"
+    assert chunks[1].metadata["yv_ref"] == "YV 13.3"
+    assert chunks[2].metadata["pbr_ref"] == "PB 14.3.2"
+    assert citation_from_refs(chunks[3].metadata) is None
+    print(f"  ✅ {len(chunks)} chunks: {[citation_from_refs(c.metadata) for c in chunks]}")
+
+
+def test_answer_time_reads_metadata():
+    print("\n" + "=" * 70)
+    print("TEST 3: Answer-time citations come from metadata")
+    print("=" * 70)
+
+    plain = _docs()
+    indexed = add_citation_metadata(_docs())
+    expected_context = enhance_corpus_results_with_citations(plain)
+    expected_citations = create_enhanced_citations_list(plain)
+
+    saved = citation_enhancer._COMBINED_PATTERN
+    citation_enhancer._COMBINED_PATTERN = None  # any scan would fail
+    try:
+        assert enhance_corpus_results_with_citations(indexed) == expected_context
+        assert create_enhanced_citations_list(indexed) == expected_citations
+        label, _ = CitationFormatter.format_citation_with_source(indexed[0], 1)
+    finally:
+        citation_enhancer._COMBINED_PATTERN = saved
+    assert label == "RV 7.18 - Sudas"
+    assert expected_citations[3]["citation"] == "Passage 4"
+    print(f"  ✅ {[c['citation'] for c in expected_citations]}")
+
+
+def test_batch_fallback():
+    print("\n" + "=" * 70)
+    print("TEST 4: Chunks without metadata scanned in one batch")
+    print("=" * 70)
+
+    docs = _docs()
+    docs[1] = add_citation_metadata([docs[1]])[0]
+    scans = []
+    original = VedicCitationExtractor._first_matches
+
+    def counting(texts):
+        scans.append(len(texts))
+        return original(texts)
+
+    VedicCitationExtractor._first_matches = staticmethod(counting)
+    try:
+        citations = create_enhanced_citations_list(docs)
+    finally:
+        VedicCitationExtractor._first_matches = staticmethod(original)
+    assert scans == [3], scans
+    assert citations == create_enhanced_citations_list(_docs())
+    print(f"  ✅ 3 unindexed chunks in {len(scans)} scan")
+
+
+def main():
+    test_scan_parity()
+    test_chunk_metadata()
+    test_answer_time_reads_metadata()
+    test_batch_fallback()
+    print("\n✅ All citation metadata tests passed")
+
+
+if __name__ == "__main__":
+    main()
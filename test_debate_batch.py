@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Test script to validate batch migration debates with a resumable ledger.
+
+Tests:
+1. Verse lists skip comments, blank lines and duplicates
+2. Debates run on a bounded pool; the summary reports throughput
+3. A rerun skips verses already done and retries failed ones
+4. A line cut short by an interrupted write is ignored
+5. A silent orchestrator prints nothing and returns its transcript path
+
+Debates are stand-ins that sleep, so no provider is called.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from src.utils.debate_batch import DebateLedger, print_batch_summary, read_verse_list, run_debate_batch
+from src.utils.migration_debate_agents import AMTAgent, MigrationDebateOrchestrator, OITAgent
+
+VERSE_LIST = """# River hymns
+RV 10.75      # Nadistuti
+RV 3.33
+
+# Sudas
+RV 7.18
+RV  7.33
+RV 10.75
+"""
+
+
+class FakeDebates:
+    """Sleeps per verse and records how many run at once; fails the verses in `failing`."""
+
+    def __init__(self, delay=0.2, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, verse_ref):
+        with self._lock:
+            self.calls.append(verse_ref)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            time.sleep(self.delay)
+            if verse_ref in self.failing:
+                raise RuntimeError("provider unavailable")
+            return f"migration_debates/{verse_ref.replace(' ', '_')}.json"
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+def _verse_list(tmp):
+    path = os.path.join(tmp, "river_hymns.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(VERSE_LIST)
+    return path
+
+
+def _quietly(fn, *args, **kwargs):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        result = fn(*args, **kwargs)
+    return result, out.getvalue()
+
+
+def test_read_verse_list():
+    print("=" * 70)
+    print("TEST 1: Verse lists")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        refs = read_verse_list(_verse_list(tmp))
+    assert refs == ["RV 10.75", "RV 3.33", "RV 7.18", "RV 7.33"], refs
+    print(f"  ✅ {refs}")
+
+
+def test_bounded_pool():
+    print("\n" + "=" * 70)
+    print("TEST 2: Bounded worker pool and summary")
+    print("=" * 70)
+
+    refs = [f"RV 1.{n}" for n in range(1, 7)]
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = DebateLedger(os.path.join(tmp, "runs", "batch.ledger.jsonl"))
+        debates = FakeDebates(delay=0.2)
+        summary, out = _quietly(run_debate_batch, refs, debates, ledger, workers=3)
+        entries = ledger.entries()
+
+    assert sorted(debates.calls) == sorted(refs) and debates.peak == 3
+    assert summary["completed"] == 6 and summary["failed"] == [] and summary["skipped"] == 0
+    assert summary["elapsed_seconds"] < 0.6 * sum(e["seconds"] for e in entries)
+    assert summary["debates_per_hour"] > 0 and 0.15 < summary["mean_debate_seconds"] < 0.5
+    assert {e["verse_ref"] for e in entries} == set(refs)
+    assert all(e["status"] == "done" and e["transcript"].endswith(".json") for e in entries)
+    assert out.count("✅") == 6 and "[6/6]" in out
+
+    _, report = _quietly(print_batch_summary, summary)
+    assert "Completed:  6" in report and "debates/hour" in report
+    print(f"  ✅ 6 debates, 3 at a time, in {summary['elapsed_seconds']:.2f}s")
+
+
+def test_resume():
+    print("\n" + "=" * 70)
+    print("TEST 3: Resume after failures")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        refs = read_verse_list(_verse_list(tmp))
+        ledger = DebateLedger(os.path.join(tmp, "batch.ledger.jsonl"))
+
+        first = FakeDebates(delay=0.01, failing={"RV 3.33"})
+        summary, out = _quietly(run_debate_batch, refs, first, ledger, workers=2)
+        assert summary["completed"] == 3 and summary["failed"] == ["RV 3.33"]
+        assert "provider unavailable" in out
+        failed = [e for e in ledger.entries() if e["status"] == "failed"]
+        assert failed[0]["error"] == "RuntimeError: provider unavailable"
+
+        second = FakeDebates(delay=0.01)
+        summary, out = _quietly(run_debate_batch, refs, second, DebateLedger(ledger.path), workers=2)
+        assert second.calls == ["RV 3.33"]
+        assert summary["skipped"] == 3 and summary["completed"] == 1 and summary["failed"] == []
+        assert set(ledger.completed()) == set(refs)
+
+        third = FakeDebates(delay=0.01)
+        summary, _ = _quietly(run_debate_batch, refs, third, ledger, workers=2)
+        assert third.calls == [] and summary["skipped"] == 4
+    print("  ✅ Second run retried only RV 3.33; third run had nothing to do")
+
+
+def test_partial_line():
+    print("\n" + "=" * 70)
+    print("TEST 4: Interrupted ledger write")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = DebateLedger(os.path.join(tmp, "batch.ledger.jsonl"))
+        ledger.record("RV 7.18", "done", 1.0, transcript="a.json")
+        with open(ledger.path, "a", encoding="utf-8") as f:
+            f.write('{"verse_ref": "RV 7.33", "stat')
+        assert list(ledger.completed()) == ["RV 7.18"]
+
+        debates = FakeDebates(delay=0.0)
+        _quietly(run_debate_batch, ["RV 7.18", "RV 7.33"], debates, ledger)
+        assert debates.calls == ["RV 7.33"]
+        with open(ledger.path, encoding="utf-8") as f:
+            assert json.loads(f.readlines()[-1])["verse_ref"] == "RV 7.33"
+    print("  ✅ Partial line ignored; RV 7.33 rerun and recorded")
+
+
+def test_silent_orchestrator():
+    print("\n" + "=" * 70)
+    print("TEST 5: Silent orchestrator")
+    print("=" * 70)
+
+    class EchoLLM:
+        def invoke(self, messages):
+            return type("Reply", (), {"content": "analysis"})()
+
+    orchestrator = MigrationDebateOrchestrator(AMTAgent(EchoLLM()), OITAgent(EchoLLM()), EchoLLM(), echo=False)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            history, out = _quietly(orchestrator.run_debate, "RV 7.18", "griffith", "sharma", rounds=2, save=False)
+            path, saved = _quietly(orchestrator._save_debate, "RV 7.18", history)
+            assert os.path.exists(path)
+        finally:
+            os.chdir(cwd)
+    assert out == "" and saved == "" and history["synthesis"] == "analysis" and len(history["rounds"]) == 2
+    assert path.name.startswith("migration_debate_RV_7_18_")
+    print(f"  ✅ Nothing printed; saved {path.name}")
+
+
+def main():
+    test_read_verse_list()
+    test_bounded_pool()
+    test_resume()
+    test_partial_line()
+    test_silent_orchestrator()
+    print("\n✅ All debate batch tests passed")
+
+
+if __name__ == "__main__":
+    main()
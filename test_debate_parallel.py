@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script to validate parallel AMT/OIT rounds in the migration debate.
+
+Tests:
+1. A parallel two-round debate gives the same transcript in about half the time
+2. Replies print AMT first even when OIT answers first
+3. A slow agent times out with a placeholder reply and the debate goes on
+
+Uses stand-in chat models that sleep and echo the prompt, so no provider is called.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from langchain_core.messages import AIMessageChunk
+
+from src.utils.migration_debate_agents import AMTAgent, MigrationDebateOrchestrator, OITAgent
+
+VERSE = "RV 7.95.2"
+GRIFFITH = "Pure in her course from mountains to the ocean, alone of streams Sarasvati hath listened."
+SHARMA = "Sarasvati, pure and unsullied, flows from the mountains to the sea."
+
+
+class Reply:
+    def __init__(self, content):
+        self.content = content
+
+
+class SleepyLLM:
+    """Answers after `delay` seconds with its name and the last message's first line."""
+
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+
+    def invoke(self, messages):
+        time.sleep(self.delay)
+        return Reply(self._text(messages))
+
+    def stream(self, messages):
+        words = self._text(messages).split(" ")
+        for i, word in enumerate(words):
+            time.sleep(self.delay / len(words))
+            yield AIMessageChunk(content=word if i == 0 else " " + word)
+
+    def _text(self, messages):
+        last = messages[-1]
+        text = last["content"] if isinstance(last, dict) else last.content
+        return f"{self.name}: {text.strip().splitlines()[0]}"
+
+
+def _orchestrator(amt_delay=0.3, oit_delay=0.3, **kwargs):
+    return MigrationDebateOrchestrator(
+        AMTAgent(SleepyLLM("amt", amt_delay)),
+        OITAgent(SleepyLLM("oit", oit_delay)),
+        SleepyLLM("synthesis", 0.0),
+        **kwargs,
+    )
+
+
+def _debate(orchestrator, rounds=2):
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        history = orchestrator.run_debate(VERSE, GRIFFITH, SHARMA, rounds=rounds, save=False)
+    return history, out.getvalue(), time.perf_counter() - start
+
+
+def _without_timestamp(history):
+    return {key: value for key, value in history.items() if key != "timestamp"}
+
+
+def test_parallel_speedup():
+    print("=" * 70)
+    print("TEST 1: Parallel rounds")
+    print("=" * 70)
+
+    sequential, sequential_out, sequential_time = _debate(_orchestrator(parallel=False))
+    parallel, parallel_out, parallel_time = _debate(_orchestrator(parallel=True))
+
+    assert _without_timestamp(parallel) == _without_timestamp(sequential)
+    assert parallel_out == sequential_out
+    assert len(parallel["rounds"]) == 2 and "timed_out" not in parallel["rounds"][0]
+    assert parallel["rounds"][1]["amt_rebuttal"].startswith("amt: Verse: RV 7.95.2")
+    assert sequential_time >= 1.2 and parallel_time < 0.75 * sequential_time, (sequential_time, parallel_time)
+    print(f"  ✅ Sequential {sequential_time:.2f}s, parallel {parallel_time:.2f}s, identical transcripts")
+
+
+def test_deterministic_order():
+    print("\n" + "=" * 70)
+    print("TEST 2: Output order")
+    print("=" * 70)
+
+    history, out, _ = _debate(_orchestrator(amt_delay=0.4, oit_delay=0.05, parallel=True), rounds=1)
+    amt_at = out.index(history["rounds"][0]["amt_analysis"])
+    oit_at = out.index(history["rounds"][0]["oit_analysis"])
+    assert out.index("AMT SCHOLAR") < amt_at < out.index("OIT SCHOLAR") < oit_at
+    print("  ✅ AMT heading, AMT reply, OIT heading, OIT reply")
+
+
+def test_agent_timeout():
+    print("\n" + "=" * 70)
+    print("TEST 3: Per-agent timeout")
+    print("=" * 70)
+
+    for parallel in (True, False):
+        orchestrator = _orchestrator(amt_delay=0.05, oit_delay=1.0, parallel=parallel, agent_timeout=0.3)
+        history, out, elapsed = _debate(orchestrator, rounds=1)
+        first = history["rounds"][0]
+        assert first["timed_out"] == ["OIT Scholar"]
+        assert first["oit_analysis"] == "[OIT Scholar did not respond within 0.3s]"
+        assert first["amt_analysis"].startswith("amt: ")
+        assert first["oit_analysis"] in out and history["synthesis"]
+        assert elapsed < 0.9, elapsed
+    print(f"  ✅ OIT marked as timed out after {orchestrator.agent_timeout}s; synthesis still ran")
+
+
+def main():
+    test_parallel_speedup()
+    test_deterministic_order()
+    test_agent_timeout()
+    print("\n✅ All parallel debate tests passed")
+
+
+if __name__ == "__main__":
+    main()
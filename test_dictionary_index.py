@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the compiled Monier-Williams dictionary index.
+
+Tests:
+1. Exact lookups match the JSON dictionary with the old per-call noise filter
+2. Stem and prefix search ("loves" -> "love")
+3. Fuzzy matches agree with a brute-force edit-distance scan
+   (lookup corrects typos, but leaves names, short words and English words alone)
+4. Reverse (Sanskrit -> English) lookup, with and without diacritics
+5. The saved index is memory-mapped on reopen, rebuilt when the JSON changes,
+   and lookups take well under a millisecond
+6. The agent's dictionary phase keeps English words it lacks unmapped and
+   flags spelling corrections
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from src.utils.dictionary_index import (
+    DictionaryIndex,
+    load_or_build_dictionary_index,
+    lookup_distance,
+    osa_distance,
+)
+
+SOURCE = os.path.join(ROOT, "sanskrit_dictionary_cleaned.json")
+
+
+def _load_json():
+    with open(SOURCE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _old_lookup(entries, word):
+    """dictionary_lookup's previous exact-match behaviour (before the [:5] cut)."""
+    terms = entries.get(word.lower())
+    if terms:
+        clean = [t for t in terms if not any(c.isdigit() for c in t) and len(t) > 2]
+        if clean:
+            return clean
+    return None
+
+
+def test_exact_parity():
+    """Every JSON key gives the same cleaned terms as before."""
+    print("=" * 70)
+    print("TEST 1: Exact lookups match the JSON dictionary")
+    print("=" * 70)
+
+    entries = _load_json()
+    index = DictionaryIndex.build(entries)
+    for word in entries:
+        assert index.get(word) == _old_lookup(entries, word), word
+    assert index.get("MILK") == index.get("milk")
+    assert index.get("no such headword") is None
+    noise_only = sum(_old_lookup(entries, w) is None for w in entries)
+    assert len(index) == len(entries) - noise_only
+    print(f"  ✅ {len(entries)} keys checked ({noise_only} noise-only keys dropped at build time)")
+
+
+def test_stem_and_prefix():
+    print("\n" + "=" * 70)
+    print("TEST 2: Stem and prefix search")
+    print("=" * 70)
+
+    index = DictionaryIndex.build({
+        "love": ["preman"], "king": ["rājan"], "run": ["dhāv"], "carry": ["bhṛ"],
+        "horse": ["aśva"], "horsemanship": ["daya"], "hot": ["uṣṇa"],
+    })
+    for word, stem in [("loves", "love"), ("loved", "love"), ("kings", "king"),
+                       ("running", "run"), ("carries", "carry"), ("kingly", "king")]:
+        assert index.stem(word) == stem, (word, index.stem(word))
+        match = index.lookup(word)
+        assert (match.key, match.match) == (stem, "stem")
+    assert index.stem("horse") is None
+    assert index.lookup("love").match == "exact"
+    assert index.prefix("hors") == ["horse", "horsemanship"]
+    assert index.prefix("ho", limit=1) == ["horse"]
+    assert index.prefix("zebra") == []
+    print("  ✅ Inflections resolve to their headword; prefix ranges are sorted")
+
+
+def test_fuzzy_matches_brute_force():
+    """For words within the indexed prefix length, the deletes index misses nothing."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Fuzzy matching")
+    print("=" * 70)
+
+    entries = _load_json()
+    index = DictionaryIndex.build(entries)
+    keys = [index.key(i) for i in range(len(index))]
+    for word in ["watr", "waetr", "mlik", "hrose", "agni", "fier", "kng", "sunn"]:
+        expected = {k for k in keys if len(k) <= index.prefix_length and osa_distance(word, k, 2) <= 2}
+        found = {key for key, _ in index.fuzzy(word, limit=len(keys))}
+        assert expected <= found, (word, expected - found)
+        assert all(osa_distance(word, key, 2) == distance for key, distance in index.fuzzy(word))
+
+    assert index.lookup("waetr") == ("waetr", "water", index.get("water"), "fuzzy", 1)
+    assert index.lookup("beautifull").key == "beautiful"
+    assert index.lookup("qqqqqqqq") is None
+    assert index.lookup("waetr", fuzzy=False) is None
+
+    # Proper nouns and short words have close headwords, but are not typos of them
+    for word in ["indra", "Indra", "sudas", "mitra", "varuna", "agni", "soma", "my", "mlik", "walked"]:
+        assert index.fuzzy(word) and index.lookup(word) is None, (word, index.lookup(word))
+    assert [lookup_distance(w) for w in ["my", "agni", "indra", "walked", "sacrifise"]] == [0, 0, 1, 1, 2]
+
+    # Real English words one edit from a headword are suggested, not remapped
+    for word, closest in [("singing", "sinking"), ("lightning", "lighting")]:
+        assert index.get(word) is None and index.is_english_word(word)
+        assert index.lookup(word) is None and index.suggest(word) == (closest, 1)
+    assert not index.is_english_word("waetr") and not index.is_english_word("beautifull")
+    print("  ✅ Same candidates as a full scan; 'waetr' -> 'water'; 'indra', 'my', 'singing' not matched")
+
+
+def test_reverse():
+    print("\n" + "=" * 70)
+    print("TEST 4: Reverse lookup")
+    print("=" * 70)
+
+    index = DictionaryIndex.build(_load_json())
+    assert index.reverse("payas") == ["milk"]
+    assert index.reverse("kṣīra") == index.reverse("ksira") == index.reverse("KSIRA") == ["milk"]
+    assert index.reverse("क्षीर") == ["milk"]
+    assert "water" in index.reverse("jala")
+    assert index.reverse("nonexistent") == []
+    print(f"  ✅ payas -> {index.reverse('payas')}, ksira -> {index.reverse('ksira')}, jala -> {index.reverse('jala')[:3]}")
+
+
+def test_persistence():
+    print("\n" + "=" * 70)
+    print("TEST 5: Persistence and lookup latency")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "dictionary.json")
+        index_dir = os.path.join(tmp, "dictionary_index")
+        shutil.copy(SOURCE, source)
+
+        built = load_or_build_dictionary_index(source, index_dir)
+        start = time.perf_counter()
+        loaded = load_or_build_dictionary_index(source, index_dir)
+        load_time = time.perf_counter() - start
+        assert type(loaded.deletes_hash).__name__ == "memmap"
+        assert loaded.fingerprint == built.fingerprint and len(loaded) == len(built)
+        for word in ["milk", "loves", "waetr"]:
+            assert loaded.lookup(word) == built.lookup(word)
+        assert loaded.reverse("payas") == built.reverse("payas")
+
+        words = ["milk", "water", "loves", "kings", "horse", "waetr"] * 100
+        start = time.perf_counter()
+        for word in words:
+            loaded.lookup(word)
+        per_lookup = (time.perf_counter() - start) / len(words)
+        assert per_lookup < 1e-3, per_lookup
+
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump({"milk": ["payas"]}, f)
+        rebuilt = load_or_build_dictionary_index(source, index_dir)
+        assert len(rebuilt) == 1 and rebuilt.get("milk") == ["payas"]
+        assert DictionaryIndex.load(index_dir).get("milk") == ["payas"]
+    print(f"  ✅ Reopened in {load_time * 1000:.1f} ms; {per_lookup * 1e6:.0f} µs per lookup; stale index rebuilt")
+
+
+def test_agent_dictionary_phase():
+    print("\n" + "=" * 70)
+    print("TEST 6: Agent dictionary phase")
+    print("=" * 70)
+
+    from src.utils import agentic_rag
+
+    result = agentic_rag._dictionary_phase(["singing", "waetr", "loves", "milk"])
+    words, matches = result["sanskrit_words"], result["dictionary_matches"]
+    assert words["singing"] == [] and "singing" not in matches
+    assert words["waetr"] == agentic_rag.load_monier_williams().get("water")[:5]
+    assert matches == {"waetr": {"key": "water", "match": "fuzzy"}, "loves": {"key": "love", "match": "stem"}}
+    assert "Did you mean 'sinking'?" in agentic_rag.dictionary_lookup.invoke({"word": "singing"})
+    assert "spelling corrected to 'water'" in agentic_rag.dictionary_lookup.invoke({"word": "waetr"})
+    print(f"  ✅ 'singing' left empty; corrections recorded: {matches}")
+
+
+def main():
+    test_exact_parity()
+    test_stem_and_prefix()
+    test_fuzzy_matches_brute_force()
+    test_reverse()
+    test_persistence()
+    test_agent_dictionary_phase()
+    print("\n✅ All dictionary index tests passed")
+
+
+if __name__ == "__main__":
+    main()
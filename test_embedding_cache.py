@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the on-disk embedding cache (CachedEmbeddings).
+
+Tests:
+1. Batch-aware misses: only distinct uncached texts reach the model
+2. Entries persist across processes (new store on the same file)
+3. Query/document separation per provider
+4. LRU eviction keeps the cache under its size budget
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import numpy as np
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.utils.embedding_cache import CachedEmbeddings, EmbeddingCacheStore
+
+
+class RecordingEmbeddings(DeterministicFakeEmbedding):
+    calls: list = []
+
+    def embed_documents(self, texts):
+        self.calls.append(("doc", list(texts)))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.calls.append(("query", [text]))
+        return super().embed_query(text)
+
+
+def _as_f32(vector):
+    return np.asarray(vector, dtype=np.float32).tolist()
+
+
+def test_batch_misses_and_persistence():
+    """Only distinct uncached texts are embedded; a reopened store serves them."""
+    print("=" * 70)
+    print("TEST 1: Batch-aware misses and persistence")
+    print("=" * 70)
+
+    base = RecordingEmbeddings(size=8, calls=[])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "embeddings.sqlite")
+        cached = CachedEmbeddings(base, EmbeddingCacheStore(path), "fake:8", query_uses_document_embedding=True)
+
+        first = cached.embed_documents(["Indra", "Agni", "Indra"])
+        assert base.calls == [("doc", ["Indra", "Agni"])]
+        assert first[0] == first[2] == _as_f32(base.embed_documents(["Indra"])[0])
+        base.calls.clear()
+
+        second = cached.embed_documents(["Agni", "Soma", "Indra"])
+        assert base.calls == [("doc", ["Soma"])]
+        assert second[0] == first[1]
+        stats = cached.stats()
+        assert stats["misses"] == 3 and stats["entries"] == 3
+        print(f"  ✅ {stats['hits']} hits, {stats['misses']} misses")
+
+        # Queries share document entries for models that embed them the same way
+        assert cached.embed_query("Soma") == second[1]
+
+        base.calls.clear()
+        reopened = CachedEmbeddings(base, EmbeddingCacheStore(path), "fake:8", query_uses_document_embedding=True)
+        assert reopened.embed_documents(["Indra", "Agni", "Soma"]) == [first[0], first[1], second[1]]
+        assert base.calls == []
+        print("  ✅ Cache persisted across store instances")
+
+
+def test_query_namespace():
+    """Providers with distinct query embeddings never reuse document entries."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Query entries for asymmetric providers")
+    print("=" * 70)
+
+    base = RecordingEmbeddings(size=8, calls=[])
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingCacheStore(os.path.join(tmp, "embeddings.sqlite"))
+        cached = CachedEmbeddings(base, store, "gemini:test", query_uses_document_embedding=False)
+        cached.embed_documents(["Rudra"])
+        cached.embed_query("Rudra")
+        cached.embed_query("Rudra")
+        assert base.calls == [("doc", ["Rudra"]), ("query", ["Rudra"])]
+
+        other_model = CachedEmbeddings(base, store, "gemini:other", query_uses_document_embedding=False)
+        other_model.embed_documents(["Rudra"])
+        assert len(base.calls) == 3
+        print("  ✅ Query and model namespaces kept apart")
+
+
+def test_eviction():
+    """The least recently used entries are evicted once the budget is exceeded."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Size-bounded eviction")
+    print("=" * 70)
+
+    base = RecordingEmbeddings(size=256, calls=[])  # 1 KB per float32 vector
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingCacheStore(os.path.join(tmp, "embeddings.sqlite"), max_bytes=10 * 1024)
+        cached = CachedEmbeddings(base, store, "fake:256")
+        cached.embed_documents([f"hymn {i}" for i in range(8)])
+        cached.embed_documents(["hymn 0"])  # refresh so it survives eviction
+        cached.embed_documents([f"verse {i}" for i in range(6)])
+        assert store.size_bytes <= 10 * 1024
+
+        base.calls.clear()
+        cached.embed_documents(["hymn 0"])
+        assert base.calls == [], "Recently used entry was evicted"
+        cached.embed_documents(["hymn 1"])
+        assert base.calls == [("doc", ["hymn 1"])], "Stale entry was not evicted"
+        print(f"  ✅ {len(store)} entries kept, {store.size_bytes} bytes")
+
+
+def main():
+    test_batch_misses_and_persistence()
+    test_query_namespace()
+    test_eviction()
+    print("\n✅ All embedding cache tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script to validate batched proper-noun expansion searches in HybridRetriever.
+
+Tests:
+1. One batched Qdrant request returns what per-variant searches return, in order
+2. Whole queries give the same documents with batching on and off
+3. The thread-pool fallback runs when batched search is unavailable or fails
+
+Uses deterministic fake embeddings and an in-memory Qdrant collection, so no
+model or index is needed.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_qdrant import QdrantVectorStore
+
+import src.utils.retriever as retriever_module
+from src.utils.retriever import create_retriever
+
+VARIANTS = ["Sudas", "Sudasa", "Vasishtha", "Vasistha", "Sudas", "Bharata"]
+QUERY = "Who are Sudas and Vasishtha?"
+
+
+class SymmetricEmbeddings(DeterministicFakeEmbedding):
+    """Embeds queries and documents identically, so the batched path may be used."""
+
+    query_uses_document_embedding: bool = True
+
+
+def _chunks():
+    names = ["Sudas", "Vasishtha", "Vishvamitra", "Bharata", "Indra", "Agni"]
+    return [
+        Document(
+            page_content=f"HYMN {i}. {names[i % len(names)]} praises {names[(i * 7) % len(names)]} by the river, verse {i}.",
+            metadata={"chunk": i},
+        )
+        for i in range(40)
+    ]
+
+
+def _retriever(tmp, embeddings, collection):
+    chunks = _chunks()
+    vec_db = QdrantVectorStore.from_documents(chunks, embeddings, location=":memory:", collection_name=collection)
+    retriever = create_retriever(vec_db, chunks, index_dir=tmp)
+    retriever.result_cache = None
+    return retriever, vec_db
+
+
+def _spy_batch(vec_db, fail=False):
+    """Count (or fail) the client's batched requests."""
+    calls = []
+    real = vec_db.client.query_batch_points
+
+    def query_batch_points(*args, **kwargs):
+        calls.append(len(kwargs["requests"]))
+        if fail:
+            raise RuntimeError("batch search unavailable")
+        return real(*args, **kwargs)
+
+    vec_db.client.query_batch_points = query_batch_points
+    return calls
+
+
+def _spy_searches(vec_db):
+    """Threads that ran a per-variant similarity search."""
+    threads = []
+    real = vec_db.similarity_search
+
+    def similarity_search(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return real(*args, **kwargs)
+
+    vec_db.similarity_search = similarity_search
+    return threads
+
+
+def _contents(docs):
+    return [doc.page_content for doc in docs]
+
+
+def _with_settings(batch, workers, test):
+    saved = retriever_module.EXPANSION_BATCH_SEARCH, retriever_module.EXPANSION_MAX_WORKERS
+    retriever_module.EXPANSION_BATCH_SEARCH, retriever_module.EXPANSION_MAX_WORKERS = batch, workers
+    try:
+        return test()
+    finally:
+        retriever_module.EXPANSION_BATCH_SEARCH, retriever_module.EXPANSION_MAX_WORKERS = saved
+
+
+def test_batched_matches_per_variant():
+    print("=" * 70)
+    print("TEST 1: Batched expansion search")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        retriever, vec_db = _retriever(tmp, SymmetricEmbeddings(size=16), "batch_test")
+        batches = _spy_batch(vec_db)
+        timings = {}
+        prefetched = _with_settings(True, 4, lambda: retriever._prefetch_expansion_searches(VARIANTS, timings))
+        expected = {variant: _contents(retriever.semantic_retriever.invoke(variant)) for variant in VARIANTS}
+
+    assert batches == [5], batches  # one request, duplicate variant searched once
+    assert list(prefetched) == list(dict.fromkeys(VARIANTS))
+    assert {variant: _contents(docs) for variant, docs in prefetched.items()} == expected
+    assert "expansion_embed" in timings and "expansion_search" in timings
+    print(f"  ✅ {len(prefetched)} variants in one request; same documents and order as per-variant search")
+
+
+def test_same_results_end_to_end():
+    print("\n" + "=" * 70)
+    print("TEST 2: Same results with batching on and off")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        retriever, vec_db = _retriever(tmp, SymmetricEmbeddings(size=16), "end_to_end_test")
+        batches = _spy_batch(vec_db)
+        batched = _with_settings(True, 4, lambda: _contents(retriever.invoke(QUERY)))
+        assert batches, "batched path not taken"
+        pooled = _with_settings(False, 4, lambda: _contents(retriever.invoke(QUERY)))
+        sequential = _with_settings(False, 1, lambda: _contents(retriever.invoke(QUERY)))
+
+    assert batched == pooled == sequential and len(batched) > retriever.k
+    print(f"  ✅ {len(batched)} documents, identical for batched, thread-pool and sequential search")
+
+
+def test_fallback():
+    print("\n" + "=" * 70)
+    print("TEST 3: Thread-pool fallback")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Query embeddings may differ from document embeddings: no batched path
+        retriever, vec_db = _retriever(tmp, DeterministicFakeEmbedding(size=16), "fallback_test")
+        batches = _spy_batch(vec_db)
+        threads = _spy_searches(vec_db)
+        timings = {}
+        prefetched = _with_settings(True, 4, lambda: retriever._prefetch_expansion_searches(VARIANTS, timings))
+        assert batches == [] and "expansion_embed" not in timings
+        assert len(threads) == 5 and all(name != threading.current_thread().name for name in threads)
+
+        # A failing batched request falls back too
+        retriever, vec_db = _retriever(tmp, SymmetricEmbeddings(size=16), "failing_test")
+        batches = _spy_batch(vec_db, fail=True)
+        threads = _spy_searches(vec_db)
+        recovered = _with_settings(True, 4, lambda: retriever._prefetch_expansion_searches(VARIANTS, {}))
+        expected = {variant: _contents(retriever.semantic_retriever.invoke(variant)) for variant in recovered}
+        assert batches == [5] and len(threads) >= 5
+        assert {variant: _contents(docs) for variant, docs in recovered.items()} == expected
+
+        # With both disabled, the expansion loop searches lazily
+        assert _with_settings(False, 1, lambda: retriever._prefetch_expansion_searches(VARIANTS, {})) == {}
+    assert len(prefetched) == 5
+    print("  ✅ Thread pool used when batching is unavailable or fails; {} when both are off")
+
+
+def main():
+    test_batched_matches_per_variant()
+    test_same_results_end_to_end()
+    test_fallback()
+    print("\n✅ All expansion batch tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script to validate hybrid result fusion (src/utils/fusion.py).
+
+Tests:
+1. rank_heuristic reproduces the original HybridRetriever merge
+2. RRF and weighted_score rank chunks found by both retrievers first
+3. Point ids deduplicate chunks whose text differs only in whitespace
+4. ChunkStore round-trips Document ids for the keyword side
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from langchain_core.documents import Document
+
+from src.utils.chunk_store import ChunkStore
+from src.utils.fusion import chunk_key, fuse
+
+
+def _original_merge(semantic_docs, keyword_docs, semantic_weight=0.7, keyword_weight=0.3):
+    """The merge HybridRetriever used before fusion.py."""
+    seen_content = {}
+    doc_scores = {}
+    for i, doc in enumerate(semantic_docs):
+        content_hash = hash(doc.page_content)
+        seen_content[content_hash] = doc
+        doc_scores[content_hash] = (len(semantic_docs) - i) * semantic_weight
+    for i, doc in enumerate(keyword_docs):
+        content_hash = hash(doc.page_content)
+        score = (len(keyword_docs) - i) * keyword_weight
+        if content_hash in doc_scores:
+            doc_scores[content_hash] += score * 2
+        else:
+            seen_content[content_hash] = doc
+            doc_scores[content_hash] = score
+    sorted_hashes = sorted(doc_scores.keys(), key=lambda h: doc_scores[h], reverse=True)
+    return [seen_content[h].page_content for h in sorted_hashes]
+
+
+def test_rank_heuristic_parity():
+    """The default method returns exactly what the old merge returned."""
+    print("=" * 70)
+    print("TEST 1: rank_heuristic parity")
+    print("=" * 70)
+
+    rnd = random.Random(7)
+    pool = [Document(page_content=f"RV {i}.{i * 3} Indra") for i in range(20)]
+    for _ in range(500):
+        semantic = rnd.sample(pool, rnd.randint(0, 12))
+        keyword = rnd.sample(pool, rnd.randint(0, 12))
+        docs, scores, keys = fuse(semantic, keyword)
+        assert [d.page_content for d in docs] == _original_merge(semantic, keyword)
+        assert scores == sorted(scores, reverse=True)
+        assert len(set(keys)) == len(keys)
+    print("  ✅ 500 random candidate lists merged identically")
+
+
+def test_score_aware_methods():
+    """A chunk in both lists beats single-list chunks under RRF and weighted scores."""
+    print("\n" + "=" * 70)
+    print("TEST 2: rrf and weighted_score")
+    print("=" * 70)
+
+    shared = Document(page_content="Sudas at the Parushni")
+    semantic = [Document(page_content="Vasishtha's hymn"), shared, Document(page_content="Bharatas")]
+    keyword = [Document(page_content="ten kings"), shared]
+
+    for method in ("rrf", "weighted_score"):
+        docs, _, _ = fuse(semantic, keyword, [0.9, 0.85, 0.2], [7.5, 6.9], method=method, semantic_weight=0.5, keyword_weight=0.5)
+        assert docs[0] is shared, method
+        assert len(docs) == 4
+        print(f"  ✅ {method}: shared chunk ranked first")
+
+    try:
+        fuse(semantic, keyword, method="borda")
+        raise AssertionError("Unknown method accepted")
+    except ValueError:
+        print("  ✅ Unknown method rejected")
+
+
+def test_point_id_dedup():
+    """With point ids, Qdrant (_id) and chunk-store (Document.id) copies merge."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Point id deduplication")
+    print("=" * 70)
+
+    from_qdrant = Document(page_content="Agni, the priest", metadata={"_id": "p-1"})
+    from_bm25 = Document(page_content="Agni,  the priest", id="p-1")
+    docs, _, keys = fuse([from_qdrant], [from_bm25], key=lambda d: chunk_key(d, use_point_ids=True))
+    assert len(docs) == 1 and keys == ["p-1"]
+
+    docs, _, _ = fuse([from_qdrant], [from_bm25])
+    assert len(docs) == 2, "Content keys should not merge different texts"
+    print("  ✅ Point ids merge copies; content digests keep legacy behavior")
+
+
+def test_chunk_store_ids():
+    """Chunk ids written by the indexer come back as Document.id."""
+    print("\n" + "=" * 70)
+    print("TEST 4: Chunk store ids")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with_ids = ChunkStore.write(
+            [Document(page_content=f"hymn {i}", metadata={"i": i}, id=f"id-{i}") for i in range(3)],
+            os.path.join(tmp, "with_ids"),
+        )
+        assert with_ids.has_ids and [d.id for d in with_ids] == ["id-0", "id-1", "id-2"]
+
+        legacy = ChunkStore.write([Document(page_content="hymn")], os.path.join(tmp, "legacy"))
+        assert not legacy.has_ids and legacy[0].id is None
+    print("  ✅ Ids round-trip; stores without ids fall back to content keys")
+
+
+def main():
+    test_rank_heuristic_parity()
+    test_score_aware_methods()
+    test_point_id_dedup()
+    test_chunk_store_ids()
+    print("\n✅ All fusion tests passed")
+
+
+if __name__ == "__main__":
+    main()
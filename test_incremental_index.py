@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script to validate incremental re-indexing (update_qdrant_vector_store).
+
+Tests:
+1. First run indexes everything and writes the manifest
+2. Unchanged corpus embeds nothing
+3. Adding a document embeds only its chunks
+4. Shrinking and removing documents deletes their stale points
+
+Uses a deterministic fake embedding model and a temporary local Qdrant store.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.settings import Settings
+from src.utils.index_files import update_qdrant_vector_store, chunk_point_id
+from src.config import COLLECTION_NAME, LOCAL_FOLDER, VECTORDB_FOLDER
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    embedded: int = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def _write_doc(name, text):
+    folder = os.path.join(LOCAL_FOLDER, COLLECTION_NAME, name)
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, f"{name}.md"), "w", encoding="utf-8") as f:
+        f.write(text)
+    with open(os.path.join(folder, f"{name}_metadata.json"), "w", encoding="utf-8") as f:
+        json.dump({"title": name}, f)
+
+
+def _hymns(book, count):
+    return "\n\n".join(
+        f"HYMN {book}.{i}. Indra and Agni are praised by the singers of book {book}, verse {i}. " * 3
+        for i in range(1, count + 1)
+    )
+
+
+def _run(embeddings):
+    embeddings.embedded = 0
+    vector_store, chunks = update_qdrant_vector_store()
+    client = vector_store.client
+    points = sorted(str(p.id) for p in client.scroll(COLLECTION_NAME, limit=10000)[0])
+    with open(os.path.join(VECTORDB_FOLDER, COLLECTION_NAME, "index_manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    client.close()
+    return chunks, points, manifest
+
+
+def test_incremental_updates():
+    print("=" * 70)
+    print("TEST: Incremental re-indexing")
+    print("=" * 70)
+
+    embeddings = CountingEmbeddings(size=16)
+    original_get_embed_model = Settings.get_embed_model
+    Settings.get_embed_model = classmethod(lambda cls: embeddings)
+    cwd = os.getcwd()
+    tmp = tempfile.mkdtemp()
+    try:
+        os.chdir(tmp)
+        _write_doc("rigveda", _hymns(1, 20))
+        _write_doc("yajurveda", _hymns(2, 20))
+
+        chunks, points, manifest = _run(embeddings)
+        assert len(points) == len(chunks) == sum(f["n_chunks"] for f in manifest["files"].values())
+        assert manifest["files"]["rigveda"]["point_ids"][0] == chunk_point_id("rigveda", 0)
+        print(f"  ✅ Initial index: {len(points)} points")
+
+        # from_existing_collection embeds one probe text to validate dimensions
+        _, points_again, _ = _run(embeddings)
+        assert points_again == points and embeddings.embedded <= 1
+        print("  ✅ Unchanged corpus: nothing re-embedded")
+
+        _write_doc("brahmana", _hymns(3, 5))
+        chunks, points, manifest = _run(embeddings)
+        added = manifest["files"]["brahmana"]["n_chunks"]
+        assert embeddings.embedded <= added + 1
+        assert len(points) == len(chunks)
+        print(f"  ✅ Added document: {added} chunks embedded")
+
+        _write_doc("rigveda", _hymns(1, 5))
+        shutil.rmtree(os.path.join(LOCAL_FOLDER, COLLECTION_NAME, "yajurveda"))
+        chunks, points, manifest = _run(embeddings)
+        expected = sorted(pid for f in manifest["files"].values() for pid in f["point_ids"])
+        assert points == expected and len(points) == len(chunks)
+        assert {d.metadata["title"] for d in chunks} == {"rigveda", "brahmana"}
+        print(f"  ✅ Shrunk and removed documents: {len(points)} points remain")
+    finally:
+        os.chdir(cwd)
+        Settings.get_embed_model = original_get_embed_model
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    test_incremental_updates()
+    print("\n✅ All incremental indexing tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the process-wide index service.
+
+Tests:
+1. Concurrent callers share one loaded index; reopening does not re-embed
+2. Memory footprint reports chunks, BM25, vectors and process RSS
+3. Rebuild closes the old Qdrant client and swaps in a new bundle
+
+Uses a deterministic fake embedding model and a temporary local Qdrant store.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.settings import Settings
+from src.config import COLLECTION_NAME, LOCAL_FOLDER
+from src.utils import index_service
+from src.utils.index_service import (
+    format_footprint,
+    get_index_service,
+    index_service_loaded,
+    rebuild_index_service,
+    reset_index_service,
+)
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    embedded: int = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def _write_doc(name, text):
+    folder = os.path.join(LOCAL_FOLDER, COLLECTION_NAME, name)
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, f"{name}.md"), "w", encoding="utf-8") as f:
+        f.write(text)
+    with open(os.path.join(folder, f"{name}_metadata.json"), "w", encoding="utf-8") as f:
+        json.dump({"title": name}, f)
+
+
+def _hymns(book, count):
+    return "\n\n".join(
+        f"HYMN {book}.{i}. Indra and Agni are praised by the singers of book {book}, verse {i}. " * 3
+        for i in range(1, count + 1)
+    )
+
+
+def _in_temp_corpus(test):
+    """Run test(embeddings) in a temporary working directory with a small corpus."""
+    embeddings = CountingEmbeddings(size=16)
+    original_get_embed_model = Settings.get_embed_model
+    Settings.get_embed_model = classmethod(lambda cls: embeddings)
+    cwd = os.getcwd()
+    tmp = tempfile.mkdtemp()
+    try:
+        os.chdir(tmp)
+        _write_doc("rigveda", _hymns(1, 20))
+        test(embeddings)
+    finally:
+        reset_index_service()
+        os.chdir(cwd)
+        Settings.get_embed_model = original_get_embed_model
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_shared_load():
+    """Eight concurrent sessions get the same index, loaded once."""
+    print("=" * 70)
+    print("TEST 1: One index per process")
+    print("=" * 70)
+
+    def run(embeddings):
+        first = get_index_service()  # builds the index
+        assert embeddings.embedded >= len(first.chunks)
+        reset_index_service()
+        assert not index_service_loaded()
+
+        loads = []
+        original_load = index_service._load
+        index_service._load = lambda **kw: loads.append(1) or original_load(**kw)
+        embeddings.embedded = 0
+        try:
+            services = [None] * 8
+
+            def session(i):
+                services[i] = get_index_service()
+
+            threads = [threading.Thread(target=session, args=(i,)) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            index_service._load = original_load
+
+        assert len(loads) == 1 and all(s is services[0] for s in services)
+        # Reopening the local collection embeds at most one probe text
+        assert embeddings.embedded <= 1, embeddings.embedded
+        assert services[0].retriever.invoke("Indra and Agni")
+        print(f"  ✅ 8 sessions, 1 load, {len(services[0].chunks)} chunks, nothing re-embedded")
+
+    _in_temp_corpus(run)
+
+
+def test_memory_footprint():
+    """Footprint separates heap and memory-mapped bytes per component."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Memory footprint")
+    print("=" * 70)
+
+    def run(embeddings):
+        service = get_index_service()
+        footprint = service.memory_footprint()
+        n_chunks = len(service.chunks)
+        assert footprint["chunks"]["count"] == n_chunks and footprint["chunks"]["mapped_bytes"] > 0
+        # Built in memory on first load, memory-mapped when reopened
+        assert footprint["bm25"]["heap_bytes"] + footprint["bm25"]["mapped_bytes"] > 0
+        assert footprint["vector_store"] == {"points": n_chunks, "dimensions": 16, "vector_bytes": n_chunks * 16 * 4}
+        assert footprint["process_rss_bytes"] is None or footprint["process_rss_bytes"] > 0
+        print(f"  ✅ {format_footprint(footprint)}")
+
+    _in_temp_corpus(run)
+
+
+def test_rebuild():
+    """Rebuilding replaces the bundle; the old one is immutable and closed."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Rebuild and reset")
+    print("=" * 70)
+
+    def run(embeddings):
+        old = get_index_service()
+        try:
+            old.retriever = None
+            raise AssertionError("IndexService should be immutable")
+        except AttributeError:
+            pass
+
+        _write_doc("yajurveda", _hymns(2, 10))
+        new = rebuild_index_service(force_recreate=True)
+        assert new is not old and get_index_service() is new
+        assert len(new.chunks) > len(old.chunks)
+        assert {d.metadata["title"] for d in new.retriever.invoke("Indra and Agni book 2")} >= {"yajurveda"}
+
+        reset_index_service()
+        assert not index_service_loaded()
+        print(f"  ✅ Rebuilt {len(old.chunks)} -> {len(new.chunks)} chunks")
+
+    _in_temp_corpus(run)
+
+
+def main():
+    test_shared_load()
+    test_memory_footprint()
+    test_rebuild()
+    print("\n✅ All index service tests passed")
+
+
+if __name__ == "__main__":
+    main()
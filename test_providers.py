@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script to validate lazy LLM provider loading.
+
+Tests:
+1. Importing settings and the RAG graphs loads no provider SDK
+2. The registry resolves providers on demand and rejects unknown names
+3. Provider exceptions can be caught without importing the SDK
+"""
+
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from src.utils.providers import (
+    chat_model_class,
+    loaded_class,
+    provider_exception,
+    register_chat_model,
+)
+
+PROVIDER_SDKS = ("langchain_groq", "langchain_google_genai", "langchain_ollama", "langchain_huggingface")
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_import_loads_no_sdk():
+    """A fresh interpreter imports the graphs without touching any provider SDK."""
+    print("=" * 70)
+    print("TEST 1: No provider SDK at import time")
+    print("=" * 70)
+
+    script = (
+        "import sys; sys.path[:0] = ['src', '.']\n"
+        "import settings, utils.final_block_rag, utils.agentic_rag\n"
+        f"print(','.join(m for m in {PROVIDER_SDKS!r} if m in sys.modules))\n"
+    )
+    env = dict(os.environ, MODEL=os.environ.get("MODEL", "llama-3.1-8b-instant"),
+               GROQ_API_KEY=os.environ.get("GROQ_API_KEY", "test-key"))
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stderr[-2000:]
+    loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+    assert loaded == "", f"SDKs imported eagerly: {loaded}"
+    print("  ✅ settings, final_block_rag and agentic_rag import lazily")
+
+
+def test_registry():
+    """Known providers resolve to their classes; unknown ones raise ValueError."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Provider registry")
+    print("=" * 70)
+
+    register_chat_model("fake", "langchain_core.language_models.fake_chat_models", "FakeListChatModel")
+    llm = chat_model_class("fake")(responses=["ok"])
+    assert llm.invoke("hi").content == "ok"
+
+    try:
+        chat_model_class("no-such-provider")
+        raise AssertionError("unknown provider should raise")
+    except ValueError as e:
+        assert "no-such-provider" in str(e)
+    print("  ✅ Registered, resolved and rejected providers")
+
+
+def test_provider_exception():
+    """Exceptions of unloaded SDKs map to a placeholder that is never raised."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Provider exceptions")
+    print("=" * 70)
+
+    assert loaded_class("not_an_imported_module", "Anything") is None
+    placeholder = provider_exception("not_an_imported_module", "BadRequestError")
+    try:
+        raise KeyError("other error")
+    except placeholder:
+        raise AssertionError("placeholder must not catch unrelated errors")
+    except KeyError:
+        pass
+    assert provider_exception("json", "JSONDecodeError") is sys.modules["json"].JSONDecodeError
+    print("  ✅ Placeholder for unloaded SDKs, real class once imported")
+
+
+def main():
+    test_import_loads_no_sdk()
+    test_registry()
+    test_provider_exception()
+    print("\n✅ All provider tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the shared single-pass query analysis.
+
+Tests:
+1. Source filters, BM25 keyword query and proper nouns
+2. Location/tribal intents and query-type routing
+3. Repeated analysis of the same query returns the same immutable object
+"""
+
+import dataclasses
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from src.utils.query_analysis import analyze_query
+from src.utils.sanskrit_lexicon import classify_query_type
+
+
+def test_retrieval_fields():
+    """The fields HybridRetriever consumes."""
+    print("=" * 70)
+    print("TEST 1: Retrieval fields")
+    print("=" * 70)
+
+    analysis = analyze_query("Who was Sūdaḥ in the Rigveda, and what did Vasishtha say?")
+    assert analysis.source_filters == ("rigveda",) and analysis.strict_source_filter
+    assert analysis.keyword_query == "was Sudah   Rigveda and  did Vasishtha say"
+    assert analysis.proper_nouns == ("Sūdaḥ", "Rigveda", "Vasishtha")
+    print(f"  ✅ keyword query: '{analysis.keyword_query}'")
+
+    both = analyze_query("Compare Agni in the Rig Veda and the Yajur-Veda")
+    assert both.source_filters == ("rigveda", "yajurveda") and not both.strict_source_filter
+
+    # All-stopword queries fall back to the original text; acronyms are not names
+    assert analyze_query("Who is a?").keyword_query == "Who is a?"
+    assert analyze_query("Tell me about NASA and Indra").proper_nouns == ("Indra",)
+    print("  ✅ Source filters, fallbacks and proper nouns")
+
+
+def test_intents():
+    """Keyword intents match as substrings; routing types agree with the lexicon."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Intents and query types")
+    print("=" * 70)
+
+    location = analyze_query("Which rivers did the Bharatas cross?")
+    assert location.is_location_query and not location.is_tribal_query
+    assert "rivers" in location.location_keywords and "cross" in location.location_keywords
+
+    tribal = analyze_query("Who fought against Sudas in the Ten Kings battle?")
+    assert tribal.is_tribal_query and "fought against" in tribal.tribal_keywords
+
+    assert analyze_query("How do I say 'give me water' in Sanskrit?").agent_query_type == "construction"
+    assert analyze_query("Explain the declension of deva").agent_query_type == "grammar"
+    # The lexicon treats "what is" as a construction cue; the planner does not
+    assert analyze_query("What is soma?").query_type == "construction"
+    assert analyze_query("What is soma?").agent_query_type == "factual"
+    assert classify_query_type("Why is sandhi applied?") == "grammar"
+    print("  ✅ Location, tribal and routing intents")
+
+
+def test_shared_instance():
+    """Every stage that analyzes the same query shares one frozen object."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Shared immutable analysis")
+    print("=" * 70)
+
+    first = analyze_query("Where did the Purus live?")
+    assert analyze_query("Where did the Purus live?") is first
+    try:
+        first.proper_nouns = ()
+        raise AssertionError("QueryAnalysis should be immutable")
+    except dataclasses.FrozenInstanceError:
+        pass
+    print("  ✅ Memoized and frozen")
+
+
+def main():
+    test_retrieval_fields()
+    test_intents()
+    test_shared_instance()
+    print("\n✅ All query analysis tests passed")
+
+
+if __name__ == "__main__":
+    main()
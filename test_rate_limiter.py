@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the token-bucket limiter behind RateLimitedEmbeddings.
+
+Tests:
+1. Throughput stays within the per-minute quota across threads
+2. embed_documents is split into maximal batches, one request each
+3. 429 responses are retried after the suggested delay
+4. The async path respects the same limiter
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from src.settings import RateLimitedEmbeddings
+from src.utils.rate_limiter import RateLimiter
+
+
+class FakeProvider:
+    """Records request times and batch sizes; optionally fails with 429 first."""
+
+    def __init__(self, batch_size=100, fail_first=0):
+        self.batch_size = batch_size
+        self.fail_first = fail_first
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def _record(self, n):
+        with self._lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                raise RuntimeError("429 RESOURCE_EXHAUSTED: quota exceeded. Please retry in 0.2s.")
+            self.requests.append((time.monotonic(), n))
+
+    def embed_documents(self, texts):
+        self._record(len(texts))
+        return [[float(len(t))] for t in texts]
+
+    def embed_query(self, text):
+        self._record(1)
+        return [float(len(text))]
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text):
+        return self.embed_query(text)
+
+
+def test_threaded_quota():
+    """Four threads sharing one limiter never exceed burst + rate * elapsed."""
+    print("=" * 70)
+    print("TEST 1: Quota across threads")
+    print("=" * 70)
+
+    provider = FakeProvider()
+    embeddings = RateLimitedEmbeddings(provider, requests_per_minute=6000)  # 100 requests/s
+    start = time.monotonic()
+    threads = [
+        threading.Thread(target=lambda: [embeddings.embed_query("agni") for _ in range(15)])
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+
+    rate = embeddings.limiter.requests.rate
+    assert len(provider.requests) == 60
+    assert elapsed >= (60 - 1) / rate * 0.95, f"Too fast: {elapsed:.2f}s"
+    for i, (t_i, _) in enumerate(provider.requests):
+        admitted = sum(1 for t_j, _ in provider.requests if t_i <= t_j <= t_i + 0.1)
+        assert admitted <= 1 + rate * 0.1 + 1, f"Burst of {admitted} requests in 100ms"
+    print(f"  ✅ 60 requests in {elapsed:.2f}s (ceiling {rate:.1f}/s)")
+
+
+def test_batch_splitting():
+    """Documents are sent in provider-sized batches, each counted as one request."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Batch splitting")
+    print("=" * 70)
+
+    provider = FakeProvider(batch_size=3)
+    embeddings = RateLimitedEmbeddings(provider, requests_per_minute=6000)
+    vectors = embeddings.embed_documents([f"hymn {i}" for i in range(7)])
+    assert len(vectors) == 7
+    assert [n for _, n in provider.requests] == [3, 3, 1]
+
+    # A single request can never carry more texts than the per-minute text quota
+    limited = RateLimitedEmbeddings(FakeProvider(batch_size=100), requests_per_minute=6000, texts_per_minute=40)
+    assert [len(b) for b in limited._batches([f"verse {i}" for i in range(90)])] == [40, 40, 10]
+    print("  ✅ Batches respect provider batch size and texts-per-minute quota")
+
+
+def test_retry_on_429():
+    """A 429 pauses the limiter for the suggested delay and the batch is retried."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Retry on 429")
+    print("=" * 70)
+
+    provider = FakeProvider(fail_first=1)
+    embeddings = RateLimitedEmbeddings(provider, requests_per_minute=6000)
+    start = time.monotonic()
+    assert embeddings.embed_documents(["soma"]) == [[4.0]]
+    assert time.monotonic() - start >= 0.2
+    assert embeddings.limiter.rate_scale < 1.0
+    print(f"  ✅ Retried after 429; rate scaled to {embeddings.limiter.rate_scale:.0%}")
+
+
+def test_async_limiter():
+    """Concurrent async callers share the limiter without blocking the loop."""
+    print("\n" + "=" * 70)
+    print("TEST 4: Async path")
+    print("=" * 70)
+
+    provider = FakeProvider()
+    embeddings = RateLimitedEmbeddings(provider, requests_per_minute=6000)
+
+    async def run():
+        return await asyncio.gather(*(embeddings.aembed_query(f"rc {i}") for i in range(20)))
+
+    start = time.monotonic()
+    results = asyncio.run(run())
+    elapsed = time.monotonic() - start
+    assert len(results) == 20
+    assert elapsed >= 19 / embeddings.limiter.requests.rate * 0.95
+    print(f"  ✅ 20 async requests in {elapsed:.2f}s")
+
+
+def test_window_bound():
+    """No 60-second window admits more than the per-minute limit (scaled-down check)."""
+    limiter = RateLimiter(requests_per_minute=120, request_burst=10)
+    waits = [limiter._reserve(1) for _ in range(30)]
+    # The first `burst` requests go immediately, the rest are spaced at the refill rate
+    assert all(w == 0 for w in waits[:10])
+    assert abs(waits[-1] - 20 / limiter.requests.rate) < 0.05
+
+
+def main():
+    test_threaded_quota()
+    test_batch_splitting()
+    test_retry_on_429()
+    test_async_limiter()
+    test_window_bound()
+    print("\n✅ All rate limiter tests passed")
+
+
+if __name__ == "__main__":
+    main()
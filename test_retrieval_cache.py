@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the query-result cache (RetrievalCache).
+
+Tests:
+1. Normalized keys: whitespace variants hit, configuration changes miss
+2. LRU eviction by entry count and by bytes
+3. TTL expiry and fingerprint invalidation
+4. The on-disk tier serves a fresh process and drops results of old indexes
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from langchain_core.documents import Document
+
+from src.utils.retrieval_cache import RetrievalCache
+
+CONFIG = {"k": 10, "fusion": "rank_heuristic"}
+
+
+def _docs(label, n=2):
+    return [Document(page_content=f"{label} {i}", metadata={"filename": "rigveda-griffith", "chunk": i}) for i in range(n)]
+
+
+def test_normalized_keys():
+    """Whitespace-only differences share an entry; other configurations do not."""
+    print("=" * 70)
+    print("TEST 1: Normalized keys")
+    print("=" * 70)
+
+    cache = RetrievalCache()
+    cache.bind("index-1")
+    cache.put(cache.make_key("Who is Indra?", CONFIG), _docs("Indra"))
+
+    hit = cache.get(cache.make_key("  Who   is Indra? ", CONFIG))
+    assert [d.page_content for d in hit] == ["Indra 0", "Indra 1"]
+    hit[0].metadata["chunk"] = 99  # callers may mutate what they get back
+    assert cache.get(cache.make_key("Who is Indra?", CONFIG))[0].metadata["chunk"] == 0
+
+    assert cache.get(cache.make_key("who is indra?", CONFIG)) is None  # case drives proper-noun detection
+    assert cache.get(cache.make_key("Who is Indra?", {**CONFIG, "k": 5})) is None
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2 and stats["hit_rate"] == 0.5
+    print(f"  ✅ hit rate {stats['hit_rate']:.0%}")
+
+
+def test_lru_bounds():
+    """Least recently used entries go first, by count and by size."""
+    print("\n" + "=" * 70)
+    print("TEST 2: LRU eviction")
+    print("=" * 70)
+
+    cache = RetrievalCache(max_entries=2)
+    keys = [cache.make_key(q, CONFIG) for q in ("Agni", "Soma", "Varuna")]
+    cache.put(keys[0], _docs("Agni"))
+    cache.put(keys[1], _docs("Soma"))
+    cache.get(keys[0])
+    cache.put(keys[2], _docs("Varuna"))
+    assert cache.get(keys[1]) is None and cache.get(keys[0]) is not None
+    print("  ✅ Entry limit evicts least recently used")
+
+    size = cache.stats()["bytes"] // 2  # one serialized entry
+    small = RetrievalCache(max_bytes=size * 2 + size // 2)
+    for key, label in zip(keys, ("Agni", "Soma", "Varuna")):
+        small.put(key, _docs(label))
+    assert small.stats()["bytes"] <= small.max_bytes
+    assert small.get(keys[0]) is None and small.get(keys[2]) is not None
+    print(f"  ✅ Byte limit holds ({small.stats()['bytes']} <= {small.max_bytes})")
+
+
+def test_ttl_and_fingerprint():
+    """Expired entries miss; binding a new index fingerprint empties the cache."""
+    print("\n" + "=" * 70)
+    print("TEST 3: TTL and fingerprint invalidation")
+    print("=" * 70)
+
+    cache = RetrievalCache(ttl=0.05)
+    cache.bind("index-1")
+    key = cache.make_key("Sudas", CONFIG)
+    cache.put(key, _docs("Sudas"))
+    time.sleep(0.1)
+    assert cache.get(key) is None
+    print("  ✅ Expired entry missed")
+
+    cache = RetrievalCache()
+    cache.bind("index-1")
+    cache.put(cache.make_key("Sudas", CONFIG), _docs("Sudas"))
+    cache.bind("index-2")
+    assert cache.stats()["entries"] == 0
+    assert cache.get(cache.make_key("Sudas", CONFIG)) is None
+    print("  ✅ Re-indexed corpus invalidates cached results")
+
+
+def test_disk_tier():
+    """A new cache on the same file serves stored results for the same index only."""
+    print("\n" + "=" * 70)
+    print("TEST 4: On-disk tier")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.sqlite")
+        first = RetrievalCache(disk_path=path)
+        first.bind("index-1")
+        first.put(first.make_key("Bharatas", CONFIG), _docs("Bharatas"))
+
+        warm = RetrievalCache(disk_path=path)
+        warm.bind("index-1")
+        assert [d.page_content for d in warm.get(warm.make_key("Bharatas", CONFIG))] == ["Bharatas 0", "Bharatas 1"]
+        assert warm.stats()["disk_hits"] == 1
+        print("  ✅ Warm restart served from disk")
+
+        reindexed = RetrievalCache(disk_path=path)
+        reindexed.bind("index-2")
+        assert reindexed.get(reindexed.make_key("Bharatas", CONFIG)) is None
+        stale = RetrievalCache(disk_path=path)
+        stale.bind("index-1")
+        assert stale.get(stale.make_key("Bharatas", CONFIG)) is None
+        print("  ✅ Results of the previous index were dropped")
+
+
+def main():
+    test_normalized_keys()
+    test_lru_bounds()
+    test_ttl_and_fingerprint()
+    test_disk_tier()
+    print("\n✅ All retrieval cache tests passed")
+
+
+if __name__ == "__main__":
+    main()
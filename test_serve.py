@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the local HTTP service (src/serve.py) and its client.
+
+Tests:
+1. /retrieve runs on the retrieval pool and serializes Documents
+2. /answer runs the async LangGraph app through the LLM queue; follow-ups reuse chat_history
+3. /agentic runs arun_agentic_rag through the LLM queue
+4. The LLM queue caps concurrency and answers 503 with Retry-After when full
+5. Bad requests and unknown endpoints get 400/404
+
+Runs in-process on a free port with the stub retriever and stub chat model
+from stubs.py, so no index, embedding model or LLM provider is needed.
+"""
+
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import serve
+from src.utils import agentic_rag
+from src.utils.service_client import ServiceBusy, ServiceClient, ServiceError
+from stubs import STUB_ANSWER, StubChatModel, StubRetriever, patched, use_llm
+
+
+def _with_server(test, **service_kwargs):
+    """Run test(client, service, retriever) against a server on a free port."""
+    retriever = StubRetriever(count=4, metadata={"title": "rigveda"})
+    with use_llm(StubChatModel()), patched(agentic_rag, _SHARED_RETRIEVER=retriever):
+        service = serve.RagService(retriever=retriever, request_timeout=30, **service_kwargs)
+        server = serve.create_server(service, "127.0.0.1", 0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            host, port = server.server_address[:2]
+            test(ServiceClient(f"http://{host}:{port}", retries=0), service, retriever)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+
+def test_retrieve():
+    """Documents come back as {page_content, metadata}, truncated to k."""
+    print("=" * 70)
+    print("TEST 1: /retrieve")
+    print("=" * 70)
+
+    def run(client, service, retriever):
+        result = client.retrieve("Who is Sudas?", k=2)
+        assert retriever.queries == ["Who is Sudas?"]
+        assert len(result["documents"]) == 2
+        assert result["documents"][0] == {
+            "page_content": "HYMN VII.18. Sudas and the Ten Kings (0)",
+            "metadata": {"title": "rigveda", "chunk": 0},
+        }
+        assert result["elapsed_ms"] >= 0
+        print(f"  ✅ {len(result['documents'])} documents in {result['elapsed_ms']} ms")
+
+    _with_server(run)
+
+
+def test_answer():
+    """The RAG graph answers through the LLM queue and returns chat history."""
+    print("\n" + "=" * 70)
+    print("TEST 2: /answer")
+    print("=" * 70)
+
+    def run(client, service, retriever):
+        first = client.answer("Who is Sudas?", debug=True)
+        assert first["answer"]["answer"] == STUB_ANSWER
+        assert first["evaluation"]["confidence_score"] == 90
+        assert [m["role"] for m in first["chat_history"]] == ["user", "assistant"]
+        assert len(first["documents"]) == 4 and retriever.queries
+
+        follow_up = client.answer("And his enemies?", chat_history=first["chat_history"])
+        assert len(follow_up["chat_history"]) == 4
+        assert "documents" not in follow_up
+        assert service.llm_queue.stats()["completed"] == 2
+        # The graph is compiled once and reused
+        assert service.langgraph_app() is service.langgraph_app()
+        print(f"  ✅ Answer and follow-up ({first['elapsed_ms']} ms, {follow_up['elapsed_ms']} ms)")
+
+    _with_server(run)
+
+
+def test_agentic():
+    """The agentic pipeline runs through the same queue."""
+    print("\n" + "=" * 70)
+    print("TEST 3: /agentic")
+    print("=" * 70)
+
+    def run(client, service, retriever):
+        result = client.agentic("How do I say 'I want milk' in Sanskrit?")
+        assert result["query_type"]
+        assert isinstance(result["answer"], dict)
+        assert service.llm_queue.stats()["completed"] == 1
+        print(f"  ✅ query_type={result['query_type']} in {result['elapsed_ms']} ms")
+
+    _with_server(run)
+
+
+def test_backpressure():
+    """One LLM slot and one queue slot: a third request is refused with 503."""
+    print("\n" + "=" * 70)
+    print("TEST 4: LLM queue limits and backpressure")
+    print("=" * 70)
+
+    def run(client, service, retriever):
+        queue = service.llm_queue
+        release = threading.Event()
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def job():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            release.wait(10)
+            with lock:
+                active[0] -= 1
+            return "done"
+
+        running = queue.submit(job)
+        waiting = queue.submit(job)
+        deadline = time.time() + 5
+        while queue.stats()["running"] < 1 and time.time() < deadline:
+            time.sleep(0.01)
+        assert queue.stats()["queued"] == 1
+
+        try:
+            client.answer("Who is Sudas?")
+            raise AssertionError("Expected 503 while the LLM queue is full")
+        except ServiceBusy as e:
+            assert e.status == 503 and e.retry_after == 1
+
+        # Retrieval does not go through the LLM queue
+        assert len(client.retrieve("Sudas")["documents"]) == 4
+
+        release.set()
+        assert running.result(5) == "done" and waiting.result(5) == "done"
+        assert peak[0] == 1
+        assert client.health()["llm_queue"]["rejected"] == 1
+        print("  ✅ 1 running, 1 queued, 3rd request got 503 + Retry-After; retrieval unaffected")
+
+    _with_server(run, llm_concurrency=1, queue_size=1)
+
+
+def test_errors():
+    """Missing fields are 400, unknown paths 404, failures 500 with the message."""
+    print("\n" + "=" * 70)
+    print("TEST 5: Error responses")
+    print("=" * 70)
+
+    def run(client, service, retriever):
+        for call, status in [
+            (lambda: client.retrieve(""), 400),
+            (lambda: client.retrieve("Sudas", k=0), 400),
+            (lambda: client.answer("Sudas", chat_history=[{"role": "user"}]), 400),
+            (lambda: client._request("POST", "/missing", {}), 404),
+        ]:
+            try:
+                call()
+                raise AssertionError(f"Expected {status}")
+            except ServiceBusy:
+                raise
+            except ServiceError as e:
+                assert e.status == status, (e.status, status)
+
+        retriever.fail = True
+        try:
+            client.retrieve("Sudas")
+            raise AssertionError("Expected 500")
+        except ServiceError as e:
+            assert e.status == 500 and "ZeroDivisionError" in e.message
+        print("  ✅ 400, 404 and 500 responses carry an error message")
+
+    _with_server(run)
+
+
+def main():
+    test_retrieve()
+    test_answer()
+    test_agentic()
+    test_backpressure()
+    test_errors()
+    print("\n✅ All service tests passed")
+
+
+if __name__ == "__main__":
+    main()
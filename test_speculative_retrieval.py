@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test script to validate speculative retrieval in the RAG graph.
+
+Tests:
+1. An unchanged rewrite reuses the speculative documents; retrieval overlaps the LLM calls
+2. A material rewrite (new words, or new capitalised names) discards them and
+   retrieves on the rewritten question
+3. Follow-ups: rephrase and topic change run concurrently, the topic-change flag is kept
+4. The async speculative graph matches the blocking one
+5. same_retrieval_query ignores punctuation and stopwords, not case; honours the
+   similarity threshold
+
+Uses the stub chat model (answering by prompt) and stub retriever from
+stubs.py, both with a fixed delay, so no provider or index is needed.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import utils.final_block_rag as rag
+from stubs import StubChatModel, StubRetriever, use_llm
+from utils.final_block_rag import (
+    arun_rag_with_langgraph,
+    create_async_langgraph_app,
+    create_langgraph_app,
+    run_rag_with_langgraph,
+    same_retrieval_query,
+)
+
+DELAY = 0.1
+
+
+def _stub_llm(follow_up="no", grammar="", rephrase="", topic_change="no"):
+    """Answers each rewrite prompt with the given reply."""
+    return StubChatModel(delay=DELAY, replies={
+        "direct follow-up": follow_up,
+        "Correct any grammatical errors": grammar,
+        "question rephraser": rephrase,
+        "completely changed the topic": topic_change,
+    })
+
+
+def _retriever():
+    # Same documents for questions that differ only in case or punctuation
+    return StubRetriever(template="{words} ({i})", delay=DELAY)
+
+
+def _initial_state(question, chat_history=None):
+    return {
+        "question": question,
+        "chat_history": chat_history or [],
+        "documents": [],
+        "answer": "",
+        "enhanced_question": "",
+        "is_follow_up": False,
+        "reset_history": False,
+        "regeneration_count": 0,
+    }
+
+
+def _timed_run(state, app):
+    start = time.perf_counter()
+    result = run_rag_with_langgraph(state, app)
+    return result, time.perf_counter() - start
+
+
+def test_reuse():
+    """Grammar correction only fixes punctuation: one retrieval, overlapped with the LLM calls."""
+    print("=" * 70)
+    print("TEST 1: Speculative documents reused")
+    print("=" * 70)
+
+    with use_llm(_stub_llm(grammar="Who is Sudas?")):
+        baseline_retriever, retriever = _retriever(), _retriever()
+        baseline, sequential = _timed_run(
+            _initial_state("Who is Sudas"), create_langgraph_app(baseline_retriever, speculative=False)
+        )
+        result, speculative = _timed_run(
+            _initial_state("Who is Sudas"), create_langgraph_app(retriever, speculative=True)
+        )
+
+        assert retriever.queries == ["Who is Sudas"]
+        assert baseline_retriever.queries == ["Who is Sudas?"]
+        for key in ("answer", "enhanced_question", "documents", "chat_history"):
+            assert result[key] == baseline[key], key
+        assert speculative < sequential - DELAY / 2, (speculative, sequential)
+        print(f"  ✅ 1 retrieval, same answer; {sequential:.2f}s -> {speculative:.2f}s")
+
+
+def test_discard():
+    """A rewrite that changes the words or capitalises a name triggers a second retrieval."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Speculative documents discarded")
+    print("=" * 70)
+
+    with use_llm(_stub_llm(grammar="Who is Sudas?")):
+        # "sudas" -> "Sudas" makes it a proper noun: variant expansion changes
+        for question in ("who is sudass", "who is sudas"):
+            baseline_retriever, retriever = _retriever(), _retriever()
+            baseline = run_rag_with_langgraph(
+                _initial_state(question), create_langgraph_app(baseline_retriever, speculative=False)
+            )
+            result = run_rag_with_langgraph(
+                _initial_state(question), create_langgraph_app(retriever, speculative=True)
+            )
+
+            assert len(retriever.queries) == 2, (question, retriever.queries)
+            assert retriever.queries[1] == baseline_retriever.queries[0]
+            assert result["enhanced_question"] == "Who is Sudas?"
+            assert result["documents"] == baseline["documents"]
+        print(f"  ✅ Retrieved again for '{result['enhanced_question']}' after a spelling or case-only rewrite")
+
+
+def test_follow_up():
+    """Rephrase and topic change overlap; the topic-change flag reaches the state."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Follow-up rewrite")
+    print("=" * 70)
+
+    with use_llm(_stub_llm(follow_up="yes", rephrase="Who is Agni?", topic_change="yes")) as llm:
+        history = [HumanMessage(content="Who is Sudas?"), AIMessage(content="A king.")]
+        retriever = _retriever()
+        result = run_rag_with_langgraph(
+            _initial_state("Tell me about Agni", history), create_langgraph_app(retriever, speculative=True)
+        )
+
+        assert llm.peak == 2, llm.peak
+        assert result["is_follow_up"] and result["enhanced_question"] == "Who is Agni?"
+        assert len(retriever.queries) == 2
+        assert result["reset_history"] is True
+        print(f"  ✅ Rephrase and topic change overlapped (peak {llm.peak}); topic change kept")
+
+
+def test_async_matches():
+    """The async speculative graph gives the blocking graph's state."""
+    print("\n" + "=" * 70)
+    print("TEST 4: Async speculative graph")
+    print("=" * 70)
+
+    with use_llm(_stub_llm(grammar="Who is Sudas?")):
+        for question in ("Who is Sudas", "who is sudass"):
+            sync_result = run_rag_with_langgraph(
+                _initial_state(question), create_langgraph_app(_retriever(), speculative=True)
+            )
+            async_result = asyncio.run(arun_rag_with_langgraph(
+                _initial_state(question), create_async_langgraph_app(_retriever(), speculative=True)
+            ))
+            for key in ("answer", "enhanced_question", "documents", "chat_history"):
+                assert sync_result[key] == async_result[key], (question, key)
+        print("  ✅ Reused and discarded cases match")
+
+
+def test_same_retrieval_query():
+    """Punctuation never counts, case of a name always does; other changes depend on the threshold."""
+    print("\n" + "=" * 70)
+    print("TEST 5: same_retrieval_query")
+    print("=" * 70)
+
+    assert same_retrieval_query("Who is Sudas", "Who is Sudas?")
+    assert same_retrieval_query("who is sudas?", "Who is sudas")
+    assert not same_retrieval_query("who is sudass", "Who is Sudas?")
+    # Case-only rewrite that turns words into proper nouns
+    assert not same_retrieval_query("what did sudas do to the purus", "What did Sudas do to the Purus?")
+    assert not same_retrieval_query("", "Who is Sudas?")
+
+    saved = rag.SPECULATIVE_REUSE_SIMILARITY
+    rag.SPECULATIVE_REUSE_SIMILARITY = 0.75
+    try:
+        long_question = "what did the ten kings do at the battle on the parushni river"
+        assert same_retrieval_query(long_question, long_question + " against sudas")
+        assert not same_retrieval_query(long_question, long_question + " against Sudas")
+        assert not same_retrieval_query("who is sudas", "who is sudas really")
+    finally:
+        rag.SPECULATIVE_REUSE_SIMILARITY = saved
+    print("  ✅ Exact by default, word overlap with a lower threshold")
+
+
+def main():
+    test_reuse()
+    test_discard()
+    test_follow_up()
+    test_async_matches()
+    test_same_retrieval_query()
+    print("\n✅ All speculative retrieval tests passed")
+
+
+if __name__ == "__main__":
+    main()
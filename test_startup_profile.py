@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the startup profiler.
+
+Tests:
+1. Nested phases, checkpoints and self time in the report
+2. Import timing attributes self time to each imported module
+3. Module-level helpers: flag detection, no-op when inactive, JSON report
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from src.utils import startup_profile
+from src.utils.startup_profile import (
+    StartupProfiler,
+    finish_startup_profile,
+    profiling_requested,
+    start_startup_profile,
+    startup_checkpoint,
+    startup_phase,
+)
+
+
+def test_phases():
+    """Phases nest under the enclosing phase; self time excludes children."""
+    print("=" * 70)
+    print("TEST 1: Phases and checkpoints")
+    print("=" * 70)
+
+    profiler = StartupProfiler("test", time_imports=False)
+    time.sleep(0.01)
+    profiler.checkpoint("imports")
+    with profiler.phase("index"):
+        with profiler.phase("embed_model_load"):
+            time.sleep(0.02)
+        time.sleep(0.01)
+    report = profiler.report()
+
+    names = [p["name"] for p in report["phases"]]
+    assert names == ["imports", "index", "embed_model_load"], names
+    index, embed = report["phases"][1], report["phases"][2]
+    assert embed["parent"] == "index" and embed["depth"] == 1
+    assert embed["seconds"] >= 0.02 and index["seconds"] >= 0.03
+    assert abs(index["self_seconds"] - (index["seconds"] - embed["seconds"])) < 1e-3
+    assert report["imports"] is None
+    assert set(report["phase_totals"]) == {"imports", "index", "embed_model_load"}
+    print(f"  ✅ index {index['seconds']:.3f}s (self {index['self_seconds']:.3f}s)")
+
+
+def test_import_timing():
+    """A module's import time excludes the modules it imports."""
+    print("\n" + "=" * 70)
+    print("TEST 2: Import timing")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "sp_outer_mod.py"), "w") as f:
+            f.write("import time\nimport sp_inner_mod\ntime.sleep(0.02)\n")
+        with open(os.path.join(tmp, "sp_inner_mod.py"), "w") as f:
+            f.write("import time\ntime.sleep(0.03)\n")
+        sys.path.insert(0, tmp)
+        profiler = StartupProfiler("test")
+        try:
+            import sp_outer_mod
+            # Imports made under the profiler still bind the real modules
+            assert sp_outer_mod.sp_inner_mod is sys.modules["sp_inner_mod"]
+        finally:
+            profiler.stop()
+            sys.path.remove(tmp)
+            sys.modules.pop("sp_outer_mod", None)
+            sys.modules.pop("sp_inner_mod", None)
+
+    assert profiler not in sys.meta_path
+    packages = {p["name"]: p["seconds"] for p in profiler.report()["imports"]["by_package"]}
+    assert 0.02 <= packages["sp_outer_mod"] < 0.03, packages
+    assert packages["sp_inner_mod"] >= 0.03, packages
+    print(f"  ✅ outer {packages['sp_outer_mod']:.3f}s, inner {packages['sp_inner_mod']:.3f}s")
+
+
+def test_module_helpers():
+    """The flag starts a shared profiler; helpers are no-ops without one."""
+    print("\n" + "=" * 70)
+    print("TEST 3: Entry-point helpers")
+    print("=" * 70)
+
+    assert profiling_requested(["--profile-startup"]) and profiling_requested(["--profile-startup=x.json"])
+    assert start_startup_profile("cli_run", argv=["--debug"]) is None
+    with startup_phase("bm25_build"):
+        startup_checkpoint("imports")  # inactive: nothing to record
+
+    profiler = start_startup_profile("migration_debate_cli", argv=["--profile-startup"])
+    try:
+        # A second entry point imported by the first reuses its profiler and skips its checkpoint
+        assert start_startup_profile("cli_run", argv=["--profile-startup"]) is profiler
+        startup_checkpoint("imports", "cli_run")
+        startup_checkpoint("imports", "migration_debate_cli")
+        with startup_phase("bm25_build"):
+            pass
+    finally:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "startup.json")
+            finish_startup_profile(path)
+            with open(path) as f:
+                report = json.load(f)
+
+    assert startup_profile.active_profiler() is None
+    assert report["entry_point"] == "migration_debate_cli"
+    assert [p["name"] for p in report["phases"] if p["name"] != "config"] == ["imports", "bm25_build"]
+    print("  ✅ Flag detection, shared profiler and JSON report")
+
+
+def main():
+    test_phases()
+    test_import_timing()
+    test_module_helpers()
+    print("\n✅ All startup profiler tests passed")
+
+
+if __name__ == "__main__":
+    main()
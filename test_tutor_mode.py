@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the tutor-mode RAG graph.
+
+Tests:
+1. The tutor LLM answers in one call, with the mode's system prompt and the retrieved documents
+2. skip_evaluation accepts the answer without a confidence check
+3. A regenerated answer keeps the tutor's system prompt
+4. VedicSanskritTutor makes one tutor call per turn and skips evaluation per mode
+5. Streamed tutor answers print once
+
+Uses the recording stub chat model and stub retriever from stubs.py, so no
+provider or index is needed.
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from langchain_core.messages import SystemMessage
+
+import src.vedic_sanskrit_tutor as tutor_module
+from stubs import StubChatModel, StubRetriever, patched, use_llm
+from utils.final_block_rag import create_tutor_langgraph_app, run_rag_with_langgraph
+
+QUESTION = "Teach me Sandhi rules in Vedic Sanskrit"
+LESSON = "Sandhi joins sounds at word boundaries: agni + iva → agnīva (RV 1.1.1 shows many such joins)."
+SYSTEM_PROMPT = "You are a patient Vedic Sanskrit tutor. Use {Hindi} when helpful."
+
+
+def _retriever():
+    return StubRetriever(template="HYMN I. Agni. I Laud Agni, the chosen Priest", count=1)
+
+
+def _rag_llm(scores=(90,)):
+    """The pipeline LLM: repeats the question for the follow-up and grammar steps, scores answers."""
+    return StubChatModel(reply=QUESTION, script={
+        "ConfidenceScore": [{"confidence_score": score, "reasoning": "scripted"} for score in scores],
+        "RAGResponse": [{"answer": "Regenerated lesson", "citations": []}],
+    })
+
+
+def _tutor_llm():
+    return StubChatModel(reply=LESSON)
+
+
+def _state(**extra):
+    return {
+        "question": QUESTION,
+        "chat_history": [],
+        "documents": [],
+        "answer": "",
+        "enhanced_question": "",
+        "is_follow_up": False,
+        "reset_history": False,
+        "regeneration_count": 0,
+        "system_prompt": SYSTEM_PROMPT,
+        **extra,
+    }
+
+
+def _tutor(tutor_llm, **kwargs):
+    """A VedicSanskritTutor whose LLM client is `tutor_llm`."""
+    with patched(tutor_module, chat_model_class=lambda provider: (lambda **_: tutor_llm)):
+        return tutor_module.VedicSanskritTutor(_retriever(), **kwargs)
+
+
+def test_single_tutor_call():
+    print("=" * 70)
+    print("TEST 1: One tutor call with the system prompt")
+    print("=" * 70)
+
+    rag_llm, tutor_llm = _rag_llm(), _tutor_llm()
+    app = create_tutor_langgraph_app(_retriever(), tutor_llm, speculative=False)
+    with use_llm(rag_llm):
+        result = run_rag_with_langgraph(_state(), app)
+
+    assert tutor_llm.kinds() == ["text"]
+    system, human = tutor_llm.calls[0][1]
+    assert isinstance(system, SystemMessage) and system.content == SYSTEM_PROMPT
+    assert "I Laud Agni" in human.content and QUESTION in human.content
+    assert rag_llm.kinds() == ["text", "text", "ConfidenceScore"]  # follow-up check, grammar, evaluation
+    assert result["answer"]["answer"] == LESSON and result["answer"]["confidence"]["confidence_score"] == 90
+    assert len(result["chat_history"]) == 2
+    print(f"  ✅ Tutor LLM called once; pipeline calls: {rag_llm.kinds()}")
+
+
+def test_skip_evaluation():
+    print("\n" + "=" * 70)
+    print("TEST 2: Evaluation skipped")
+    print("=" * 70)
+
+    rag_llm, tutor_llm = _rag_llm(scores=(10,)), _tutor_llm()
+    app = create_tutor_langgraph_app(_retriever(), tutor_llm, speculative=False)
+    with use_llm(rag_llm):
+        result = run_rag_with_langgraph(_state(skip_evaluation=True), app)
+
+    assert "ConfidenceScore" not in rag_llm.kinds() and tutor_llm.kinds() == ["text"]
+    assert result["answer"] == {"answer": LESSON, "citations": []} and len(result["chat_history"]) == 2
+    print("  ✅ Answer accepted with no evaluation call")
+
+
+def test_regeneration_keeps_prompt():
+    print("\n" + "=" * 70)
+    print("TEST 3: Regeneration keeps the tutor prompt")
+    print("=" * 70)
+
+    rag_llm, tutor_llm = _rag_llm(scores=(40, 90)), _tutor_llm()
+    app = create_tutor_langgraph_app(_retriever(), tutor_llm, speculative=False)
+    with use_llm(rag_llm):
+        result = run_rag_with_langgraph(_state(), app)
+
+    regenerations = [messages for kind, messages in rag_llm.calls if kind == "RAGResponse"]
+    assert len(regenerations) == 1 and regenerations[0][0].content == SYSTEM_PROMPT
+    assert result["answer"]["answer"] == "Regenerated lesson"
+    print("  ✅ Low-confidence lesson regenerated under the same system prompt")
+
+
+def test_tutor_turns():
+    print("\n" + "=" * 70)
+    print("TEST 4: Tutor turns")
+    print("=" * 70)
+
+    rag_llm, tutor_llm = _rag_llm(), _tutor_llm()
+    tutor = _tutor(tutor_llm, stream=False, skip_evaluation="pronunciation, quiz")
+    assert tutor.skip_evaluation == {"pronunciation", "quiz"}
+
+    with use_llm(rag_llm):
+        grammar = tutor._ask_tutor(QUESTION, mode="grammar")
+        evaluated = rag_llm.kinds().count("ConfidenceScore")
+        quiz = tutor._ask_tutor("Give me a beginner-level quiz question", mode="quiz")
+    assert grammar == quiz == LESSON
+    assert tutor_llm.kinds() == ["text", "text"]  # one tutor call per turn, no second pass
+    assert evaluated == 1 and rag_llm.kinds().count("ConfidenceScore") == 1
+    assert tutor_llm.calls[0][1][0].content == tutor.get_system_prompt("grammar")
+    assert tutor_llm.calls[1][1][0].content == tutor.get_system_prompt("quiz")
+    assert len(tutor.chat_history) == 4
+    print("  ✅ Grammar turn evaluated, quiz turn not; one tutor call each")
+
+
+def test_streamed_turn():
+    print("\n" + "=" * 70)
+    print("TEST 5: Streamed turn")
+    print("=" * 70)
+
+    rag_llm, tutor_llm = _rag_llm(), _tutor_llm()
+    tutor = _tutor(tutor_llm, stream=True)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), use_llm(rag_llm):
+        response = tutor._teach(QUESTION, mode="conversation")
+    out = out.getvalue()
+    assert response.strip() == LESSON and out.count(LESSON) == 1
+    print("  ✅ Lesson streamed and printed once")
+
+
+def main():
+    test_single_tutor_call()
+    test_skip_evaluation()
+    test_regeneration_keeps_prompt()
+    test_tutor_turns()
+    test_streamed_turn()
+    print("\n✅ All tutor mode tests passed")
+
+
+if __name__ == "__main__":
+    main()
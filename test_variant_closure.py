@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the compiled proper noun variant tables.
+
+Tests:
+1. Every name resolves to the same variants and context as a scan of the JSON
+2. The compiled tables are cached next to the JSON and reused
+3. The cache is rebuilt when the JSON changes
+4. get_variants_many matches get_variants, unknown nouns included
+5. Confederation lookups and disambiguation are unchanged
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+from src.utils.proper_noun_variants import (
+    VARIANT_CATEGORIES,
+    ProperNounVariantManager,
+    compile_variants,
+)
+
+SOURCE = os.path.join(ROOT, "proper_noun_variants.json")
+
+
+def _load_json():
+    with open(SOURCE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _scan_variants(data, canonical):
+    """get_variants' previous per-call scan of every category."""
+    variants = [canonical]
+    for category in VARIANT_CATEGORIES:
+        if canonical in data.get(category, {}):
+            variants.extend(data[category][canonical].get('variants', []))
+    return list(dict.fromkeys(variants))
+
+
+def _manager(tmp, source=SOURCE):
+    return ProperNounVariantManager(source, cache_file=os.path.join(tmp, "variants.compiled.json"))
+
+
+def test_closure_parity():
+    print("=" * 70)
+    print("TEST 1: Closure table matches a scan of the JSON")
+    print("=" * 70)
+
+    data = _load_json()
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = _manager(tmp)
+    tables = compile_variants(data)
+    for name, canonical in tables["variant_to_canonical"].items():
+        expected = _scan_variants(data, canonical)
+        assert manager.get_variants(name) == expected, name
+        assert manager.get_variants(f"  {name.upper()} ") == expected, name
+        context = manager.get_context(name)
+        assert context["canonical"] == canonical
+        assert context == dict(data[context["category"]][canonical], category=context["category"], canonical=canonical)
+    assert manager.get_variants(" Nobody ") == ["Nobody"]
+    assert manager.get_context("Nobody") is None
+    entry = manager.get_entry("vasistha")
+    assert isinstance(entry.variants, tuple) and entry.variants[0] == entry.canonical
+    print(f"  ✅ {len(tables['variant_to_canonical'])} names, {len(tables['entries'])} canonical entries")
+
+
+def test_cache_reused():
+    print("\n" + "=" * 70)
+    print("TEST 2: Compiled tables cached and reused")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "proper_noun_variants.json")
+        shutil.copy(SOURCE, source)
+
+        built = ProperNounVariantManager(source)
+        cache_file = os.path.join(tmp, "proper_noun_variants.compiled.json")
+        assert os.path.exists(cache_file)
+
+        start = time.perf_counter()
+        loaded = ProperNounVariantManager(source)
+        load_time = time.perf_counter() - start
+        assert loaded._variants_data is None  # served from the cache, JSON never parsed
+        assert loaded.variant_to_canonical == built.variant_to_canonical
+        assert loaded.get_variants("Sudas") == built.get_variants("Sudas")
+        assert loaded.variants_data == _load_json()  # still available on demand
+
+        # Same bytes with a new mtime: the content hash keeps the cache valid
+        os.utime(source, ns=(0, 0))
+        touched = ProperNounVariantManager(source)
+        assert touched._variants_data is None
+
+        assert ProperNounVariantManager(source, cache_file="").get_variants("Sudas") == built.get_variants("Sudas")
+    print(f"  ✅ Reopened from cache in {load_time * 1000:.1f} ms")
+
+
+def test_cache_invalidated():
+    print("\n" + "=" * 70)
+    print("TEST 3: Cache rebuilt when the JSON changes")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "proper_noun_variants.json")
+        shutil.copy(SOURCE, source)
+        assert "Sudaas" not in ProperNounVariantManager(source).get_variants("Sudas")
+
+        data = _load_json()
+        for category in VARIANT_CATEGORIES:
+            if "Sudas" in data.get(category, {}):
+                data[category]["Sudas"]["variants"].append("Sudaas")
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        assert "Sudaas" in ProperNounVariantManager(source).get_variants("Sudas")
+        assert "Sudaas" in ProperNounVariantManager(source).get_variants("sudaas")
+    print("  ✅ New variant picked up after an edit")
+
+
+def test_variants_many():
+    print("\n" + "=" * 70)
+    print("TEST 4: get_variants_many")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = _manager(tmp)
+    nouns = ["Sudas", "Vasishtha", "Bharatas", "Nobody", "sudas"]
+    many = manager.get_variants_many(nouns)
+    assert list(many) == nouns
+    for noun in nouns:
+        assert many[noun] == manager.get_variants(noun)
+    assert manager.get_variants_many([]) == {}
+    print(f"  ✅ {len(nouns)} nouns in one call")
+
+
+def test_confederations_and_homonyms():
+    print("\n" + "=" * 70)
+    print("TEST 5: Confederations and disambiguation")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = _manager(tmp)
+    assert manager.get_confederation_for_tribe("Krivis") == "Panchalas"
+    assert manager.get_confederation_for_tribe(" bharata ") == "Kurus"
+    assert manager.get_confederation_for_tribe("Sudas") is None
+    assert manager.get_constituent_tribes("Kurus") == ["Bharatas", "Purus"]
+    assert manager.get_constituent_tribes("Nobody") == []
+
+    empty = ProperNounVariantManager(os.path.join(ROOT, "no_such_variants.json"), cache_file="")
+    assert empty.get_confederation_for_tribe("Krivis") is None
+    assert empty.get_constituent_tribes("Kurus") == []
+    assert empty.disambiguate("Bharata") == ("Bharata", "Unknown")
+    assert empty.get_variants("Sudas") == ["Sudas"]
+
+    homonyms = _load_json().get("homonyms", {})
+    for name in homonyms:
+        form, role = manager.disambiguate(name, "battle")
+        assert form and role, name
+    print(f"  ✅ Krivis -> Panchalas, Bharata -> Kurus; {len(homonyms)} homonyms disambiguated")
+
+
+def main():
+    test_closure_parity()
+    test_cache_reused()
+    test_cache_invalidated()
+    test_variants_many()
+    test_confederations_and_homonyms()
+    print("\n✅ All variant closure tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Test script to validate the verse reference index.
+
+Tests:
+1. Verse references are found in queries in their usual spellings
+2. Griffith hymns and verses, and Sharma suktas, map to their chunks and byte ranges
+3. A verse Sharma does not number falls back to the whole sukta
+4. The saved index is reused, and rebuilt when a source file changes
+5. The hybrid retriever answers a verse query from the index without searching
+6. A hymn with more chunks than the retriever keeps is cut evenly across translations
+
+Uses the first part of the Griffith and Sharma Rigveda texts in the repo.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from src.utils.index_files import chunk_doc
+from src.utils.retriever import HybridRetriever
+from src.utils.verse_index import (
+    VerseIndex,
+    VerseRef,
+    find_verse_refs,
+    load_or_build_verse_index,
+)
+
+GRIFFITH = "rigveda-griffith_COMPLETE_english_with_metadata"
+SHARMA = "rigveda-sharma_COMPLETE_english_with_metadata"
+SOURCE_CHARS = {GRIFFITH: 120_000, SHARMA: 250_000}
+
+
+def _write_sources(source_dir):
+    """Truncated copies of the two translations; returns their chunks."""
+    docs = []
+    for name, limit in SOURCE_CHARS.items():
+        with open(os.path.join(ROOT, f"{name}.txt"), "r", encoding="utf-8", newline="") as f:
+            text = f.read(limit)
+        with open(os.path.join(source_dir, f"{name}.txt"), "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        docs.append(Document(page_content=text, metadata={"filename": name}))
+    return chunk_doc(docs)
+
+
+class NoSearch(BaseRetriever):
+    """Fails the test if the hybrid search runs."""
+
+    calls: list = []
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        self.calls.append(query)
+        return []
+
+
+def test_find_refs():
+    print("=" * 70)
+    print("TEST 1: References in queries")
+    print("=" * 70)
+
+    assert find_verse_refs("Explain RV 2.33") == [VerseRef("RV", 2, 33)]
+    assert find_verse_refs("what does rv 7.95.2 say?") == [VerseRef("RV", 7, 95, 2)]
+    assert find_verse_refs("Rigveda 10.90 and Rig-veda 10 90") == [VerseRef("RV", 10, 90)]
+    assert find_verse_refs("[02-033] HYMN") == [VerseRef("RV", 2, 33)]
+    assert find_verse_refs("YV 13.3") == [VerseRef("YV", 13, 3)]
+    assert find_verse_refs("PBr. XIV. 3. 2 and PB 4.2") == [VerseRef("PB", 14, 3, 2), VerseRef("PB", 4, 2)]
+    assert find_verse_refs("Who is Sudas?") == []
+    assert VerseRef("RV", 7, 95, 2).key == "RV 7.95.2" and VerseRef("RV", 7, 95, 2).hymn.key == "RV 7.95"
+    print("  ✅ RV / Rigveda / [MM-SSS] / YV / PBr. forms parsed")
+
+
+def test_locations():
+    print("\n" + "=" * 70)
+    print("TEST 2: Chunks and byte ranges")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chunks = _write_sources(tmp)
+        index = VerseIndex.build(chunks, source_dir=tmp)
+        index.docs = chunks
+
+        hymn = index.locate("RV 1.2", "griffith")[0]
+        assert hymn.ref == VerseRef("RV", 1, 2)
+        assert "[01-002] HYMN" in chunks[hymn.chunks[0]].page_content
+        hymn_text = index.text("RV 1.2", "griffith")
+        assert hymn_text.startswith("[01-002] HYMN II.") and "[01-003]" not in hymn_text
+        assert not hymn_text.endswith("-")
+
+        verse = index.text("RV 1.2.4", "griffith")
+        assert verse.startswith("4 These, Indra-Vayu"), verse
+        assert verse in hymn_text and "5 " not in verse[:3]
+        verse_chunks = index.locate("RV 1.2.4", "griffith")[0].chunks
+        assert any(verse[:40] in chunks[i].page_content for i in verse_chunks)
+
+        # Byte ranges address the file exactly
+        (start, end), = index.locate("RV 1.2.4", "griffith")[0].spans
+        with open(os.path.join(tmp, f"{GRIFFITH}.txt"), "rb") as f:
+            f.seek(start)
+            assert f.read(end - start).decode("utf-8") == verse
+
+        sukta = index.text("RV 1.2", "sharma")
+        assert sukta.startswith("Mandala 1/Sukta 2") and "Mandala 1/Sukta 3" not in sukta
+        print(f"  ✅ {len(index)} references; RV 1.2.4 = chunk {verse_chunks}, bytes {start}-{end}")
+
+
+def test_sharma_fallback():
+    print("\n" + "=" * 70)
+    print("TEST 3: Verse falls back to the sukta where unnumbered")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chunks = _write_sources(tmp)
+        index = VerseIndex.build(chunks, source_dir=tmp)
+        index.docs = chunks
+
+    locations = {location.source: location for location in index.locate("RV 1.2.4")}
+    assert locations[GRIFFITH].ref == VerseRef("RV", 1, 2, 4)
+    assert locations[SHARMA].ref == VerseRef("RV", 1, 2)
+    assert locations[SHARMA].chunks == index.locate("RV 1.2", "sharma")[0].chunks
+    assert "RV 1.2.4" in index and "RV 99.1" not in index
+    print(f"  ✅ Griffith verse chunks {locations[GRIFFITH].chunks}, Sharma sukta chunks {locations[SHARMA].chunks}")
+
+
+def test_persistence():
+    print("\n" + "=" * 70)
+    print("TEST 4: Persistence")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chunks = _write_sources(tmp)
+        index_dir = os.path.join(tmp, "verse_index")
+        built = load_or_build_verse_index(chunks, index_dir, source_dir=tmp)
+
+        start = time.perf_counter()
+        loaded = load_or_build_verse_index(chunks, index_dir, source_dir=tmp)
+        load_time = time.perf_counter() - start
+        assert loaded.refs == built.refs and loaded.docs is chunks
+        assert loaded.text("RV 1.2.4", "griffith") == built.text("RV 1.2.4", "griffith")
+
+        # Editing a source file invalidates its byte ranges
+        source = os.path.join(tmp, f"{GRIFFITH}.txt")
+        with open(source, "a", encoding="utf-8") as f:
+            f.write("\n")
+        os.utime(source, ns=(1, 1))
+        rebuilt = load_or_build_verse_index(chunks, index_dir, source_dir=tmp)
+        assert rebuilt.sources[GRIFFITH] != built.sources[GRIFFITH]
+
+        # Without the source files, texts come from the chunks
+        no_sources = VerseIndex.build(chunks)
+        no_sources.docs = chunks
+        assert no_sources.locate("RV 1.2", "griffith")[0].spans == ()
+        assert "[01-002] HYMN" in no_sources.text("RV 1.2", "griffith")
+    print(f"  ✅ Reloaded in {load_time * 1000:.1f} ms; rebuilt after a source edit")
+
+
+def test_retriever_short_circuit():
+    print("\n" + "=" * 70)
+    print("TEST 5: Retriever short-circuit")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chunks = _write_sources(tmp)
+        index = VerseIndex.build(chunks, source_dir=tmp)
+        index.docs = chunks
+
+    search = NoSearch(calls=[])
+    retriever = HybridRetriever(semantic_retriever=search, keyword_retriever=search, k=10, verse_index=index)
+    docs = retriever.invoke("What does RV 1.2 say about Vayu?")
+    assert search.calls == []
+    assert docs[0].metadata["filename"] == GRIFFITH and "[01-002] HYMN" in docs[0].page_content
+    assert {doc.metadata["filename"] for doc in docs} == {GRIFFITH, SHARMA}
+    assert "verse_index" in retriever.last_stage_timings
+
+    griffith_only = retriever.invoke("RV 1.2.4 in the Rigveda Griffith translation")
+    assert search.calls == [] and griffith_only
+
+    retriever.invoke("Who is Vayu?")
+    retriever.invoke("What does RV 99.1 say?")  # not indexed: searched as before
+    assert "Who is Vayu?" in search.calls and "What does RV 99.1 say?" in search.calls
+    print(f"  ✅ RV 1.2 -> {len(docs)} chunks with no search; other queries searched")
+
+
+def _long_hymn_chunks():
+    """RV 7.18 split into 9 Griffith and 22 Sharma chunks, as at CHUNK_SIZE=768."""
+    chunks = [Document(page_content="[07-018] HYMN XVIII. Indra.", metadata={"filename": GRIFFITH})]
+    chunks += [Document(page_content=f"{i} Griffith verse {i}", metadata={"filename": GRIFFITH}) for i in range(1, 9)]
+    chunks.append(Document(page_content="Mandala 7/Sukta 18\nIndra.", metadata={"filename": SHARMA}))
+    chunks += [Document(page_content=f"Sharma verse {i}", metadata={"filename": SHARMA}) for i in range(1, 22)]
+    return chunks
+
+
+def test_long_hymn():
+    print("\n" + "=" * 70)
+    print("TEST 6: Hymn longer than k")
+    print("=" * 70)
+
+    chunks = _long_hymn_chunks()
+    index = VerseIndex.build(chunks)
+    index.docs = chunks
+    assert [len(location.chunks) for location in index.locate("RV 7.18")] == [9, 22]
+
+    search = NoSearch(calls=[])
+    retriever = HybridRetriever(semantic_retriever=search, keyword_retriever=search, k=5, verse_index=index)
+    docs = retriever.invoke("Explain RV 7.18")
+    griffith = [doc.page_content for doc in docs if doc.metadata["filename"] == GRIFFITH]
+    sharma = [doc.page_content for doc in docs if doc.metadata["filename"] == SHARMA]
+    assert search.calls == [] and len(docs) < len(chunks)
+    assert griffith[0].startswith("[07-018] HYMN") and sharma[0].startswith("Mandala 7/Sukta 18")
+    assert griffith == [chunks[i].page_content for i in range(len(griffith))]  # hymn start, in order
+    assert abs(len(griffith) - len(sharma)) <= 1, (griffith, sharma)
+    print(f"  ✅ {len(docs)} of {len(chunks)} chunks: Griffith 1-{len(griffith)}, Sharma 1-{len(sharma)}")
+
+
+def main():
+    test_find_refs()
+    test_locations()
+    test_sharma_fallback()
+    test_persistence()
+    test_retriever_short_circuit()
+    test_long_hymn()
+    print("\n✅ All verse index tests passed")
+
+
+if __name__ == "__main__":
+    main()